@@ -0,0 +1,27 @@
+"""
+The overhead of routing a Prompt through the AI_Interface and the AIModelStrategy to the AI tool, with a stub client
+"""
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+
+def create_prompt(cache_mode):
+    prompt, _ = Chatbot().create_chatbot_prompt(
+        "Generate Response", "openai", None, "Hello", None, 1024, .7, 1, 0, 0, False, None, cache_mode
+    )
+    return prompt
+
+def bench_call_ai_tool(benchmark, stub_client):
+    prompt = create_prompt("bypass")
+    response = benchmark(AI_Interface().call_ai_tool, prompt)
+    assert response.message == "A response"
+
+def bench_call_ai_tool_coalesced(benchmark, stub_client):
+    # Cacheable Prompts go through single flight, even when the response cache is disabled
+    prompt = create_prompt("use")
+    response = benchmark(AI_Interface().call_ai_tool, prompt)
+    assert response.message == "A response"
+
+def bench_generate_response(benchmark, stub_client):
+    chatbot = Chatbot()
+    assert benchmark(chatbot.generate_response, ai_model="openai", message="Hello", cache_mode="bypass") == "A response"
@@ -0,0 +1,21 @@
+"""
+Formatting the messages of a Prompt with a growing history, and turning large responses into test data
+"""
+import json
+from types import SimpleNamespace
+import pytest
+from RobotFrameworkAI.ai_interface.ai_model_services.openai_tools.OpenAITool import OpenAITool
+from RobotFrameworkAI.modules.real_test_data_generator.test_data_generators.AddressGenerator import AddressGenerator
+
+
+@pytest.mark.parametrize("history_length", [0, 10, 100, 1000])
+def bench_format_prompt_messages(benchmark, history_length):
+    history = [entry for i in range(history_length) for entry in ({"user": f"Question {i}"}, {"assistant": f"Answer {i}"})]
+    messages = benchmark(OpenAITool().format_prompt_messages, "You are helpful", "Hello", history)
+    assert len(messages) == 2 * history_length + 2
+
+@pytest.mark.parametrize("amount", [10, 1000, 10000])
+def bench_address_format_response(benchmark, amount):
+    addresses = {"addresses": [{"address": f"Street {i}, 1234 AB City, Country"} for i in range(amount)]}
+    response = SimpleNamespace(message=json.dumps(addresses))
+    assert len(benchmark(AddressGenerator().format_response, response)) == amount
@@ -0,0 +1,34 @@
+"""
+The overhead of a keyword before its Prompt is sent: default values, validation and creating the Prompt
+"""
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+
+ARGUMENTS = {
+    "ai_model": "openai", "system_message": None, "message": "Hello", "model": None, "max_tokens": None, "temperature": .7,
+    "top_p": None, "frequency_penalty": None, "presence_penalty": None, "keep_history": None, "response_format": None,
+    "cache_mode": None, "stream": None, "stop_pattern": None
+}
+
+def bench_get_default_values_for_arguments(benchmark):
+    chatbot = Chatbot()
+    values = benchmark(chatbot.get_default_values_for_arguments, **ARGUMENTS)
+    assert len(values) == len(ARGUMENTS)
+
+def bench_validate_input_arguments(benchmark):
+    chatbot = Chatbot()
+    arguments = {
+        "message": "Hello", "max_tokens": 1024, "temperature": .7, "top_p": 1, "frequency_penalty": 0, "presence_penalty": 0,
+        "cache_mode": "use", "stop_pattern": None
+    }
+    assert benchmark(chatbot.validate_input_arguments, **arguments)
+
+def bench_create_prompt(benchmark):
+    chatbot = Chatbot()
+    prompt = benchmark(chatbot.create_prompt, "text_generator", "openai", None, "Hello", None, None, 1024, .7, 1, 0, 0, None)
+    assert prompt.message.user == "Hello"
+
+def bench_create_chatbot_prompt(benchmark):
+    chatbot = Chatbot()
+    prompt, _ = benchmark(chatbot.create_chatbot_prompt, "Generate Response", **ARGUMENTS)
+    assert prompt.parameters["temperature"] == .7
@@ -0,0 +1,73 @@
+"""
+Benchmarks the SQLiteCacheBackend with many processes reading and writing the same database at the same time
+
+Every process writes and reads entries from a shared set of keys, so processes overwrite each other's entries.
+Reports the throughput, the latency percentiles and the amount of errors.
+
+    python benchmarks/cache_contention.py --processes 16 --operations 500
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from RobotFrameworkAI.ai_interface.cache.SQLiteCacheBackend import SQLiteCacheBackend
+
+
+def worker(path, operations, keys, entry_size, seed):
+    backend = SQLiteCacheBackend(path, compaction_interval=None)
+    generator = random.Random(seed)
+    entry = {"message": "x" * entry_size, "metadata": {"ai_tool": "text_generator"}}
+    write_latencies, read_latencies, errors = [], [], 0
+    for _ in range(operations):
+        key = f"key-{generator.randrange(keys)}"
+        try:
+            start = time.perf_counter()
+            backend.set(key, entry, time.time())
+            write_latencies.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            backend.get(key)
+            read_latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors += 1
+    return write_latencies, read_latencies, errors
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--operations", type=int, default=500, help="Writes and reads per process")
+    parser.add_argument("--keys", type=int, default=1000, help="Amount of distinct keys shared by the processes")
+    parser.add_argument("--entry-size", type=int, default=2000, help="Size of each entry in bytes")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "responses.sqlite3")
+        SQLiteCacheBackend(path, compaction_interval=None)
+        tasks = [(path, arguments.operations, arguments.keys, arguments.entry_size, seed) for seed in range(arguments.processes)]
+        start = time.perf_counter()
+        with multiprocessing.Pool(arguments.processes) as pool:
+            results = pool.starmap(worker, tasks)
+        duration = time.perf_counter() - start
+        entries = SQLiteCacheBackend(path, compaction_interval=None).size()[1]
+
+    writes = [latency for result in results for latency in result[0]]
+    reads = [latency for result in results for latency in result[1]]
+    errors = sum(result[2] for result in results)
+    print(f"Processes: {arguments.processes}, operations per process: {arguments.operations}, entries in database: {entries}")
+    print(f"Throughput: {(len(writes) + len(reads)) / duration:.0f} operations/s over {duration:.2f}s, errors: {errors}")
+    for name, latencies in (("write", writes), ("read", reads)):
+        print(
+            f"{name:>5} latency ms: mean {statistics.mean(latencies) * 1000:.2f}, p50 {percentile(latencies, .5) * 1000:.2f}, "
+            f"p95 {percentile(latencies, .95) * 1000:.2f}, p99 {percentile(latencies, .99) * 1000:.2f}, max {max(latencies) * 1000:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import glob
+import os
+from types import SimpleNamespace
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+
+
+STORAGE = os.path.join(os.path.dirname(__file__), ".benchmarks")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Saved runs are kept next to the benchmarks, wherever pytest is run from
+    if config.getoption("benchmark_storage") == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{STORAGE}"
+    # The first run on a machine has nothing to compare to, so it can't fail on regressions.
+    # A run that is given explicitly, like the committed baseline.json, is compared to whenever it exists.
+    if not has_run_to_compare(config.getoption("benchmark_compare")):
+        config.option.benchmark_compare = None
+        config.option.benchmark_compare_fail = None
+
+def has_run_to_compare(compare) -> bool:
+    """
+    Returns whether the run to compare to exists, compare is True for the previous run or the file, number or id of a run
+    """
+    if not compare:
+        return True
+    if compare is True:
+        return bool(glob.glob(os.path.join(STORAGE, "*", "*.json")))
+    if os.path.isfile(compare):
+        return True
+    return bool(glob.glob(os.path.join(STORAGE, "*", f"{compare.rstrip('*')}*.json")) or glob.glob(os.path.join(STORAGE, f"{compare.rstrip('*')}*.json")))
+
+class StubCompletions:
+    """
+    Takes the place of the chat completions of the OpenAI client, returns the same completion straight away
+    """
+    def __init__(self):
+        message = SimpleNamespace(content="A response", role="assistant")
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=2)
+        self.completion = SimpleNamespace(created=1700000000, choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=usage)
+
+    async def create(self, **kwargs):
+        return self.completion
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    """
+    Gives the OpenAI text generator a stub client, so only the overhead of the library is measured
+    """
+    monkeypatch.setenv("OPENAI_KEY", "stub")
+    tool = AI_Interface().ai_models["openai"].ai_tools["text_generator"]
+    monkeypatch.setattr(tool, "client", SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions())))
+    return tool
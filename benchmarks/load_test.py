@@ -0,0 +1,197 @@
+"""
+Drives many concurrent callers through the keywords against the stub server of the OpenAI API and reports the results
+
+Each caller sends its requests one after another, the callers run at the same time. Callers are threads calling the keywords
+(--mode threads), like parallel Robot Framework runs in one process, or coroutines gathered on the event loop of the library
+using the async keywords (--mode async). The keywords are used in turn: Generate Response (chatbot), Generate Test Data
+(test_data) and Send Message (assistant). Every request is unique, so nothing is cached or coalesced.
+
+By default the stub server is started in its own process, so it doesn't compete with the callers for the GIL. Use --base-url
+to use a stub server that is already running. Reports the throughput, latency percentiles and error rate per keyword.
+No network or API key is needed.
+
+    python benchmarks/load_test.py --callers 50 --requests 20 --latency 0.2 --latency-distribution lognormal --latency-stddev 0.1
+    python benchmarks/load_test.py --callers 200 --mode async --keywords chatbot --error-rate 0.02
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+
+KEYWORDS = ("chatbot", "test_data", "assistant")
+
+
+def start_stub_server(arguments):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = [
+        sys.executable, "-m", "RobotFrameworkAI.stub_server", "--port", str(port), "--latency", str(arguments.latency),
+        "--latency-distribution", arguments.latency_distribution, "--latency-stddev", str(arguments.latency_stddev),
+        "--error-rate", str(arguments.error_rate), "--rate-limit-rate", str(arguments.rate_limit_rate)
+    ]
+    if arguments.seed is not None:
+        command += ["--seed", str(arguments.seed)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.perf_counter() + 10
+    while time.perf_counter() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=.1).close()
+            return process, f"http://127.0.0.1:{port}/v1"
+        except OSError:
+            time.sleep(.05)
+    process.kill()
+    raise RuntimeError("The stub server didn't start within 10 seconds")
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+def create_calls(caller, arguments):
+    """
+    Returns the keyword and the arguments of each request of the caller
+    """
+    calls = []
+    for request in range(arguments.requests):
+        keyword = arguments.keywords[(caller + request) % len(arguments.keywords)]
+        message = f"Caller {caller} request {request}"
+        if keyword == "chatbot":
+            calls.append((keyword, {"ai_model": "openai", "message": message, "max_tokens": arguments.max_tokens, "cache_mode": "bypass"}))
+        elif keyword == "test_data":
+            calls.append((keyword, {"ai_model": "openai", "type": "address", "amount": 5, "format": message, "cache_mode": "bypass"}))
+        else:
+            calls.append((keyword, {"ai_model": "openai", "message": message}))
+    return calls
+
+def run_threads(modules, arguments):
+    keywords = {
+        "chatbot": modules["chatbot"].generate_response,
+        "test_data": modules["test_data"].generate_test_data,
+        "assistant": modules["assistant"].send_message,
+    }
+    def caller(number):
+        results = []
+        for keyword, kwargs in create_calls(number, arguments):
+            start = time.perf_counter()
+            try:
+                keywords[keyword](**kwargs)
+                results.append((keyword, time.perf_counter() - start, None))
+            except Exception as e:
+                results.append((keyword, time.perf_counter() - start, type(e).__name__))
+        return results
+    with concurrent.futures.ThreadPoolExecutor(arguments.callers) as executor:
+        return [result for results in executor.map(caller, range(arguments.callers)) for result in results]
+
+def run_async(modules, arguments):
+    from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+
+    keywords = {
+        "chatbot": modules["chatbot"].generate_response_async,
+        "test_data": modules["test_data"].generate_test_data_async,
+        "assistant": modules["assistant"].send_message_async,
+    }
+    async def caller(number):
+        results = []
+        for keyword, kwargs in create_calls(number, arguments):
+            start = time.perf_counter()
+            try:
+                await keywords[keyword](**kwargs)
+                results.append((keyword, time.perf_counter() - start, None))
+            except Exception as e:
+                results.append((keyword, time.perf_counter() - start, type(e).__name__))
+        return results
+    async def run():
+        return await asyncio.gather(*(caller(number) for number in range(arguments.callers)))
+    return [result for results in AI_Interface().run(run()) for result in results]
+
+def report(results, duration, arguments):
+    summary = {
+        "callers": arguments.callers,
+        "mode": arguments.mode,
+        "requests": len(results),
+        "duration": duration,
+        "throughput": len(results) / duration,
+        "keywords": {}
+    }
+    for keyword in arguments.keywords:
+        latencies = [latency for name, latency, _ in results if name == keyword]
+        errors = [error for name, _, error in results if name == keyword and error is not None]
+        if not latencies:
+            continue
+        summary["keywords"][keyword] = {
+            "requests": len(latencies),
+            "throughput": len(latencies) / duration,
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies),
+            "mean": statistics.mean(latencies),
+            "error_rate": len(errors) / len(latencies),
+            "errors": {error: errors.count(error) for error in set(errors)}
+        }
+    if arguments.json:
+        print(json.dumps(summary, indent=4))
+        return
+    print(f"{summary['requests']} requests by {arguments.callers} {arguments.mode} callers in {duration:.2f} s: {summary['throughput']:.1f} requests/s")
+    print(f"{'keyword':<10} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for keyword, stats in summary["keywords"].items():
+        print(f"{keyword:<10} {stats['requests']:>8} {stats['throughput']:>8.1f} {stats['p50'] * 1000:>8.0f} {stats['p90'] * 1000:>8.0f} "
+              f"{stats['p99'] * 1000:>8.0f} {stats['max'] * 1000:>8.0f} {stats['error_rate']:>7.1%}")
+        for error, count in stats["errors"].items():
+            print(f"    {error}: {count}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", type=int, default=20, help="The amount of callers at the same time")
+    parser.add_argument("--requests", type=int, default=10, help="The amount of requests of each caller")
+    parser.add_argument("--mode", choices=("threads", "async"), default="threads")
+    parser.add_argument("--keywords", type=lambda value: value.split(","), default=list(KEYWORDS), help=f"A comma separated list of: {', '.join(KEYWORDS)}")
+    parser.add_argument("--max-tokens", type=int, default=100)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--base-url", help="The URL of a stub server that is already running")
+    parser.add_argument("--latency", type=float, default=.1)
+    parser.add_argument("--latency-distribution", default="fixed")
+    parser.add_argument("--latency-stddev", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    arguments = parser.parse_args()
+    unknown_keywords = set(arguments.keywords) - set(KEYWORDS)
+    if unknown_keywords:
+        parser.error(f"Unknown keywords: {', '.join(unknown_keywords)}")
+
+    process, base_url = (None, arguments.base_url) if arguments.base_url else start_stub_server(arguments)
+    os.environ.setdefault("OPENAI_KEY", "stub")
+    try:
+        from RobotFrameworkAI.modules.assistant.Assistant import Assistant
+        from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+        from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+
+        modules = {"chatbot": Chatbot(), "test_data": RealTestDataGenerator(), "assistant": Assistant()}
+        modules["chatbot"].configure_ai_transport(
+            "openai", max_connections=arguments.callers, max_keepalive_connections=arguments.callers, base_url=base_url
+        )
+        modules["chatbot"].set_retry_policy("openai", max_retries=arguments.max_retries, base_delay=.1)
+        if "assistant" in arguments.keywords:
+            modules["assistant"].create_assistant(ai_model="openai", name="Load test", instructions="Answer shortly")
+        start = time.perf_counter()
+        if arguments.mode == "threads":
+            results = run_threads(modules, arguments)
+        else:
+            results = run_async(modules, arguments)
+        report(results, time.perf_counter() - start, arguments)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+if __name__ == "__main__":
+    main()
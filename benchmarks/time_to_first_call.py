@@ -0,0 +1,41 @@
+"""
+Measures the time to first call to OpenAI with and without warming up the connections first
+
+Each run starts a new process, so every run pays for DNS, TCP and TLS setup like the first keyword of a suite does.
+Cold runs send the first prompt straight away. Warm runs first call Warm Up AI Connections, as a suite setup would,
+and then only measure the first prompt. Requires the OPENAI_KEY environment variable and uses a few tokens per run.
+
+    python benchmarks/time_to_first_call.py --runs 5
+"""
+import argparse
+import multiprocessing
+import statistics
+import time
+
+
+def first_call(warm_up):
+    from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+    chatbot = Chatbot()
+    if warm_up:
+        chatbot.warm_up_ai_connections("openai")
+    start = time.perf_counter()
+    chatbot.generate_response("openai", message="Say hi", max_tokens=5, cache_mode="bypass")
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    arguments = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for warm_up in (False, True):
+        durations = []
+        for _ in range(arguments.runs):
+            with context.Pool(1) as pool:
+                durations.append(pool.apply(first_call, (warm_up,)))
+        print(f"{'warm' if warm_up else 'cold'}: median {statistics.median(durations) * 1000:.0f} ms, "
+              f"min {min(durations) * 1000:.0f} ms, max {max(durations) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
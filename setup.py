@@ -35,4 +35,5 @@ setup(
     package_data={"": ["*.misc"]},
     python_requires=">=3.8",
     #install_requires=[get_requirements()],
+    extras_require={"semantic_cache": ["numpy"], "benchmarks": ["pytest-benchmark"], "tokens": ["tiktoken"]},
 )
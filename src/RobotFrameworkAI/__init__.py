@@ -8,6 +8,7 @@ import inspect
 from .modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
 from .modules.chatbot.Chatbot import Chatbot
 from .modules.assistant.Assistant import Assistant
+from .listener.AIListener import AIListener
 from .logger.logger import setup_logging
 
 @library
@@ -16,6 +17,9 @@ class RobotFrameworkAI(DynamicCore):
     RobotFrameworkAI is a custom library for Robot Framework that integrates AI functionalities,
     including generating real test data, interacting with a chatbot, and managing AI assistants.
     """
+    # The modules share their state through the AI_Interface, so one instance is used for the whole run
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+
     def __init__(self) -> None:
         """
         Initializes the RobotFrameworkAI library with necessary components like RealTestDataGenerator,
@@ -23,6 +27,7 @@ class RobotFrameworkAI(DynamicCore):
         """
         libraries = [RealTestDataGenerator(), Chatbot(), Assistant()]
         DynamicCore.__init__(self, libraries)
+        self.ROBOT_LIBRARY_LISTENER = AIListener()
 
     @keyword
     @wraps(setup_logging)
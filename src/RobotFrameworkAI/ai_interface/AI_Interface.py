@@ -1,13 +1,32 @@
+import asyncio
+import concurrent.futures
+import copy
+import dataclasses
 import importlib
 import inspect
 import os
 import pkgutil
 import sys
-from RobotFrameworkAI.ai_interface.ai_model_services.GeminiService import GeminiService
-from RobotFrameworkAI.ai_interface.ai_model_services.OpenAIService import OpenAIService
+import tempfile
+import threading
+import time
 import logging
+from typing import Optional
 
 from RobotFrameworkAI.ai_interface.ai_model_services.AIModelStrategy import AIModelStrategy
+from RobotFrameworkAI.ai_interface.budget.BudgetManager import BudgetManager
+from RobotFrameworkAI.ai_interface.cache.DiskCacheBackend import DiskCacheBackend
+from RobotFrameworkAI.ai_interface.cache.ResponseCache import ResponseCache
+from RobotFrameworkAI.ai_interface.cache.SQLiteCacheBackend import SQLiteCacheBackend
+from RobotFrameworkAI.ai_interface.metrics.MetricsRegistry import MetricsRegistry
+from RobotFrameworkAI.ai_interface.rate_limiting.RateLimiter import estimate_tokens
+from RobotFrameworkAI.ai_interface.routing.Router import Router
+from RobotFrameworkAI.ai_interface.scheduling.Scheduler import Scheduler
+from RobotFrameworkAI.ai_interface.tokens.TokenCounter import TokenCounter
+from RobotFrameworkAI.gateway.GatewayClient import GatewayClient
+from RobotFrameworkAI.gateway.GatewayProtocol import GatewayUnavailableError
+from RobotFrameworkAI.manifest.LazyRegistry import LazyRegistry
+from RobotFrameworkAI.manifest.manifest import AI_MODELS, DEFAULT_MODELS
 
 
 logger = logging.getLogger(__name__)
@@ -49,10 +68,68 @@ class AI_Interface:
     Another way to look at it is like a table. On the top row there are different AI models, with different types of AI tool types
     on the left most column. Each specific AI tool will belong in a column and row. Each AI tool will both inherit from the AI model
     in the column the AI tool is and in the AI tool type in the row of the AI tool.
+
+    There is only 1 AI_Interface per process. Every module creates an AI_Interface, but they all get the same instance.
+    This way the AI models are only discovered once and every module shares the same AIModelStrategy objects, and with
+    that the same API clients, connection pools, caches and counters of each AI model.
+
+    The AI models are not imported when the AI_Interface is created. They are listed in the generated manifest
+    and each AI model is only imported and instantiated when the first Prompt for that AI model comes in.
+
+    Optionally a ResponseCache can be enabled. Prompts that have been sent before will then get the cached Response
+    instead of being sent to the AI model again.
+
+    All communication with AI models is asynchronous. The AI_Interface owns an event loop that runs in a background thread,
+    on which all Prompts are handled. This way many Prompts can be in flight at the same time and the async API clients,
+    which are bound to the event loop they are first used on, are always used on the same event loop.
+    The synchronous call_ai_tool simply submits the Prompt to this event loop and waits for the Response.
+
+    Identical Prompts that are in flight at the same time, e.g. from parallel tests sharing a setup keyword, are only sent once.
+    The other callers wait for that request and each get their own copy of its Response. This only applies to Prompts for AI
+    tools without side effects, the same ones that can be cached, and not to Prompts with the cache_mode bypass.
+
+    The ai_model of a Prompt can also be the name of a model group. The Router then picks a member of the group, an AI model
+    and one of its models, by their recent latency and error rate, and fails over to the next member when one fails.
+
+    Prompts that are sent to an AI model first get a slot of the Scheduler. When all slots are taken, the Prompt with the
+    highest priority, in the config kwargs, gets the next free slot. This way urgent Prompts overtake bulk work.
+
+    When an AI gateway runs on the machine, Prompts for the text generator are sent to it instead of to the AI model directly.
+    The gateway shares its API clients, response cache, rate limiters and metrics between all processes, e.g. pabot workers.
+    When the gateway isn't running, or goes away, Prompts are handled in this process as usual. See the GatewayServer.
     """
+    _instance = None
+    _instance_lock = threading.Lock()
 
-    def __init__(self) -> None:
-        self.ai_models: list[AIModelStrategy] = self._discover_ai_models()
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.ai_models: LazyRegistry = LazyRegistry(AI_MODELS)
+                instance.response_cache: Optional[ResponseCache] = None
+                instance.loop: Optional[asyncio.AbstractEventLoop] = None
+                instance._loop_lock = threading.Lock()
+                # ResponseHandles of requests started in the background that haven't been waited for yet
+                instance.response_handles: list = []
+                # Futures of the Responses to the Prompts that are in flight, by fingerprint. Only used on the event loop.
+                instance.in_flight: dict = {}
+                # The Prompts that were sent for those futures, by fingerprint
+                instance.in_flight_prompts: dict = {}
+                # The usage of the AI models, updated for every Prompt
+                instance.metrics = MetricsRegistry()
+                # The token and cost budgets of the run, checked before every Prompt sent to an AI model
+                instance.budget = BudgetManager()
+                # Counts the tokens of Prompts before they are sent and fits them in the context window of their model
+                instance.token_counter = TokenCounter()
+                # Sends Prompts for a model group to one of its members
+                instance.router = Router()
+                # Decides which Prompt is sent next when all slots are taken
+                instance.scheduler = Scheduler()
+                # Sends Prompts to the AI gateway when it is running
+                instance.gateway = GatewayClient()
+                cls._instance = instance
+                logger.debug(f"Created the shared AI_Interface with AI models: `{'`, `'.join(instance.ai_models)}`")
+        return cls._instance
 
     def _discover_ai_models(self):
         """
@@ -60,6 +137,7 @@ class AI_Interface:
 
         A dictionary will be created with the name of each AIModelStrategy as the key and an instance as value.
         The name comes from the name attribute in the implementation of the AIModelStrategy.
+        This imports every AI model, it's used to generate the manifest and not when handling Prompts.
         """
         ai_models = {}
         package = 'RobotFrameworkAI.ai_interface.ai_model_services'
@@ -91,31 +169,318 @@ class AI_Interface:
                         raise
         return ai_models
 
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Returns the event loop on which all Prompts are handled, starting it in a background thread on first use
+        """
+        if self.loop is None:
+            with self._loop_lock:
+                if self.loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(target=loop.run_forever, name="AI_Interface", daemon=True)
+                    thread.start()
+                    self.loop = loop
+        return self.loop
+
+    def is_in_loop(self) -> bool:
+        """
+        Returns whether the current code runs on the event loop of the AI_Interface
+        """
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def run(self, coroutine):
+        """
+        Runs the coroutine on the event loop of the AI_Interface, waits for it to finish and returns its result
+
+        This is how synchronous code, like the keywords, uses the asynchronous code.
+        """
+        if self.is_in_loop():
+            coroutine.close()
+            raise RuntimeError("AI_Interface.run can't be used from the event loop of the AI_Interface, await the coroutine instead.")
+        return asyncio.run_coroutine_threadsafe(coroutine, self.get_loop()).result()
+
+    async def run_async(self, coroutine):
+        """
+        Awaits the coroutine on the event loop of the AI_Interface from any event loop, e.g. the one of Robot Framework
+        """
+        if self.is_in_loop():
+            return await coroutine
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, self.get_loop()))
+
+    def start(self, coroutine) -> concurrent.futures.Future:
+        """
+        Starts running the coroutine on the event loop of the AI_Interface and returns a Future of its result without waiting
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.get_loop())
+
+    def submit(self, prompt) -> concurrent.futures.Future:
+        """
+        Starts handling the Prompt on the event loop of the AI_Interface and returns a Future of the Response
+        """
+        return self.start(self._call_ai_tool(prompt))
+
     def call_ai_tool(self, prompt):
+        """
+        Sends the prompt to the right AI model service class and waits for the Response
+
+        See call_ai_tool_async.
+        """
+        return self.run(self._call_ai_tool(prompt))
+
+    async def call_ai_tool_async(self, prompt):
         """
         Sends the prompt to the right AI model service class
 
         Depending on the AI model assigned to the Prompt sends the Prompt to the right AI model strategy class.
         Will raise an error if the AI model doesn't exists.
 
-        Those classes also have a call_ai_tool method which further sends the Prompt to the specific AI tool type.
+        Those classes also have a call_ai_tool_async method which further sends the Prompt to the specific AI tool type.
+
+        When the response cache is enabled, the cache_mode in the config kwargs of the Prompt determines whether the
+        cache is used. See the ResponseCache for the different modes.
+
+        Can be awaited from any event loop, the Prompt is always handled on the event loop of the AI_Interface.
         """
+        return await self.run_async(self._call_ai_tool(prompt))
+
+    async def _call_ai_tool(self, prompt):
         ai_model = prompt.config.ai_model
+        if ai_model in self.router.groups:
+            # Each member is called with this method again, so the metrics are recorded per AI model
+            return await self.router.route(prompt, self._call_ai_tool)
         if ai_model not in self.ai_models:
             error_message = f"Invalid ai_model: `{ai_model}`. Valid ai_models are: `{'`, `'.join(self.ai_models)}`"
+            if self.router.groups:
+                error_message += f" and the model groups: `{'`, `'.join(self.router.groups)}`"
             logger.error(error_message)
             raise ValueError(error_message)
 
-        ai_model_strategy = self.ai_models[ai_model]
+        start = time.perf_counter()
+        try:
+            response = await self._handle_prompt(prompt)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.record_metrics(prompt, time.perf_counter() - start)
+            raise
+        self.record_metrics(prompt, time.perf_counter() - start, response)
+        return response
+
+    def record_metrics(self, prompt, latency: float, response = None):
+        """
+        Adds the Prompt and its Response to the metrics, a Prompt without a Response failed
+        """
+        metadata = response.metadata if response is not None else None
+        self.metrics.record(
+            prompt.metadata.module,
+            prompt.config.ai_model,
+            metadata.model if metadata is not None and metadata.model else prompt.config.model,
+            prompt.config.ai_tool,
+            latency,
+            metadata.prompt_tokens if metadata is not None else 0,
+            metadata.completion_tokens if metadata is not None else 0,
+            error = response is None,
+            cache_hit = metadata is not None and metadata.cache_status == "hit",
+            retries = metadata.retries if metadata is not None else 0,
+            coalesced = metadata is not None and metadata.coalesced
+        )
+
+    async def _handle_prompt(self, prompt):
+        """
+        Gets the Response to the Prompt, identical Prompts that are in flight at the same time are only sent once
+
+        When a Prompt joins an identical Prompt of a lower priority class that is still waiting for a slot of the scheduler,
+        the waiting Prompt is moved up to the priority class of the Prompt that joined, so it isn't held up by bulk work.
+        """
+        cache_mode = prompt.config.kwargs.get("cache_mode") or "use"
+        if not ResponseCache.is_cacheable(prompt) or cache_mode == "bypass":
+            return await self._get_response(prompt)
+
+        fingerprint = prompt.fingerprint()
+        in_flight = self.in_flight.get(fingerprint)
+        if in_flight is not None:
+            logger.debug(f"Waiting for identical prompt in flight: {prompt}")
+            self.scheduler.promote(id(self.in_flight_prompts[fingerprint]), prompt.config.kwargs.get("priority") or "normal")
+            try:
+                # Shielded, so cancelling this caller doesn't cancel the request of the other callers
+                response = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The caller that sent the request was cancelled, so send it again
+                return await self._handle_prompt(prompt)
+            metadata = dataclasses.replace(copy.deepcopy(response.metadata), coalesced=True)
+            return dataclasses.replace(copy.deepcopy(response), metadata=metadata)
+
+        in_flight = asyncio.get_running_loop().create_future()
+        # Prevents a warning about an error that was never retrieved when no other caller was waiting
+        in_flight.add_done_callback(lambda future: future.cancelled() or future.exception())
+        self.in_flight[fingerprint] = in_flight
+        self.in_flight_prompts[fingerprint] = prompt
+        try:
+            response = await self._get_response(prompt)
+        except asyncio.CancelledError:
+            in_flight.cancel()
+            raise
+        except Exception as e:
+            in_flight.set_exception(e)
+            raise
+        else:
+            in_flight.set_result(response)
+        finally:
+            del self.in_flight[fingerprint]
+            del self.in_flight_prompts[fingerprint]
+        return response
+
+    async def _get_response(self, prompt):
+        """
+        Gets the Response to the Prompt from the response cache or, when it's not there, the AI model
+        """
+        cache = self.response_cache
+        cache_mode = prompt.config.kwargs.get("cache_mode") or "use"
+        if cache is None or not cache.is_cacheable(prompt) or cache_mode == "bypass":
+            response = await self._send_prompt(prompt)
+            if cache is not None:
+                response = cache.annotate(response, "bypass")
+            return response
+
+        # The cache backend might read from disk or wait on other processes, so it's kept off the event loop
+        loop = asyncio.get_running_loop()
+        if cache_mode == "use":
+            response = await loop.run_in_executor(None, cache.get, prompt)
+            if response is not None:
+                logger.debug(f"Found cached response for prompt: {prompt}")
+                return cache.annotate(response, "hit")
+        response = await self._send_prompt(prompt)
+        await loop.run_in_executor(None, cache.set, prompt, response)
+        return cache.annotate(response, "miss" if cache_mode == "use" else "refresh")
+
+    async def _send_prompt(self, prompt):
+        """
+        Sends the Prompt to the AIModelStrategy of its AI model, or to the AI gateway, and returns the Response
+        """
+        ai_model = prompt.config.ai_model
+        # The AI model isn't loaded in this process when the gateway handles the Prompt, so no API key is needed here
+        use_gateway = self.gateway.accepts(prompt)
         print(f"Request being handled by {ai_model}...")
         
-        logger.debug(f"Sending prompt to {ai_model}: {prompt}")
+        logger.debug(f"Sending prompt to {ai_model}{' through the AI gateway' if use_gateway else ''}: {prompt}")
 
-        response = ai_model_strategy.call_ai_tool(prompt)
+        if use_gateway:
+            model = prompt.config.model or self.get_default_model(ai_model, prompt.config.ai_tool)
+        else:
+            model = self.get_model(prompt, self.ai_models[ai_model])
+        prompt_tokens, completion_tokens = self.estimate_budget_tokens(prompt)
+        priority = prompt.config.kwargs.get("priority") or "normal"
+        # Keyed by the Prompt, so identical Prompts of a higher priority class can move it up while it waits
+        async with self.scheduler.slot(priority, prompt.metadata.module, id(prompt)) as scheduler_wait:
+            reservation = self.budget.reserve(model, prompt_tokens, completion_tokens)
+            try:
+                response = await self._call_ai_model(prompt, use_gateway)
+            except BaseException:
+                self.budget.release(reservation)
+                raise
+        metadata = response.metadata
+        self.budget.reconcile(reservation, metadata.model or model, metadata.prompt_tokens, metadata.completion_tokens)
+        if scheduler_wait:
+            response = dataclasses.replace(response, metadata=dataclasses.replace(metadata, scheduler_wait=scheduler_wait))
 
         logger.debug(f"Recieved response from {ai_model}: {response}")
         return response
 
+    @staticmethod
+    def estimate_budget_tokens(prompt) -> tuple:
+        """
+        Returns the estimated prompt and completion tokens of the Prompt, which are reserved against the budgets
+
+        A batch that is submitted is estimated as all of its Prompts together, their messages plus their max_tokens.
+        """
+        batch_prompts = getattr(prompt.ai_tool_data, "prompts", None) or {}
+        prompts = list(batch_prompts.values()) or [prompt]
+        completion_tokens = sum((prompt.parameters or {}).get("max_tokens") or 0 for prompt in prompts)
+        return sum(estimate_tokens(prompt) for prompt in prompts) - completion_tokens, completion_tokens
+
+    async def _call_ai_model(self, prompt, use_gateway: bool):
+        """
+        Calls the AI model through the gateway, falling back to the AIModelStrategy of the AI model when the gateway is unavailable
+        """
+        if use_gateway:
+            try:
+                return await self.gateway.send(prompt)
+            except GatewayUnavailableError as e:
+                logger.warning(f"Handling the Prompt in this process, the AI gateway is unavailable: {e}")
+        return await self.ai_models[prompt.config.ai_model].call_ai_tool_async(prompt)
+
+    def get_default_model(self, ai_model: str, ai_tool: str) -> Optional[str]:
+        """
+        Returns the default model of the AI tool, or None when it has none
+
+        Nothing is created, so this doesn't import the AI model or create its API client. When the AI tool hasn't been
+        used yet, its default model is taken from the manifest.
+        """
+        ai_model_strategy = self.ai_models.loaded().get(ai_model)
+        if ai_model_strategy is not None and ai_model_strategy.ai_tools is not None:
+            tool = ai_model_strategy.ai_tools.loaded().get(ai_tool)
+            if tool is not None:
+                return tool.default_model
+        return DEFAULT_MODELS.get(ai_model, {}).get(ai_tool)
+
+    def get_model(self, prompt, ai_model_strategy) -> Optional[str]:
+        """
+        Returns the model the Prompt will be sent to, which is the default model of its AI tool when it has no model
+        """
+        if prompt.config.model is not None or ai_model_strategy.ai_tools is None:
+            return prompt.config.model
+        tool = ai_model_strategy.ai_tools.get(prompt.config.ai_tool)
+        return tool.default_model if tool is not None else None
+
+    def enable_response_cache(
+            self,
+            ttl: Optional[float] = None,
+            max_entries: int = 1000,
+            persistent: bool = True,
+            directory: Optional[str] = None,
+            max_disk_size: int = 100 * 1024 * 1024,
+            backend: str = "disk"
+        ):
+        """
+        Enables the response cache, replacing the current response cache if there is one
+
+        When persistent, Responses are also stored in the backend, so they can be reused by later runs.
+        The backend can be:
+        - disk: Stores each Response as a file in the directory.
+        - sqlite: Stores the Responses in a SQLite database in the directory. This database can safely be used by many
+            processes at the same time, so pabot workers share their Responses.
+        By default the directory is a folder in the temp folder of the system, so it's shared by every run on the machine.
+        """
+        cache_backend = None
+        if persistent:
+            directory = directory or os.path.join(tempfile.gettempdir(), "robotframework-ai", "response_cache")
+            if backend == "disk":
+                cache_backend = DiskCacheBackend(directory, max_disk_size)
+            elif backend == "sqlite":
+                cache_backend = SQLiteCacheBackend(os.path.join(directory, "responses.sqlite3"), max_disk_size, ttl=ttl)
+            else:
+                error_message = f"Invalid cache backend: `{backend}`. Valid cache backends are: `disk`, `sqlite`"
+                logger.error(error_message)
+                raise ValueError(error_message)
+        self.disable_response_cache()
+        self.response_cache = ResponseCache(ttl, max_entries, cache_backend)
+        logger.debug(f"Enabled response cache with ttl: {ttl}, max_entries: {max_entries}, backend: {backend if persistent else None}, directory: {directory}")
+        return self.response_cache
+
+    def disable_response_cache(self):
+        if self.response_cache is not None and self.response_cache.backend is not None:
+            self.response_cache.backend.close()
+        self.response_cache = None
+
+    def clear_response_cache(self):
+        if self.response_cache is not None:
+            self.response_cache.clear()
+
 
         
 
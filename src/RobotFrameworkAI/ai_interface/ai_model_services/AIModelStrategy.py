@@ -1,9 +1,24 @@
+import asyncio
+import atexit
+import dataclasses
 import importlib
 import inspect
 import logging
 import os
 import pkgutil
+import threading
+import time
+from typing import Optional
 
+from RobotFrameworkAI.manifest.LazyRegistry import LazyRegistry
+from RobotFrameworkAI.manifest.manifest import AI_TOOLS
+from RobotFrameworkAI.ai_interface.cassette.Cassette import Cassette
+from RobotFrameworkAI.ai_interface.cassette.CassetteClient import CassetteClient
+from RobotFrameworkAI.ai_interface.rate_limiting.RateLimiter import RateLimiter, estimate_tokens
+from RobotFrameworkAI.ai_interface.hedging.Hedger import Hedger
+from RobotFrameworkAI.ai_interface.resilience.CircuitBreaker import CircuitBreaker, CircuitOpenError
+from RobotFrameworkAI.ai_interface.resilience.RetryPolicy import RetryPolicy
+from RobotFrameworkAI.ai_interface.transport.TransportConfig import TransportConfig
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +32,143 @@ class AIModelStrategy:
     
     After sending the Prompts to the AI model specific class (this class), it will get send
     to the right AI tool class of that AI model.
+
+    There is only 1 instance per AI model in the whole process, owned by the shared AI_Interface.
+    So anything kept on this object, like the API client, is shared between all modules.
+
+    Creating an AIModelStrategy is cheap. The API client and the AI tools are only created when the first Prompt
+    for that AI model comes in. The AI tools of each AI model are listed in the generated manifest.
+
+    Optionally the requests and tokens per minute sent to the AI model can be limited, either for all models or per model.
+    Prompts over the limit are queued until there is room again, instead of failing on the API.
+
+    Calls failing with a transient error, like a timeout or a server error, are retried as per the RetryPolicy when the Prompt
+    is idempotent. Each model has a CircuitBreaker that stops calling it for a while when it keeps failing.
+
+    Optionally text generation requests are hedged: when a request takes long, a duplicate is sent and the first response wins.
     """
     def __init__(self) -> None:
         self.ai_tools = None
         self.name = None
+        # The subfolder and the interface of the AI tools of this AI model, used to generate the manifest
+        self.tools_package = None
+        self.tool_interface = None
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.transport_config = TransportConfig()
+        # The duration in seconds of the first call to the AI model, which includes setting up the connection
+        self.time_to_first_call = None
+        # Counters for all Prompts handled by this AI model
+        self.call_count = 0
+        self.error_count = 0
+        self._counter_lock = threading.Lock()
+        # RateLimiters per model, the RateLimiter under None applies to all models of this AI model
+        self.rate_limiters: dict = {}
+        self.retry_policy = RetryPolicy()
+        # CircuitBreakers per model, created on first use with the failure_threshold and cooldown below
+        self.circuit_breakers: dict = {}
+        self.failure_threshold = 5
+        self.cooldown = 30
+        self.hedger: Optional[Hedger] = None
+        # When set, all requests to the API are recorded to or replayed from this Cassette
+        self.cassette: Optional[Cassette] = None
+
+    @property
+    def client(self):
+        """
+        The API client of the AI model, created on first use
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    if self.cassette is not None:
+                        self._client = CassetteClient(self.cassette, self._create_client)
+                    else:
+                        self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        """
+        Creates the API client of the AI model. Implemented by the AI model specific classes.
+        """
+        return None
+
+    def configure_transport(self, transport_config: TransportConfig):
+        """
+        Sets the settings of the HTTP connections to the API, the API client is recreated with them
+
+        Returns the previous API client, which should be closed by the caller.
+        """
+        transport_config.validate()
+        self.transport_config = transport_config
+        return self.reset_client()
+
+    def reset_client(self):
+        """
+        Replaces the API client with a new one, also in the AI tools that have been created. Returns the previous API client.
+        """
+        with self._client_lock:
+            old_client, self._client = self._client, None
+        tools = self.ai_tools.loaded().values() if self.ai_tools is not None else []
+        if tools:
+            client = self.client
+            for tool in tools:
+                tool.client = client
+        return old_client
+
+    def use_cassette(self, cassette: Cassette):
+        """
+        Records or replays all requests to the API with the Cassette. Returns the previous API client, which should be closed by the caller.
+        """
+        self.eject_cassette()
+        self.cassette = cassette
+        atexit.register(cassette.save)
+        logger.info(f"Using cassette `{cassette.path}` for {self.name} in {cassette.mode} mode with the {cassette.policy} policy")
+        return self.reset_client()
+
+    def eject_cassette(self):
+        """
+        Saves the Cassette and sends requests to the API again. Returns the previous API client, which should be closed by the caller.
+        """
+        cassette, self.cassette = self.cassette, None
+        if cassette is None:
+            return None
+        cassette.save()
+        atexit.unregister(cassette.save)
+        return self.reset_client()
+
+    async def warm_up(self, connections: int = 1) -> float:
+        """
+        Opens connections to the API ahead of time by sending cheap requests at the same time, returns the time it took in seconds
+
+        The connections are kept alive and reused by the first Prompts, so they don't pay for setting up a connection.
+        """
+        start = time.perf_counter()
+        await asyncio.gather(*(self._warm_up_request() for _ in range(connections)))
+        duration = time.perf_counter() - start
+        logger.info(f"Warmed up {connections} connections to {self.name} in {duration:.3f} seconds")
+        return duration
+
+    async def _warm_up_request(self):
+        """
+        Sends a cheap request to the API. Implemented by the AI model specific classes, by default only creates the API client.
+        """
+        return self.client
+
+    def _create_tool_registry(self):
+        """
+        Creates a LazyRegistry with the AI tools of this AI model as listed in the manifest
+
+        Each AI tool gets instantiated with the API client of the AI model when it's first used.
+        """
+        return LazyRegistry(AI_TOOLS.get(self.name, {}), lambda tool_class: tool_class(self.client))
 
     def _discover_tools(self, package: str, tool_interface, ai_client):
         """
         Dynamically collects all tool implementations in the specified package
 
         A dictionary will be created with the tool attribute as the key and an instance as value.
+        This imports every tool, it's used to generate the manifest and not when handling Prompts.
         """
         tools = {}
 
@@ -59,7 +201,7 @@ class AIModelStrategy:
                         raise
         return tools
 
-    def call_ai_tool(self, prompt):
+    async def call_ai_tool_async(self, prompt):
         """
         Sends the prompt to the right AI tool class
 
@@ -72,7 +214,167 @@ class AIModelStrategy:
         tool = self.ai_tools[tool_name]
         self.validate_model(model, tool)
 
-        return tool.call_ai_tool(prompt)
+        model = model or tool.default_model
+        rate_limiters = self.get_rate_limiters(model)
+        circuit_breaker = self.get_circuit_breaker(model)
+        estimated_tokens = estimate_tokens(prompt)
+        queue_wait = 0
+        retries = 0
+
+        with self._counter_lock:
+            self.call_count += 1
+        while True:
+            try:
+                circuit_breaker.before_call()
+            except CircuitOpenError:
+                with self._counter_lock:
+                    self.error_count += 1
+                raise
+            acquired = []
+            try:
+                for rate_limiter in rate_limiters:
+                    queue_wait += await rate_limiter.acquire(estimated_tokens)
+                    acquired.append(rate_limiter)
+                call_start = time.perf_counter()
+                response = await self._call_tool(tool, prompt)
+                if self.time_to_first_call is None:
+                    self.time_to_first_call = time.perf_counter() - call_start
+                    logger.info(f"Time to first call to {self.name}: {self.time_to_first_call:.3f} seconds")
+            except asyncio.CancelledError:
+                circuit_breaker.release()
+                self._reconcile_rate_limiters(acquired, estimated_tokens)
+                raise
+            except Exception as e:
+                # The failed attempt didn't use its tokens, a retry takes them again
+                self._reconcile_rate_limiters(acquired, estimated_tokens)
+                retryable = tool.is_retryable_error(e)
+                if retryable:
+                    circuit_breaker.record_failure()
+                else:
+                    # The model did respond, so it's healthy
+                    circuit_breaker.record_success()
+                if retryable and tool.is_idempotent(prompt) and retries < self.retry_policy.max_retries:
+                    delay = self.retry_policy.get_delay(retries, tool.get_retry_after(e))
+                    retries += 1
+                    logger.warning(f"Call to {self.name} {model} failed with `{e}`, retry {retries} of {self.retry_policy.max_retries} in {delay:.2f} seconds")
+                    await asyncio.sleep(delay)
+                    continue
+                with self._counter_lock:
+                    self.error_count += 1
+                if retries:
+                    logger.error(f"Call to {self.name} {model} failed after {retries} retries")
+                raise
+            circuit_breaker.record_success()
+            break
+
+        # When the hedge won, it already took its tokens and the cancelled primary request gives its estimate back
+        actual_tokens = 0 if response.metadata.hedged else response.metadata.prompt_tokens + response.metadata.completion_tokens
+        self._reconcile_rate_limiters(rate_limiters, estimated_tokens, actual_tokens)
+        metadata = dataclasses.replace(response.metadata, queue_wait=queue_wait, retries=retries, circuit_state=circuit_breaker.state)
+        return dataclasses.replace(response, metadata=metadata)
+
+    @staticmethod
+    def _reconcile_rate_limiters(rate_limiters: list, estimated_tokens: int, actual_tokens: int = 0):
+        """
+        Corrects the token buckets of the rate limiters once a request is done, requests without a response use 0 tokens
+        """
+        for rate_limiter in rate_limiters:
+            rate_limiter.reconcile(estimated_tokens, actual_tokens)
+
+    async def _call_tool(self, tool, prompt):
+        """
+        Calls the AI tool, hedging the call when hedging is enabled and the AI tool is a text generator
+        """
+        hedger = self.hedger
+        if hedger is None or tool.tool_name != "text_generator":
+            return await tool.call_ai_tool_async(prompt)
+
+        async def send_hedge():
+            hedge_prompt = prompt
+            if hedger.fallback_model is not None:
+                self.validate_model(hedger.fallback_model, tool)
+                hedge_prompt = dataclasses.replace(prompt, config=dataclasses.replace(prompt.config, model=hedger.fallback_model))
+            # The hedge request goes through the circuit breaker and the rate limiters of its model like any other request
+            hedge_model = hedge_prompt.config.model or tool.default_model
+            circuit_breaker = self.get_circuit_breaker(hedge_model)
+            circuit_breaker.before_call()
+            estimated_tokens = estimate_tokens(hedge_prompt)
+            acquired = []
+            try:
+                for rate_limiter in self.get_rate_limiters(hedge_model):
+                    await rate_limiter.acquire(estimated_tokens)
+                    acquired.append(rate_limiter)
+                response = await tool.call_ai_tool_async(hedge_prompt)
+            except asyncio.CancelledError:
+                circuit_breaker.release()
+                self._reconcile_rate_limiters(acquired, estimated_tokens)
+                raise
+            except Exception as e:
+                self._reconcile_rate_limiters(acquired, estimated_tokens)
+                if tool.is_retryable_error(e):
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.record_success()
+                raise
+            circuit_breaker.record_success()
+            self._reconcile_rate_limiters(acquired, estimated_tokens, response.metadata.prompt_tokens + response.metadata.completion_tokens)
+            return response
+
+        response, hedged = await hedger.run(lambda: tool.call_ai_tool_async(prompt), send_hedge)
+        if hedged:
+            response = dataclasses.replace(response, metadata=dataclasses.replace(response.metadata, hedged=True))
+        return response
+
+    def enable_hedging(self, delay: float = None, percentile: float = 95, fallback_model: str = None, min_samples: int = 20):
+        """
+        Enables hedging of text generation requests, see the Hedger
+        """
+        self.hedger = Hedger(delay, percentile, fallback_model, min_samples)
+        logger.debug(f"Hedging of {self.name}: {self.hedger}")
+
+    def disable_hedging(self):
+        self.hedger = None
+
+    def set_retry_policy(self, max_retries: int = 2, base_delay: float = 1, max_delay: float = 30):
+        """
+        Sets how often and after how long failed calls are retried
+        """
+        self.retry_policy = RetryPolicy(max_retries, base_delay, max_delay)
+        logger.debug(f"Retry policy of {self.name}: {self.retry_policy}")
+
+    def set_circuit_breaker(self, failure_threshold: int = 5, cooldown: float = 30):
+        """
+        Sets after how many failures in a row the circuit breaker of a model opens and for how long, resets all circuit breakers
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.circuit_breakers = {}
+
+    def get_circuit_breaker(self, model: str) -> CircuitBreaker:
+        """
+        Returns the CircuitBreaker of the model
+        """
+        if model not in self.circuit_breakers:
+            self.circuit_breakers[model] = CircuitBreaker(f"{self.name} {model}", self.failure_threshold, self.cooldown)
+        return self.circuit_breakers[model]
+
+    def set_rate_limit(self, model: str = None, requests_per_minute: float = None, tokens_per_minute: float = None):
+        """
+        Limits the requests and tokens per minute sent to the model, or to all models of this AI model when model is None
+
+        Setting both limits to None removes the limit.
+        """
+        if requests_per_minute is None and tokens_per_minute is None:
+            self.rate_limiters.pop(model, None)
+        else:
+            self.rate_limiters[model] = RateLimiter(requests_per_minute, tokens_per_minute)
+        logger.debug(f"Rate limits of {self.name}: {self.rate_limiters}")
+
+    def get_rate_limiters(self, model: str) -> list:
+        """
+        Returns the RateLimiters that apply to the model
+        """
+        return [self.rate_limiters[key] for key in (None, model) if key in self.rate_limiters]
 
     def validate_tool(self, tool_name: str):
         """
@@ -23,4 +23,19 @@ class AIModelTool:
         self.ai_model_name: str = None
         self.client: object = None
         self.models: list[str] = None
-        self.default_model: str = None
\ No newline at end of file
+        self.default_model: str = None
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """
+        Returns whether the error is transient, like a timeout, a rate limit or a server error
+
+        Transient errors are retried and count towards opening the circuit breaker of the model.
+        Other errors, like an invalid request, would fail again and say nothing about the health of the model.
+        """
+        return False
+
+    def get_retry_after(self, error: Exception):
+        """
+        Returns the amount of seconds the AI model asked to wait before retrying, or None if it didn't
+        """
+        return None
@@ -15,8 +15,9 @@ class GeminiService(AIModelStrategy):
     def __init__(self) -> None:
         super().__init__()
         self.name = "gemini"
-        client = None
-        # self.ai_tools = self._discover_tools("gemini_tools", GeminiTool, client)
+        # self.tools_package = "gemini_tools"
+        # self.tool_interface = GeminiTool
+        self.ai_tools = self._create_tool_registry()
         
     def send_prompt(self, prompt):
         return "Beep boop"
\ No newline at end of file
@@ -0,0 +1,43 @@
+import logging
+
+from RobotFrameworkAI.ai_interface.ai_model_services.AIModelStrategy import AIModelStrategy
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockBehaviour, MockClient
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockTool import MockTool
+
+
+logger = logging.getLogger(__name__)
+
+
+class MockService(AIModelStrategy):
+    """
+    An AI model that runs in the same process and makes up its responses
+
+    This class is an implementation of the abstract class AIModelStrategy.
+    It has a text generator and an assistant, like OpenAI, but nothing is sent over the network and no API key is needed.
+    Responses are deterministic and follow the response format of the Prompt. The latency, amount of tokens and
+    errors of calls are set with a MockBehaviour, see set_behaviour.
+
+    Because everything else, like rate limiting, retries and hedging, works the same as for a real AI model,
+    the mock AI model can be used to test suites offline and to measure the overhead of this library.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.name = "mock"
+        self.tools_package = "mock_tools"
+        self.tool_interface = MockTool
+        self.ai_tools = self._create_tool_registry()
+
+    def _create_client(self):
+        return MockClient()
+
+    def set_behaviour(self, behaviour: MockBehaviour):
+        """
+        Sets how the mock AI model behaves, like the latency and error rate of calls
+        """
+        self.client.set_behaviour(behaviour)
+        logger.debug(f"Behaviour of {self.name}: {behaviour}")
+
+    def use_cassette(self, cassette):
+        error_message = "The mock AI model doesn't send requests, so it can't use a cassette."
+        logger.error(error_message)
+        raise ValueError(error_message)
@@ -1,5 +1,4 @@
 import os
-from openai import OpenAI
 from typing import Optional
 
 from RobotFrameworkAI.ai_interface.ai_model_services.AIModelStrategy import AIModelStrategy
@@ -25,17 +24,53 @@ class OpenAIService(AIModelStrategy):
     This class is an implementation of the abstract class AIModelStrategy.
     Prompts directed at the OpenAI API will get sent to the right OpenAI AI tool.
     All the logic doing that can be found in the abstract class AIModelStrategy. 
+
+    The OpenAI client, and with it the openai package, is only loaded when the first Prompt is sent to OpenAI.
     """
 
     def __init__(self, openai_key: Optional[str] = None) -> None:
         super().__init__()
         self.name = "openai"
+        self.openai_key = openai_key
+        self.tools_package = "openai_tools"
+        self.tool_interface = OpenAITool
+        self.ai_tools = self._create_tool_registry()
+
+    def _create_client(self):
+        import openai
 
         # Use the provided key or fallback to the environment variable
-        self.openai_key = openai_key or os.getenv("OPENAI_KEY")
-        if not self.openai_key:
-            raise ValueError("OpenAI API key must be provided either as a parameter or via the OPENAI_KEY environment variable.")
+        openai_key = self.openai_key or os.getenv("OPENAI_KEY")
+        if not openai_key:
+            error_message = "OpenAI API key must be provided either as a parameter or via the OPENAI_KEY environment variable."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        # The base URL can point to a stub server or a proxy, None means the URL of the OpenAI API
+        base_url = self.transport_config.base_url or os.getenv("OPENAI_BASE_URL")
+        # Retries are handled by the AIModelStrategy, so they respect the rate limits and the circuit breaker
+        return openai.AsyncOpenAI(api_key=openai_key, base_url=base_url, max_retries=0, http_client=self._create_http_client())
+
+    def _create_http_client(self):
+        """
+        Creates the HTTP client shared by all OpenAI AI tools with the settings of the transport_config
+        """
+        import openai
+
+        config = self.transport_config
+        # The classes of the defaults of openai are those of the HTTP library it uses
+        limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry
+        )
+        timeout = type(openai.DEFAULT_TIMEOUT)(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.write_timeout,
+            pool=config.pool_timeout
+        )
+        return openai.DefaultAsyncHttpxClient(limits=limits, timeout=timeout, http2=config.http2)
 
-        print("OpenAI API key:", self.openai_key)
-        client = OpenAI(api_key=self.openai_key)
-        self.ai_tools = self._discover_tools("openai_tools", OpenAITool, client)
+    async def _warm_up_request(self):
+        # Listing the models is free and doesn't use any tokens
+        return await self.client.models.list()
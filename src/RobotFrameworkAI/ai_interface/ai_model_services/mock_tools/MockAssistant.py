@@ -0,0 +1,133 @@
+import logging
+import time
+from types import SimpleNamespace
+
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockClient
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockTool import MockTool
+from RobotFrameworkAI.ai_interface.ai_model_tools.AssistantTool import AssistantTool
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+logger = logging.getLogger(__name__)
+
+
+class MockAssistant(MockTool, AssistantTool):
+    """
+    The AI tool in charge of handling all assistant actions for the mock AI model
+
+    Assistants, threads and their messages are kept in memory by the MockClient, so they only exist during the test run.
+    Each action takes the latency of the MockClient and can fail like the MockClient says.
+    """
+    def __init__(self, client) -> None:
+        MockTool.__init__(self)
+        AssistantTool.__init__(self)
+        self.client: MockClient = client
+        self.assistant = None
+
+    # Actions
+    async def create_assistant(self, prompt):
+        assistant_data = prompt.ai_tool_data
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        await self.client.call()
+        self.assistant = SimpleNamespace(
+            id = self.client.create_id("asst"),
+            name = assistant_data.name,
+            model = model,
+            instructions = assistant_data.instructions,
+            temperature = prompt.parameters["temperature"],
+            top_p = prompt.parameters["top_p"],
+            response_format = prompt.config.response_format,
+            file_paths = []
+        )
+        self.client.assistants[self.assistant.id] = self.assistant
+        await self.create_new_thread()
+        return Response(self.assistant.id, ResponseMetadata(self.tool_name, self.ai_model_name, model))
+
+    async def update_assistant(self, prompt):
+        assistant_data = prompt.ai_tool_data
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        await self.client.call()
+        self.assistant.name = assistant_data.name
+        self.assistant.model = model
+        self.assistant.instructions = assistant_data.instructions
+        self.assistant.temperature = prompt.parameters["temperature"]
+        self.assistant.top_p = prompt.parameters["top_p"]
+        self.assistant.response_format = prompt.config.response_format
+        message = f"Successfully updated assistant `{self.assistant.name}` with id `{self.assistant.id}`."
+        return Response(message, ResponseMetadata(self.tool_name, self.ai_model_name, model))
+
+    async def get_active_assistant_id(self, _ = None):
+        return Response(self.assistant.id, ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model))
+
+    async def delete_assistant(self, _ = None):
+        response = await self.delete_assistant_by_id(SimpleNamespace(ai_tool_data=SimpleNamespace(id=self.assistant.id)))
+        self.assistant = None
+        return response
+
+    async def delete_assistant_by_id(self, prompt):
+        id = prompt.ai_tool_data.id
+        await self.client.call()
+        assistant = self.client.assistants.pop(id, None)
+        if assistant is None:
+            error_message = f"No assistant found with id `{id}`"
+            logger.error(error_message)
+            raise ValueError(error_message)
+        if self.assistant is not None and self.assistant.id == id:
+            self.assistant = None
+        message = f"Successfully deleted assistant `{assistant.name}` with id `{id}`"
+        return Response(message, ResponseMetadata(self.tool_name, self.ai_model_name, assistant.model))
+
+    async def set_active_assistant(self, prompt):
+        id = prompt.ai_tool_data.id
+        previous_assistant = self.assistant
+        self.assistant = await self.get_assistant(id)
+        await self.create_new_thread()
+        message = f"Succesfully changed the active assistant to assistant `{self.assistant.name}` with id `{self.assistant.id}`"
+        if previous_assistant is not None:
+            message += f" from assistant `{previous_assistant.name}` with id `{previous_assistant.id}`"
+        return Response(message, ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model))
+
+    async def attach_files(self, prompt):
+        files = self.prepare_files(prompt.ai_tool_data.file_paths)
+        await self.client.call()
+        self.assistant.file_paths += [path for path, _ in files]
+        message = f"Succesfully added {len(files)} files to assistant with id `{self.assistant.id}` and name `{self.assistant.name}`. The following files got added: `{'`, `'.join([file[0] for file in files])}`"
+        return Response(message, ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model))
+
+    async def send_message(self, prompt):
+        await self.add_message_to_thread(prompt.message, prompt.ai_tool_data.file_paths)
+        await self.client.call()
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        messages = self.client.threads[self.thread.id]
+        seed = self.create_seed(model, self.assistant.instructions, messages)
+        content = self.create_content(self.assistant.instructions, prompt.message.user, self.assistant.response_format, seed)
+        content, completion_tokens, finish_reason = self.pad_content(content, None, self.client.behaviour.completion_tokens)
+        prompt_tokens = self.count_tokens(self.assistant.instructions, *(message["content"] for message in messages))
+        messages.append({"role": "assistant", "content": content})
+        response_metadata = ResponseMetadata(
+            self.tool_name, self.ai_model_name, model, None, prompt_tokens, completion_tokens, int(time.time())
+        )
+        return Response(content, response_metadata)
+
+    async def create_new_thread(self, _ = None):
+        self.thread = SimpleNamespace(id=self.client.create_id("thread"))
+        self.client.threads[self.thread.id] = []
+        message = f"Succesfully created new thread with id `{self.thread.id}` for assistant `{self.assistant.name}` with id `{self.assistant.id}`"
+        return Response(message, ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model))
+
+    # Helper functions
+    async def get_assistant(self, id):
+        await self.client.call()
+        if id not in self.client.assistants:
+            error_message = f"No assistant found with id `{id}`"
+            logger.error(error_message)
+            raise ValueError(error_message)
+        return self.client.assistants[id]
+
+    async def upload_file(self, file):
+        return self.client.create_id("file")
+
+    async def add_message_to_thread(self, message, file_paths=None):
+        file_ids = [await self.upload_file(file) for file in self.prepare_files(file_paths)] if file_paths else []
+        self.client.threads[self.thread.id].append({"role": "user", "content": message.user, "file_ids": file_ids})
@@ -0,0 +1,96 @@
+import logging
+
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockClient
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockTool import MockTool
+from RobotFrameworkAI.ai_interface.ai_model_tools.BatchTool import BatchTool
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+logger = logging.getLogger(__name__)
+
+
+class MockBatch(MockTool, BatchTool):
+    """
+    The AI tool in charge of handling all batch actions for the mock AI model
+
+    Batches are kept in memory by the MockClient and are answered as soon as they are submitted, each request can fail like
+    the MockClient says. The requests are still written to the file, like with a real AI model. Each action takes the latency
+    of the MockClient and can fail like the MockClient says.
+    """
+    def __init__(self, client) -> None:
+        MockTool.__init__(self)
+        BatchTool.__init__(self)
+        self.client: MockClient = client
+
+    # Actions
+    async def submit_batch(self, prompt):
+        batch_data = prompt.ai_tool_data
+        self.write_jsonl(batch_data.file_path, (self.create_batch_request(custom_id, request) for custom_id, request in batch_data.prompts.items()))
+        await self.client.call()
+        results = [self.create_batch_result(custom_id, request) for custom_id, request in batch_data.prompts.items()]
+        id = self.client.create_id("batch")
+        self.client.batches[id] = {"status": "completed", "results": results}
+        return self.create_response(id, prompt, status="completed")
+
+    async def get_batch(self, prompt):
+        batch = self.get_mock_batch(prompt.ai_tool_data.id)
+        await self.client.call()
+        failed = sum(result["error"] is not None for result in batch["results"])
+        request_counts = {"total": len(batch["results"]), "completed": len(batch["results"]) - failed, "failed": failed}
+        return self.create_response(batch["status"], prompt, request_counts=request_counts)
+
+    async def download_batch_results(self, prompt):
+        batch_data = prompt.ai_tool_data
+        batch = self.get_mock_batch(batch_data.id)
+        await self.client.call()
+
+        async def read_results():
+            for result in batch["results"]:
+                yield result
+
+        count, errors, prompt_tokens, completion_tokens = await self.write_results(batch_data.file_path, read_results())
+        response = self.create_response(batch_data.file_path, prompt, results=count, errors=errors)
+        response.metadata.prompt_tokens = prompt_tokens
+        response.metadata.completion_tokens = completion_tokens
+        return response
+
+    async def cancel_batch(self, prompt):
+        batch = self.get_mock_batch(prompt.ai_tool_data.id)
+        await self.client.call()
+        return self.create_response(batch["status"], prompt)
+
+    def create_batch_request(self, custom_id: str, prompt) -> dict:
+        message = prompt.message
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        return {"custom_id": custom_id, "model": model, "system": message.system, "user": message.user, "history": message.history}
+
+    def create_batch_result(self, custom_id: str, prompt) -> dict:
+        """
+        Makes up the result of a request of a batch, like the mock text generator does
+        """
+        _, error = self.client.sample()
+        if error is not None:
+            return self.create_result(custom_id, error=str(error))
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        message = prompt.message
+        seed = self.create_seed(model, message.system, message.user, message.history, prompt.config.response_format)
+        content = self.create_content(message.system, message.user, prompt.config.response_format, seed)
+        content, completion_tokens, finish_reason = self.pad_content(
+            content, prompt.parameters["max_tokens"], self.client.behaviour.completion_tokens
+        )
+        history = [text for entry in message.history or [] for text in entry.values()]
+        prompt_tokens = self.count_tokens(message.system, message.user, *history)
+        return self.create_result(custom_id, content, finish_reason, prompt_tokens, completion_tokens, model)
+
+    def get_mock_batch(self, id: str) -> dict:
+        batch = self.client.batches.get(id)
+        if batch is None:
+            error_message = f"No batch found with id `{id}`"
+            logger.error(error_message)
+            raise ValueError(error_message)
+        return batch
+
+    def create_response(self, message: str, prompt, **kwargs):
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        return Response(message, ResponseMetadata(self.tool_name, self.ai_model_name, model, kwargs=kwargs))
@@ -0,0 +1,138 @@
+import asyncio
+from dataclasses import dataclass
+import itertools
+import logging
+import random
+import threading
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockBehaviour:
+    """
+    How the mock AI model behaves
+
+    Attributes:
+        latency (float): The average amount of seconds a call takes.
+        latency_distribution (str): How the latency of each call is picked, one of LATENCY_DISTRIBUTIONS:
+            - "fixed": Every call takes latency seconds.
+            - "uniform": Between latency - latency_stddev and latency + latency_stddev seconds.
+            - "normal": Normally distributed around latency with a standard deviation of latency_stddev.
+            - "lognormal": Mostly around latency with a long tail of slow calls, like real AI models.
+        latency_stddev (float): The spread of the latency in seconds.
+        error_rate (float): The fraction of calls that fail with a server error, between 0 and 1.
+        rate_limit_rate (float): The fraction of calls that fail with a rate limit error, between 0 and 1.
+        completion_tokens (Optional[int]): The amount of tokens of each response, capped by max_tokens.
+            None means the response is only as long as needed.
+        seed (Optional[int]): The seed for picking latencies and errors, so runs can be repeated.
+    """
+    latency: float = 0
+    latency_distribution: str = "fixed"
+    latency_stddev: float = 0
+    error_rate: float = 0
+    rate_limit_rate: float = 0
+    completion_tokens: Optional[int] = None
+    seed: Optional[int] = None
+
+    LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+    def validate(self) -> None:
+        """
+        Raises an error when the behaviour can't be used
+        """
+        error_message = None
+        if self.latency_distribution not in self.LATENCY_DISTRIBUTIONS:
+            error_message = f"Invalid value `{self.latency_distribution}` for `latency_distribution`. Valid values are: `{'`, `'.join(self.LATENCY_DISTRIBUTIONS)}`."
+        for name in ("latency", "latency_stddev"):
+            if getattr(self, name) < 0:
+                error_message = f"Invalid value `{getattr(self, name)}` for `{name}`. Value can't be negative."
+        for name in ("error_rate", "rate_limit_rate"):
+            if not 0 <= getattr(self, name) <= 1:
+                error_message = f"Invalid value `{getattr(self, name)}` for `{name}`. Value must be between 0 and 1."
+        if self.error_rate + self.rate_limit_rate > 1:
+            error_message = "The sum of `error_rate` and `rate_limit_rate` can't be greater than 1."
+        if self.completion_tokens is not None and self.completion_tokens < 1:
+            error_message = f"Invalid value `{self.completion_tokens}` for `completion_tokens`. Value must be greater than 0."
+        if error_message is not None:
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+
+class MockClient:
+    """
+    Takes the place of the API client for the mock AI model
+
+    It simulates the latency and errors of calls as described by its MockBehaviour, and keeps the assistants
+    and threads of the mock assistant and the batches of the mock batch tool in memory. Nothing is sent over the network.
+    """
+    def __init__(self, behaviour: MockBehaviour = None) -> None:
+        self.behaviour = behaviour or MockBehaviour()
+        self.random = random.Random(self.behaviour.seed)
+        self.calls = 0
+        self.assistants: dict = {}
+        self.threads: dict = {}
+        self.batches: dict = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def set_behaviour(self, behaviour: MockBehaviour):
+        behaviour.validate()
+        self.behaviour = behaviour
+        self.random = random.Random(behaviour.seed)
+
+    def create_id(self, prefix: str) -> str:
+        return f"{prefix}_mock_{next(self._ids)}"
+
+    def get_latency(self) -> float:
+        behaviour = self.behaviour
+        with self._lock:
+            if behaviour.latency_distribution == "uniform":
+                latency = self.random.uniform(behaviour.latency - behaviour.latency_stddev, behaviour.latency + behaviour.latency_stddev)
+            elif behaviour.latency_distribution == "normal":
+                latency = self.random.gauss(behaviour.latency, behaviour.latency_stddev)
+            elif behaviour.latency_distribution == "lognormal" and behaviour.latency > 0:
+                # The median is the latency, the stddev is relative to it so it works for any latency
+                latency = behaviour.latency * self.random.lognormvariate(0, behaviour.latency_stddev / behaviour.latency)
+            else:
+                latency = behaviour.latency
+        return max(latency, 0)
+
+    def sample(self) -> tuple:
+        """
+        Picks the latency of a call and whether it fails, returns the latency and the MockAPIError to raise or None
+        """
+        behaviour = self.behaviour
+        with self._lock:
+            self.calls += 1
+            chance = self.random.random()
+        latency = self.get_latency()
+        if chance < behaviour.rate_limit_rate:
+            return latency, MockAPIError(429, "Rate limit reached for the mock AI model")
+        if chance < behaviour.rate_limit_rate + behaviour.error_rate:
+            return latency, MockAPIError(500, "The mock AI model had an internal server error")
+        return latency, None
+
+    async def call(self):
+        """
+        Simulates a call to the AI model, waits for the latency and raises a MockAPIError when the call fails
+        """
+        latency, error = self.sample()
+        if latency:
+            await asyncio.sleep(latency)
+        if error is not None:
+            raise error
+
+    async def close(self):
+        pass
+
+
+class MockAPIError(Exception):
+    """Exception raised by the mock AI model when a call fails, like an error response of a real API."""
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"Error code: {status_code} - {message}")
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
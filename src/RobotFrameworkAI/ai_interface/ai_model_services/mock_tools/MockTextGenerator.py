@@ -0,0 +1,60 @@
+import logging
+import time
+
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockClient
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockTool import MockTool
+from RobotFrameworkAI.ai_interface.ai_model_tools.TextGeneratorTool import TextGeneratorTool
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+logger = logging.getLogger(__name__)
+
+
+class MockTextGenerator(MockTool, TextGeneratorTool):
+    """
+    The AI tool in charge of handling all text generation for the mock AI model
+
+    Given a prompt, will make up a response after the latency of the MockClient, or fail like the MockClient says.
+    When stream or a stop_predicate is set in the config kwargs of the Prompt, the response is streamed word by word,
+    and the stop_predicate can stop it early, like with a real AI model.
+    """
+    def __init__(self, client) -> None:
+        MockTool.__init__(self)
+        TextGeneratorTool.__init__(self)
+        self.client: MockClient = client
+
+    async def call_ai_tool_async(self, prompt):
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        message = prompt.message
+        seed = self.create_seed(model, message.system, message.user, message.history, prompt.config.response_format)
+        content = self.create_content(message.system, message.user, prompt.config.response_format, seed)
+        content, completion_tokens, finish_reason = self.pad_content(
+            content, prompt.parameters["max_tokens"], self.client.behaviour.completion_tokens
+        )
+        history = [text for entry in message.history or [] for text in entry.values()]
+        prompt_tokens = self.count_tokens(message.system, message.user, *history)
+
+        start = time.perf_counter()
+        await self.client.call()
+        time_to_first_token = None
+        stop_predicate = prompt.config.kwargs.get("stop_predicate")
+        if prompt.config.kwargs.get("stream") or stop_predicate:
+            time_to_first_token = time.perf_counter() - start
+            words = content.split(" ")
+            for i in range(len(words)):
+                if stop_predicate is not None and stop_predicate(" ".join(words[:i + 1])):
+                    content, completion_tokens, finish_reason = " ".join(words[:i + 1]), i + 1, "stop_predicate"
+                    break
+        logger.debug(f"{self.ai_model_name} {self.tool_name}: {content}")
+        metadata = ResponseMetadata(
+            self.tool_name,
+            self.ai_model_name,
+            model,
+            finish_reason,
+            prompt_tokens,
+            completion_tokens,
+            int(time.time()),
+            time_to_first_token = time_to_first_token
+        )
+        return Response(content, metadata)
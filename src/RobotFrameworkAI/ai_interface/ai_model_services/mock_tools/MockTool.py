@@ -0,0 +1,119 @@
+import hashlib
+import json
+import re
+
+from RobotFrameworkAI.ai_interface.ai_model_services.AIModelTool import AIModelTool
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockAPIError
+
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+
+class MockTool(AIModelTool):
+    """
+    The abstract class for all mock tools
+
+    The mock AI model doesn't call an API, it makes up responses. Responses are deterministic: the same Prompt always gets
+    the same response, so tests using it are repeatable. Responses follow the response_format of the Prompt:
+    - None or {"type": "text"}: A sentence that repeats the start of the user message.
+    - {"type": "json_schema", ...}: A JSON object that matches the schema.
+    - {"type": "json_object"}: A JSON object. When the system message names a list and a key in quotes, like
+        "Call the list 'addresses' and each list item is a dictionary with the key 'address'", the object contains such a list
+        with as many items as the first number in the user message.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.ai_model_name: str = "mock"
+        self.models: list[str] = ["mock-small", "mock-large"]
+        self.default_model: str = "mock-small"
+
+    def create_content(self, system_message: str, user_message: str, response_format: dict, seed: str) -> str:
+        """
+        Makes up the content of a response that follows the response_format, the same seed gives the same content
+        """
+        response_format = response_format or {}
+        format_type = response_format.get("type", "text")
+        if format_type == "json_schema":
+            schema = response_format.get("json_schema", {}).get("schema", {})
+            return json.dumps(self.create_json_value(schema, "value", seed))
+        if format_type == "json_object":
+            return json.dumps(self.create_json_object(system_message or "", user_message or "", seed))
+        user_message = " ".join((user_message or "").split())
+        return f"Mock response {seed[:8]} to: {user_message[:100]}"
+
+    def create_json_object(self, system_message: str, user_message: str, seed: str) -> dict:
+        names = re.findall(r"['\"]([A-Za-z_][\w ]*)['\"]", system_message)
+        if not names:
+            return {"response": f"Mock response {seed[:8]}"}
+        amount = re.search(r"\d+", user_message)
+        amount = int(amount.group()) if amount else 3
+        list_name, key = names[0], names[1] if len(names) > 1 else "value"
+        return {list_name: [{key: f"Mock {key} {i + 1} {seed[:8]}"} for i in range(amount)]}
+
+    def create_json_value(self, schema: dict, name: str, seed: str):
+        """
+        Creates a value that matches a JSON schema, every object property is filled in
+        """
+        if "enum" in schema:
+            return schema["enum"][0]
+        if "const" in schema:
+            return schema["const"]
+        for combination in ("anyOf", "oneOf", "allOf"):
+            if combination in schema:
+                return self.create_json_value(schema[combination][0], name, seed)
+        schema_type = schema.get("type", "object" if "properties" in schema else "string")
+        if isinstance(schema_type, list):
+            schema_type = next((type for type in schema_type if type != "null"), "null")
+        if schema_type == "object":
+            properties = schema.get("properties", {})
+            return {key: self.create_json_value(value, key, seed) for key, value in properties.items()}
+        if schema_type == "array":
+            amount = max(schema.get("minItems", 1), 1)
+            if "maxItems" in schema:
+                amount = min(amount, schema["maxItems"])
+            return [self.create_json_value(schema.get("items", {}), name, f"{seed}{i}") for i in range(amount)]
+        if schema_type in ("integer", "number"):
+            number = int(hashlib.sha256(f"{seed}{name}".encode("utf-8")).hexdigest(), 16) % 100
+            number = max(number, schema.get("minimum", number))
+            number = min(number, schema.get("maximum", number))
+            return number if schema_type == "integer" else float(number)
+        if schema_type == "boolean":
+            return True
+        if schema_type == "null":
+            return None
+        return f"Mock {name} {seed[:8]}"
+
+    def pad_content(self, content: str, max_tokens: int, completion_tokens: int):
+        """
+        Pads or cuts the content to the amount of tokens asked for, each word is counted as a token
+
+        Returns the content, the amount of tokens and the finish reason.
+        """
+        words = content.split(" ")
+        if completion_tokens is not None and completion_tokens > len(words):
+            words += [WORDS[i % len(WORDS)] for i in range(completion_tokens - len(words))]
+        if max_tokens is not None and len(words) > max_tokens:
+            return " ".join(words[:max_tokens]), max_tokens, "length"
+        return " ".join(words), len(words), "stop"
+
+    @staticmethod
+    def count_tokens(*messages) -> int:
+        """
+        Estimates the amount of tokens of the messages at about 4 characters per token
+        """
+        return sum(len(message or "") for message in messages) // 4 + 1
+
+    @staticmethod
+    def create_seed(*values) -> str:
+        return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """
+        Rate limits and server errors of the mock AI model are transient, like those of real AI models
+        """
+        return isinstance(error, MockAPIError) and (error.status_code == 429 or error.status_code >= 500)
+
+    def get_retry_after(self, error: Exception):
+        return getattr(error, "retry_after", None)
@@ -1,4 +1,4 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
 from RobotFrameworkAI.ai_interface.ai_model_services.openai_tools.OpenAITool import OpenAITool
 from RobotFrameworkAI.ai_interface.ai_model_tools.AssistantTool import AssistantTool
 from RobotFrameworkAI.objects.response.Response import Response
@@ -17,15 +17,15 @@ class OpenAIAssistant(OpenAITool, AssistantTool):
         print(__name__)
         OpenAITool.__init__(self)
         AssistantTool.__init__(self)
-        self.client:OpenAI = client
+        self.client:AsyncOpenAI = client
 
     # Actions
-    def create_assistant(self, prompt):
+    async def create_assistant(self, prompt):
         assistant_data = prompt.ai_tool_data
 
         model = self.default_model if prompt.config.model is None else prompt.config.model
 
-        self.assistant = self.client.beta.assistants.create(
+        self.assistant = await self.client.beta.assistants.create(
             name = assistant_data.name,
             model = model,
             instructions = assistant_data.instructions,
@@ -34,12 +34,12 @@ class OpenAIAssistant(OpenAITool, AssistantTool):
             top_p = prompt.parameters["top_p"],
             response_format = prompt.config.response_format
         )
-        self.create_new_thread()
+        await self.create_new_thread()
         response_metadata = ResponseMetadata(self.tool_name, self.ai_model_name, model)
         response = Response(self.assistant.id, response_metadata)
         return response
 
-    def update_assistant(self, prompt):
+    async def update_assistant(self, prompt):
         assistant_data = prompt.ai_tool_data
 
         model = self.default_model if prompt.config.model is None else prompt.config.model
@@ -57,7 +57,7 @@ class OpenAIAssistant(OpenAITool, AssistantTool):
         updated_parameters = updated_parameters if updated_parameters else ["no parameters have been updated."]        
         message = f"Successfully updated assistant `{self.assistant.name}` with id `{self.assistant.id}`. Updated parameters: {', '.join(updated_parameters)}."
         
-        self.assistant = self.client.beta.assistants.update(
+        self.assistant = await self.client.beta.assistants.update(
             self.assistant.id,
             name=assistant_data.name,
             model=model,
@@ -72,43 +72,43 @@ class OpenAIAssistant(OpenAITool, AssistantTool):
         return response
 
 
-    def get_active_assistant_id(self, _ = None):
+    async def get_active_assistant_id(self, _ = None):
         response_metadata = ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model)
         response = Response(self.assistant.id, response_metadata)
         return response
 
-    def delete_assistant(self, _ = None):
+    async def delete_assistant(self, _ = None):
         response_metadata = ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model)
-        response = Response(self.client.beta.assistants.delete(self.assistant.id), response_metadata)
+        response = Response(await self.client.beta.assistants.delete(self.assistant.id), response_metadata)
         self.assistant = None
         return response
 
-    def delete_assistant_by_id(self, prompt):
+    async def delete_assistant_by_id(self, prompt):
         id = prompt.ai_tool_data.id
         if id == self.assistant.id:
             self.assistant = None
         response_metadata = ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model)
-        response = Response(self.client.beta.assistants.delete(id), response_metadata)
+        response = Response(await self.client.beta.assistants.delete(id), response_metadata)
         return response
 
-    def set_active_assistant(self, prompt):
+    async def set_active_assistant(self, prompt):
         id = prompt.ai_tool_data.id
         previous_active_assistant = self.assistant
-        self.assistant = self.get_assistant(id)
-        self.create_new_thread()
+        self.assistant = await self.get_assistant(id)
+        await self.create_new_thread()
         response_metadata = ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model)
         message = f"Succesfully set assistant `{self.assistant.name}` with id `{self.assistant.id}` as the active assistant. Previous active assistant: name: `{previous_active_assistant.name}`, id: `{previous_active_assistant.id}`"
         response = Response(message, response_metadata)
         return response 
 
-    def attach_files(self, prompt):
+    async def attach_files(self, prompt):
         file_paths = prompt.ai_tool_data.file_paths
         files = self.prepare_files(file_paths)
-        vector_store = self.client.beta.vector_stores.create()
-        self.client.beta.vector_stores.file_batches.upload_and_poll(
+        vector_store = await self.client.vector_stores.create()
+        await self.client.vector_stores.file_batches.upload_and_poll(
             vector_store_id=vector_store.id, files=[(path, content.encode('utf-8')) for path, content in files]
         )
-        self.assistant = self.client.beta.assistants.update(
+        self.assistant = await self.client.beta.assistants.update(
             assistant_id = self.assistant.id,
             tool_resources = {"file_search": {"vector_store_ids": [vector_store.id]}},
         )
@@ -117,13 +117,13 @@ class OpenAIAssistant(OpenAITool, AssistantTool):
         response = Response(message, response_metadata)
         return response
 
-    def send_message(self, prompt):
-        self.add_message_to_thread(prompt.message, prompt.ai_tool_data.file_paths)
-        run = self.client.beta.threads.runs.create_and_poll(
+    async def send_message(self, prompt):
+        await self.add_message_to_thread(prompt.message, prompt.ai_tool_data.file_paths)
+        run = await self.client.beta.threads.runs.create_and_poll(
             thread_id = self.thread.id, assistant_id = self.assistant.id
         )
-        messages = list(self.client.beta.threads.messages.list(thread_id=self.thread.id, run_id=run.id))
-        message = messages[0]
+        messages = await self.client.beta.threads.messages.list(thread_id=self.thread.id, run_id=run.id)
+        message = messages.data[0]
         message_content = message.content[0].text.value
         model = self.default_model if prompt.config.model is None else prompt.config.model
         token_usage = run.usage
@@ -134,39 +134,39 @@ class OpenAIAssistant(OpenAITool, AssistantTool):
         response = Response(message_content, response_metadata)
         return response
 
-    def create_new_thread(self, _ = None):        
-        self.thread = self.client.beta.threads.create()
+    async def create_new_thread(self, _ = None):        
+        self.thread = await self.client.beta.threads.create()
         response_metadata = ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model)
         message = f"Succesfully created new thread with id `{self.thread}` for assistant `{self.assistant.name}` with id `{self.assistant.id}`"
         response = Response(message, response_metadata)
         return response
     
-    def set_active_assistant(self, prompt):
+    async def set_active_assistant(self, prompt):
         id = prompt.ai_tool_data.id
         previous_assistant = self.assistant
-        self.assistant = self.get_assistant(id)
-        self.create_new_thread()
+        self.assistant = await self.get_assistant(id)
+        await self.create_new_thread()
         response_metadata = ResponseMetadata(self.tool_name, self.ai_model_name, self.assistant.model)
         message = f"Succesfully changed the active assistant to assistant `{self.assistant.name}` with id `{self.assistant.id}` from assistant `{previous_assistant.name}` with id `{previous_assistant.id}`"
         response = Response(message, response_metadata)
         return response
 
     # Helper functions
-    def get_assistant(self, id):
-        return self.client.beta.assistants.retrieve(id)
+    async def get_assistant(self, id):
+        return await self.client.beta.assistants.retrieve(id)
 
-    def upload_file(self, file):
-        file = self.client.files.create(
+    async def upload_file(self, file):
+        file = await self.client.files.create(
             file = file,
             purpose = 'assistants'
             )
         return file.id
 
-    def add_message_to_thread(self, message, file_paths=None):
+    async def add_message_to_thread(self, message, file_paths=None):
         if file_paths:
             files = self.prepare_files(file_paths)
-            file_ids = [self.upload_file(file) for file in files]
-            return self.client.beta.threads.messages.create(
+            file_ids = [await self.upload_file(file) for file in files]
+            return await self.client.beta.threads.messages.create(
                 thread_id=self.thread.id,
                 role="user",
                 content=message.user,
@@ -176,7 +176,7 @@ class OpenAIAssistant(OpenAITool, AssistantTool):
                 } for file_id in file_ids][:10]
             )
         else:
-            return self.client.beta.threads.messages.create(
+            return await self.client.beta.threads.messages.create(
                 thread_id=self.thread.id,
                 role="user",
                 content=message.user
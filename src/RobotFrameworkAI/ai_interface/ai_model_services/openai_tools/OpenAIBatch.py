@@ -0,0 +1,106 @@
+import json
+from openai import AsyncOpenAI
+from RobotFrameworkAI.ai_interface.ai_model_services.openai_tools.OpenAITool import OpenAITool
+from RobotFrameworkAI.ai_interface.ai_model_tools.BatchTool import BatchTool
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIBatch(OpenAITool, BatchTool):
+    """
+    The AI tool in charge of handling all batch actions for OpenAI, using the Batch API
+
+    The requests of a batch are chat completions, written to a JSONL file that is uploaded to OpenAI. OpenAI handles the
+    batch within 24 hours. The output file and the error file of a finished batch are streamed line by line, so batches
+    of any size can be downloaded without keeping them in memory.
+    """
+    ENDPOINT = "/v1/chat/completions"
+
+    def __init__(self, client) -> None:
+        OpenAITool.__init__(self)
+        BatchTool.__init__(self)
+        self.client:AsyncOpenAI = client
+
+    # Actions
+    async def submit_batch(self, prompt):
+        batch_data = prompt.ai_tool_data
+        self.write_jsonl(batch_data.file_path, (self.create_batch_request(custom_id, request) for custom_id, request in batch_data.prompts.items()))
+        with open(batch_data.file_path, "rb") as file:
+            input_file = await self.client.files.create(file=file, purpose="batch")
+        batch = await self.client.batches.create(input_file_id=input_file.id, endpoint=self.ENDPOINT, completion_window="24h")
+        logger.debug(f"{self.ai_model_name} {self.tool_name}: submitted {batch}")
+        return self.create_response(batch.id, prompt, status=batch.status, input_file_id=input_file.id)
+
+    async def get_batch(self, prompt):
+        batch = await self.client.batches.retrieve(prompt.ai_tool_data.id)
+        logger.debug(f"{self.ai_model_name} {self.tool_name}: {batch}")
+        request_counts = batch.request_counts.model_dump() if batch.request_counts is not None else {"total": 0, "completed": 0, "failed": 0}
+        return self.create_response(batch.status, prompt, request_counts=request_counts)
+
+    async def download_batch_results(self, prompt):
+        batch_data = prompt.ai_tool_data
+        batch = await self.client.batches.retrieve(batch_data.id)
+        file_ids = [file_id for file_id in (batch.output_file_id, batch.error_file_id) if file_id is not None]
+
+        async def read_results():
+            for file_id in file_ids:
+                async with self.client.files.with_streaming_response.content(file_id) as response:
+                    async for line in response.iter_lines():
+                        if line.strip():
+                            yield self.parse_batch_result(json.loads(line))
+
+        count, errors, prompt_tokens, completion_tokens = await self.write_results(batch_data.file_path, read_results())
+        response = self.create_response(batch_data.file_path, prompt, results=count, errors=errors)
+        response.metadata.prompt_tokens = prompt_tokens
+        response.metadata.completion_tokens = completion_tokens
+        return response
+
+    async def cancel_batch(self, prompt):
+        batch = await self.client.batches.cancel(prompt.ai_tool_data.id)
+        return self.create_response(batch.status, prompt)
+
+    def create_batch_request(self, custom_id: str, prompt) -> dict:
+        """
+        Returns a line of the input file of a batch, the chat completion request of the Prompt
+        """
+        arguments = prompt.parameters
+        body = {
+            "model": self.default_model if prompt.config.model is None else prompt.config.model,
+            "messages": self.format_prompt_messages(prompt.message.system, prompt.message.user, prompt.message.history),
+            "response_format": prompt.config.response_format,
+            "max_tokens": arguments["max_tokens"],
+            "temperature": arguments["temperature"],
+            "top_p": arguments["top_p"],
+            "frequency_penalty": arguments["frequency_penalty"],
+            "presence_penalty": arguments["presence_penalty"]
+        }
+        body = {key: value for key, value in body.items() if value is not None}
+        return {"custom_id": custom_id, "method": "POST", "url": self.ENDPOINT, "body": body}
+
+    def parse_batch_result(self, line: dict) -> dict:
+        """
+        Returns the result of a line of the output or error file of a batch
+        """
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        if line.get("error") is None and response.get("status_code") == 200:
+            choice = body["choices"][0]
+            usage = body.get("usage") or {}
+            return self.create_result(
+                line["custom_id"],
+                choice["message"]["content"],
+                choice.get("finish_reason"),
+                usage.get("prompt_tokens", 0),
+                usage.get("completion_tokens", 0),
+                body.get("model")
+            )
+        error = line.get("error") or body.get("error") or {}
+        return self.create_result(line["custom_id"], error=f"Error code: {response.get('status_code')} - {error.get('message', error)}")
+
+    def create_response(self, message: str, prompt, **kwargs):
+        model = self.default_model if prompt.config.model is None else prompt.config.model
+        return Response(message, ResponseMetadata(self.tool_name, self.ai_model_name, model, kwargs=kwargs))
@@ -1,9 +1,10 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
 from RobotFrameworkAI.ai_interface.ai_model_services.openai_tools.OpenAITool import OpenAITool
 from RobotFrameworkAI.ai_interface.ai_model_tools.TextGeneratorTool import TextGeneratorTool
 from RobotFrameworkAI.objects.response.Response import Response
 from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
 import logging
+import time
 
 
 logger = logging.getLogger(__name__)
@@ -14,17 +15,21 @@ class OpenAITextGenerator(OpenAITool, TextGeneratorTool):
     The AI tool in charge of handling all text generation for OpenAI
 
     Given a prompt, will send it to OpenAI API, and return a Response.
+
+    When stream is set in the config kwargs of the Prompt, the response is streamed. See call_ai_tool_streaming_async.
     """
     def __init__(self, client) -> None:
         OpenAITool.__init__(self)
         TextGeneratorTool.__init__(self)
-        self.client:OpenAI = client
+        self.client:AsyncOpenAI = client
     
-    def call_ai_tool(self, prompt):
+    async def call_ai_tool_async(self, prompt):
         model = self.default_model if prompt.config.model is None else prompt.config.model
         messages = self.format_prompt_messages(prompt.message.system, prompt.message.user, prompt.message.history)
         arguments = prompt.parameters
-        chat_completion = self.client.chat.completions.create(
+        if prompt.config.kwargs.get("stream") or prompt.config.kwargs.get("stop_predicate"):
+            return await self.call_ai_tool_streaming_async(prompt, model, messages)
+        chat_completion = await self.client.chat.completions.create(
             model = model,
             messages = messages,
             response_format= prompt.config.response_format,
@@ -48,4 +53,81 @@ class OpenAITextGenerator(OpenAITool, TextGeneratorTool):
             chat_completion.choices[0].message.content,
             metadata
         )
-        return response
\ No newline at end of file
+        return response
+
+    async def call_ai_tool_streaming_async(self, prompt, model, messages):
+        """
+        Streams the response and collects it as it comes in
+
+        Records the time to first token and the tokens per second after the first token in the metadata.
+        When a stop_predicate is set in the config kwargs of the Prompt, it is called with the text received so far after each
+        part that comes in. Once it returns True, the stream is closed, which stops the generation, and the text so far is returned
+        with the finish_reason "stop_predicate".
+        """
+        arguments = prompt.parameters
+        stop_predicate = prompt.config.kwargs.get("stop_predicate")
+        start = time.perf_counter()
+        stream = await self.client.chat.completions.create(
+            model = model,
+            messages = messages,
+            response_format= prompt.config.response_format,
+            max_tokens = arguments["max_tokens"],
+            temperature = arguments["temperature"],
+            top_p = arguments["top_p"],
+            frequency_penalty = arguments["frequency_penalty"],
+            presence_penalty = arguments["presence_penalty"],
+            stream = True,
+            stream_options = {"include_usage": True}
+        )
+        message = ""
+        parts = 0
+        first_token_time = None
+        finish_reason = None
+        usage = None
+        created = None
+        try:
+            async for chunk in stream:
+                created = chunk.created
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason is not None:
+                    finish_reason = choice.finish_reason
+                content = choice.delta.content
+                if not content:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.perf_counter()
+                message += content
+                parts += 1
+                if stop_predicate is not None and stop_predicate(message):
+                    finish_reason = "stop_predicate"
+                    break
+        finally:
+            await stream.close()
+        end = time.perf_counter()
+
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            # The usage is only sent at the end of the stream, when stopped early each part is about 1 token
+            prompt_tokens = sum(len(entry["content"] or "") for entry in messages) // 4
+            completion_tokens = parts
+        time_to_first_token = first_token_time - start if first_token_time is not None else None
+        generation_time = end - first_token_time if first_token_time is not None else 0
+        tokens_per_second = completion_tokens / generation_time if generation_time > 0 else None
+        logger.debug(f"{self.ai_model_name} {self.tool_name}: streamed {parts} parts, time to first token: {time_to_first_token}, tokens per second: {tokens_per_second}")
+        metadata = ResponseMetadata(
+            self.tool_name,
+            self.ai_model_name,
+            model,
+            finish_reason,
+            prompt_tokens,
+            completion_tokens,
+            created if created is not None else int(time.time()),
+            time_to_first_token = time_to_first_token,
+            tokens_per_second = tokens_per_second
+        )
+        return Response(message, metadata)
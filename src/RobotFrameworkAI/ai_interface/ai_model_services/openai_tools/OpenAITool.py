@@ -1,3 +1,6 @@
+from email.utils import parsedate_to_datetime
+import time
+
 from RobotFrameworkAI.ai_interface.ai_model_services.AIModelTool import AIModelTool
 
 
@@ -39,3 +42,39 @@ class OpenAITool(AIModelTool):
         if user_message is not None:
             prompt_messages.append(self.format_prompt_message("user", user_message))
         return prompt_messages
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """
+        Timeouts, connection errors, rate limits, conflicts and server errors of the OpenAI API are transient
+        """
+        import openai
+
+        if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in (408, 409, 429) or error.status_code >= 500
+        return False
+
+    def get_retry_after(self, error: Exception):
+        """
+        Reads the retry-after-ms or retry-after header of the response, the latter can be in seconds or a date
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        for header, divisor in (("retry-after-ms", 1000), ("retry-after", 1)):
+            value = headers.get(header)
+            if value is None:
+                continue
+            try:
+                return float(value) / divisor
+            except ValueError:
+                pass
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return None
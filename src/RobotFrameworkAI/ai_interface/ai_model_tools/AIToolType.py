@@ -22,8 +22,18 @@ class AIToolType():
     def __init__(self) -> None:
         self.tool_name = None
 
-    def call_ai_tool(self, prompt):
+    async def call_ai_tool_async(self, prompt):
         """
         Makes a call to the AI tool
+
+        All AI tools are asynchronous, they are awaited on the event loop of the AI_Interface.
         """
         pass
+
+    def is_idempotent(self, prompt) -> bool:
+        """
+        Returns whether sending the Prompt twice has the same effect as sending it once
+
+        Only idempotent Prompts are retried, as a failed call might still have been handled by the AI model.
+        """
+        return False
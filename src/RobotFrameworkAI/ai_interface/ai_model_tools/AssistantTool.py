@@ -24,15 +24,17 @@ class AssistantTool(AIToolType):
     # File types that can be used with the assistant
     ALLOWED_EXTENSIONS = {"c", "cpp", "css", "csv", "docx", "gif", "html", "java", "jpeg", "jpg", "js", "json", "md", "pdf", 
                         "php", "png", "pptx", "py", "rb", "tar", "tex", "ts", "txt", "webp", "xlsx", "xml", "zip"}
-    
-    
+
+    # Actions that can safely be sent again when a call failed, as they don't create anything on the server of the AI model
+    IDEMPOTENT_ACTIONS = {"get_active_assistant_id", "update_assistant"}
+
     def __init__(self) -> None:
         print(__name__)
         super().__init__()
         self.tool_name = "assistant"
         self.thread = None
 
-    def call_ai_tool(self, prompt):
+    async def call_ai_tool_async(self, prompt):
         """
         Calls the method that handles the handles the right action as per the Prompt
 
@@ -49,12 +51,18 @@ class AssistantTool(AIToolType):
 
         if hasattr(self, assistant_data.action):
             method = getattr(self, assistant_data.action)
-            return method(prompt)
+            return await method(prompt)
         else:
             error_message = f"Invalid value `{assistant_data.action}` for assistant data action"
             logger.error(error_message)
             raise ValueError(error_message)
 
+    def is_idempotent(self, prompt) -> bool:
+        """
+        Only actions that don't create anything, like a message in a thread, can be retried
+        """
+        return prompt.ai_tool_data.action in self.IDEMPOTENT_ACTIONS
+
     def prepare_files(self, files):
         f"""
         Given a list of paths to folders and files.
@@ -118,7 +126,7 @@ class AssistantTool(AIToolType):
             return file.read()
 
     # Actions
-    def create_assistant(self, prompt):
+    async def create_assistant(self, prompt):
         """
         Creates a new assistant and returns its Id
 
@@ -126,7 +134,7 @@ class AssistantTool(AIToolType):
         """
         pass
 
-    def send_message(self, prompt):
+    async def send_message(self, prompt):
         """
         Sends a prompt to the active assistant and returns its response
 
@@ -135,7 +143,7 @@ class AssistantTool(AIToolType):
         """
         pass
 
-    def delete_assistant(self, _):
+    async def delete_assistant(self, _):
         """
         Deletes the active assistant
 
@@ -144,7 +152,7 @@ class AssistantTool(AIToolType):
         """
         pass
 
-    def delete_assistant_by_id(self, prompt):
+    async def delete_assistant_by_id(self, prompt):
         """
         Deletes the assistant with the specified Id
 
@@ -153,7 +161,7 @@ class AssistantTool(AIToolType):
         """
         pass
 
-    def attach_files(self, prompt):
+    async def attach_files(self, prompt):
         """
         Attaches files to the active assistant
 
@@ -161,13 +169,13 @@ class AssistantTool(AIToolType):
         """
         pass
 
-    def get_active_assistant_id(self, _):
+    async def get_active_assistant_id(self, _):
         """
         Returns the Id of the active assistant
         """
         pass
 
-    def create_new_thread(self, _):
+    async def create_new_thread(self, _):
         """
         Create a new thread
 
@@ -175,7 +183,7 @@ class AssistantTool(AIToolType):
         """
         pass
 
-    def set_active_assistant(self, prompt):
+    async def set_active_assistant(self, prompt):
         """
         Sets the assistant with the specified Id as active
 
@@ -183,7 +191,7 @@ class AssistantTool(AIToolType):
     	"""
         pass
 
-    def update_assistant(self, prompt):
+    async def update_assistant(self, prompt):
         """
         Updates the parameters of the active assistant
 
@@ -192,19 +200,19 @@ class AssistantTool(AIToolType):
         pass
 
     # Helper methods
-    def get_assistant(self, id):
+    async def get_assistant(self, id):
         """
         Returns the assistant with the specified Id
         """
         pass
 
-    def upload_file(self, file):
+    async def upload_file(self, file):
         """
         Uploads a file to the server of the AI model and returns it id
         """
         pass
 
-    def add_message_to_thread(self, message, file_paths=None):
+    async def add_message_to_thread(self, message, file_paths=None):
         """
         Adds a message to a thread
 
@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+from RobotFrameworkAI.ai_interface.ai_model_tools.AIToolType import AIToolType
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTool(AIToolType):
+    """
+    The abstract class for all batch tools
+
+    A batch is a file with many requests that the AI model handles on its own time, usually within a day and for a lower price.
+    There are multiple actions on batches, like submitting one or downloading its results. For each of these actions an abstract
+    method is created. When recieving a Prompt, this class will call the method that is in charge of the action as per the Prompt.
+
+    The results of a batch are written to a JSONL file in the same format for every AI model, one result per line:
+    {"custom_id": ..., "message": ..., "finish_reason": ..., "prompt_tokens": ..., "completion_tokens": ..., "model": ..., "error": ...}
+    The error is None for requests that succeeded.
+
+    For each abstract method, documentation is provided. This removes the need for documentation in subclasses.
+    """
+    # Actions that can safely be sent again when a call failed, as they don't create anything on the server of the AI model
+    IDEMPOTENT_ACTIONS = {"get_batch", "download_batch_results", "cancel_batch"}
+    # The statuses of a batch after which it won't change anymore
+    FINISHED_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.tool_name = "batch"
+
+    async def call_ai_tool_async(self, prompt):
+        """
+        Calls the method that handles the action as per the Prompt, see AssistantTool.call_ai_tool_async
+        """
+        batch_data = prompt.ai_tool_data
+        logger.debug(f"Calling the `{prompt.config.ai_model}` batch tool with action {batch_data.action}, {prompt}")
+
+        if batch_data.action in ("submit_batch", "get_batch", "download_batch_results", "cancel_batch"):
+            return await getattr(self, batch_data.action)(prompt)
+        error_message = f"Invalid value `{batch_data.action}` for batch data action"
+        logger.error(error_message)
+        raise ValueError(error_message)
+
+    def is_idempotent(self, prompt) -> bool:
+        """
+        Only actions that don't create a batch can be retried
+        """
+        return prompt.ai_tool_data.action in self.IDEMPOTENT_ACTIONS
+
+    async def submit_batch(self, prompt):
+        """
+        Writes the Prompts of the batch data as requests to its file_path, uploads it and starts the batch
+
+        Returns a Response with the id of the batch as message and its status in the metadata kwargs.
+        """
+        pass
+
+    async def get_batch(self, prompt):
+        """
+        Returns a Response with the status of the batch as message
+
+        The metadata kwargs contain the request_counts, a dictionary with the total, completed and failed amount of requests.
+        """
+        pass
+
+    async def download_batch_results(self, prompt):
+        """
+        Writes the results of a finished batch to the file_path of the batch data, see the class documentation for the format
+
+        Returns a Response with the file_path as message. The metadata contains the tokens used by all requests together
+        and the metadata kwargs the amount of results and errors.
+        """
+        pass
+
+    async def cancel_batch(self, prompt):
+        """
+        Cancels the batch, returns a Response with its status as message
+        """
+        pass
+
+    @staticmethod
+    def create_result(custom_id: str, message: str = None, finish_reason: str = None, prompt_tokens: int = 0,
+                      completion_tokens: int = 0, model: str = None, error: str = None) -> dict:
+        return {
+            "custom_id": custom_id,
+            "message": message,
+            "finish_reason": finish_reason,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "model": model,
+            "error": error
+        }
+
+    @staticmethod
+    def write_jsonl(file_path: str, lines) -> None:
+        """
+        Writes the lines to the file as JSON, one per line
+
+        The lines are written to a temporary file first, so the file is never left half written.
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{file_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            for line in lines:
+                file.write(json.dumps(line) + "\n")
+        os.replace(temporary_path, file_path)
+
+    async def write_results(self, file_path: str, results) -> tuple:
+        """
+        Writes the results, an async iterator of results, to the file while they come in
+
+        Returns the amount of results, the amount of errors and the prompt and completion tokens of all results.
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{file_path}.tmp"
+        count = errors = prompt_tokens = completion_tokens = 0
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            async for result in results:
+                file.write(json.dumps(result) + "\n")
+                count += 1
+                errors += result["error"] is not None
+                prompt_tokens += result["prompt_tokens"] or 0
+                completion_tokens += result["completion_tokens"] or 0
+        os.replace(temporary_path, file_path)
+        return count, errors, prompt_tokens, completion_tokens
@@ -11,8 +11,14 @@ class TextGeneratorTool(AIToolType):
         super().__init__()
         self.tool_name = "text_generator"
 
-    def call_ai_tool(self, prompt):
+    async def call_ai_tool_async(self, prompt):
         """
         Sends a Prompt to the AI model and creates and returns a Response
         """
-        pass
\ No newline at end of file
+        pass
+
+    def is_idempotent(self, prompt) -> bool:
+        """
+        Generating text has no side effects, so it can always be retried
+        """
+        return True
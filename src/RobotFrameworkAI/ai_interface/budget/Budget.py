@@ -0,0 +1,95 @@
+import logging
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class Budget:
+    """
+    A limit on the tokens and the cost of the Prompts sent during a test, a suite or the whole run
+
+    Before a Prompt is sent, its tokens and cost are estimated and reserved. When the Response comes in, the reservation
+    is replaced by the actual usage. A Prompt that would take the usage and the reservations over the limit exceeds the budget.
+    What happens then depends on the policy:
+    - fail: The Prompt is not sent and a BudgetExceededError is raised.
+    - warn: The Prompt is sent anyway and a warning is logged, once per budget.
+
+    The estimate is an upper bound of the completion, so with the fail policy the budget is only exceeded when the
+    estimate of the prompt tokens was too low. A limit of None means that there is no limit.
+    """
+    SCOPES = ("global", "suite", "test")
+    POLICIES = ("fail", "warn")
+
+    def __init__(self, scope: str, name: str, max_tokens: Optional[int] = None, max_cost: Optional[float] = None, policy: str = "fail") -> None:
+        self.scope = scope
+        self.name = name
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.policy = policy
+        self.tokens = 0
+        self.cost = 0.0
+        self.reserved_tokens = 0
+        self.reserved_cost = 0.0
+        self.requests = 0
+        # The amount of Prompts that were not sent because of this budget
+        self.blocked = 0
+        self.exceeded = False
+        self.warned = False
+
+    def would_exceed(self, tokens: int, cost: float) -> bool:
+        """
+        Returns whether the usage, the reservations and the tokens and cost go over the limit
+        """
+        if self.max_tokens is not None and self.tokens + self.reserved_tokens + tokens > self.max_tokens:
+            return True
+        if self.max_cost is not None and self.cost + self.reserved_cost + cost > self.max_cost:
+            return True
+        return False
+
+    def reserve(self, tokens: int, cost: float):
+        self.reserved_tokens += tokens
+        self.reserved_cost += cost
+
+    def release(self, tokens: int, cost: float):
+        self.reserved_tokens -= tokens
+        self.reserved_cost -= cost
+
+    def add(self, tokens: int, cost: float):
+        self.requests += 1
+        self.tokens += tokens
+        self.cost += cost
+        if (self.max_tokens is not None and self.tokens > self.max_tokens) or (self.max_cost is not None and self.cost > self.max_cost):
+            self.exceeded = True
+            self.warn(f"The {self} is exceeded: used {self.tokens} tokens and ${self.cost:.4f}.")
+
+    def warn(self, message: str):
+        if not self.warned:
+            self.warned = True
+            logger.warning(message)
+
+    def to_dict(self) -> dict:
+        return {
+            "scope": self.scope,
+            "name": self.name,
+            "max_tokens": self.max_tokens,
+            "max_cost": self.max_cost,
+            "policy": self.policy,
+            "tokens": self.tokens,
+            "cost": self.cost,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "exceeded": self.exceeded,
+        }
+
+    def __str__(self) -> str:
+        limits = [f"{self.max_tokens} tokens" if self.max_tokens is not None else None, f"${self.max_cost}" if self.max_cost is not None else None]
+        return f"AI budget of {self.scope} `{self.name}` ({', '.join(limit for limit in limits if limit)})"
+
+
+class BudgetExceededError(Exception):
+    """Exception raised when a Prompt is not sent because it would exceed a budget with the fail policy."""
+
+    def __init__(self, error_message, budget):
+        super().__init__(error_message)
+        self.budget = budget
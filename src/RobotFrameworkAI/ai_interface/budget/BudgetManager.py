@@ -0,0 +1,187 @@
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+from RobotFrameworkAI.ai_interface.budget.Budget import Budget, BudgetExceededError
+from RobotFrameworkAI.ai_interface.budget.PriceTable import PriceTable
+
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetManager:
+    """
+    Keeps the budgets of the run and checks every Prompt sent to an AI model against them
+
+    There can be a budget for the whole run, for each running suite and for the running test. A Prompt counts towards
+    all of them. The listener of the library tells the BudgetManager when suites and tests start and end. When a suite
+    or test ends, its budget ends with it and is added to the report.
+
+    A test budget set outside of a test is used for each test of the running suite and its child suites,
+    or for every test when no suite is running.
+
+    Outside of Robot Framework, e.g. in unit tests, there are no suites or tests, so only the global budget can be used,
+    unless start_suite and start_test are called.
+    """
+    def __init__(self) -> None:
+        self.price_table = PriceTable()
+        self.global_budget: Optional[Budget] = None
+        # The limits for each test when no suite is running, as the arguments of a Budget
+        self.test_limits: Optional[tuple] = None
+        # The running suites from the outermost to the innermost, each with its budget and the limits for its tests
+        self.suites: list = []
+        self.test: Optional[dict] = None
+        # The budgets that have ended
+        self.finished: list = []
+        self._lock = threading.Lock()
+
+    def set_budget(self, scope: str, max_tokens: Optional[int] = None, max_cost: Optional[float] = None, policy: str = "fail"):
+        """
+        Sets the budget of the scope, a budget that already exists gets the new limits and keeps its usage
+        """
+        with self._lock:
+            if scope == "test" and self.test is None:
+                limits = (max_tokens, max_cost, policy)
+                if self.suites:
+                    self.suites[-1]["test_limits"] = limits
+                else:
+                    self.test_limits = limits
+                return
+            if scope == "suite" and not self.suites:
+                error_message = "A suite budget can only be set while a suite is running."
+                logger.error(error_message)
+                raise ValueError(error_message)
+            budget = self._get_budget(scope)
+            if budget is None:
+                name = {"global": "run", "suite": self.suites[-1]["name"] if self.suites else None, "test": self.test["name"] if self.test else None}[scope]
+                self._set_budget(scope, Budget(scope, name, max_tokens, max_cost, policy))
+            else:
+                budget.max_tokens, budget.max_cost, budget.policy = max_tokens, max_cost, policy
+
+    def remove_budget(self, scope: str):
+        with self._lock:
+            if scope == "test" and self.test is None:
+                if self.suites:
+                    self.suites[-1]["test_limits"] = None
+                else:
+                    self.test_limits = None
+                return
+            budget = self._get_budget(scope)
+            if budget is not None:
+                self.finished.append(budget)
+                self._set_budget(scope, None)
+
+    def _get_budget(self, scope: str) -> Optional[Budget]:
+        if scope == "global":
+            return self.global_budget
+        if scope == "suite":
+            return self.suites[-1]["budget"] if self.suites else None
+        return self.test["budget"] if self.test else None
+
+    def _set_budget(self, scope: str, budget: Optional[Budget]):
+        if scope == "global":
+            self.global_budget = budget
+        elif scope == "suite":
+            self.suites[-1]["budget"] = budget
+        else:
+            self.test["budget"] = budget
+
+    def start_suite(self, name: str):
+        with self._lock:
+            self.suites.append({"name": name, "budget": None, "test_limits": None})
+
+    def end_suite(self):
+        with self._lock:
+            if self.suites:
+                suite = self.suites.pop()
+                if suite["budget"] is not None:
+                    self.finished.append(suite["budget"])
+
+    def start_test(self, name: str):
+        with self._lock:
+            limits = next((suite["test_limits"] for suite in reversed(self.suites) if suite["test_limits"] is not None), self.test_limits)
+            self.test = {"name": name, "budget": Budget("test", name, *limits) if limits is not None else None}
+
+    def end_test(self):
+        with self._lock:
+            if self.test is not None and self.test["budget"] is not None:
+                self.finished.append(self.test["budget"])
+            self.test = None
+
+    def get_budgets(self) -> list:
+        """
+        Returns the budgets a Prompt sent now counts towards
+        """
+        budgets = [self.global_budget] + [suite["budget"] for suite in self.suites] + [self.test["budget"] if self.test else None]
+        return [budget for budget in budgets if budget is not None]
+
+    def reserve(self, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[tuple]:
+        """
+        Checks the estimated tokens of a Prompt against the budgets and reserves them
+
+        Raises a BudgetExceededError when a budget with the fail policy would be exceeded. Returns the reservation,
+        to give to reconcile or release once the Prompt is done, or None when there are no budgets.
+        """
+        with self._lock:
+            budgets = self.get_budgets()
+            if not budgets:
+                return None
+            tokens = prompt_tokens + completion_tokens
+            cost = self.price_table.get_cost(model, prompt_tokens, completion_tokens)
+            for budget in budgets:
+                if not budget.would_exceed(tokens, cost):
+                    continue
+                message = (f"The {budget} would be exceeded by a request of about {tokens} tokens and ${cost:.4f}. "
+                           f"Used {budget.tokens} tokens and ${budget.cost:.4f} so far.")
+                if budget.policy == "fail":
+                    budget.blocked += 1
+                    logger.error(message)
+                    raise BudgetExceededError(message, budget)
+                budget.warn(message)
+            for budget in budgets:
+                budget.reserve(tokens, cost)
+            return budgets, tokens, cost
+
+    def reconcile(self, reservation: Optional[tuple], model: str, prompt_tokens: int, completion_tokens: int):
+        """
+        Replaces the reserved tokens and cost by the actual usage of the Prompt
+        """
+        if reservation is None:
+            return
+        budgets, tokens, cost = reservation
+        actual_cost = self.price_table.get_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            for budget in budgets:
+                budget.release(tokens, cost)
+                budget.add(prompt_tokens + completion_tokens, actual_cost)
+
+    def release(self, reservation: Optional[tuple]):
+        """
+        Gives back the reserved tokens and cost of a Prompt that failed
+        """
+        if reservation is None:
+            return
+        budgets, tokens, cost = reservation
+        with self._lock:
+            for budget in budgets:
+                budget.release(tokens, cost)
+
+    def get_report(self) -> list:
+        """
+        Returns the usage of every budget, of those that ended first
+        """
+        with self._lock:
+            return [budget.to_dict() for budget in self.finished + self.get_budgets()]
+
+    def write(self, directory: str, name: str = "ai_budget_report"):
+        """
+        Writes the report to <name>.json in the directory and returns its path
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.json")
+        with open(path, "w") as file:
+            json.dump(self.get_report(), file, indent=4)
+        logger.info(f"Written AI budget report to `{path}`")
+        return path
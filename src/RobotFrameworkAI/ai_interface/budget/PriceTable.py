@@ -0,0 +1,60 @@
+import logging
+import threading
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class PriceTable:
+    """
+    The prices of the models, used to estimate the cost of Prompts
+
+    Prices are in dollars per 1 million tokens, with a separate price for prompt (input) tokens and completion (output) tokens.
+    Models are matched on the longest known name they start with, so dated versions like gpt-4o-2024-08-06 get the price of gpt-4o.
+    The default prices are the list prices at the time of writing, set your own with set_price when they change.
+    A model without a price has no cost, a warning is logged the first time it's used.
+    """
+    DEFAULT_PRICES = {
+        "gpt-3.5-turbo": (.5, 1.5),
+        "gpt-4o": (2.5, 10),
+        "gpt-4o-mini": (.15, .6),
+        "mock-small": (0, 0),
+        "mock-large": (0, 0),
+    }
+
+    def __init__(self) -> None:
+        self.prices = dict(self.DEFAULT_PRICES)
+        self._unknown_models = set()
+        self._lock = threading.Lock()
+
+    def set_price(self, model: str, input_price: float, output_price: float):
+        with self._lock:
+            self.prices[model] = (input_price, output_price)
+
+    def get_price(self, model: str) -> Optional[tuple]:
+        """
+        Returns the input and output price per 1 million tokens of the model, or None when it has no price
+        """
+        if model is None:
+            return None
+        with self._lock:
+            if model in self.prices:
+                return self.prices[model]
+            known_models = [known_model for known_model in self.prices if model.startswith(known_model)]
+            if known_models:
+                return self.prices[max(known_models, key=len)]
+            if model not in self._unknown_models:
+                self._unknown_models.add(model)
+                logger.warning(f"There is no price for model `{model}`, its cost is not counted. Set it with the Set AI Model Price keyword.")
+        return None
+
+    def get_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """
+        Returns the cost in dollars of the tokens of the model
+        """
+        price = self.get_price(model)
+        if price is None:
+            return 0
+        input_price, output_price = price
+        return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
@@ -0,0 +1,42 @@
+class CacheBackend:
+    """
+    The interface for all storage backends of the ResponseCache
+
+    The ResponseCache keeps recently used responses in memory. Behind that there can be a backend that
+    stores the responses somewhere else, like on disk, so they survive the end of the process.
+
+    A backend stores entries by key. An entry is a dictionary that can be turned into JSON, together with
+    the time it was stored. Backends are in charge of limiting their own size, by evicting the least recently
+    used entries. Expiring entries is done by the ResponseCache, as it is the one who knows the TTL.
+    """
+    def get(self, key: str):
+        """
+        Returns a tuple with the time the entry was stored and the entry, or None if there is no entry with that key
+
+        Getting an entry counts as using it, so it becomes the most recently used entry.
+        """
+        pass
+
+    def set(self, key: str, entry: dict, created: float):
+        """
+        Stores the entry, replacing any entry with the same key
+        """
+        pass
+
+    def delete(self, key: str):
+        """
+        Deletes the entry with that key, if it exists
+        """
+        pass
+
+    def clear(self):
+        """
+        Deletes all entries
+        """
+        pass
+
+    def close(self):
+        """
+        Releases anything the backend holds on to, like background threads. Stored entries are kept.
+        """
+        pass
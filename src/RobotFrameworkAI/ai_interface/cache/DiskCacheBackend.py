@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from RobotFrameworkAI.ai_interface.cache.CacheBackend import CacheBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    A CacheBackend that stores each entry as a JSON file in a directory
+
+    The name of the file is the key. The modification time of the file is used to track when an entry was
+    last used, so the least recently used entries can be evicted when the directory grows beyond max_size bytes.
+    Files are written to a temporary file first and then renamed, so a half written entry is never read.
+    """
+    def __init__(self, directory: str, max_size: int = 100 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.size = sum(size for _, _, size in self._list_files())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _list_files(self):
+        """
+        Returns a list of tuples with the path, the last time used and the size of each entry
+        """
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_mtime, stat.st_size))
+        return files
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read cache entry `{path}`: {e}")
+            return None
+        return stored["created"], stored["entry"]
+
+    def set(self, key: str, entry: dict, created: float):
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = json.dumps({"created": created, "entry": entry})
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(data)
+        with self._lock:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+            self.size += len(data.encode("utf-8")) - previous_size
+            if self.size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        """
+        Deletes the least recently used entries until the directory is at 90% of its max size
+        """
+        files = sorted(self._list_files(), key=lambda file: file[1])
+        self.size = sum(size for _, _, size in files)
+        target_size = self.max_size * .9
+        for path, _, size in files:
+            if self.size <= target_size:
+                break
+            try:
+                os.remove(path)
+                self.size -= size
+            except FileNotFoundError:
+                pass
+        logger.debug(f"Evicted cache entries from `{self.directory}`, size is now {self.size} bytes")
+
+    def delete(self, key: str):
+        path = self._path(key)
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self.size -= size
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._list_files():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self.size = 0
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+import copy
+import dataclasses
+import logging
+import threading
+import time
+from typing import Optional
+
+from RobotFrameworkAI.ai_interface.cache.CacheBackend import CacheBackend
+from RobotFrameworkAI.objects.response.Response import Response
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    A cache of Responses, keyed on the fingerprint of the Prompt they are a response to
+
+    Sending the same Prompt twice will give the cached Response the second time instead of calling the AI model again.
+    The cache has 2 levels. The first level is kept in memory and holds the max_entries most recently used Responses.
+    The second level is an optional CacheBackend, e.g. on disk, that holds more Responses and survives the process.
+    When a Response is found in the second level, it gets added to the first level again.
+
+    Responses older than ttl seconds are expired and won't be returned. When ttl is None, Responses never expire.
+
+    Only Prompts for AI tools without side effects are cached. Assistants for example keep state on the server of
+    the AI model, so sending the same message twice is not the same as sending it once.
+
+    The modes determine how a single Prompt uses the cache:
+    - use: Return the cached Response if there is one, otherwise call the AI model and cache its Response.
+    - refresh: Always call the AI model and replace the cached Response.
+    - bypass: Don't use the cache at all.
+    """
+    CACHEABLE_TOOLS = {"text_generator"}
+    MODES = ("use", "refresh", "bypass")
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 1000, backend: CacheBackend = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = backend
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def is_cacheable(cls, prompt) -> bool:
+        # A Response cut short by a stop predicate is not the Response to the Prompt
+        return prompt.config.ai_tool in cls.CACHEABLE_TOOLS and prompt.config.kwargs.get("stop_predicate") is None
+
+    def is_expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, prompt) -> Optional[Response]:
+        """
+        Returns a copy of the cached Response to the Prompt, or None if there is none
+
+        Counts as a hit or a miss.
+        """
+        key = prompt.fingerprint()
+        response = self._get_from_memory(key)
+        if response is None and self.backend is not None:
+            response = self._get_from_backend(key)
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(response)
+
+    def _get_from_memory(self, key: str) -> Optional[Response]:
+        with self._lock:
+            if key not in self.entries:
+                return None
+            created, response = self.entries[key]
+            if self.is_expired(created):
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return response
+
+    def _get_from_backend(self, key: str) -> Optional[Response]:
+        stored = self.backend.get(key)
+        if stored is None:
+            return None
+        created, entry = stored
+        if self.is_expired(created):
+            self.backend.delete(key)
+            return None
+        response = Response.from_dict(entry)
+        self._add_to_memory(key, response, created)
+        return response
+
+    def _add_to_memory(self, key: str, response: Response, created: float):
+        with self._lock:
+            self.entries[key] = (created, response)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def set(self, prompt, response: Response):
+        """
+        Caches a copy of the Response to the Prompt
+        """
+        key = prompt.fingerprint()
+        created = time.time()
+        response = copy.deepcopy(response)
+        self._add_to_memory(key, response, created)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, response.to_dict(), created)
+            except Exception as e:
+                # A broken second level shouldn't fail the keyword, the Response is still cached in memory
+                logger.warning(f"Failed to store response in the cache backend: {e}")
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if self.backend is not None:
+            self.backend.clear()
+
+    def annotate(self, response: Response, status: str) -> Response:
+        """
+        Returns the Response with the cache status and the hit and miss counters added to its metadata
+        """
+        with self._lock:
+            response.metadata = dataclasses.replace(
+                response.metadata, cache_status=status, cache_hits=self.hits, cache_misses=self.misses
+            )
+        return response
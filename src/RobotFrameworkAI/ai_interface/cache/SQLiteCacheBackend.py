@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from RobotFrameworkAI.ai_interface.cache.CacheBackend import CacheBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    A CacheBackend that stores entries in a SQLite database, which can be shared by many processes
+
+    The database uses write-ahead logging, so readers don't block writers and many processes, like pabot workers,
+    can use the same database at the same time. Entries are written with a single upsert statement, so an entry is
+    either fully written or not at all. When the database is locked by another process, it waits up to busy_timeout
+    seconds before giving up.
+
+    The storage is bounded to max_size bytes and max_entries entries. Instead of checking the size on every write,
+    a background thread compacts the database every compaction_interval seconds. Compacting removes the least
+    recently used entries beyond the bounds, entries older than the ttl when given, and truncates the write-ahead log.
+
+    The last time an entry was used is only updated when it is more than a minute old. This keeps reads from
+    turning into writes, which would make the processes wait on each other.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            entry TEXT NOT NULL,
+            created REAL NOT NULL,
+            last_used REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+    """
+    UPSERT = """
+        INSERT INTO responses (key, entry, created, last_used, size) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (key) DO UPDATE SET
+            entry = excluded.entry, created = excluded.created, last_used = excluded.last_used, size = excluded.size
+    """
+    LAST_USED_RESOLUTION = 60
+
+    def __init__(
+            self,
+            path: str,
+            max_size: int = 100 * 1024 * 1024,
+            max_entries: Optional[int] = None,
+            ttl: Optional[float] = None,
+            compaction_interval: Optional[float] = 60,
+            busy_timeout: float = 30
+        ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._stopped = threading.Event()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connection()
+        # Changing the journal mode needs a lock on the database, another process might be creating it at the same time
+        self._retry_when_locked(lambda: connection.execute("PRAGMA journal_mode=WAL"))
+        self._retry_when_locked(lambda: connection.executescript(self.SCHEMA))
+        self._compaction_thread = None
+        if compaction_interval:
+            self._compaction_thread = threading.Thread(
+                target=self._compact_periodically, args=(compaction_interval,), name="SQLiteCacheCompaction", daemon=True
+            )
+            self._compaction_thread.start()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread, SQLite connections can't be shared between threads
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _retry_when_locked(self, operation, attempts: int = 50):
+        for attempt in range(attempts):
+            try:
+                return operation()
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or attempt == attempts - 1:
+                    raise
+                time.sleep(.05)
+
+    def get(self, key: str):
+        connection = self._connection()
+        row = connection.execute("SELECT entry, created, last_used FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry, created, last_used = row
+        now = time.time()
+        if now - last_used > self.LAST_USED_RESOLUTION:
+            connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return created, json.loads(entry)
+
+    def set(self, key: str, entry: dict, created: float):
+        data = json.dumps(entry)
+        self._connection().execute(self.UPSERT, (key, data, created, time.time(), len(data)))
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM responses")
+
+    def size(self) -> tuple:
+        """
+        Returns a tuple with the total size in bytes and the amount of entries
+        """
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM responses").fetchone()
+
+    def compact(self):
+        """
+        Removes expired and least recently used entries until the database is within its bounds and truncates the write-ahead log
+        """
+        connection = self._connection()
+        if self.ttl is not None:
+            connection.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        size, entries = self.size()
+        if self._is_within_bounds(size, entries, 1):
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return
+        # Evict to 90% of the bounds, so the next few writes don't immediately need another compaction
+        while not self._is_within_bounds(size, entries, .9):
+            batch = max(1, entries // 10)
+            connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)", (batch,)
+            )
+            size, entries = self.size()
+            if entries == 0:
+                break
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        logger.debug(f"Compacted response cache `{self.path}`, size: {size} bytes, entries: {entries}")
+
+    def _is_within_bounds(self, size: int, entries: int, fraction: float) -> bool:
+        return size <= self.max_size * fraction and (self.max_entries is None or entries <= self.max_entries * fraction)
+
+    def _compact_periodically(self, interval: float):
+        while not self._stopped.wait(interval):
+            try:
+                self.compact()
+            except sqlite3.Error as e:
+                # Another process might hold the lock for a long time, just try again next time
+                logger.warning(f"Failed to compact response cache `{self.path}`: {e}")
+
+    def close(self):
+        """
+        Stops the compaction thread
+        """
+        self._stopped.set()
@@ -0,0 +1,217 @@
+import copy
+import dataclasses
+import hashlib
+import json
+import logging
+import re
+import threading
+import zlib
+from typing import List, Optional
+
+import numpy as np
+
+from RobotFrameworkAI.objects.response.Response import Response
+
+
+logger = logging.getLogger(__name__)
+
+
+class HashingVectorizer:
+    """
+    Turns texts into vectors without a model, a vocabulary or a network connection
+
+    The text is split into features: words, pairs of words and 3 character pieces of words. Each feature is
+    hashed to one of the dimensions of the vector, with the hash also deciding whether it adds or subtracts.
+    The vector is normalized, so the dot product of two vectors is their cosine similarity.
+
+    The same text always results in the same vector. Texts that only differ in whitespace, casing or punctuation
+    result in the same vector and texts that differ in a few words result in similar vectors.
+    """
+    WORD_PATTERN = re.compile(r"\w+")
+
+    def __init__(self, dimensions: int = 256) -> None:
+        self.dimensions = dimensions
+
+    def features(self, text: str) -> List[str]:
+        words = self.WORD_PATTERN.findall(text.lower())
+        features = list(words)
+        features.extend(f"{first} {second}" for first, second in zip(words, words[1:]))
+        for word in words:
+            word = f"<{word}>"
+            features.extend(word[i:i + 3] for i in range(len(word) - 2))
+        return features
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns a matrix with a normalized vector for each text
+        """
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in self.features(text)), dtype=np.uint32)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], hashes % self.dimensions, signs)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+class SemanticCache:
+    """
+    A cache of Responses that also returns the Response to a Prompt that is almost the same
+
+    Where the ResponseCache only finds a Response when the Prompt is exactly the same, this cache looks for the
+    most similar cached Prompt. When its cosine similarity is at least the threshold, its Response is returned.
+
+    Only the user message is compared. Everything else, like the system message, history, AI model and parameters,
+    has to be exactly the same. This is done by giving each combination of these its own context and only comparing
+    Prompts within the same context.
+
+    The user messages are turned into vectors with a HashingVectorizer. Comparing a Prompt with every cached Prompt
+    would mean reading every vector for every lookup, which gets slow with 100k cached Prompts. Instead each vector also
+    gets a 64 bit signature. Each bit tells on which side of a fixed random hyperplane the vector lies, so the amount
+    of bits 2 signatures differ in estimates the angle between their vectors. Looking up a Prompt first compares its
+    signature with all signatures at once and then only compares the vectors of the closest candidates exactly.
+
+    A lookup still reads every signature, so its cost grows with the amount of cached Prompts. With 100k cached Prompts
+    a lookup takes about 0.4 ms with numpy 2, which counts bits natively. With older versions of numpy the bits are
+    counted with arithmetic instead, a lookup then takes about 1 ms. Lower max_entries when lookups have to be faster.
+
+    When the cache is full, the oldest entries are replaced.
+    """
+    SIGNATURE_BITS = 64
+    # The amount of closest signatures that are compared exactly
+    CANDIDATES = 32
+
+    def __init__(self, threshold: float = .95, max_entries: int = 100_000, dimensions: int = 256) -> None:
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.vectorizer = HashingVectorizer(dimensions)
+        # The random hyperplanes are seeded, so signatures are the same in every run
+        self.hyperplanes = np.random.default_rng(0).standard_normal((dimensions, self.SIGNATURE_BITS)).astype(np.float32)
+        # Each bit differs with a chance of angle / pi. Allow 4 standard deviations above the expected amount at the threshold.
+        chance = np.arccos(np.clip(threshold, -1, 1)) / np.pi
+        self.max_distance = int(np.ceil(self.SIGNATURE_BITS * chance + 4 * np.sqrt(self.SIGNATURE_BITS * chance * (1 - chance))))
+        capacity = min(max_entries, 1024)
+        self.vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.signatures = np.zeros(capacity, dtype=np.uint64)
+        self.contexts = np.zeros(capacity, dtype=np.int64)
+        self.responses: List[Optional[Response]] = [None] * capacity
+        self.context_ids = {}
+        self.size = 0
+        self.position = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def context(self, prompt) -> str:
+        """
+        Returns a hash of everything in the Prompt except the user message
+        """
+        content = {
+            "ai_tool": prompt.config.ai_tool,
+            "ai_model": prompt.config.ai_model,
+            "model": prompt.config.model,
+            "response_format": prompt.config.response_format,
+            "system": prompt.message.system,
+            "history": prompt.message.history,
+            "parameters": prompt.parameters
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _context_id(self, prompt) -> int:
+        return self.context_ids.setdefault(self.context(prompt), len(self.context_ids) + 1)
+
+    def _signatures(self, vectors: np.ndarray) -> np.ndarray:
+        bits = (vectors @ self.hyperplanes) > 0
+        return np.packbits(bits, axis=1).view(np.uint64).ravel()
+
+    @staticmethod
+    def _count_bits(values: np.ndarray) -> np.ndarray:
+        if hasattr(np, "bitwise_count"):
+            return np.bitwise_count(values)
+        # Counts the bits of each 2, 4 and 8 bits in place, then adds up the 8 bytes with a multiplication
+        values = values - ((values >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        values = (values & np.uint64(0x3333333333333333)) + ((values >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        values = (values + (values >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        return (values * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+    def _candidates(self, signature, context_id: int) -> np.ndarray:
+        """
+        Returns the rows of the cached Prompts in the same context with the signatures closest to the signature
+
+        Signatures that differ in more bits than max_distance are very unlikely to be similar enough.
+        When there are still too many candidates left, only the closest are kept.
+        """
+        distances = self._count_bits(self.signatures[:self.size] ^ signature)
+        candidates = np.flatnonzero(distances <= self.max_distance)
+        candidates = candidates[self.contexts[candidates] == context_id]
+        if len(candidates) > self.CANDIDATES:
+            closest = np.argpartition(distances[candidates], self.CANDIDATES)[:self.CANDIDATES]
+            candidates = candidates[closest]
+        return candidates
+
+    def get(self, prompt) -> Optional[Response]:
+        """
+        Returns a copy of the cached Response of the most similar Prompt, or None if none is similar enough
+        """
+        query = self.vectorizer.transform([prompt.message.user or ""])
+        signature = self._signatures(query)[0]
+        context_id = self._context_id(prompt)
+        with self._lock:
+            candidates = self._candidates(signature, context_id)
+            similarities = self.vectors[candidates] @ query[0]
+            best = int(np.argmax(similarities)) if len(candidates) else None
+            if best is None or similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            response = self.responses[candidates[best]]
+        logger.debug(f"Found similar prompt with similarity {similarities[best]:.3f}")
+        # The message is a string and annotate replaces the metadata, so only the kwargs of the metadata need their own copy
+        return dataclasses.replace(response, metadata=dataclasses.replace(response.metadata, kwargs=copy.deepcopy(response.metadata.kwargs)))
+
+    def set(self, prompt, response: Response):
+        """
+        Caches a copy of the Response to the Prompt
+        """
+        vector = self.vectorizer.transform([prompt.message.user or ""])
+        signature = self._signatures(vector)[0]
+        with self._lock:
+            if self.position == len(self.vectors) and len(self.vectors) < self.max_entries:
+                self._grow()
+            self.position %= len(self.vectors)
+            self.vectors[self.position] = vector[0]
+            self.signatures[self.position] = signature
+            self.contexts[self.position] = self._context_id(prompt)
+            self.responses[self.position] = copy.deepcopy(response)
+            self.position += 1
+            self.size = max(self.size, self.position)
+
+    def _grow(self):
+        capacity = min(self.max_entries, len(self.vectors) * 2)
+        vectors = np.zeros((capacity, self.vectorizer.dimensions), dtype=np.float32)
+        vectors[:len(self.vectors)] = self.vectors
+        signatures = np.zeros(capacity, dtype=np.uint64)
+        signatures[:len(self.signatures)] = self.signatures
+        contexts = np.zeros(capacity, dtype=np.int64)
+        contexts[:len(self.contexts)] = self.contexts
+        self.vectors, self.signatures, self.contexts = vectors, signatures, contexts
+        self.responses.extend([None] * (capacity - len(self.responses)))
+
+    def clear(self):
+        with self._lock:
+            self.size = 0
+            self.position = 0
+            self.hits = 0
+            self.misses = 0
+            self.context_ids.clear()
+            self.responses = [None] * len(self.vectors)
+
+    def annotate(self, response: Response, status: str) -> Response:
+        """
+        Returns the Response with the cache status and the hit and miss counters added to its metadata
+        """
+        with self._lock:
+            response.metadata = dataclasses.replace(
+                response.metadata, cache_status=status, cache_hits=self.hits, cache_misses=self.misses
+            )
+        return response
@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class Cassette:
+    """
+    A file with recorded requests to the API of an AI model and their responses
+
+    In record mode every request goes to the API and is recorded together with its response. In replay mode the recorded
+    responses are served instead, without using the network. Requests are matched on their fingerprint: a hash of the API
+    method and all arguments. The same request can be made more than once, e.g. creating a new thread, so each fingerprint
+    has a list of responses that are replayed in the order they were recorded.
+
+    Replaying has 3 policies for matching requests:
+    - strict: A request has to match a recorded request exactly and can't be replayed more often than it was recorded.
+    - lenient: Requests are also matched while ignoring sampling parameters, like temperature and max_tokens, and the last
+        response of a request is repeated when it is made more often than it was recorded.
+    - new_episodes: Like strict, but requests that weren't recorded are sent to the API and added to the cassette.
+    Requests that can't be matched raise a CassetteMissError.
+
+    The cassette is stored as gzipped JSON. It is loaded once, after which finding a response is a dictionary lookup.
+    """
+    MODES = ("record", "replay")
+    POLICIES = ("strict", "lenient", "new_episodes")
+    # Arguments ignored when matching leniently, they change the response but not what the request is about
+    LENIENT_IGNORED = {"temperature", "top_p", "max_tokens", "frequency_penalty", "presence_penalty", "seed", "stream_options"}
+
+    def __init__(self, path: str, mode: str = "replay", policy: str = "strict") -> None:
+        self.path = path
+        self.mode = mode
+        self.policy = policy
+        # The recorded interactions by fingerprint, each a list of entries with the method, the request and the response
+        self.interactions: dict = {}
+        self.lenient_interactions: dict = {}
+        self.played: dict = {}
+        self.changed = False
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self.load()
+
+    @property
+    def records(self) -> bool:
+        """
+        Whether requests that aren't replayed are recorded
+        """
+        return self.mode == "record" or self.policy == "new_episodes"
+
+    def load(self) -> None:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                stored = json.load(file)
+        except FileNotFoundError:
+            if self.policy != "new_episodes":
+                error_message = f"Cassette `{self.path}` doesn't exist. Record it first by using the cassette with mode record."
+                logger.error(error_message)
+                raise FileNotFoundError(error_message)
+            return
+        for entry in stored["interactions"]:
+            self._add(entry)
+        logger.info(f"Loaded {len(stored['interactions'])} interactions from cassette `{self.path}`")
+
+    def save(self) -> None:
+        """
+        Writes the cassette to disk if anything was recorded
+        """
+        with self._lock:
+            if not self.changed:
+                return
+            interactions = [entry for entries in self.interactions.values() for entry in entries]
+            self.changed = False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+            json.dump({"version": 1, "interactions": interactions}, file, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+        logger.info(f"Saved {len(interactions)} interactions to cassette `{self.path}`")
+
+    def play(self, method: str, request: dict):
+        """
+        Returns the recorded entry for the request, or None if it should be sent to the API and recorded
+        """
+        with self._lock:
+            fingerprint = self.fingerprint(method, request)
+            entries = self.interactions.get(fingerprint)
+            if not entries and self.policy == "lenient":
+                fingerprint = "lenient-" + self.fingerprint(method, request, lenient=True)
+                entries = self.lenient_interactions.get(fingerprint)
+            played = self.played.get(fingerprint, 0)
+            if entries and played < len(entries):
+                self.played[fingerprint] = played + 1
+                return entries[played]
+            if entries and self.policy == "lenient":
+                return entries[-1]
+        if self.policy == "new_episodes":
+            return None
+        if entries:
+            error_message = f"Request `{method}` was made more often than the {len(entries)} times recorded in cassette `{self.path}`"
+        else:
+            error_message = f"Request `{method}` was not recorded in cassette `{self.path}`. Request: {self.canonical(request)[:500]}"
+        logger.error(error_message)
+        raise CassetteMissError(error_message)
+
+    def record(self, method: str, request: dict, response: dict) -> None:
+        """
+        Adds the request and its response to the cassette
+        """
+        entry = {"method": method, "request": json.loads(self.canonical(request)), **response}
+        with self._lock:
+            fingerprint = self._add(entry)
+            # A request recorded now has also been played, so a repeat of it gets the next response
+            self.played[fingerprint] = self.played.get(fingerprint, 0) + 1
+            self.changed = True
+
+    def _add(self, entry: dict) -> str:
+        fingerprint = self.fingerprint(entry["method"], entry["request"])
+        self.interactions.setdefault(fingerprint, []).append(entry)
+        lenient_fingerprint = "lenient-" + self.fingerprint(entry["method"], entry["request"], lenient=True)
+        self.lenient_interactions.setdefault(lenient_fingerprint, []).append(entry)
+        return fingerprint
+
+    @classmethod
+    def fingerprint(cls, method: str, request: dict, lenient: bool = False) -> str:
+        request = json.loads(cls.canonical(request))
+        if lenient:
+            request["kwargs"] = {key: value for key, value in request["kwargs"].items() if key not in cls.LENIENT_IGNORED}
+        return hashlib.sha256(f"{method}:{cls.canonical(request)}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def canonical(request: dict) -> str:
+        """
+        Returns the request as JSON with sorted keys, bytes are replaced by their hash so files don't bloat the cassette
+        """
+        def default(value):
+            if isinstance(value, bytes):
+                return "sha256:" + hashlib.sha256(value).hexdigest()
+            if isinstance(value, (tuple, set)):
+                return list(value)
+            if hasattr(value, "model_dump"):
+                return value.model_dump(mode="json")
+            return str(value)
+        return json.dumps(request, sort_keys=True, default=default, separators=(",", ":"))
+
+
+class CassetteMissError(Exception):
+    """Exception raised when a request can't be replayed from the cassette."""
@@ -0,0 +1,139 @@
+import logging
+
+from RobotFrameworkAI.ai_interface.cassette.Cassette import Cassette
+
+
+logger = logging.getLogger(__name__)
+
+
+class CassetteClient:
+    """
+    Takes the place of the API client of an AI model and records or replays all requests made with it
+
+    Accessing an attribute, like client.chat.completions.create, returns another CassetteClient that remembers the path.
+    Calling it looks the request up in the Cassette. When replayed, the recorded response is returned as a RecordedObject,
+    which has the same attributes as the response of the API. Otherwise the request is made with the real API client,
+    which is only created at that point, so replaying doesn't need an API key, and the response is recorded.
+
+    Streamed responses are recorded chunk by chunk once the stream is closed, and replayed as a stream of the same chunks.
+    """
+    def __init__(self, cassette: Cassette, create_client, path: tuple = (), real_client: dict = None) -> None:
+        self._cassette = cassette
+        self._create_client = create_client
+        self._path = path
+        # Shared by all CassetteClients of the same API client
+        self._real_client = real_client if real_client is not None else {}
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return CassetteClient(self._cassette, self._create_client, self._path + (name,), self._real_client)
+
+    def get_real_client(self):
+        if "client" not in self._real_client:
+            self._real_client["client"] = self._create_client()
+        return self._real_client["client"]
+
+    async def __call__(self, *args, **kwargs):
+        method = ".".join(self._path)
+        request = {"args": list(args), "kwargs": kwargs}
+        if self._cassette.mode == "replay":
+            entry = self._cassette.play(method, request)
+            if entry is not None:
+                if "stream" in entry:
+                    return ReplayStream([RecordedObject.create(chunk) for chunk in entry["stream"]])
+                return RecordedObject.create(entry["response"])
+
+        real_method = self.get_real_client()
+        for name in self._path:
+            real_method = getattr(real_method, name)
+        result = await real_method(*args, **kwargs)
+        if kwargs.get("stream"):
+            return RecordingStream(result, lambda chunks: self._cassette.record(method, request, {"stream": chunks}))
+        self._cassette.record(method, request, {"response": dump(result)})
+        return result
+
+    async def close(self):
+        if self._path:
+            return await self.__getattr__("close")()
+        real_client = self._real_client.pop("client", None)
+        if real_client is not None:
+            await real_client.close()
+
+
+def dump(value):
+    """
+    Turns a response of the API into JSON compatible data
+    """
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, (list, tuple)):
+        return [dump(item) for item in value]
+    if isinstance(value, dict):
+        return {key: dump(item) for key, item in value.items()}
+    return value
+
+
+class RecordedObject:
+    """
+    A recorded response of the API, its keys can be used as attributes like on the original response
+    """
+    def __init__(self, data: dict) -> None:
+        self.__dict__.update({key: RecordedObject.create(value) for key, value in data.items()})
+
+    @staticmethod
+    def create(value):
+        if isinstance(value, dict):
+            return RecordedObject(value)
+        if isinstance(value, list):
+            return [RecordedObject.create(item) for item in value]
+        return value
+
+    def __iter__(self):
+        # Pages, like a list of messages, iterate over their data
+        return iter(self.__dict__.get("data", []))
+
+    def __repr__(self) -> str:
+        return f"RecordedObject({self.__dict__})"
+
+
+class ReplayStream:
+    """
+    Replays the recorded chunks of a streamed response
+    """
+    def __init__(self, chunks: list) -> None:
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def close(self):
+        pass
+
+
+class RecordingStream:
+    """
+    Passes on the chunks of a streamed response and records them once the stream is closed
+    """
+    def __init__(self, stream, on_close) -> None:
+        self.stream = stream
+        self.on_close = on_close
+        self.chunks = []
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        async for chunk in self.stream:
+            self.chunks.append(dump(chunk))
+            yield chunk
+
+    async def close(self):
+        await self.stream.close()
+        if self.on_close is not None:
+            self.on_close(self.chunks)
+            self.on_close = None
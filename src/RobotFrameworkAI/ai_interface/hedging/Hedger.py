@@ -0,0 +1,103 @@
+import asyncio
+from collections import deque
+import logging
+import math
+import time
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class Hedger:
+    """
+    Sends a duplicate of a request that is taking long and uses whichever response comes first
+
+    Most requests to an AI model are fast, but a few take many times longer. Those few decide how long a suite takes.
+    When a request hasn't finished after the hedge delay, a second request is sent, optionally to a fallback model.
+    The first of the 2 to succeed wins and the other is cancelled. If one fails, the other is still waited for.
+
+    The hedge delay is either fixed or adaptive. An adaptive delay is the percentile of the latencies of the last window
+    requests, so only the slowest requests get hedged. Until min_samples latencies are known, no requests are hedged.
+
+    Hedging costs extra requests, the statistics show how many requests were hedged and how often the hedge won.
+    All methods have to be used on the event loop of the AI_Interface.
+    """
+    def __init__(
+            self,
+            delay: Optional[float] = None,
+            percentile: float = 95,
+            fallback_model: Optional[str] = None,
+            min_samples: int = 20,
+            window: int = 200
+        ) -> None:
+        self.delay = delay
+        self.percentile = percentile
+        self.fallback_model = fallback_model
+        self.min_samples = min_samples
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def get_delay(self) -> Optional[float]:
+        """
+        Returns the amount of seconds after which a request gets hedged, or None if it shouldn't be hedged
+        """
+        if self.delay is not None:
+            return self.delay
+        if len(self.latencies) < self.min_samples:
+            return None
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, math.ceil(len(latencies) * self.percentile / 100) - 1)
+        return latencies[max(index, 0)]
+
+    async def run(self, send_primary, send_hedge):
+        """
+        Runs the coroutine of send_primary and, if it takes longer than the hedge delay, also that of send_hedge
+
+        Returns the result of the first to succeed and whether that was the hedge.
+        When both fail, the error of the primary request is raised.
+        """
+        start = time.monotonic()
+        self.requests += 1
+        delay = self.get_delay()
+        primary = asyncio.ensure_future(send_primary())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedges += 1
+                logger.debug(f"Request didn't finish within {delay:.3f} seconds, sending a hedge request")
+                tasks.add(asyncio.ensure_future(send_hedge()))
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        hedged = task is not primary
+                        if hedged:
+                            self.hedge_wins += 1
+                        self.latencies.append(time.monotonic() - start)
+                        return task.result(), hedged
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the amount of requests, hedges and hedge wins, the hedge rate, the hedge win rate and the current hedge delay
+        """
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0,
+            "hedge_win_rate": self.hedge_wins / self.hedges if self.hedges else 0,
+            "delay": self.get_delay()
+        }
+
+    def __repr__(self) -> str:
+        return f"Hedger(delay={self.delay}, percentile={self.percentile}, fallback_model={self.fallback_model})"
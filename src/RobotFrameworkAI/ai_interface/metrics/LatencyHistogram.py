@@ -0,0 +1,56 @@
+import bisect
+import math
+
+
+class LatencyHistogram:
+    """
+    Counts latencies in buckets, like a Prometheus histogram
+
+    Only the count of each bucket is kept, so it takes the same memory for 10 or 10 million latencies.
+    Percentiles are estimated by interpolating within the bucket they fall in, which is accurate to the size of the bucket.
+    The buckets are in seconds and cover both cached responses of a few milliseconds and completions of minutes.
+    """
+    BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self) -> None:
+        # The last bucket counts everything above the highest bound
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, latency: float):
+        self.counts[bisect.bisect_left(self.BUCKETS, latency)] += 1
+        self.count += 1
+        self.sum += latency
+        self.min = min(self.min, latency)
+        self.max = max(self.max, latency)
+
+    def percentile(self, percentile: float):
+        """
+        Returns the estimated latency below which the percentile of latencies fall, or None when nothing was observed
+        """
+        if not self.count:
+            return None
+        rank = percentile / 100 * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.BUCKETS[i - 1] if i > 0 else 0
+                upper = self.BUCKETS[i] if i < len(self.BUCKETS) else self.max
+                # The observed min and max are exact, so they narrow down the first and last bucket
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.max
+
+    def cumulative_counts(self) -> list:
+        """
+        Returns the upper bound of each bucket with the amount of latencies at or below it, the last bound is infinity
+        """
+        cumulative, result = 0, []
+        for bound, count in zip(self.BUCKETS + (math.inf,), self.counts):
+            cumulative += count
+            result.append((bound, cumulative))
+        return result
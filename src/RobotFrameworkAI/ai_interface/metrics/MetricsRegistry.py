@@ -0,0 +1,141 @@
+import json
+import logging
+import math
+import os
+import threading
+
+from RobotFrameworkAI.ai_interface.metrics.LatencyHistogram import LatencyHistogram
+
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    """
+    Collects the usage of AI models for every Prompt handled by the AI_Interface
+
+    The usage is kept per series: the combination of the module that sent the Prompt, the AI model, the model and the AI tool.
+    Each series counts the calls, errors, cached responses, retries and prompt and completion tokens, and keeps a LatencyHistogram.
+    Responses from the response cache count as calls, but their tokens are not counted, as they weren't used again.
+    The same goes for coalesced Responses, their tokens and retries are counted once, with the Prompt that was sent.
+
+    The metrics can be read as a dictionary, see get_statistics, or written as JSON and in the Prometheus text format.
+    """
+    LABELS = ("module", "ai_model", "model", "ai_tool")
+    COUNTERS = ("calls", "errors", "cache_hits", "retries", "prompt_tokens", "completion_tokens")
+
+    def __init__(self) -> None:
+        self.series: dict = {}
+        self._lock = threading.Lock()
+
+    def record(
+            self,
+            module: str,
+            ai_model: str,
+            model: str,
+            ai_tool: str,
+            latency: float,
+            prompt_tokens: int = 0,
+            completion_tokens: int = 0,
+            error: bool = False,
+            cache_hit: bool = False,
+            retries: int = 0,
+            coalesced: bool = False
+        ):
+        key = (module, ai_model, model or "default", ai_tool)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {"counters": dict.fromkeys(self.COUNTERS, 0), "latency": LatencyHistogram()}
+            counters = series["counters"]
+            counters["calls"] += 1
+            counters["errors"] += error
+            counters["cache_hits"] += cache_hit
+            if not cache_hit and not coalesced:
+                counters["retries"] += retries
+                counters["prompt_tokens"] += prompt_tokens or 0
+                counters["completion_tokens"] += completion_tokens or 0
+            series["latency"].observe(latency)
+
+    def reset(self):
+        with self._lock:
+            self.series = {}
+
+    def get_statistics(self, **filters) -> dict:
+        """
+        Returns the totals and the statistics of each series, only of the series matching the filters, e.g. module="chatbot"
+
+        Latencies are in seconds. The error_rate is the fraction of calls that failed.
+        """
+        with self._lock:
+            series = [
+                self.create_statistics(dict(zip(self.LABELS, key)), value["counters"], value["latency"])
+                for key, value in sorted(self.series.items())
+                if all(wanted is None or label_value == wanted for label_value, wanted in zip(key, (filters.get(label) for label in self.LABELS)))
+            ]
+        totals = dict.fromkeys(self.COUNTERS, 0)
+        for statistics in series:
+            for counter in self.COUNTERS:
+                totals[counter] += statistics[counter]
+        totals["error_rate"] = totals["errors"] / totals["calls"] if totals["calls"] else 0
+        totals["total_tokens"] = totals["prompt_tokens"] + totals["completion_tokens"]
+        return {"totals": totals, "series": series}
+
+    @staticmethod
+    def create_statistics(labels: dict, counters: dict, latency: LatencyHistogram) -> dict:
+        return {
+            **labels,
+            **counters,
+            "total_tokens": counters["prompt_tokens"] + counters["completion_tokens"],
+            "error_rate": counters["errors"] / counters["calls"] if counters["calls"] else 0,
+            "latency_mean": latency.sum / latency.count if latency.count else None,
+            "latency_p50": latency.percentile(50),
+            "latency_p95": latency.percentile(95),
+            "latency_p99": latency.percentile(99),
+            "latency_max": latency.max if latency.count else None,
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Returns all series in the Prometheus text format, with a counter per COUNTER and a latency histogram
+        """
+        with self._lock:
+            series = [
+                (dict(zip(self.LABELS, key)), dict(value["counters"]), value["latency"].cumulative_counts(), value["latency"].sum, value["latency"].count)
+                for key, value in sorted(self.series.items())
+            ]
+        lines = []
+        for counter in self.COUNTERS:
+            name = f"robotframework_ai_{counter}_total"
+            lines += [f"# HELP {name} The amount of {counter.replace('_', ' ')} of AI models.", f"# TYPE {name} counter"]
+            lines += [f"{name}{{{self.format_labels(labels)}}} {counters[counter]}" for labels, counters, *_ in series]
+        name = "robotframework_ai_latency_seconds"
+        lines += [f"# HELP {name} The time it took to get a response from an AI model.", f"# TYPE {name} histogram"]
+        for labels, _, buckets, latency_sum, latency_count in series:
+            formatted_labels = self.format_labels(labels)
+            for bound, count in buckets:
+                le = "+Inf" if math.isinf(bound) else repr(float(bound))
+                lines.append(f'{name}_bucket{{{formatted_labels},le="{le}"}} {count}')
+            lines.append(f"{name}_sum{{{formatted_labels}}} {latency_sum}")
+            lines.append(f"{name}_count{{{formatted_labels}}} {latency_count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def format_labels(labels: dict) -> str:
+        def escape(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return ",".join(f'{label}="{escape(value)}"' for label, value in labels.items())
+
+    def write(self, directory: str, name: str = "ai_metrics"):
+        """
+        Writes the metrics to <name>.json and <name>.prom in the directory, returns the paths of both files
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"{name}.json")
+        prometheus_path = os.path.join(directory, f"{name}.prom")
+        with open(json_path, "w") as file:
+            json.dump(self.get_statistics(), file, indent=4)
+        with open(prometheus_path, "w") as file:
+            file.write(self.to_prometheus())
+        logger.info(f"Written AI metrics to `{json_path}` and `{prometheus_path}`")
+        return json_path, prometheus_path
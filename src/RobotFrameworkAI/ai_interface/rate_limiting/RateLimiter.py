@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from RobotFrameworkAI.ai_interface.rate_limiting.TokenBucket import TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Limits the requests per minute and tokens per minute sent to an AI model
+
+    Each limit is a TokenBucket. Before a Prompt is sent, acquire waits until both buckets have room for 1 request and
+    the estimated amount of tokens of the Prompt. After the Response is received, reconcile corrects the token bucket with
+    the actual amount of tokens used.
+
+    Callers are queued fairly: they get their turn in the order they called acquire. A caller at the front of the queue
+    that has to wait for tokens makes the callers behind it wait too, so small Prompts can't starve big ones.
+
+    All methods have to be used on the event loop of the AI_Interface.
+    """
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        # Created on first use, so it belongs to the event loop it is used on
+        self._queue: Optional[asyncio.Lock] = None
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Waits for its turn and for room for 1 request and the tokens, then takes them. Returns the amount of seconds waited.
+        """
+        start = time.monotonic()
+        if self._queue is None:
+            self._queue = asyncio.Lock()
+        # asyncio.Lock wakes up waiters in the order they started waiting
+        async with self._queue:
+            while True:
+                wait = max(self._time_until_available(tokens), 0)
+                if wait == 0:
+                    break
+                logger.debug(f"Rate limit reached, waiting {wait:.2f} seconds")
+                await asyncio.sleep(wait)
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+        return time.monotonic() - start
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Corrects the token bucket once the actual amount of tokens used is known
+        """
+        if self.tokens is not None:
+            self.tokens.take(actual_tokens - estimated_tokens)
+
+    def _time_until_available(self, tokens: int) -> float:
+        waits = [0]
+        if self.requests is not None:
+            waits.append(self.requests.time_until_available(1))
+        if self.tokens is not None:
+            waits.append(self.tokens.time_until_available(tokens))
+        return max(waits)
+
+    def __repr__(self) -> str:
+        return f"RateLimiter(requests_per_minute={self.requests_per_minute}, tokens_per_minute={self.tokens_per_minute})"
+
+
+def estimate_tokens(prompt) -> int:
+    """
+    Estimates the amount of tokens a Prompt will use before it is sent
+
+    This is the max_tokens of the Prompt, as the response can use up to that many tokens, plus the size of the messages.
+    The size is counted by the TokenCounter when the Prompt is created and kept in the config kwargs as prompt_tokens.
+    Prompts without it are estimated at roughly 4 characters per token.
+    """
+    max_tokens = (prompt.parameters or {}).get("max_tokens") or 0
+    prompt_tokens = prompt.config.kwargs.get("prompt_tokens")
+    if prompt_tokens is not None:
+        return max_tokens + prompt_tokens
+    characters = len(prompt.message.system or "") + len(prompt.message.user or "")
+    for entry in prompt.message.history or []:
+        characters += sum(len(message or "") for message in entry.values())
+    return max_tokens + characters // 4 + 1
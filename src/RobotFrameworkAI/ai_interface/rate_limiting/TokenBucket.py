@@ -0,0 +1,38 @@
+import time
+
+
+class TokenBucket:
+    """
+    A token bucket that refills at a constant rate per minute
+
+    The bucket holds at most per_minute tokens and starts full, so a full minute of budget can be used at once.
+    Taking tokens is allowed to make the bucket go negative. This is used when the actual amount of tokens used
+    turns out to be higher than estimated, later requests then have to wait until the debt is refilled.
+    """
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_available(self, amount: float) -> float:
+        """
+        Returns the amount of seconds until amount tokens are available
+
+        A request for more tokens than the bucket can hold only waits until the bucket is full.
+        """
+        self.refill()
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        """
+        Takes amount tokens from the bucket, a negative amount gives tokens back
+        """
+        self.refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
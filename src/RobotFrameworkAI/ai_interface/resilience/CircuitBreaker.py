@@ -0,0 +1,80 @@
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a model that keeps failing for a cool-down period
+
+    The circuit breaker has 3 states:
+    - closed: Calls go through. After failure_threshold failures in a row, the circuit opens.
+    - open: Calls fail immediately with a CircuitOpenError, without calling the model. After cooldown seconds, the circuit is half open.
+    - half_open: A single trial call goes through, other calls still fail immediately. When the trial call succeeds the circuit
+        closes again, when it fails the circuit opens for another cool-down period.
+
+    Only failures that say something about the health of the model, like timeouts and server errors, should be recorded as failures.
+    A failure_threshold of 0 disables the circuit breaker.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 30) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self._trial_running = False
+
+    def before_call(self) -> None:
+        """
+        Raises a CircuitOpenError if the call is not allowed to go through
+        """
+        if self.state == self.OPEN:
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuit breaker of `{self.name}` is open after {self.failures} failures in a row, retry in {remaining:.1f} seconds", remaining)
+            self.state = self.HALF_OPEN
+            logger.info(f"Circuit breaker of `{self.name}` is half open, letting a trial call through")
+        if self.state == self.HALF_OPEN:
+            if self._trial_running:
+                raise CircuitOpenError(f"Circuit breaker of `{self.name}` is half open and waiting for its trial call", self.cooldown)
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit breaker of `{self.name}` is closed again")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.failure_threshold and (self.state == self.HALF_OPEN or self.failures >= self.failure_threshold):
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit breaker of `{self.name}` opened for {self.cooldown} seconds after {self.failures} failures in a row")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """
+        Lets another trial call through when the trial call was cancelled before it finished
+        """
+        self._trial_running = False
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(name={self.name}, state={self.state}, failures={self.failures})"
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when a call is not made because the circuit breaker is open."""
+
+    def __init__(self, error_message, retry_after):
+        super().__init__(error_message)
+        self.retry_after = retry_after
@@ -0,0 +1,31 @@
+import random
+from typing import Optional
+
+
+class RetryPolicy:
+    """
+    Determines how often and after how long a failed call to an AI model is retried
+
+    The delay before retry n (starting at 0) grows exponentially: base_delay * 2^n, capped at max_delay.
+    With jitter, the actual delay is a random value between 0 and that delay. This spreads out the retries of
+    calls that failed at the same time, so they don't hit the AI model at the same time again.
+
+    When the AI model says how long to wait, e.g. with a Retry-After header, that is used instead, also capped at max_delay.
+    """
+    def __init__(self, max_retries: int = 2, base_delay: float = 1, max_delay: float = 30, jitter: bool = True) -> None:
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def get_delay(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the amount of seconds to wait before the retry
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0), self.max_delay)
+        delay = min(self.base_delay * 2 ** retry, self.max_delay)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy(max_retries={self.max_retries}, base_delay={self.base_delay}, max_delay={self.max_delay}, jitter={self.jitter})"
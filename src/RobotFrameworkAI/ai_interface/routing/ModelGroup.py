@@ -0,0 +1,79 @@
+import itertools
+import logging
+from typing import Optional
+
+from RobotFrameworkAI.ai_interface.routing.ProviderHealth import ProviderHealth
+
+
+logger = logging.getLogger(__name__)
+
+
+class GroupMember:
+    """
+    An AI model and one of its models in a model group, with its health
+
+    A model of None means the default model of the AI tool the Prompt is for.
+    """
+    def __init__(self, ai_model: str, model: Optional[str], health: ProviderHealth) -> None:
+        self.ai_model = ai_model
+        self.model = model
+        self.health = health
+
+    @property
+    def name(self) -> str:
+        return self.ai_model if self.model is None else f"{self.ai_model}:{self.model}"
+
+    def __repr__(self) -> str:
+        return f"GroupMember({self.name})"
+
+
+class ModelGroup:
+    """
+    A logical model that Prompts can be sent to, backed by models of one or more AI models
+
+    The members are tried one by one until one of them responds. The policy decides the order:
+    - latency: The member with the lowest recent median latency first. Members without recent requests go first, so every
+        member gets measured now and then.
+    - priority: The members in the order they were given, e.g. a cheap model with an expensive one as fallback.
+    - round_robin: Each Prompt starts at the next member, spreading the Prompts over all members.
+    With every policy, degraded members, those with a high recent error rate, are only tried after all others.
+    """
+    POLICIES = ("latency", "priority", "round_robin")
+
+    def __init__(self, name: str, members: list, policy: str = "latency") -> None:
+        self.name = name
+        self.members = members
+        self.policy = policy
+        self._next = itertools.count()
+        self.requests = 0
+        # The amount of Prompts that were answered by another member than the first one tried
+        self.failovers = 0
+
+    def get_candidates(self) -> list:
+        """
+        Returns the members in the order they should be tried for the next Prompt
+        """
+        members = list(self.members)
+        if self.policy == "latency":
+            # Sorting is stable, members with the same latency keep their order
+            members.sort(key=lambda member: member.health.get_latency() or 0)
+        elif self.policy == "round_robin":
+            start = next(self._next) % len(members)
+            members = members[start:] + members[:start]
+        healthy = [member for member in members if not member.health.is_degraded()]
+        degraded = [member for member in members if member.health.is_degraded()]
+        if degraded:
+            logger.debug(f"Model group `{self.name}` tries degraded members last: {degraded}")
+        return healthy + degraded
+
+    def get_statistics(self) -> dict:
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "requests": self.requests,
+            "failovers": self.failovers,
+            "members": [member.health.get_statistics() for member in self.members]
+        }
+
+    def __repr__(self) -> str:
+        return f"ModelGroup(name={self.name}, policy={self.policy}, members={self.members})"
@@ -0,0 +1,71 @@
+from collections import deque
+import math
+import time
+from typing import Optional
+
+
+class ProviderHealth:
+    """
+    The recent latency and error rate of a member of a model group, an AI model and one of its models
+
+    The outcome of each request is kept in a sliding window of the last window requests. Outcomes older than max_age seconds
+    are left out as well, so a member that was degraded gets tried again after a while instead of being avoided forever.
+
+    A member is degraded when at least min_samples recent requests are known and more than max_error_rate of them failed.
+    """
+    def __init__(self, name: str, window: int = 50, max_age: float = 60, min_samples: int = 3, max_error_rate: float = .5) -> None:
+        self.name = name
+        self.max_age = max_age
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        # (time, latency, error) of each request, latency is None for failed requests
+        self.outcomes = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency: Optional[float], error: bool = False) -> None:
+        self.outcomes.append((time.monotonic(), latency, error))
+        self.requests += 1
+        self.errors += error
+
+    def get_recent(self) -> list:
+        cutoff = time.monotonic() - self.max_age
+        while self.outcomes and self.outcomes[0][0] < cutoff:
+            self.outcomes.popleft()
+        return list(self.outcomes)
+
+    def get_error_rate(self) -> float:
+        recent = self.get_recent()
+        return sum(error for _, _, error in recent) / len(recent) if recent else 0
+
+    def get_latency(self, percentile: float = 50) -> Optional[float]:
+        """
+        Returns the percentile of the latencies of the recent requests that succeeded, None when there are none
+        """
+        latencies = sorted(latency for _, latency, error in self.get_recent() if not error)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, math.ceil(len(latencies) * percentile / 100) - 1)
+        return latencies[max(index, 0)]
+
+    def is_degraded(self) -> bool:
+        recent = self.get_recent()
+        return len(recent) >= self.min_samples and self.get_error_rate() > self.max_error_rate
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the amount of requests and errors, and the error rate, latencies and state of the recent requests
+        """
+        return {
+            "member": self.name,
+            "requests": self.requests,
+            "errors": self.errors,
+            "recent_requests": len(self.get_recent()),
+            "error_rate": self.get_error_rate(),
+            "latency_p50": self.get_latency(50),
+            "latency_p95": self.get_latency(95),
+            "degraded": self.is_degraded()
+        }
+
+    def __repr__(self) -> str:
+        return f"ProviderHealth(name={self.name}, error_rate={self.get_error_rate():.2f}, latency_p50={self.get_latency()})"
@@ -0,0 +1,97 @@
+import dataclasses
+import logging
+import time
+
+from RobotFrameworkAI.ai_interface.budget.Budget import BudgetExceededError
+from RobotFrameworkAI.ai_interface.resilience.CircuitBreaker import CircuitOpenError
+from RobotFrameworkAI.ai_interface.routing.ModelGroup import GroupMember, ModelGroup
+from RobotFrameworkAI.ai_interface.routing.ProviderHealth import ProviderHealth
+
+
+logger = logging.getLogger(__name__)
+
+
+class Router:
+    """
+    Sends Prompts for a model group to one of its members, failing over to the next member when one fails
+
+    The ai_model of a Prompt can be the name of a model group instead of an AI model. The Router then tries the members of
+    the group in the order of its policy, see the ModelGroup. The latency and the errors of each attempt are recorded in the
+    health of the member, which the next Prompts are routed by.
+
+    Errors that would happen with every member, like invalid arguments or an exceeded budget, are raised right away.
+    Other errors, like timeouts, server errors and open circuit breakers, make the Router try the next member. When all members
+    failed, a ModelGroupError is raised. Only text generation can be routed, as assistants and batches live at a single AI model.
+    """
+    ROUTABLE_TOOLS = ("text_generator",)
+
+    def __init__(self) -> None:
+        self.groups: dict = {}
+
+    def create_group(self, name: str, members: list, policy: str = "latency", window: int = 50, max_age: float = 60,
+                     min_samples: int = 3, max_error_rate: float = .5) -> ModelGroup:
+        """
+        Creates a model group, members is a list of (ai_model, model) tuples. An existing group with the same name is replaced.
+        """
+        group_members = [
+            GroupMember(ai_model, model, ProviderHealth(f"{ai_model}:{model}" if model else ai_model, window, max_age, min_samples, max_error_rate))
+            for ai_model, model in members
+        ]
+        group = ModelGroup(name, group_members, policy)
+        self.groups[name] = group
+        logger.debug(f"Created {group}")
+        return group
+
+    def remove_group(self, name: str) -> None:
+        self.groups.pop(name, None)
+
+    async def route(self, prompt, send):
+        """
+        Sends the Prompt to the members of its model group with send, a coroutine function, until one of them responds
+        """
+        group: ModelGroup = self.groups[prompt.config.ai_model]
+        if prompt.config.ai_tool not in self.ROUTABLE_TOOLS:
+            error_message = f"Model group `{group.name}` can't be used for the `{prompt.config.ai_tool}` AI tool. Model groups can only be used for: `{'`, `'.join(self.ROUTABLE_TOOLS)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+        group.requests += 1
+        errors = []
+        for member in group.get_candidates():
+            member_prompt = dataclasses.replace(prompt, config=dataclasses.replace(prompt.config, ai_model=member.ai_model, model=member.model))
+            start = time.perf_counter()
+            try:
+                response = await send(member_prompt)
+            except CircuitOpenError as e:
+                # The member wasn't called, so this says nothing new about its health
+                errors.append((member, e))
+                continue
+            except (ValueError, BudgetExceededError):
+                raise
+            except Exception as e:
+                member.health.record(None, error=True)
+                errors.append((member, e))
+                logger.warning(f"Model group `{group.name}`: {member.name} failed with `{e}`, failing over to the next member")
+                continue
+            # Cached responses say nothing about the latency of the member
+            if response.metadata.cache_status != "hit":
+                member.health.record(time.perf_counter() - start)
+            if errors:
+                group.failovers += 1
+                logger.info(f"Model group `{group.name}`: {member.name} responded after {len(errors)} members failed")
+            return response
+
+        error_message = f"All members of model group `{group.name}` failed: " + "; ".join(f"{member.name}: {error}" for member, error in errors)
+        logger.error(error_message)
+        raise ModelGroupError(error_message, errors) from errors[-1][1]
+
+    def get_statistics(self, name: str) -> dict:
+        return self.groups[name].get_statistics()
+
+
+class ModelGroupError(Exception):
+    """Exception raised when every member of a model group failed. Contains the member and error of each attempt."""
+
+    def __init__(self, error_message, errors):
+        super().__init__(error_message)
+        self.errors = errors
@@ -0,0 +1,208 @@
+import asyncio
+from collections import defaultdict, deque
+import contextlib
+import heapq
+import itertools
+import logging
+import math
+import time
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class PriorityStatistics:
+    """
+    The amount of requests of a priority class and how long they waited for a slot
+    """
+    def __init__(self, window: int = 1000) -> None:
+        self.requests = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits = deque(maxlen=window)
+
+    def record_wait(self, wait: float) -> None:
+        self.waits.append(wait)
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self) -> dict:
+        waits = sorted(self.waits)
+        p95 = waits[max(0, math.ceil(len(waits) * .95) - 1)] if waits else 0
+        return {
+            "requests": self.requests,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "waited": self.waited,
+            "mean_wait": self.total_wait / self.requests if self.requests else 0,
+            "p95_wait": p95,
+            "max_wait": self.max_wait
+        }
+
+
+class Scheduler:
+    """
+    Decides which request is sent next when more requests want to be sent than there are slots
+
+    Every request sent to an AI model takes a slot for as long as it runs. There are max_concurrency slots, shared by all modules,
+    and each module can have a quota of slots on top of that. A request that can't get a slot waits in a queue.
+    When a slot frees up, the waiting request with the highest priority class goes first:
+    - critical: Requests whose result a test is waiting for right now, e.g. an assertion on the critical path.
+    - normal: The default for keywords that wait for their result.
+    - bulk: Many requests whose results aren't needed right away, like batch keywords and file uploads.
+    Within a priority class requests go first come, first served. A request of a module that is at its quota doesn't hold
+    up requests of other modules. A waiting request with a key can be moved up to a higher priority class with promote,
+    e.g. when a critical caller waits for the same Response as a bulk request.
+
+    A max_concurrency of None means there is no limit, requests then only wait for the quota of their module.
+    The scheduler is used on the event loop of the AI_Interface only, it is configured from other threads through that loop.
+    """
+    PRIORITIES = ("critical", "normal", "bulk")
+
+    def __init__(self, max_concurrency: Optional[int] = None) -> None:
+        self.max_concurrency = max_concurrency
+        self.module_quotas: dict = {}
+        self.running = 0
+        self.running_per_module = defaultdict(int)
+        # (priority class, sequence, module, future) of each waiting request
+        self.queue: list = []
+        # The (priority class, module, future) of each waiting request with a key, so it can be promoted
+        self.waiting: dict = {}
+        self.statistics = {priority: PriorityStatistics() for priority in self.PRIORITIES}
+        self._sequence = itertools.count()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def configure(self, max_concurrency: Optional[int] = None) -> None:
+        self.max_concurrency = max_concurrency
+        self._dispatch_soon()
+
+    def set_module_quota(self, module: str, max_concurrency: Optional[int] = None) -> None:
+        if max_concurrency is None:
+            self.module_quotas.pop(module, None)
+        else:
+            self.module_quotas[module] = max_concurrency
+        self._dispatch_soon()
+
+    def can_start(self, module: str) -> bool:
+        if self.max_concurrency is not None and self.running >= self.max_concurrency:
+            return False
+        quota = self.module_quotas.get(module)
+        return quota is None or self.running_per_module[module] < quota
+
+    async def acquire(self, priority: str, module: str, key=None) -> float:
+        """
+        Waits for a slot for a request of the module and returns the amount of seconds waited
+
+        The key identifies the request while it waits, see promote.
+        """
+        self.loop = asyncio.get_running_loop()
+        statistics = self.statistics[priority]
+        statistics.requests += 1
+        # Requests that are waiting can't start either, otherwise they would have been started when the last slot freed up
+        if self.can_start(module):
+            self._start(module)
+            statistics.record_wait(0)
+            return 0
+
+        future = self.loop.create_future()
+        heapq.heappush(self.queue, (self.PRIORITIES.index(priority), next(self._sequence), module, future))
+        if key is not None:
+            self.waiting[key] = (self.PRIORITIES.index(priority), module, future)
+        statistics.queued += 1
+        statistics.max_queued = max(statistics.max_queued, statistics.queued)
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was given to the request right before it was cancelled
+                self.release(module)
+            raise
+        finally:
+            statistics.queued -= 1
+            if key is not None and self.waiting.get(key, (None, None, None))[2] is future:
+                del self.waiting[key]
+        wait = time.monotonic() - start
+        statistics.waited += 1
+        statistics.record_wait(wait)
+        logger.debug(f"A {priority} request of `{module}` waited {wait:.3f} seconds for a slot")
+        return wait
+
+    def promote(self, key, priority: str) -> bool:
+        """
+        Moves the waiting request with the key up to the priority class, when that is higher than its own
+
+        The request is queued again at the end of its new priority class, its old place in the queue is skipped.
+        Returns whether the request was moved up.
+        """
+        waiting = self.waiting.get(key)
+        priority_class = self.PRIORITIES.index(priority)
+        if waiting is None or waiting[0] <= priority_class or waiting[2].done():
+            return False
+        _, module, future = waiting
+        heapq.heappush(self.queue, (priority_class, next(self._sequence), module, future))
+        self.waiting[key] = (priority_class, module, future)
+        logger.debug(f"Moved a waiting request of `{module}` up to {priority}")
+        return True
+
+    def release(self, module: str) -> None:
+        self.running -= 1
+        self.running_per_module[module] -= 1
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: str, module: str, key=None):
+        """
+        Holds a slot for a request while in the context, yields the amount of seconds waited for it
+        """
+        wait = await self.acquire(priority, module, key)
+        try:
+            yield wait
+        finally:
+            self.release(module)
+
+    def _start(self, module: str) -> None:
+        self.running += 1
+        self.running_per_module[module] += 1
+
+    def _dispatch(self) -> None:
+        """
+        Gives free slots to the waiting requests, in order of priority class and arrival
+        """
+        waiting = []
+        while self.queue and (self.max_concurrency is None or self.running < self.max_concurrency):
+            entry = heapq.heappop(self.queue)
+            _, _, module, future = entry
+            if future.done():
+                continue
+            if self.can_start(module):
+                self._start(module)
+                future.set_result(None)
+            else:
+                waiting.append(entry)
+        for entry in waiting:
+            heapq.heappush(self.queue, entry)
+
+    def _dispatch_soon(self) -> None:
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._dispatch)
+
+    def get_statistics(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "queued": sum(statistics.queued for statistics in self.statistics.values()),
+            "module_quotas": dict(self.module_quotas),
+            "running_per_module": {module: running for module, running in self.running_per_module.items() if running},
+            "priorities": {priority: statistics.to_dict() for priority, statistics in self.statistics.items()}
+        }
+
+    def reset_statistics(self) -> None:
+        self.statistics = {priority: PriorityStatistics() for priority in self.PRIORITIES}
+
+    def __repr__(self) -> str:
+        return f"Scheduler(max_concurrency={self.max_concurrency}, module_quotas={self.module_quotas}, running={self.running})"
@@ -0,0 +1,161 @@
+import logging
+import threading
+from typing import Optional
+
+from RobotFrameworkAI.ai_interface.tokens.TokenEstimator import HeuristicTokenEstimator, TiktokenEstimator, TokenEstimator
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCounter:
+    """
+    Counts the tokens of Prompts before they are sent and fits them in the context window of their model
+
+    Each model has a context window, the max amount of tokens of the prompt and the completion together, a max amount of
+    completion tokens and optionally the name of its tiktoken encoding. Models are matched on the longest known name they
+    start with, so gpt-4o-2024-08-06 gets the limits of gpt-4o. Models without limits are counted, but not fitted.
+
+    With the tokenizer "auto", models with an encoding are counted exactly with tiktoken when it's installed and all other
+    models with the HeuristicTokenEstimator. With "heuristic" the HeuristicTokenEstimator is always used.
+    An estimator for a specific model can be set with set_estimator.
+
+    Prompts are counted like the chat completions API counts them: the messages plus a few tokens per message and for the reply.
+    When a Prompt and its max_tokens don't fit in the context window, the overflow policy determines what happens:
+    - trim: The oldest messages of the history are left out until it fits.
+    - fail: A ContextWindowExceededError is raised.
+    The max_tokens is always lowered to what is left of the context window and the max completion tokens of the model.
+    """
+    # The context window, the max completion tokens and the tiktoken encoding of each model
+    MODELS = {
+        "gpt-3.5-turbo": (16385, 4096, "cl100k_base"),
+        "gpt-4o": (128000, 16384, "o200k_base"),
+        "gpt-4o-mini": (128000, 16384, "o200k_base"),
+        "mock-small": (8192, 4096, None),
+        "mock-large": (32768, 8192, None),
+    }
+    TOKENIZERS = ("auto", "heuristic")
+    OVERFLOW_POLICIES = ("trim", "fail")
+    # The tokens every message takes on top of its content and the tokens that start the reply
+    MESSAGE_OVERHEAD = 4
+    REPLY_OVERHEAD = 3
+
+    def __init__(self, tokenizer: str = "auto", overflow: str = "trim") -> None:
+        self.models = dict(self.MODELS)
+        self.tokenizer = tokenizer
+        self.overflow = overflow
+        self.heuristic = HeuristicTokenEstimator()
+        # Estimators by model, set by hand or created on first use
+        self.estimators: dict = {}
+        self._custom_estimators: dict = {}
+        self._lock = threading.Lock()
+
+    def configure(self, tokenizer: str = "auto", overflow: str = "trim"):
+        with self._lock:
+            self.tokenizer = tokenizer
+            self.overflow = overflow
+            self.estimators = dict(self._custom_estimators)
+
+    def set_model(self, model: str, context_window: int, max_completion_tokens: Optional[int] = None, encoding: Optional[str] = None):
+        with self._lock:
+            self.models[model] = (context_window, max_completion_tokens, encoding)
+            self.estimators = dict(self._custom_estimators)
+
+    def set_estimator(self, model: str, estimator: TokenEstimator):
+        with self._lock:
+            self._custom_estimators[model] = estimator
+            self.estimators[model] = estimator
+
+    def get_model(self, model: Optional[str]) -> Optional[tuple]:
+        """
+        Returns the context window, max completion tokens and encoding of the model, or None when they're not known
+        """
+        if model is None:
+            return None
+        if model in self.models:
+            return self.models[model]
+        known_models = [known_model for known_model in self.models if model.startswith(known_model)]
+        return self.models[max(known_models, key=len)] if known_models else None
+
+    def get_estimator(self, model: Optional[str]) -> TokenEstimator:
+        estimator = self.estimators.get(model)
+        if estimator is not None:
+            return estimator
+        estimator = self.heuristic
+        limits = self.get_model(model)
+        if self.tokenizer == "auto" and limits is not None and limits[2] is not None:
+            try:
+                estimator = TiktokenEstimator(limits[2])
+            except ImportError:
+                pass
+            except Exception as e:
+                # tiktoken downloads an encoding the first time it's used, which fails when offline
+                logger.warning(f"Could not load the tiktoken encoding `{limits[2]}` of `{model}`, its tokens are estimated instead: {e}")
+        with self._lock:
+            self.estimators.setdefault(model, estimator)
+        return estimator
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        return self.get_estimator(model).count(text)
+
+    def count_entry(self, entry: dict, model: Optional[str] = None) -> int:
+        """
+        Returns the tokens of an entry of the history, a dictionary of the role and the message
+        """
+        estimator = self.get_estimator(model)
+        return self.MESSAGE_OVERHEAD + sum(estimator.count(message or "") for message in entry.values())
+
+    def count_messages(self, system: Optional[str], user: Optional[str], history: Optional[list], model: Optional[str] = None) -> int:
+        """
+        Returns the tokens of the messages of a Prompt
+        """
+        estimator = self.get_estimator(model)
+        tokens = self.REPLY_OVERHEAD + sum(self.MESSAGE_OVERHEAD + estimator.count(message) for message in (system, user) if message)
+        return tokens + sum(self.count_entry(entry, model) for entry in history or [])
+
+    def fit(self, model: Optional[str], system: Optional[str], user: Optional[str], history: Optional[list], max_tokens: Optional[int]) -> tuple:
+        """
+        Fits the messages and the max_tokens of a Prompt in the context window of the model
+
+        Returns the history, which is a new list when it was trimmed, the max_tokens and the amount of prompt tokens.
+        """
+        tokens = self.count_messages(system, user, None, model)
+        history_tokens = [self.count_entry(entry, model) for entry in history or []]
+        prompt_tokens = tokens + sum(history_tokens)
+        limits = self.get_model(model)
+        if limits is None:
+            return history, max_tokens, prompt_tokens
+        context_window, max_completion_tokens, _ = limits
+        if max_tokens is not None and max_completion_tokens is not None and max_tokens > max_completion_tokens:
+            logger.info(f"Lowered max_tokens from {max_tokens} to {max_completion_tokens}, the max completion tokens of `{model}`")
+            max_tokens = max_completion_tokens
+        if tokens >= context_window:
+            error_message = f"The message of about {tokens} tokens doesn't fit in the context window of {context_window} tokens of `{model}`."
+            logger.error(error_message)
+            raise ContextWindowExceededError(error_message)
+
+        completion_tokens = max_tokens or 0
+        if history and prompt_tokens + completion_tokens > context_window:
+            if self.overflow == "fail":
+                error_message = (f"The prompt of about {prompt_tokens} tokens and max_tokens {completion_tokens} don't fit in the context window "
+                                 f"of {context_window} tokens of `{model}`. Trim the history or set the overflow to trim.")
+                logger.error(error_message)
+                raise ContextWindowExceededError(error_message)
+            start = 0
+            while start < len(history) and prompt_tokens + completion_tokens > context_window:
+                prompt_tokens -= history_tokens[start]
+                start += 1
+            # The history starts with a message of the user, so an answer is never left without its question
+            while start < len(history) and "user" not in history[start]:
+                prompt_tokens -= history_tokens[start]
+                start += 1
+            logger.info(f"Left out the oldest {start} of {len(history)} messages of the history to fit in the context window of `{model}`")
+            history = history[start:]
+        if max_tokens is not None and prompt_tokens + max_tokens > context_window:
+            logger.info(f"Lowered max_tokens from {max_tokens} to {context_window - prompt_tokens} to fit in the context window of `{model}`")
+            max_tokens = context_window - prompt_tokens
+        return history, max_tokens, prompt_tokens
+
+
+class ContextWindowExceededError(ValueError):
+    """Exception raised when a Prompt doesn't fit in the context window of its model."""
@@ -0,0 +1,59 @@
+import functools
+import logging
+import re
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenEstimator:
+    """
+    The interface for counting the tokens of a text offline, before it is sent to an AI model
+
+    Implementations only have to implement count. Set an estimator for a model with TokenCounter.set_estimator.
+    """
+    name = None
+
+    def count(self, text: str) -> int:
+        raise NotImplementedError
+
+
+class HeuristicTokenEstimator(TokenEstimator):
+    """
+    Estimates the tokens of a text from its words, without a tokenizer
+
+    BPE tokenizers mostly turn a common word, with the space in front of it, into a single token and split long words
+    into pieces of several characters. Numbers are split into groups of up to 3 digits and punctuation and other
+    symbols are mostly a token each. This is counted with a single regular expression, so it's fast enough for every call.
+    The estimate is a bit on the high side for English, which is the safe side for sizing prompts.
+    """
+    name = "heuristic"
+    PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+    # The average amount of characters of a token within a long word
+    CHARACTERS_PER_TOKEN = 6
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return sum(1 + (len(match) - 1) // self.CHARACTERS_PER_TOKEN for match in self.PATTERN.findall(text))
+
+
+class TiktokenEstimator(TokenEstimator):
+    """
+    Counts the exact tokens of a text with the BPE tokenizer of OpenAI models, using tiktoken
+
+    The counts of recent texts are cached, so the history of a chat that is sent again and again is only tokenized once.
+    Raises an ImportError when tiktoken is not installed.
+    """
+    name = "tiktoken"
+
+    def __init__(self, encoding_name: str) -> None:
+        import tiktoken
+
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.count = functools.lru_cache(maxsize=4096)(self._count)
+
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self.encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+import importlib.util
+import logging
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransportConfig:
+    """
+    The settings of the HTTP connections to the API of an AI model
+
+    Each AI model has 1 HTTP client shared by all modules and AI tools. Its connections are kept alive and reused,
+    so only the first request to the API pays for setting up the connection (DNS, TCP and TLS).
+
+    - max_connections: The max amount of connections open at the same time.
+    - max_keepalive_connections: The max amount of idle connections kept open for reuse.
+    - keepalive_expiry: The amount of seconds an idle connection is kept open.
+    - connect_timeout: The amount of seconds to wait for a connection to be set up.
+    - read_timeout: The amount of seconds to wait for a response. Completions can take long, so this is high by default.
+    - write_timeout: The amount of seconds to wait for the request to be sent.
+    - pool_timeout: The amount of seconds to wait for a free connection when max_connections are in use.
+    - http2: Whether to use HTTP/2, which sends all requests over a single connection. Requires the h2 package.
+    - base_url: The URL of the API, e.g. of a stub server or a proxy. None means the default URL of the AI model.
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30
+    connect_timeout: float = 5
+    read_timeout: float = 600
+    write_timeout: float = 600
+    pool_timeout: float = 600
+    http2: bool = False
+    base_url: Optional[str] = None
+
+    def validate(self) -> None:
+        """
+        Raises an error when the settings can't be used
+        """
+        for name in ("max_connections", "max_keepalive_connections"):
+            if getattr(self, name) < 1:
+                error_message = f"Invalid value `{getattr(self, name)}` for `{name}`. Value must be greater than 0."
+                logger.error(error_message)
+                raise ValueError(error_message)
+        for name in ("keepalive_expiry", "connect_timeout", "read_timeout", "write_timeout", "pool_timeout"):
+            if getattr(self, name) < 0:
+                error_message = f"Invalid value `{getattr(self, name)}` for `{name}`. Value can't be negative."
+                logger.error(error_message)
+                raise ValueError(error_message)
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            error_message = "HTTP/2 requires the h2 package, install it with: pip install httpx[http2]"
+            logger.error(error_message)
+            raise ImportError(error_message)
@@ -0,0 +1,161 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+from typing import Optional
+
+from RobotFrameworkAI.gateway import GatewayProtocol
+from RobotFrameworkAI.gateway.GatewayProtocol import GatewayUnavailableError
+from RobotFrameworkAI.objects.response.Response import Response
+
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayClient:
+    """
+    Sends Prompts to the AI gateway, a process that handles the Prompts of every Robot Framework process on the machine
+
+    The gateway is used when its socket exists and is owned by the current user. When it can't be reached, the Prompt is handled in the process itself and
+    the gateway is only tried again after retry_interval seconds, so a gateway that is down costs a single failed connect.
+    Only Prompts for the text generator whose config kwargs can be turned into JSON are sent to the gateway. Assistants keep
+    state in the process that created them, and callables like a stop_predicate can't be sent to another process.
+
+    All Prompts share a single connection, which is opened on first use on the event loop of the AI_Interface.
+    """
+    SUPPORTED_TOOLS = ("text_generator",)
+
+    def __init__(self, socket_path: Optional[str] = None, enabled: bool = True, retry_interval: float = 5) -> None:
+        self.socket_path = socket_path or GatewayProtocol.get_default_socket_path()
+        self.enabled = enabled
+        self.retry_interval = retry_interval
+        self.retry_at = 0
+        self.requests = 0
+        self.fallbacks = 0
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.pending: dict = {}
+        self._ids = itertools.count(1)
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    def configure(self, socket_path: Optional[str] = None, enabled: bool = True) -> None:
+        """
+        Changes the socket of the gateway, the current connection is closed when the AI_Interface next uses the gateway
+        """
+        self.socket_path = socket_path or GatewayProtocol.get_default_socket_path()
+        self.enabled = enabled
+        self.retry_at = 0
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    def accepts(self, prompt) -> bool:
+        """
+        Returns whether the Prompt should be sent to the gateway
+        """
+        if not self.enabled or prompt.config.ai_tool not in self.SUPPORTED_TOOLS or prompt.ai_tool_data is not None:
+            return False
+        if self.writer is None and (time.monotonic() < self.retry_at or not hasattr(asyncio, "open_unix_connection") or not GatewayProtocol.is_trusted_socket(self.socket_path)):
+            return False
+        try:
+            json.dumps(prompt.config.kwargs)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    async def send(self, prompt) -> Response:
+        """
+        Sends the Prompt to the gateway and returns its Response
+
+        Raises a GatewayUnavailableError when the gateway can't be reached or goes away before it answered.
+        """
+        try:
+            await self.connect()
+            message = await self.request({"type": "prompt", "prompt": prompt.to_dict()})
+        except OSError as e:
+            self.retry_at = time.monotonic() + self.retry_interval
+            self.fallbacks += 1
+            logger.info(f"The AI gateway at `{self.socket_path}` can't be reached, handling Prompts in this process for {self.retry_interval} seconds: {e}")
+            raise GatewayUnavailableError(str(e)) from e
+        except GatewayUnavailableError:
+            self.fallbacks += 1
+            raise
+        self.requests += 1
+        return Response.from_dict(message["response"])
+
+    async def get_statistics(self) -> Optional[dict]:
+        """
+        Returns the statistics of the gateway, or None when it can't be reached
+        """
+        try:
+            await self.connect()
+            return (await self.request({"type": "statistics"}))["statistics"]
+        except (OSError, GatewayUnavailableError):
+            return None
+
+    async def connect(self) -> None:
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.writer is not None:
+                return
+            if not GatewayProtocol.is_trusted_socket(self.socket_path):
+                error_message = f"`{self.socket_path}` is not a socket of the current user, refusing to send Prompts to it"
+                logger.warning(error_message)
+                raise PermissionError(error_message)
+            self.reader, self.writer = await asyncio.open_unix_connection(self.socket_path, limit=GatewayProtocol.LINE_LIMIT)
+            asyncio.ensure_future(self.read_messages(self.reader, self.writer))
+            logger.info(f"Connected to the AI gateway at `{self.socket_path}`")
+
+    async def request(self, message: dict) -> dict:
+        id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[id] = future
+        try:
+            self.writer.write(GatewayProtocol.encode({"id": id, **message}))
+            await self.writer.drain()
+            message = await future
+        except (OSError, AttributeError) as e:
+            # The connection broke, or was closed by another request, while sending
+            raise GatewayUnavailableError(str(e)) from e
+        finally:
+            self.pending.pop(id, None)
+        if "error" in message:
+            raise GatewayProtocol.decode_error(message["error"])
+        return message
+
+    async def read_messages(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Hands each message of the gateway to the request it belongs to, until the connection closes
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = GatewayProtocol.decode(line)
+                future = self.pending.get(message["id"])
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Lost the connection to the AI gateway at `{self.socket_path}`: {e}")
+        finally:
+            writer.close()
+            if self.writer is writer:
+                # The gateway went away, rather than the connection being closed by configure
+                self.reader = self.writer = None
+                self.retry_at = time.monotonic() + self.retry_interval
+                self.fallbacks += 1
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(GatewayUnavailableError(f"The AI gateway at `{self.socket_path}` closed the connection"))
+
+    def get_status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "socket_path": self.socket_path,
+            "connected": self.writer is not None,
+            "requests": self.requests,
+            "fallbacks": self.fallbacks
+        }
@@ -0,0 +1,90 @@
+"""
+The messages sent between the AI gateway and its clients over the Unix socket
+
+Every message is a single line of JSON. A client sends requests with an id, the gateway answers each request with a
+message with the same id. Requests are answered as soon as they are done, not in the order they were sent, so a single
+connection carries many requests at the same time.
+
+    {"id": 1, "type": "prompt", "prompt": {...}}     ->  {"id": 1, "response": {...}}
+    {"id": 2, "type": "statistics"}                  ->  {"id": 2, "statistics": {...}}
+    any request that failed                          ->  {"id": 3, "error": {"type": "ValueError", "message": "...", "retry_after": null}}
+"""
+import json
+import os
+import stat
+import tempfile
+
+from RobotFrameworkAI.ai_interface.resilience.CircuitBreaker import CircuitOpenError
+
+
+# Prompts with a long history make long lines, the default limit of asyncio streams is 64 KiB
+LINE_LIMIT = 16 * 1024 * 1024
+# The environment variable with the path of the socket, shared by the gateway and its clients
+SOCKET_VARIABLE = "ROBOTFRAMEWORKAI_GATEWAY"
+
+
+def get_default_socket_path() -> str:
+    """
+    Returns the path of the socket from the environment variable, or a path of the current user
+
+    The runtime directory of the user is only accessible by the user. Without it the socket is in the temp folder, with
+    the id of the user in its name, so users of the same machine never share a gateway.
+    """
+    path = os.environ.get(SOCKET_VARIABLE)
+    if path:
+        return path
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_directory and os.path.isdir(runtime_directory):
+        return os.path.join(runtime_directory, "robotframework-ai-gateway.sock")
+    return os.path.join(tempfile.gettempdir(), f"robotframework-ai-gateway-{os.getuid()}.sock")
+
+def is_trusted_socket(path: str) -> bool:
+    """
+    Returns whether the path is a socket of the current user
+
+    Prompts are only sent to a gateway of the user itself. Anyone else could read them or answer with made up Responses.
+    """
+    try:
+        status = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(status.st_mode) and status.st_uid == os.getuid()
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def decode(line: bytes) -> dict:
+    return json.loads(line)
+
+def encode_error(id, error: Exception) -> bytes:
+    return encode({"id": id, "error": {
+        "type": type(error).__name__,
+        "message": str(error),
+        "retry_after": getattr(error, "retry_after", None)
+    }})
+
+def decode_error(error: dict) -> Exception:
+    """
+    Returns the exception to raise for an error of the gateway
+
+    Errors caused by the Prompt itself are raised as ValueError and open circuit breakers as CircuitOpenError, like they
+    would be without the gateway, so they are handled the same. Other errors are raised as a GatewayError.
+    """
+    if error["type"] in ("ValueError", "ContextWindowExceededError"):
+        return ValueError(error["message"])
+    if error["type"] == "CircuitOpenError":
+        return CircuitOpenError(error["message"], error["retry_after"])
+    return GatewayError(f"{error['type']}: {error['message']}", error["type"], error["retry_after"])
+
+
+class GatewayError(Exception):
+    """Exception raised when the gateway couldn't get a Response from the AI model. Contains the type of the original error."""
+
+    def __init__(self, error_message, error_type, retry_after=None):
+        super().__init__(error_message)
+        self.error_type = error_type
+        self.retry_after = retry_after
+
+
+class GatewayUnavailableError(Exception):
+    """Exception raised when the gateway can't be reached, the Prompt is then handled in the process itself."""
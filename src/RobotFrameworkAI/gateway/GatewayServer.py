@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Optional
+
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.gateway import GatewayProtocol
+from RobotFrameworkAI.objects.prompt.Prompt import Prompt
+
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayServer:
+    """
+    The AI gateway, handles the Prompts of every Robot Framework process on the machine over a Unix socket
+
+    With pabot every worker process has its own API clients, connection pools, response cache, rate limiters and metrics.
+    When the gateway runs, the workers send their Prompts to it instead, so all of that is shared: a single connection pool
+    per AI model, a response cache that every worker hits, rate limits that hold for all workers together and metrics of
+    the whole run. See the GatewayProtocol for the messages.
+
+    The Prompts are handled by the AI_Interface of the gateway process, configured like in any other process. Its own
+    gateway client is disabled, so it never sends Prompts to itself.
+
+        with GatewayServer("/tmp/gateway.sock"):
+            ...  # Prompts of processes using the socket are handled here
+
+    The server runs on the event loop of the AI_Interface.
+    """
+    def __init__(self, socket_path: Optional[str] = None) -> None:
+        self.socket_path = socket_path or GatewayProtocol.get_default_socket_path()
+        self.ai_interface = AI_Interface()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.started = None
+
+    def start(self) -> str:
+        """
+        Starts listening on the socket and returns its path
+
+        A socket left behind by a gateway that didn't stop cleanly is replaced, a socket of a gateway that is running, or of
+        another user, is not. Only the current user can connect to the socket.
+        """
+        if os.path.lexists(self.socket_path):
+            if not GatewayProtocol.is_trusted_socket(self.socket_path):
+                error_message = f"`{self.socket_path}` exists and is not a socket of the current user"
+                logger.error(error_message)
+                raise RuntimeError(error_message)
+            if self.is_running(self.socket_path):
+                error_message = f"An AI gateway is already running at `{self.socket_path}`"
+                logger.error(error_message)
+                raise RuntimeError(error_message)
+            os.remove(self.socket_path)
+        self.ai_interface.gateway.enabled = False
+        self.server = self.ai_interface.run(self.start_async())
+        self.started = time.time()
+        logger.info(f"AI gateway listening on `{self.socket_path}`")
+        return self.socket_path
+
+    async def start_async(self):
+        # The umask makes the socket private from the moment it is created, the chmod makes sure of it
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle_connection, self.socket_path, limit=GatewayProtocol.LINE_LIMIT)
+        finally:
+            os.umask(umask)
+        os.chmod(self.socket_path, 0o600)
+        return server
+
+    def stop(self) -> None:
+        if self.server is None:
+            return
+        self.ai_interface.run(self.stop_async())
+        self.server = None
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    async def stop_async(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @staticmethod
+    def is_running(socket_path: str) -> bool:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(socket_path)
+                return True
+            except OSError:
+                return False
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Handles the requests of a client at the same time, each answer is written as soon as it is done
+        """
+        self.connections += 1
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self.handle_request(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Lost a connection of the AI gateway: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.connections -= 1
+            writer.close()
+
+    async def handle_request(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        id = None
+        try:
+            request = GatewayProtocol.decode(line)
+            id = request.get("id")
+            if request.get("type") == "statistics":
+                answer = GatewayProtocol.encode({"id": id, "statistics": self.get_statistics()})
+            else:
+                self.requests += 1
+                response = await self.ai_interface.call_ai_tool_async(Prompt.from_dict(request["prompt"]))
+                answer = GatewayProtocol.encode({"id": id, "response": response.to_dict()})
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"AI gateway request {id} failed: {e}")
+            answer = GatewayProtocol.encode_error(id, e)
+        async with write_lock:
+            writer.write(answer)
+            try:
+                await writer.drain()
+            except OSError:
+                pass
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the amount of connections, Prompts and errors of the gateway and the usage metrics of its AI_Interface
+        """
+        return {
+            "socket_path": self.socket_path,
+            "uptime": time.time() - self.started if self.started else 0,
+            "connections": self.connections,
+            "requests": self.requests,
+            "errors": self.errors,
+            "usage": self.ai_interface.metrics.get_statistics()
+        }
@@ -0,0 +1,47 @@
+"""
+Runs the AI gateway until it is stopped with Ctrl+C
+
+    python -m RobotFrameworkAI.gateway --response-cache sqlite --rate-limit openai 500 200000 --max-concurrency 20
+
+Robot Framework processes on the same machine, e.g. pabot workers, send their Prompts to the gateway from then on.
+The gateway uses the API keys of its own environment. Use --socket, or the environment variable ROBOTFRAMEWORKAI_GATEWAY
+in both the gateway and the test processes, to use another socket than the default.
+"""
+import argparse
+import time
+
+from RobotFrameworkAI.gateway.GatewayServer import GatewayServer
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m RobotFrameworkAI.gateway", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=None, help="The path of the Unix socket to listen on")
+    parser.add_argument("--response-cache", default="off", choices=("off", "memory", "disk", "sqlite"), help="Shares Responses between all processes")
+    parser.add_argument("--cache-ttl", type=float, default=None, help="The amount of seconds a cached Response stays valid")
+    parser.add_argument(
+        "--rate-limit", nargs=3, action="append", default=[], metavar=("AI_MODEL", "RPM", "TPM"),
+        help="Limits the requests and tokens per minute of an AI model for all processes together, 0 means no limit"
+    )
+    parser.add_argument("--max-concurrency", type=int, default=None, help="The max amount of requests sent at the same time")
+    arguments = parser.parse_args()
+
+    server = GatewayServer(arguments.socket)
+    ai_interface = server.ai_interface
+    if arguments.response_cache != "off":
+        persistent = arguments.response_cache != "memory"
+        backend = arguments.response_cache if persistent else "disk"
+        ai_interface.enable_response_cache(ttl=arguments.cache_ttl, persistent=persistent, backend=backend)
+    for ai_model, requests_per_minute, tokens_per_minute in arguments.rate_limit:
+        ai_interface.ai_models[ai_model].set_rate_limit(None, float(requests_per_minute) or None, float(tokens_per_minute) or None)
+    ai_interface.scheduler.configure(arguments.max_concurrency)
+
+    print(f"AI gateway listening on {server.start()}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print(server.get_statistics())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import logging
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+
+
+logger = logging.getLogger(__name__)
+
+
+class AIListener:
+    """
+    The library listener of RobotFrameworkAI, it follows the run to keep track of budgets and to write reports at the end of it
+
+    The BudgetManager of the AI_Interface is told when suites and tests start and end, so budgets can be set per suite and test.
+
+    When the library is closed, the metrics of the AI_Interface are written to ai_metrics.json and ai_metrics.prom in the output
+    directory of the run, but only when an AI model was called. The budget report is written to ai_budget_report.json when
+    budgets were used.
+    """
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self) -> None:
+        self.output_directory = None
+
+    def start_suite(self, data, result):
+        if self.output_directory is None:
+            try:
+                self.output_directory = BuiltIn().get_variable_value("${OUTPUT DIR}")
+            except RobotNotRunningError:
+                pass
+        AI_Interface().budget.start_suite(result.longname)
+
+    def end_suite(self, data, result):
+        AI_Interface().budget.end_suite()
+
+    def start_test(self, data, result):
+        AI_Interface().budget.start_test(result.longname)
+
+    def end_test(self, data, result):
+        AI_Interface().budget.end_test()
+
+    def close(self):
+        if self.output_directory is None:
+            return
+        ai_interface = AI_Interface()
+        try:
+            if ai_interface.metrics.series:
+                ai_interface.metrics.write(self.output_directory)
+            if ai_interface.budget.get_report():
+                ai_interface.budget.write(self.output_directory)
+        except OSError as e:
+            logger.error(f"Could not write the AI reports to `{self.output_directory}`: {e}")
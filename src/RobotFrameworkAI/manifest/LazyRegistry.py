@@ -0,0 +1,73 @@
+import importlib
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRegistry:
+    """
+    A read-only dictionary of names to objects that only get created when they are first used.
+
+    The registry is given a dictionary with names as keys and the import path of a class as values,
+    e.g. {"openai": "RobotFrameworkAI.ai_interface.ai_model_services.OpenAIService.OpenAIService"}.
+    These usually come from the generated manifest. Checking whether a name exists or listing all names
+    doesn't import anything. Only when an object is requested, is its module imported and the class instantiated.
+    The object is kept, so every following request returns the same object.
+
+    By default the class is instantiated without arguments. A factory can be given to create the object instead,
+    it gets called with the class and should return the instance.
+    """
+    def __init__(self, entries: dict, factory=None) -> None:
+        self.entries = dict(entries)
+        self.factory = factory
+        self.instances = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name) -> bool:
+        return name in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def keys(self):
+        return self.entries.keys()
+
+    def __getitem__(self, name):
+        if name in self.instances:
+            return self.instances[name]
+        with self._lock:
+            if name not in self.instances:
+                self.instances[name] = self._load(name)
+        return self.instances[name]
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def loaded(self) -> dict:
+        """
+        Returns a dictionary with all objects that have been created so far
+        """
+        return dict(self.instances)
+
+    def _load(self, name):
+        path = self.entries[name]
+        module_path, class_name = path.rsplit(".", 1)
+        try:
+            module = importlib.import_module(module_path)
+            logger.debug(f"Imported module: {module_path}")
+        except Exception as e:
+            logger.error(f"Failed to import module {module_path}: {e}")
+            raise
+        obj = getattr(module, class_name)
+        try:
+            instance = self.factory(obj) if self.factory is not None else obj()
+        except Exception as e:
+            logger.error(f"Failed to instantiate {class_name}: {e}")
+            raise
+        logger.debug(f"Loaded `{name}` from class {class_name}")
+        return instance
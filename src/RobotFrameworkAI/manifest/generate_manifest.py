@@ -0,0 +1,77 @@
+"""
+Generates the manifest of all AI models, AI tools and test data generators
+
+The manifest is a static list of where each of them can be found. It allows the library to only import
+what is actually used, instead of importing every AI model and AI tool when the library is imported.
+
+Run this after adding, removing or renaming an AI model, AI tool or test data generator:
+
+    python -m RobotFrameworkAI.manifest.generate_manifest
+"""
+import os
+
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "manifest.py")
+
+HEADER = '''# This file is generated, do not edit it by hand. To regenerate it run:
+#     python -m RobotFrameworkAI.manifest.generate_manifest
+# See generate_manifest.py for more information.
+'''
+
+
+def import_path(obj) -> str:
+    return f"{type(obj).__module__}.{type(obj).__name__}"
+
+def build_manifest() -> dict:
+    """
+    Discovers all AI models, AI tools and test data generators and returns where each of them can be found
+    """
+    ai_models = AI_Interface()._discover_ai_models()
+    ai_tools = {}
+    default_models = {}
+    models = {}
+    for name, ai_model in ai_models.items():
+        tools = {}
+        if ai_model.tools_package is not None:
+            tools = ai_model._discover_tools(ai_model.tools_package, ai_model.tool_interface, None)
+        ai_tools[name] = {tool_name: import_path(tool) for tool_name, tool in tools.items()}
+        default_models[name] = {tool_name: tool.default_model for tool_name, tool in tools.items() if tool.default_model is not None}
+        models[name] = {tool_name: list(tool.models) for tool_name, tool in tools.items() if tool.models}
+    generators = RealTestDataGenerator()._discover_test_data_generators()
+    return {
+        "AI_MODELS": {name: import_path(ai_model) for name, ai_model in ai_models.items()},
+        "AI_TOOLS": ai_tools,
+        # The default model of each AI tool, so prompts can be fitted to their model before the AI tool is loaded
+        "DEFAULT_MODELS": default_models,
+        # The models of each AI tool, so model groups can be checked before their AI models are loaded
+        "MODELS": models,
+        "TEST_DATA_GENERATORS": {type: import_path(generator) for type, generator in generators.items()},
+    }
+
+def format_dict(dictionary: dict, indent: int = 0) -> str:
+    if not dictionary:
+        return "{}"
+    padding = " " * (indent + 4)
+    lines = ["{"]
+    for key in sorted(dictionary):
+        value = dictionary[key]
+        value = format_dict(value, indent + 4) if isinstance(value, dict) else repr(value)
+        lines.append(f"{padding}{key!r}: {value},")
+    lines.append(" " * indent + "}")
+    return "\n".join(lines)
+
+def render_manifest(manifest: dict) -> str:
+    sections = [f"{name} = {format_dict(entries)}\n" for name, entries in manifest.items()]
+    return HEADER + "\n" + "\n".join(sections)
+
+def write_manifest(path: str = MANIFEST_PATH):
+    with open(path, "w") as file:
+        file.write(render_manifest(build_manifest()))
+
+
+if __name__ == "__main__":
+    write_manifest()
+    print(f"Written manifest to {MANIFEST_PATH}")
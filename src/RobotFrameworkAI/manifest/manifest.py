@@ -0,0 +1,56 @@
+# This file is generated, do not edit it by hand. To regenerate it run:
+#     python -m RobotFrameworkAI.manifest.generate_manifest
+# See generate_manifest.py for more information.
+
+AI_MODELS = {
+    'gemini': 'RobotFrameworkAI.ai_interface.ai_model_services.GeminiService.GeminiService',
+    'mock': 'RobotFrameworkAI.ai_interface.ai_model_services.MockService.MockService',
+    'openai': 'RobotFrameworkAI.ai_interface.ai_model_services.OpenAIService.OpenAIService',
+}
+
+AI_TOOLS = {
+    'gemini': {},
+    'mock': {
+        'assistant': 'RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockAssistant.MockAssistant',
+        'batch': 'RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockBatch.MockBatch',
+        'text_generator': 'RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockTextGenerator.MockTextGenerator',
+    },
+    'openai': {
+        'assistant': 'RobotFrameworkAI.ai_interface.ai_model_services.openai_tools.OpenAIAssistant.OpenAIAssistant',
+        'batch': 'RobotFrameworkAI.ai_interface.ai_model_services.openai_tools.OpenAIBatch.OpenAIBatch',
+        'text_generator': 'RobotFrameworkAI.ai_interface.ai_model_services.openai_tools.OpenAITextGenerator.OpenAITextGenerator',
+    },
+}
+
+DEFAULT_MODELS = {
+    'gemini': {},
+    'mock': {
+        'assistant': 'mock-small',
+        'batch': 'mock-small',
+        'text_generator': 'mock-small',
+    },
+    'openai': {
+        'assistant': 'gpt-4o-mini',
+        'batch': 'gpt-4o-mini',
+        'text_generator': 'gpt-4o-mini',
+    },
+}
+
+MODELS = {
+    'gemini': {},
+    'mock': {
+        'assistant': ['mock-small', 'mock-large'],
+        'batch': ['mock-small', 'mock-large'],
+        'text_generator': ['mock-small', 'mock-large'],
+    },
+    'openai': {
+        'assistant': ['gpt-3.5-turbo', 'gpt-4o', 'gpt-4o-mini'],
+        'batch': ['gpt-3.5-turbo', 'gpt-4o', 'gpt-4o-mini'],
+        'text_generator': ['gpt-3.5-turbo', 'gpt-4o', 'gpt-4o-mini'],
+    },
+}
+
+TEST_DATA_GENERATORS = {
+    'address': 'RobotFrameworkAI.modules.real_test_data_generator.test_data_generators.AddressGenerator.AddressGenerator',
+    'user_data': 'RobotFrameworkAI.modules.real_test_data_generator.test_data_generators.UserDataGenerator.UserDataGenerator',
+}
@@ -1,12 +1,25 @@
+import asyncio
+import concurrent.futures
 import logging
 from robot.api.deco import keyword, library
+from robot.utils import timestr_to_secs
 
 from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockBehaviour
+from RobotFrameworkAI.ai_interface.budget.Budget import Budget
+from RobotFrameworkAI.ai_interface.cache.ResponseCache import ResponseCache
+from RobotFrameworkAI.ai_interface.cassette.Cassette import Cassette
+from RobotFrameworkAI.ai_interface.routing.ModelGroup import ModelGroup
+from RobotFrameworkAI.ai_interface.scheduling.Scheduler import Scheduler
+from RobotFrameworkAI.ai_interface.tokens.TokenCounter import TokenCounter
+from RobotFrameworkAI.ai_interface.transport.TransportConfig import TransportConfig
+from RobotFrameworkAI.manifest.manifest import MODELS
 from RobotFrameworkAI.objects.prompt.Prompt import Prompt
 from RobotFrameworkAI.objects.prompt.PromptConfig import PromptConfig
 from RobotFrameworkAI.objects.prompt.PromptMetadata import PromptMetadata
 from RobotFrameworkAI.objects.prompt.ai_tool_data.AIToolData import AIToolData
 from RobotFrameworkAI.objects.prompt.PromptMessage import PromptMessage
+from RobotFrameworkAI.objects.response.ResponseHandle import ResponseHandle
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +56,7 @@ class Module:
     """
 
     def __init__(self) -> None:
+        # The AI_Interface is shared by all modules in the process
         self.ai_interface = AI_Interface()
         self.module_name = "base_module"
         self.ai_tool = None
@@ -55,6 +69,9 @@ class Module:
         self.frequency_penalty = 0
         self.presence_penalty = 0
         self.response_format = None
+        self.cache_mode = "use"
+        self.max_concurrency = 5
+        self.priority = None
 
     def create_prompt(
             self,
@@ -70,9 +87,26 @@ class Module:
             frequency_penalty:float,
             presence_penalty:float,
             response_format:dict,
-            ai_tool_data:AIToolData = None
+            ai_tool_data:AIToolData = None,
+            **kwargs
         ) -> Prompt:
-        config = PromptConfig(ai_tool, ai_model, model, response_format)
+        """
+        Creates a Prompt from the arguments of a keyword
+
+        Any additional kwargs, like the cache_mode, are put in the config of the Prompt. They determine how the
+        Prompt is handled by the AI_Interface and are not sent to the AI model. Prompts get the priority set with
+        Set Priority, or normal, unless a priority is given.
+
+        Prompts for the text generator are fitted in the context window of their model: the oldest messages of the history
+        are left out and the max_tokens is lowered when they don't fit. The amount of prompt tokens is added to the kwargs.
+        """
+        if ai_tool == "text_generator":
+            history, max_tokens, kwargs["prompt_tokens"] = self.ai_interface.token_counter.fit(
+                model or self.ai_interface.get_default_model(ai_model, ai_tool), system_message, user_message, history, max_tokens
+            )
+        if kwargs.get("priority") is None:
+            kwargs["priority"] = self.priority or "normal"
+        config = PromptConfig(ai_tool, ai_model, model, response_format, kwargs)
         message = PromptMessage(system_message, user_message, history)
         arguments = {
             "max_tokens": max_tokens,
@@ -91,6 +125,55 @@ class Module:
         )
         return prompt
 
+    def run_batch(self, keyword_name:str, items:list, create_coroutine, max_concurrency:int, return_errors:bool) -> list:
+        """
+        Runs a coroutine for each item concurrently and returns their results in the same order as the items
+
+        The coroutines are created by calling create_coroutine with an item. At most max_concurrency coroutines
+        run at the same time, all on the event loop of the AI_Interface.
+
+        Errors are reported per item. When return_errors is True, the result of an item that failed is its error.
+        Otherwise, all items are still run, after which a single error listing all failed items is raised.
+        """
+        async def run_item(semaphore, item):
+            async with semaphore:
+                return await create_coroutine(item)
+
+        async def run_all():
+            # The semaphore has to be created on the event loop it is used on
+            semaphore = asyncio.Semaphore(max_concurrency)
+            return await asyncio.gather(*(run_item(semaphore, item) for item in items), return_exceptions=True)
+
+        results = self.ai_interface.run(run_all())
+        errors = [(index, result) for index, result in enumerate(results) if isinstance(result, Exception)]
+        logger.debug(f"Finished `{keyword_name}`: {len(items) - len(errors)} of {len(items)} items succeeded")
+        if errors and not return_errors:
+            error_message = f"{len(errors)} of {len(items)} items of `{keyword_name}` failed: " + "; ".join(f"item {index}: {error}" for index, error in errors)
+            logger.error(error_message)
+            raise BatchError(error_message, results)
+        return results
+
+    def start_in_background(self, keyword_name:str, coroutine) -> ResponseHandle:
+        """
+        Starts running the coroutine on the event loop of the AI_Interface and returns a ResponseHandle to its result
+
+        The ResponseHandle is kept by the AI_Interface until its result is collected with Wait For Response or Wait For All Responses.
+        """
+        response_handle = ResponseHandle(self.ai_interface.start(coroutine), keyword_name)
+        self.ai_interface.response_handles.append(response_handle)
+        logger.debug(f"Started `{keyword_name}` in the background: {response_handle}")
+        return response_handle
+
+    def get_ai_model_strategy(self, ai_model:str):
+        """
+        Returns the AIModelStrategy of the AI model, raises an error if the AI model doesn't exist
+        """
+        if ai_model not in self.ai_interface.ai_models:
+            error_message = f"Invalid ai_model: `{ai_model}`. Valid ai_models are: `{'`, `'.join(self.ai_interface.ai_models)}`"
+            logger.error(error_message)
+            raise ValueError(error_message)
+        return self.ai_interface.ai_models[ai_model]
+
     def get_default_values_for_arguments(self, **arguments):
         """
         Gets default values for arguments
@@ -140,9 +223,16 @@ class Module:
         return True
 
     # Validation methods
-    def is_valid_max_tokens(self, max_tokens: int):
-        if not (0 < max_tokens <= 4096):
-            error_message = f"Invalid value `{max_tokens}` for `max_tokens`. Value must be greater than 0 and less than or equal to 4096."
+    def is_valid_max_tokens(self, max_tokens: int, model: str = None):
+        # The max completion tokens of the model, models without known limits get the limit of the smallest models
+        limits = self.ai_interface.token_counter.get_model(model)
+        if limits is None:
+            max_completion_tokens = 4096
+        else:
+            context_window, max_completion_tokens, _ = limits
+            max_completion_tokens = max_completion_tokens or context_window
+        if not (0 < max_tokens <= max_completion_tokens):
+            error_message = f"Invalid value `{max_tokens}` for `max_tokens`. Value must be greater than 0 and less than or equal to {max_completion_tokens}."
             logger.error(error_message)
             raise ValueError(error_message)
 
@@ -176,6 +266,846 @@ class Module:
             logger.error(error_message)
             raise ValueError(error_message)
 
+    def is_valid_cache_mode(self, cache_mode: str):
+        if cache_mode not in ResponseCache.MODES:
+            error_message = f"Invalid value `{cache_mode}` for `cache_mode`. Valid values are: `{'`, `'.join(ResponseCache.MODES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_budget_scope(self, budget_scope: str):
+        if budget_scope not in Budget.SCOPES:
+            error_message = f"Invalid value `{budget_scope}` for `scope`. Valid values are: `{'`, `'.join(Budget.SCOPES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_budget_policy(self, budget_policy: str):
+        if budget_policy not in Budget.POLICIES:
+            error_message = f"Invalid value `{budget_policy}` for `policy`. Valid values are: `{'`, `'.join(Budget.POLICIES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_tokenizer(self, tokenizer: str):
+        if tokenizer not in TokenCounter.TOKENIZERS:
+            error_message = f"Invalid value `{tokenizer}` for `tokenizer`. Valid values are: `{'`, `'.join(TokenCounter.TOKENIZERS)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_overflow(self, overflow: str):
+        if overflow not in TokenCounter.OVERFLOW_POLICIES:
+            error_message = f"Invalid value `{overflow}` for `overflow`. Valid values are: `{'`, `'.join(TokenCounter.OVERFLOW_POLICIES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_model_group_policy(self, model_group_policy: str):
+        if model_group_policy not in ModelGroup.POLICIES:
+            error_message = f"Invalid value `{model_group_policy}` for `policy`. Valid values are: `{'`, `'.join(ModelGroup.POLICIES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_priority(self, priority: str):
+        if priority is not None and priority not in Scheduler.PRIORITIES:
+            error_message = f"Invalid value `{priority}` for `priority`. Valid values are: `{'`, `'.join(Scheduler.PRIORITIES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_max_concurrency(self, max_concurrency: int):
+        if not (isinstance(max_concurrency, int) and max_concurrency > 0):
+            error_message = f"Invalid value `{max_concurrency}` for `max_concurrency`. Value must be an integer greater than 0."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    def is_valid_items(self, items: list):
+        if not isinstance(items, (list, tuple)):
+            error_message = f"Invalid value `{items}`. Value must be a list."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+    # Background requests
+    @keyword
+    def wait_for_response(self, response_handle: ResponseHandle, timeout: str = None):
+        """
+        Waits for a request started by a Start keyword, like Start Generate Response, and returns its result.
+
+        The result is the same as the keyword without Start would have returned. If the request failed, its error is raised here.
+
+        The following arguments can be used (arguments with a * are required):
+        - *response_handle: ResponseHandle: The handle returned by the Start keyword.
+        - timeout: str: The max time to wait, e.g. "30s" or "1 minute". When the request isn't finished in time an error is raised,
+            but the request keeps running so it can be waited for again. None means wait as long as it takes. Default = None
+        """
+        logger.debug(f"Calling keyword: Wait For Response with arguments: (response_handle: {response_handle}), (timeout: {timeout})")
+        if not isinstance(response_handle, ResponseHandle):
+            error_message = f"Invalid value `{response_handle}` for `response_handle`. Value must be a handle returned by a Start keyword."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        timeout = timestr_to_secs(timeout) if timeout is not None else None
+        try:
+            return response_handle.result(timeout)
+        finally:
+            if response_handle.done() and response_handle in self.ai_interface.response_handles:
+                self.ai_interface.response_handles.remove(response_handle)
+
+    @keyword
+    def wait_for_all_responses(self, timeout: str = None, return_errors: bool = False):
+        """
+        Waits for all requests started by Start keywords that haven't been waited for yet and returns their results.
+
+        The results are in the same order as the requests were started. Requests of all modules are included.
+
+        The following arguments can be used:
+        - timeout: str: The max time to wait for all requests together, e.g. "30s" or "1 minute". When not all requests are finished
+            in time an error is raised, requests that haven't finished can be waited for again. None means wait as long as it takes. Default = None
+        - return_errors: bool: When False, an error listing every request that failed is raised after all requests are done.
+            When True, the error of a failed request is returned in its place instead. Default = False
+        """
+        logger.debug(f"Calling keyword: Wait For All Responses with arguments: (timeout: {timeout}), (return_errors: {return_errors})")
+        response_handles = list(self.ai_interface.response_handles)
+        futures = [response_handle.future for response_handle in response_handles]
+        timeout = timestr_to_secs(timeout) if timeout is not None else None
+        _, not_done = concurrent.futures.wait(futures, timeout)
+        if not_done:
+            error_message = f"{len(not_done)} of {len(futures)} requests did not finish within {timeout} seconds"
+            logger.error(error_message)
+            raise TimeoutError(error_message)
+        for response_handle in response_handles:
+            self.ai_interface.response_handles.remove(response_handle)
+        results = []
+        errors = []
+        for index, response_handle in enumerate(response_handles):
+            try:
+                results.append(response_handle.result())
+            except Exception as e:
+                results.append(e)
+                errors.append((index, response_handle, e))
+        if errors and not return_errors:
+            error_message = f"{len(errors)} of {len(results)} requests failed: " + "; ".join(f"request {index} `{response_handle.keyword_name}`: {error}" for index, response_handle, error in errors)
+            logger.error(error_message)
+            raise BatchError(error_message, results)
+        return results
+
+    # Rate limiting
+    @keyword
+    def set_rate_limit(self, ai_model: str, model: str = None, requests_per_minute: float = None, tokens_per_minute: float = None):
+        """
+        Limits the requests and tokens per minute sent to an AI model, for all modules.
+
+        Prompts over the limit wait in a queue, in the order they were sent, until there is room again instead of failing
+        with a rate limit error of the AI model. Use this together with concurrent keywords, like Generate Responses, to
+        stay within the limits of your API key. The time waited is reported as queue_wait in the metadata of the Response.
+
+        The tokens of a Prompt are estimated before it is sent as its max_tokens plus the tokens of its messages, see the
+        Count Tokens keyword. When the Response is received, the estimate is corrected with the actual amount of tokens used.
+
+        The following arguments can be used (arguments with a * are required):
+        - *ai_model: str: The AI model to limit, e.g. "openai".
+        - model: str: The model to limit, e.g. "gpt-4o-mini". When None, the limit applies to all models of the AI model together,
+            on top of the limits of each model. Default = None
+        - requests_per_minute: float: The max amount of requests per minute. None means no limit. Default = None
+        - tokens_per_minute: float: The max amount of tokens per minute. None means no limit. Default = None
+
+        Setting both requests_per_minute and tokens_per_minute to None removes the limit.
+        """
+        logger.debug(f"Calling keyword: Set Rate Limit with arguments: (ai_model: {ai_model}), (model: {model}), (requests_per_minute: {requests_per_minute}), (tokens_per_minute: {tokens_per_minute})")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        for name, limit in (("requests_per_minute", requests_per_minute), ("tokens_per_minute", tokens_per_minute)):
+            if limit is not None and limit <= 0:
+                error_message = f"Invalid value `{limit}` for `{name}`. Value must be greater than 0."
+                logger.error(error_message)
+                raise ValueError(error_message)
+        ai_model_strategy.set_rate_limit(model, requests_per_minute, tokens_per_minute)
+
+    # Resilience
+    @keyword
+    def set_retry_policy(self, ai_model: str, max_retries: int = 2, base_delay: float = 1, max_delay: float = 30):
+        """
+        Sets how often and after how long calls to an AI model that failed with a transient error are retried, for all modules.
+
+        Transient errors are errors like timeouts, connection errors, rate limit errors and server errors.
+        Only calls that can safely be sent again are retried, like generating a response. Sending a message to an assistant is never
+        retried, as the message might have been added to the thread before the call failed.
+
+        The delay before each retry doubles, starting at base_delay, up to max_delay. A random part of that delay is used, so calls
+        that failed at the same time are retried at different times. When the AI model says how long to wait, that is used instead.
+        The amount of retries is reported as retries in the metadata of the Response.
+
+        The following arguments can be used (arguments with a * are required):
+        - *ai_model: str: The AI model to set the retry policy for, e.g. "openai".
+        - max_retries: int: The max amount of retries per call, 0 disables retrying. Default = 2
+        - base_delay: float: The delay in seconds before the first retry. Default = 1
+        - max_delay: float: The max delay in seconds before a retry. Default = 30
+        """
+        logger.debug(f"Calling keyword: Set Retry Policy with arguments: (ai_model: {ai_model}), (max_retries: {max_retries}), (base_delay: {base_delay}), (max_delay: {max_delay})")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        if max_retries < 0 or base_delay < 0 or max_delay < 0:
+            error_message = f"Invalid retry policy: (max_retries: {max_retries}), (base_delay: {base_delay}), (max_delay: {max_delay}). Values can't be negative."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        ai_model_strategy.set_retry_policy(max_retries, base_delay, max_delay)
+
+    @keyword
+    def set_circuit_breaker(self, ai_model: str, failure_threshold: int = 5, cooldown: float = 30):
+        """
+        Sets when the circuit breakers of the models of an AI model open, for all modules.
+
+        Each model has a circuit breaker. After failure_threshold calls in a row failed with a transient error, the circuit breaker opens.
+        While open, calls to that model fail immediately for cooldown seconds instead of waiting for a model that is down. After that a single
+        call is let through, when it succeeds the circuit breaker closes again. The state of the circuit breaker is reported as
+        circuit_state in the metadata of the Response.
+
+        The following arguments can be used (arguments with a * are required):
+        - *ai_model: str: The AI model to set the circuit breakers for, e.g. "openai".
+        - failure_threshold: int: The amount of failures in a row that opens the circuit breaker, 0 disables the circuit breaker. Default = 5
+        - cooldown: float: The amount of seconds the circuit breaker stays open. Default = 30
+        """
+        logger.debug(f"Calling keyword: Set Circuit Breaker with arguments: (ai_model: {ai_model}), (failure_threshold: {failure_threshold}), (cooldown: {cooldown})")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        if failure_threshold < 0 or cooldown < 0:
+            error_message = f"Invalid circuit breaker: (failure_threshold: {failure_threshold}), (cooldown: {cooldown}). Values can't be negative."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        ai_model_strategy.set_circuit_breaker(failure_threshold, cooldown)
+
+    # Hedging
+    @keyword
+    def enable_hedging(self, ai_model: str, delay: float = None, percentile: float = 95, fallback_model: str = None, min_samples: int = 20):
+        """
+        Enables hedging of requests to generate a response or test data, for all modules.
+
+        Most requests are fast, but a few take many times longer, and those decide how long a suite takes. With hedging, when a request
+        hasn't finished after the hedge delay, a duplicate request is sent. The first response wins and the other request is cancelled.
+        This costs extra requests, so by default only the slowest 5% of requests get hedged. Use Get Hedging Statistics to see how many
+        requests were hedged and how often that helped. Responses from a hedge request have hedged set in their metadata.
+        Hedge requests count towards the rate limits and the circuit breaker of their model, no hedge is sent while it's open.
+
+        The following arguments can be used (arguments with a * are required):
+        - *ai_model: str: The AI model to hedge the requests to, e.g. "openai".
+        - delay: float: A fixed amount of seconds after which a request gets hedged. When None, the delay is the percentile of the
+            durations of recent requests. Default = None
+        - percentile: float: The percentile of the durations of recent requests used as delay when no fixed delay is given. Default = 95
+        - fallback_model: str: The model the hedge request is sent to, e.g. "gpt-3.5-turbo". When None, the same model is used. Default = None
+        - min_samples: int: The amount of requests needed before requests get hedged, when no fixed delay is given. Default = 20
+        """
+        logger.debug(f"Calling keyword: Enable Hedging with arguments: (ai_model: {ai_model}), (delay: {delay}), (percentile: {percentile}), (fallback_model: {fallback_model}), (min_samples: {min_samples})")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        if (delay is not None and delay < 0) or not (0 < percentile <= 100) or min_samples < 1:
+            error_message = f"Invalid hedging: (delay: {delay}), (percentile: {percentile}), (min_samples: {min_samples}). Delay can't be negative, percentile must be between 0 and 100 and min_samples must be greater than 0."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        ai_model_strategy.enable_hedging(delay, percentile, fallback_model, min_samples)
+
+    @keyword
+    def disable_hedging(self, ai_model: str):
+        """
+        Disables hedging of requests to the AI model, for all modules.
+        """
+        logger.debug(f"Calling keyword: Disable Hedging with arguments: (ai_model: {ai_model})")
+        self.get_ai_model_strategy(ai_model).disable_hedging()
+
+    @keyword
+    def get_hedging_statistics(self, ai_model: str):
+        """
+        Returns the hedging statistics of the AI model as a dictionary.
+
+        The dictionary contains:
+        - requests: The amount of requests since hedging was enabled.
+        - hedges: The amount of hedge requests sent.
+        - hedge_wins: The amount of hedge requests that finished before the original request.
+        - hedge_rate: The fraction of requests that got hedged.
+        - hedge_win_rate: The fraction of hedge requests that won.
+        - delay: The current hedge delay in seconds, None when not enough requests have been made yet.
+        """
+        logger.debug(f"Calling keyword: Get Hedging Statistics with arguments: (ai_model: {ai_model})")
+        hedger = self.get_ai_model_strategy(ai_model).hedger
+        if hedger is None:
+            error_message = f"Hedging is not enabled for `{ai_model}`. Enable it with the Enable Hedging keyword."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        return hedger.get_statistics()
+
+    # Scheduling
+    @keyword
+    def configure_ai_scheduler(self, max_concurrency: int = None):
+        """
+        Sets the max amount of requests sent to AI models at the same time, for all modules.
+
+        When all slots are taken, requests wait in a queue. When a slot frees up, the waiting request with the highest priority
+        class goes first, so urgent requests overtake bulk work. The priority class of requests is set with Set Priority:
+        - critical: Requests whose result a test is waiting for right now, e.g. an assertion on the critical path.
+        - normal: The default for keywords that wait for their result.
+        - bulk: The default for batch keywords, like Generate Test Data Batch, and for attaching files to assistants.
+        Within a priority class requests go first come, first served. The time a request waited is reported as scheduler_wait
+        in the metadata of the Response. Use Get AI Scheduler Statistics to see the queue depths and wait times.
+
+        The following arguments can be used:
+        - max_concurrency: int: The max amount of requests sent at the same time. None means no limit. Default = None
+        """
+        logger.debug(f"Calling keyword: Configure AI Scheduler with arguments: (max_concurrency: {max_concurrency})")
+        if max_concurrency is not None:
+            self.validate_input_arguments(max_concurrency=max_concurrency)
+        self.ai_interface.scheduler.configure(max_concurrency)
+
+    @keyword
+    def set_module_concurrency_quota(self, module: str, max_concurrency: int = None):
+        """
+        Sets the max amount of requests of a module sent at the same time, for all modules.
+
+        A module at its quota doesn't hold up the requests of other modules, e.g. background file uploads of the assistant can be
+        limited so they never take all slots. The quota applies on top of the max_concurrency of Configure AI Scheduler.
+
+        The following arguments can be used (arguments with a * are required):
+        - *module: str: The module, one of "chatbot", "real_test_data_generator" and "assistant".
+        - max_concurrency: int: The max amount of requests of the module sent at the same time. None removes the quota. Default = None
+        """
+        logger.debug(f"Calling keyword: Set Module Concurrency Quota with arguments: (module: {module}), (max_concurrency: {max_concurrency})")
+        if max_concurrency is not None:
+            self.validate_input_arguments(max_concurrency=max_concurrency)
+        self.ai_interface.scheduler.set_module_quota(module, max_concurrency)
+
+    @keyword
+    def get_ai_scheduler_statistics(self, reset: bool = False):
+        """
+        Returns the statistics of the scheduler as a dictionary, to tune the max_concurrency and the quotas.
+
+        The dictionary contains:
+        - max_concurrency: The max amount of requests sent at the same time, None when there is no limit.
+        - running: The amount of requests being sent right now.
+        - queued: The amount of requests waiting for a slot right now.
+        - module_quotas: The quota of each module that has one.
+        - running_per_module: The amount of requests being sent right now per module.
+        - priorities: A dictionary per priority class with:
+            - requests: The amount of requests.
+            - queued and max_queued: The amount of requests waiting right now and the most that waited at the same time.
+            - waited: The amount of requests that had to wait for a slot.
+            - mean_wait, p95_wait and max_wait: The seconds requests waited for a slot, the p95 over the last 1000 requests.
+
+        The following arguments can be used:
+        - reset: bool: Start counting again after returning the statistics. Default = False
+        """
+        logger.debug(f"Calling keyword: Get AI Scheduler Statistics with arguments: (reset: {reset})")
+        statistics = self.ai_interface.scheduler.get_statistics()
+        if reset:
+            self.ai_interface.scheduler.reset_statistics()
+        return statistics
+
+    # AI gateway
+    @keyword
+    def configure_ai_gateway(self, socket_path: str = None, enabled: bool = True):
+        """
+        Sets the socket of the AI gateway, or stops using the gateway, for all modules.
+
+        The AI gateway is a process that handles the Prompts of every Robot Framework process on the machine, started with
+        python -m RobotFrameworkAI.gateway. When it runs, text generation requests are sent to it, so parallel runs like pabot
+        workers share a single connection pool, response cache, rate limits and metrics. When it doesn't run, or stops,
+        requests are handled in this process like always. Assistants and batches are always handled in this process.
+
+        By default the socket is the path in the environment variable ROBOTFRAMEWORKAI_GATEWAY, or a socket of the current user in
+        XDG_RUNTIME_DIR or the temp folder. Requests are only sent to a socket owned by the current user.
+
+        The following arguments can be used:
+        - socket_path: str: The path of the Unix socket of the gateway. None means the default socket. Default = None
+        - enabled: bool: Whether to send requests to the gateway. Default = True
+        """
+        logger.debug(f"Calling keyword: Configure AI Gateway with arguments: (socket_path: {socket_path}), (enabled: {enabled})")
+        self.ai_interface.gateway.configure(socket_path, enabled)
+
+    @keyword
+    def get_ai_gateway_status(self):
+        """
+        Returns the status of the AI gateway as a dictionary.
+
+        The dictionary contains:
+        - enabled and socket_path: As set with Configure AI Gateway.
+        - connected: Whether this process is connected to the gateway right now.
+        - requests: The amount of requests this process sent to the gateway.
+        - fallbacks: The amount of times the gateway couldn't be reached or went away, after which requests are handled in this
+            process for a few seconds before the gateway is tried again.
+        - gateway: The statistics of the gateway, None when it isn't running. These are the socket_path, uptime, the amount
+            of connections, requests and errors and the usage of all processes together, see Get AI Usage Statistics.
+        """
+        logger.debug("Calling keyword: Get AI Gateway Status")
+        gateway = self.ai_interface.gateway
+        status = gateway.get_status()
+        status["gateway"] = self.ai_interface.run(gateway.get_statistics()) if gateway.enabled else None
+        return status
+
+    # Model groups
+    @keyword
+    def create_model_group(
+            self,
+            name: str,
+            *members: str,
+            policy: str = "latency",
+            max_error_rate: float = .5,
+            min_samples: int = 3,
+            window: int = 50,
+            max_age: float = 60
+        ):
+        """
+        Creates a model group, a logical model backed by models of one or more AI models, for all modules.
+
+        Use the name of the model group as ai_model, e.g. Generate Response    Hello    ai_model=fast. Each request is sent to one of
+        the members, picked by the policy. When that member fails, e.g. with a timeout, a server error or an open circuit breaker,
+        the request is sent to the next member. Errors that would happen with every member, like invalid arguments, fail right away.
+        The ai_model and model of the member that answered are in the metadata of the Response. Only text generation can use model groups.
+
+        The health of each member is tracked over its recent requests. A member whose recent error rate is above max_error_rate is
+        degraded and only tried after all other members. Requests older than max_age seconds are forgotten, so a degraded member
+        gets tried again after a while.
+
+        The following arguments can be used (arguments with a * are required):
+        - *name: str: The name of the model group, can't be the name of an AI model. An existing group with the same name is replaced.
+        - *members: str: The members, each an AI model and optionally a model, e.g. "openai:gpt-4o-mini" or "mock".
+            Without a model, the default model of the AI model is used. An invalid AI model or model fails the keyword.
+        - policy: str: The order the members are tried in. Default = "latency"
+            - "latency": The member with the lowest recent median latency first.
+            - "priority": The members in the order they were given, e.g. a cheap model with an expensive one as fallback.
+            - "round_robin": Each request starts at the next member, spreading the requests over all members.
+        - max_error_rate: float: The recent error rate above which a member is degraded, between 0 and 1. Default = 0.5
+        - min_samples: int: The amount of recent requests needed before a member can be degraded. Default = 3
+        - window: int: The amount of recent requests of each member that are tracked. Default = 50
+        - max_age: float: The amount of seconds after which a request is forgotten. Default = 60
+        """
+        logger.debug(f"Calling keyword: Create Model Group with arguments: (name: {name}), (members: {members}), (policy: {policy}), (max_error_rate: {max_error_rate}), (min_samples: {min_samples}), (window: {window}), (max_age: {max_age})")
+        self.validate_input_arguments(model_group_policy=policy)
+        error_message = None
+        if name in self.ai_interface.ai_models:
+            error_message = f"Invalid name `{name}` for the model group. It can't be the name of an AI model."
+        elif not members:
+            error_message = f"Model group `{name}` needs at least one member."
+        elif not (0 <= max_error_rate <= 1) or min_samples < 1 or window < 1 or max_age <= 0:
+            error_message = f"Invalid model group health: (max_error_rate: {max_error_rate}), (min_samples: {min_samples}), (window: {window}), (max_age: {max_age}). Max_error_rate must be between 0 and 1, the others must be greater than 0."
+        if error_message is not None:
+            logger.error(error_message)
+            raise ValueError(error_message)
+        group_members = []
+        for member in members:
+            ai_model, _, model = member.partition(":")
+            self.get_ai_model_strategy(ai_model)
+            # A member with an invalid model would fail every request, so it's checked here instead of failing over each time
+            models = [model for ai_tool in self.ai_interface.router.ROUTABLE_TOOLS for model in MODELS.get(ai_model, {}).get(ai_tool, [])]
+            if model and model not in models:
+                error_message = f"Invalid model `{model}` of member `{member}` of model group `{name}`. Valid models of `{ai_model}` are: `{'`, `'.join(models)}`"
+                logger.error(error_message)
+                raise ValueError(error_message)
+            group_members.append((ai_model, model or None))
+        self.ai_interface.router.create_group(name, group_members, policy, window, max_age, min_samples, max_error_rate)
+
+    @keyword
+    def remove_model_group(self, name: str):
+        """
+        Removes the model group, for all modules.
+        """
+        logger.debug(f"Calling keyword: Remove Model Group with arguments: (name: {name})")
+        self.ai_interface.router.remove_group(name)
+
+    @keyword
+    def get_model_group_statistics(self, name: str):
+        """
+        Returns the statistics of the model group as a dictionary.
+
+        The dictionary contains:
+        - name: The name of the model group.
+        - policy: The policy of the model group.
+        - requests: The amount of requests sent to the model group.
+        - failovers: The amount of requests answered by another member than the first one tried.
+        - members: A dictionary per member, in the order they were given, with:
+            - member: The AI model and model of the member, e.g. "openai:gpt-4o-mini".
+            - requests and errors: The amount of requests sent to the member and how many of them failed.
+            - recent_requests: The amount of requests the health of the member is based on.
+            - error_rate: The fraction of the recent requests that failed.
+            - latency_p50 and latency_p95: The median and 95th percentile of the latency in seconds of the recent requests
+                that succeeded, None when there are none.
+            - degraded: Whether the member is only tried after all other members.
+        """
+        logger.debug(f"Calling keyword: Get Model Group Statistics with arguments: (name: {name})")
+        if name not in self.ai_interface.router.groups:
+            error_message = f"Invalid model group: `{name}`. Valid model groups are: `{'`, `'.join(self.ai_interface.router.groups)}`"
+            logger.error(error_message)
+            raise ValueError(error_message)
+        return self.ai_interface.router.get_statistics(name)
+
+    # Connections
+    @keyword
+    def configure_ai_transport(
+            self,
+            ai_model: str,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30,
+            connect_timeout: float = 5,
+            read_timeout: float = 600,
+            write_timeout: float = 600,
+            pool_timeout: float = 600,
+            http2: bool = False,
+            base_url: str = None
+        ):
+        """
+        Sets the settings of the HTTP connections to the API of an AI model, for all modules.
+
+        Each AI model has 1 HTTP client that is shared by all modules. Its connections are kept alive and reused, so only the first
+        request pays for setting up a connection. Use this keyword in the suite setup, as the HTTP client is replaced by a new one.
+
+        The following arguments can be used (arguments with a * are required):
+        - *ai_model: str: The AI model to configure, e.g. "openai".
+        - max_connections: int: The max amount of connections open at the same time. Default = 100
+        - max_keepalive_connections: int: The max amount of idle connections kept open for reuse. Default = 20
+        - keepalive_expiry: float: The amount of seconds an idle connection is kept open. Default = 30
+        - connect_timeout: float: The amount of seconds to wait for a connection to be set up. Default = 5
+        - read_timeout: float: The amount of seconds to wait for a response. Default = 600
+        - write_timeout: float: The amount of seconds to wait for the request to be sent. Default = 600
+        - pool_timeout: float: The amount of seconds to wait for a free connection when max_connections are in use. Default = 600
+        - http2: bool: Whether to use HTTP/2, which sends all requests over a single connection. Requires the h2 package,
+            install it with: pip install httpx[http2]. Default = False
+        - base_url: str: The URL of the API, e.g. of the stub server, see python -m RobotFrameworkAI.stub_server --help.
+            For OpenAI, the OPENAI_BASE_URL environment variable is used when not set. Default = the URL of the AI model
+        """
+        args = locals()
+        args.pop("self")
+        logger.debug(f"Calling keyword `Configure AI Transport` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        transport_config = TransportConfig(
+            max_connections, max_keepalive_connections, keepalive_expiry, connect_timeout, read_timeout, write_timeout, pool_timeout, http2, base_url
+        )
+        old_client = ai_model_strategy.configure_transport(transport_config)
+        if old_client is not None and hasattr(old_client, "close"):
+            self.ai_interface.run(old_client.close())
+
+    @keyword
+    def warm_up_ai_connections(self, ai_model: str, connections: int = 1):
+        """
+        Opens connections to the API of an AI model ahead of time and returns the time it took in seconds.
+
+        Setting up a connection (DNS, TCP and TLS) takes time, which normally the first keyword that uses the AI model pays for.
+        Use this keyword in the suite setup, so the connections are ready before the first test. The connections are kept alive
+        for keepalive_expiry seconds, see Configure AI Transport. For OpenAI, this lists the models, which doesn't use any tokens.
+
+        The following arguments can be used (arguments with a * are required):
+        - *ai_model: str: The AI model to connect to, e.g. "openai".
+        - connections: int: The amount of connections to open. Use the amount of requests you send at the same time. Default = 1
+        """
+        logger.debug(f"Calling keyword: Warm Up AI Connections with arguments: (ai_model: {ai_model}), (connections: {connections})")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        if connections < 1:
+            error_message = f"Invalid value `{connections}` for `connections`. Value must be greater than 0."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        return self.ai_interface.run(ai_model_strategy.warm_up(connections))
+
+    @keyword
+    def set_mock_behaviour(
+            self,
+            latency: float = 0,
+            latency_distribution: str = "fixed",
+            latency_stddev: float = 0,
+            error_rate: float = 0,
+            rate_limit_rate: float = 0,
+            completion_tokens: int = None,
+            seed: int = None
+        ):
+        """
+        Sets how the mock AI model behaves, for all modules.
+
+        The mock AI model, ai_model="mock", makes up its responses without using the network or an API key. Responses are
+        deterministic and follow the response_format. Use it to run suites offline, or to test how a suite handles slow
+        responses and errors. Its models are "mock-small" and "mock-large".
+
+        The following arguments can be used:
+        - latency: float: The average amount of seconds a call takes. Default = 0
+        - latency_distribution: str: How the latency of each call is picked. Default = "fixed"
+            - "fixed": Every call takes latency seconds.
+            - "uniform": Between latency - latency_stddev and latency + latency_stddev seconds.
+            - "normal": Normally distributed around latency with a standard deviation of latency_stddev.
+            - "lognormal": Mostly around latency with a long tail of slow calls, like real AI models.
+        - latency_stddev: float: The spread of the latency in seconds. Default = 0
+        - error_rate: float: The fraction of calls that fail with a server error, between 0 and 1. Default = 0
+        - rate_limit_rate: float: The fraction of calls that fail with a rate limit error, between 0 and 1. Default = 0
+        - completion_tokens: int: The amount of tokens of each response, capped by max_tokens. None means the response
+            is only as long as needed. Default = None
+        - seed: int: The seed for picking latencies and errors, so runs can be repeated. Default = None
+        """
+        args = locals()
+        args.pop("self")
+        logger.debug(f"Calling keyword `Set Mock Behaviour` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        behaviour = MockBehaviour(latency, latency_distribution, latency_stddev, error_rate, rate_limit_rate, completion_tokens, seed)
+        self.get_ai_model_strategy("mock").set_behaviour(behaviour)
+
+    # Cassettes
+    @keyword
+    def use_ai_cassette(self, path: str, ai_model: str, mode: str = "replay", policy: str = "strict"):
+        """
+        Records or replays all requests to the API of an AI model with a cassette file, for all modules.
+
+        In record mode, requests are sent to the API and their responses are written to the cassette. In replay mode, the
+        responses are read from the cassette instead, so tests run fast, give the same results every time and don't need
+        the network or an API key. All keywords are recorded, including assistants and streamed responses.
+
+        Requests are matched on the API method and all of its arguments. When a request is made more than once, the
+        responses are replayed in the order they were recorded. The cassette is saved when it's ejected or when the test run ends.
+
+        The following arguments can be used (arguments with a * are required):
+        - *path: str: The path of the cassette file, e.g. "${CURDIR}/cassettes/chatbot.json.gz".
+        - *ai_model: str: The AI model to use the cassette for, e.g. "openai".
+        - mode: str: Either "record" or "replay". Recording overwrites the cassette. Default = "replay"
+        - policy: str: How requests are matched when replaying. Default = "strict"
+            - "strict": Requests must match a recorded request exactly. Other requests fail.
+            - "lenient": Requests also match when only sampling parameters like temperature and max_tokens differ.
+                When a request is made more often than it was recorded, its last response is repeated.
+            - "new_episodes": Requests that weren't recorded are sent to the API and added to the cassette.
+        """
+        logger.debug(f"Calling keyword: Use AI Cassette with arguments: (path: {path}), (ai_model: {ai_model}), (mode: {mode}), (policy: {policy})")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        if mode not in Cassette.MODES:
+            error_message = f"Invalid value `{mode}` for `mode`. Valid values are: `{'`, `'.join(Cassette.MODES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        if policy not in Cassette.POLICIES:
+            error_message = f"Invalid value `{policy}` for `policy`. Valid values are: `{'`, `'.join(Cassette.POLICIES)}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        # The current cassette is saved first, as it might be the one that is loaded
+        self.eject_ai_cassette(ai_model)
+        old_client = ai_model_strategy.use_cassette(Cassette(path, mode, policy))
+        if old_client is not None and hasattr(old_client, "close"):
+            self.ai_interface.run(old_client.close())
+
+    @keyword
+    def eject_ai_cassette(self, ai_model: str):
+        """
+        Saves the cassette of an AI model and sends requests to its API again.
+
+        The following arguments can be used (arguments with a * are required):
+        - *ai_model: str: The AI model to eject the cassette of, e.g. "openai".
+        """
+        logger.debug(f"Calling keyword: Eject AI Cassette with arguments: (ai_model: {ai_model})")
+        ai_model_strategy = self.get_ai_model_strategy(ai_model)
+        old_client = ai_model_strategy.eject_cassette()
+        if old_client is not None and hasattr(old_client, "close"):
+            self.ai_interface.run(old_client.close())
+
+    # Response cache
+    @keyword
+    def enable_response_cache(
+            self,
+            ttl: float = None,
+            max_entries: int = 1000,
+            persistent: bool = True,
+            directory: str = None,
+            max_disk_size: int = 100 * 1024 * 1024,
+            backend: str = "disk"
+        ):
+        """
+        Enables the response cache for all modules.
+
+        When enabled, sending a prompt that has been sent before returns the cached response instead of calling the AI model again.
+        Prompts are the same when their AI model, model, messages, parameters and response format are the same.
+        Only the Generate Response and Generate Test Data keywords use the cache, assistants are never cached.
+
+        The following arguments can be used:
+        - ttl: float: The amount of seconds a response stays valid. None means responses never expire. Default = None
+        - max_entries: int: The amount of most recently used responses kept in memory. Default = 1000
+        - persistent: bool: Also store responses on disk so they can be used by later runs. Default = True
+        - directory: str: The folder to store responses in when persistent. Default = a folder in the temp folder of the system
+        - max_disk_size: int: The max size in bytes of the folder. The least recently used responses are removed first. Default = 100MB
+        - backend: str: How responses are stored when persistent. Default = "disk"
+            - "disk": Each response is stored as a file.
+            - "sqlite": Responses are stored in a SQLite database, which can be shared by many processes at the same time.
+                Use this with pabot, so all workers share the same cache.
+
+        Use the cache_mode argument of a keyword or the Set Cache Mode keyword to bypass or refresh the cache.
+        """
+        logger.debug(f"Calling keyword: Enable Response Cache with arguments: (ttl: {ttl}), (max_entries: {max_entries}), (persistent: {persistent}), (directory: {directory}), (max_disk_size: {max_disk_size}), (backend: {backend})")
+        self.ai_interface.enable_response_cache(ttl, max_entries, persistent, directory, max_disk_size, backend)
+
+    @keyword
+    def disable_response_cache(self):
+        """
+        Disables the response cache for all modules. Responses stored on disk are kept.
+        """
+        logger.debug("Calling keyword: Disable Response Cache")
+        self.ai_interface.disable_response_cache()
+
+    @keyword
+    def clear_response_cache(self):
+        """
+        Removes all responses from the response cache, both from memory and from disk.
+        """
+        logger.debug("Calling keyword: Clear Response Cache")
+        self.ai_interface.clear_response_cache()
+
+    # Metrics
+    @keyword
+    def get_ai_usage_statistics(self, module: str = None, ai_model: str = None, model: str = None, ai_tool: str = None):
+        """
+        Returns the usage of the AI models since the start of the run as a dictionary.
+
+        Every call to an AI model is counted per module, AI model, model and AI tool, this is called a series.
+        The dictionary contains:
+        - totals: The sum of the counters of all series.
+        - series: A list with the statistics of each series, containing:
+            - module, ai_model, model and ai_tool: What the series counts.
+            - calls: The amount of calls, including calls that failed or came from the response cache.
+            - errors: The amount of calls that failed.
+            - cache_hits: The amount of responses that came from the response cache.
+            - retries: The amount of retries of failed requests.
+            - prompt_tokens, completion_tokens and total_tokens: The tokens used, tokens of cached responses are not counted.
+            - error_rate: The fraction of calls that failed.
+            - latency_mean, latency_p50, latency_p95, latency_p99 and latency_max: The latency in seconds,
+                percentiles are estimated from a histogram.
+
+        The following arguments can be used to only include some series:
+        - module: str: The module, e.g. "chatbot". Default = None
+        - ai_model: str: The AI model, e.g. "openai". Default = None
+        - model: str: The model, e.g. "gpt-3.5-turbo". Default = None
+        - ai_tool: str: The AI tool, e.g. "text_generator". Default = None
+
+        At the end of the run the usage is also written to ai_metrics.json and, in the Prometheus text format,
+        to ai_metrics.prom in the output directory.
+        """
+        logger.debug(f"Calling keyword: Get AI Usage Statistics with arguments: (module: {module}), (ai_model: {ai_model}), (model: {model}), (ai_tool: {ai_tool})")
+        return self.ai_interface.metrics.get_statistics(module=module, ai_model=ai_model, model=model, ai_tool=ai_tool)
+
+    @keyword
+    def reset_ai_usage_statistics(self):
+        """
+        Sets all AI usage statistics back to zero, for all modules.
+        """
+        logger.debug("Calling keyword: Reset AI Usage Statistics")
+        self.ai_interface.metrics.reset()
+
+    # Budgets
+    @keyword
+    def set_ai_budget(self, max_tokens: int = None, max_cost: float = None, scope: str = "global", policy: str = "fail"):
+        """
+        Limits the tokens and the estimated cost of the requests to AI models, for all modules.
+
+        Before each request its tokens are estimated as its max_tokens plus the tokens of its messages, see the Count Tokens
+        keyword, and its cost with the price of its model. When the response comes in, the estimate is replaced by the actual usage.
+        Responses from the response cache are free. Set the price of models with the Set AI Model Price keyword.
+        A test data job is checked as all of its requests together when it's submitted, its actual usage is counted when its
+        results are downloaded.
+
+        The following arguments can be used:
+        - max_tokens: int: The max amount of tokens. None means no limit. Default = None
+        - max_cost: float: The max estimated cost in dollars. None means no limit. Default = None
+        - scope: str: What the budget applies to. Default = "global"
+            - "global": The whole run.
+            - "suite": The running suite, including its child suites.
+            - "test": The running test. When used outside of a test, e.g. in a suite setup, each test of the suite gets this budget.
+        - policy: str: What happens when a request would exceed the budget. Default = "fail"
+            - "fail": The request is not sent and the keyword fails.
+            - "warn": The request is sent anyway and a warning is logged.
+
+        Setting a budget that already exists changes its limits and keeps what has been used so far.
+        The usage of all budgets can be seen with the Get AI Budget Report keyword, at the end of the run it is also
+        written to ai_budget_report.json in the output directory.
+        """
+        logger.debug(f"Calling keyword: Set AI Budget with arguments: (max_tokens: {max_tokens}), (max_cost: {max_cost}), (scope: {scope}), (policy: {policy})")
+        self.validate_input_arguments(budget_scope=scope, budget_policy=policy)
+        if max_tokens is not None and max_tokens <= 0:
+            error_message = f"Invalid value `{max_tokens}` for `max_tokens`. Value must be greater than 0."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        if max_cost is not None and max_cost < 0:
+            error_message = f"Invalid value `{max_cost}` for `max_cost`. Value must be greater than or equal to 0."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        self.ai_interface.budget.set_budget(scope, max_tokens, max_cost, policy)
+
+    @keyword
+    def remove_ai_budget(self, scope: str = "global"):
+        """
+        Removes the budget of the scope, for all modules. Its usage so far stays in the budget report.
+
+        The following arguments can be used:
+        - scope: str: The scope of the budget, "global", "suite" or "test". Default = "global"
+        """
+        logger.debug(f"Calling keyword: Remove AI Budget with arguments: (scope: {scope})")
+        self.validate_input_arguments(budget_scope=scope)
+        self.ai_interface.budget.remove_budget(scope)
+
+    @keyword
+    def get_ai_budget_report(self):
+        """
+        Returns the usage of every budget of the run as a list of dictionaries, budgets that ended first.
+
+        Each dictionary contains the scope, the name of the run, suite or test, the max_tokens, max_cost and policy,
+        the tokens and cost used, the amount of requests, the amount of requests blocked by the budget and whether it was exceeded.
+        """
+        logger.debug("Calling keyword: Get AI Budget Report")
+        return self.ai_interface.budget.get_report()
+
+    @keyword
+    def set_ai_model_price(self, model: str, input_price: float, output_price: float):
+        """
+        Sets the price of a model, used to estimate the cost of requests for budgets.
+
+        The following arguments can be used (arguments with a * are required):
+        - *model: str: The model, e.g. "gpt-4o". Also used for models whose name starts with it, like "gpt-4o-2024-08-06".
+        - *input_price: float: The price in dollars per 1 million prompt tokens.
+        - *output_price: float: The price in dollars per 1 million completion tokens.
+        """
+        logger.debug(f"Calling keyword: Set AI Model Price with arguments: (model: {model}), (input_price: {input_price}), (output_price: {output_price})")
+        if input_price < 0 or output_price < 0:
+            error_message = f"Invalid price `{input_price}`, `{output_price}` for `{model}`. Prices must be greater than or equal to 0."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        self.ai_interface.budget.price_table.set_price(model, input_price, output_price)
+
+    # Token counting
+    @keyword
+    def count_tokens(self, text: str, model: str = None):
+        """
+        Returns the amount of tokens of the text for the model, counted offline.
+
+        Models with a known tokenizer, like the OpenAI models, are counted exactly when tiktoken is installed.
+        Other models, or all models when tiktoken is not installed, are estimated from the words of the text.
+
+        The following arguments can be used (arguments with a * are required):
+        - *text: str: The text to count the tokens of.
+        - model: str: The model to count the tokens for, e.g. "gpt-4o". Default = None, which estimates the tokens.
+        """
+        logger.debug(f"Calling keyword: Count Tokens with arguments: (text: {text}), (model: {model})")
+        return self.ai_interface.token_counter.count(text, model)
+
+    @keyword
+    def configure_token_counting(self, tokenizer: str = "auto", overflow: str = "trim"):
+        """
+        Sets how the tokens of messages are counted and what happens when they don't fit, for all modules.
+
+        Before a message is sent to the text generator of an AI model its tokens are counted. When the message, the history
+        and the max_tokens don't fit in the context window of the model, the max_tokens is lowered to what is left and
+        the overflow policy determines what happens with the history.
+
+        The following arguments can be used:
+        - tokenizer: str: How tokens are counted. Default = "auto"
+            - "auto": Exactly with tiktoken for the models it knows, when it's installed. Estimated otherwise.
+            - "heuristic": Always estimated from the words of the text, which is faster.
+        - overflow: str: What happens when the history doesn't fit. Default = "trim"
+            - "trim": The oldest messages of the history are left out until it fits.
+            - "fail": The keyword fails.
+        """
+        logger.debug(f"Calling keyword: Configure Token Counting with arguments: (tokenizer: {tokenizer}), (overflow: {overflow})")
+        self.validate_input_arguments(tokenizer=tokenizer, overflow=overflow)
+        self.ai_interface.token_counter.configure(tokenizer, overflow)
+
+    @keyword
+    def set_model_context_window(self, model: str, context_window: int, max_completion_tokens: int = None, encoding: str = None):
+        """
+        Sets the limits of a model, used to fit messages in its context window.
+
+        The following arguments can be used (arguments with a * are required):
+        - *model: str: The model, e.g. "gpt-4o". Also used for models whose name starts with it, like "gpt-4o-2024-08-06".
+        - *context_window: int: The max amount of tokens of the prompt and the completion together.
+        - max_completion_tokens: int: The max amount of tokens of the completion. Default = None, which means no limit
+        - encoding: str: The name of the tiktoken encoding of the model, e.g. "o200k_base". Default = None, which estimates the tokens
+        """
+        logger.debug(f"Calling keyword: Set Model Context Window with arguments: (model: {model}), (context_window: {context_window}), (max_completion_tokens: {max_completion_tokens}), (encoding: {encoding})")
+        if context_window <= 0 or (max_completion_tokens is not None and max_completion_tokens <= 0):
+            error_message = f"Invalid context window `{context_window}`, `{max_completion_tokens}` for `{model}`. Values must be greater than 0."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        self.ai_interface.token_counter.set_model(model, context_window, max_completion_tokens, encoding)
+
     # Setters
     @keyword
     def set_ai_model(self, ai_model: str):
@@ -271,6 +1201,44 @@ class Module:
         logger.debug(f"Calling keyword: Set Response Format. Changing Response Format from `{self.response_format}` to `{response_format}`")
         self.response_format = response_format
 
+    @keyword
+    def set_cache_mode(self, cache_mode: str):
+        """
+        Setter for the Cache Mode argument.
+        cache_mode: str: How the response cache is used, only has effect when the response cache is enabled. Can be one of:
+            - "use": Return the cached response if there is one, otherwise call the AI model and cache its response.
+            - "refresh": Always call the AI model and replace the cached response.
+            - "bypass": Don't use the cache.
+        Default = "use".
+        See the RobotFrameworkAI docs for more information about setters.
+        """
+        logger.debug(f"Calling keyword: Set Cache Mode. Changing Cache Mode from `{self.cache_mode}` to `{cache_mode}`")
+        self.cache_mode = cache_mode
+
+    @keyword
+    def set_max_concurrency(self, max_concurrency: int):
+        """
+        Setter for the Max Concurrency argument.
+        max_concurrency: int: The max amount of requests that batch keywords, like Generate Responses, send at the same time.
+        Default = 5.
+        See the RobotFrameworkAI docs for more information about setters.
+        """
+        logger.debug(f"Calling keyword: Set Max Concurrency. Changing Max Concurrency from `{self.max_concurrency}` to `{max_concurrency}`")
+        self.max_concurrency = max_concurrency
+
+    @keyword
+    def set_priority(self, priority: str = None):
+        """
+        Setter for the Priority argument.
+        priority: str: The priority class of the requests of keywords when the scheduler has no free slots, see Configure AI Scheduler.
+        Can be one of "critical", "normal" and "bulk". When None, batch keywords and file uploads are bulk and other keywords normal.
+        Default = None.
+        See the RobotFrameworkAI docs for more information about setters.
+        """
+        logger.debug(f"Calling keyword: Set Priority. Changing Priority from `{self.priority}` to `{priority}`")
+        self.validate_input_arguments(priority=priority)
+        self.priority = priority
+
     @keyword
     def set_message(self, message: str):
         """
@@ -287,3 +1255,11 @@ class ValidationMethodNotFoundError(Exception):
 
     def __init__(self, error_message):
         super().__init__(error_message)
+
+
+class BatchError(Exception):
+    """Exception raised when one or more items of a batch keyword failed. Contains the results of all items."""
+
+    def __init__(self, error_message, results):
+        super().__init__(error_message)
+        self.results = results
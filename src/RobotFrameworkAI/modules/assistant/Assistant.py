@@ -25,6 +25,9 @@ class Assistant(Module):
     The assistant can be given instructions and parameters to influence its behaviour. These
     can be given at creation or later be changed using the Update Assistant keyword.
     """
+    # Actions whose requests are bulk work for the scheduler, unless a priority is set
+    BULK_ACTIONS = {"attach_files"}
+
     def __init__(self) -> None:
         super().__init__()
         self.module_name = "assistant"
@@ -54,6 +57,27 @@ class Assistant(Module):
 
         This method creates the prompt, sends it to the AI interface and returns the result.
         """
+        return self.ai_interface.run(self.make_assistant_call_async(
+            action, ai_model, name, model, temperature, top_p, response_format, id, message, instructions, file_paths
+        ))
+
+    async def make_assistant_call_async(
+            self,
+            action: str,
+            ai_model: str = None,
+            name: str = None,
+            model: str = None,
+            temperature: float = None,
+            top_p: float = None,
+            response_format: dict = None,
+            id: str = None,
+            message: str = None,
+            instructions: str = None,
+            file_paths: list[str] = None
+    ):
+        """
+        The asynchronous version of make_assistant_call
+        """
         ai_tool_data = AssistantData(action, id, name, instructions, file_paths)
         # Max token, frequency penalty and presence penalty are not available for assistants and are set to None
         prompt = self.create_prompt(
@@ -69,9 +93,11 @@ class Assistant(Module):
             None,
             None,
             response_format,
-            ai_tool_data
+            ai_tool_data,
+            # Uploading files can take long and nothing waits for it, so it shouldn't hold up other requests
+            priority = self.priority or ("bulk" if action in self.BULK_ACTIONS else None)
         )
-        response = self.ai_interface.call_ai_tool(prompt)
+        response = await self.ai_interface.call_ai_tool_async(prompt)
         return response
 
     @keyword
@@ -155,6 +181,55 @@ class Assistant(Module):
         response = self.make_assistant_call(action, ai_model=ai_model, message=message, file_paths=file_paths)
         return response.message
 
+    @keyword
+    def start_send_message(self, ai_model: str = None, message: str = None, file_paths: list = None):
+        """
+        Starts sending a prompt to the active assistant the same way as Send Message, but returns a handle instead of waiting for the response
+
+        Accepts the same arguments as Send Message, see its documentation. The arguments are validated immediately.
+        The test continues while the assistant responds, use Wait For Response with the handle to get the response.
+        Messages sent to the same thread are answered in order, so wait for the response before sending another message.
+        """
+        action = "send_message"
+        # If arguments are not given directly, get their default value. This is the value of the class attribute with the same name
+        ai_model, message = self.get_default_values_for_arguments(ai_model=ai_model, message=message)
+        # Log the arguments
+        args = locals()
+        args.pop("self")
+        logger.debug(f"Calling keyword `Start Send Message` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        # Validate arguments
+        self.validate_input_arguments(message=message)
+
+        return self.start_in_background("Start Send Message", self.send_message_response_async(action, ai_model, message, file_paths))
+
+    async def send_message_response_async(self, action: str, ai_model: str, message: str, file_paths: list):
+        """
+        Sends the message to the active assistant and returns the message of the Response
+        """
+        response = await self.make_assistant_call_async(action, ai_model=ai_model, message=message, file_paths=file_paths)
+        return response.message
+
+    @keyword
+    async def send_message_async(self, ai_model: str = None, message: str = None, file_paths: list = None):
+        """
+        Sends a prompt to the active assistant the same way as Send Message, but asynchronously
+
+        Accepts the same arguments as Send Message, see its documentation.
+        Messages sent to the same thread are answered in order, so don't send a message before the previous one got answered.
+        """
+        action = "send_message"
+        # If arguments are not given directly, get their default value. This is the value of the class attribute with the same name
+        ai_model, message = self.get_default_values_for_arguments(ai_model=ai_model, message=message)
+        # Log the arguments
+        args = locals()
+        args.pop("self")
+        logger.debug(f"Calling keyword `Send Message Async` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        # Validate arguments
+        self.validate_input_arguments(message=message)
+
+        response = await self.make_assistant_call_async(action, ai_model=ai_model, message=message, file_paths=file_paths)
+        return response.message
+
     @keyword
     def delete_assistant(self, ai_model: str = None):
         """
@@ -1,5 +1,7 @@
+import re
 from robot.api.deco import keyword, library
 
+from RobotFrameworkAI.ai_interface.cache.ResponseCache import ResponseCache
 from RobotFrameworkAI.modules.Module import Module
 import logging
 
@@ -18,6 +20,9 @@ class Chatbot(Module):
     set the keep_history flag to True. This will send your message along with
     your previous message and the response to it. Setting this flag to True for
     multiple messages in a row will keep the history for as long as it was True.
+
+    Optionally a semantic cache can be enabled. Messages that are almost the same as a message sent before,
+    e.g. only differing in whitespace or casing, then get the response to that previous message.
     """
     def __init__(self) -> None:
         super().__init__()
@@ -29,6 +34,9 @@ class Chatbot(Module):
         self.message = None
         self.keep_history = False
         self.response_format = None
+        self.stream = False
+        self.stop_pattern = None
+        self.semantic_cache = None
 
     @keyword
     def generate_response(
@@ -43,7 +51,10 @@ class Chatbot(Module):
             frequency_penalty:float=None,
             presence_penalty:float=None,
             keep_history:bool = None,
-            response_format:dict = None
+            response_format:dict = None,
+            cache_mode:str = None,
+            stream:bool = None,
+            stop_pattern:str = None
         ):
         """
         Chatbot
@@ -85,6 +96,13 @@ class Chatbot(Module):
         - response_format: dict: Can be used to make the response compile to JSON.
             Set this to { "type": "json_object" } to make the response compile to JSON or None if it shouldn't necessarily.
             Default = { "type": "json_object" }
+        - cache_mode: str: How the response cache is used, only has effect when the response cache is enabled with Enable Response Cache.
+            "use" returns a cached response if there is one, "refresh" always calls the AI model and replaces the cached response
+            and "bypass" doesn't use the cache. Default = "use"
+        - stream: bool: Receive the response in parts as it is generated. The time to first token and the tokens per second are then
+            recorded in the metadata of the response. Default = False
+        - stop_pattern: str: A regular expression. The response is streamed and the generation stops as soon as the response received so far
+            matches it, e.g. "(?:.*\\n){10}" stops after 10 lines. The response up to that point is returned. Default = None
 
         AI models
         =========
@@ -112,9 +130,221 @@ class Chatbot(Module):
         Each argument has its own setter, the name of the keyword is 'set' plus the name of the argument e.g. Set AI Model for AI Model.
         """        
 
+        prompt, keep_history = self.create_chatbot_prompt(
+            "Generate Response",
+            ai_model,
+            system_message,
+            message,
+            model,
+            max_tokens,
+            temperature,
+            top_p,
+            frequency_penalty,
+            presence_penalty,
+            keep_history,
+            response_format,
+            cache_mode,
+            stream,
+            stop_pattern
+        )
+        return self.ai_interface.run(self.generate_response_message_async(prompt, keep_history))
+
+    @keyword
+    async def generate_response_async(
+            self,
+            ai_model:str=None,
+            system_message:str=None,
+            message:str=None,
+            model:str=None,
+            max_tokens:int=None,
+            temperature:float=None,
+            top_p:float=None,
+            frequency_penalty:float=None,
+            presence_penalty:float=None,
+            keep_history:bool = None,
+            response_format:dict = None,
+            cache_mode:str = None,
+            stream:bool = None,
+            stop_pattern:str = None
+        ):
+        """
+        Generates a response the same way as Generate Response, but asynchronously
+
+        Accepts the same arguments as Generate Response, see its documentation.
+
+        Robot Framework runs this keyword on its own event loop, while the request is handled on the event loop of the
+        AI_Interface. When used from Python code, many responses can be generated at the same time by gathering them.
+        """
+        prompt, keep_history = self.create_chatbot_prompt(
+            "Generate Response Async",
+            ai_model,
+            system_message,
+            message,
+            model,
+            max_tokens,
+            temperature,
+            top_p,
+            frequency_penalty,
+            presence_penalty,
+            keep_history,
+            response_format,
+            cache_mode,
+            stream,
+            stop_pattern
+        )
+        return await self.generate_response_message_async(prompt, keep_history)
+
+    @keyword
+    def start_generate_response(
+            self,
+            ai_model:str=None,
+            system_message:str=None,
+            message:str=None,
+            model:str=None,
+            max_tokens:int=None,
+            temperature:float=None,
+            top_p:float=None,
+            frequency_penalty:float=None,
+            presence_penalty:float=None,
+            keep_history:bool = None,
+            response_format:dict = None,
+            cache_mode:str = None,
+            stream:bool = None,
+            stop_pattern:str = None
+        ):
+        """
+        Starts generating a response the same way as Generate Response, but returns a handle instead of waiting for the response
+
+        Accepts the same arguments as Generate Response, see its documentation. The arguments are validated immediately.
+        The test continues while the response is generated, use Wait For Response with the handle to get the response.
+        When keep_history is True, the history is updated when the response is received.
+        """
+        prompt, keep_history = self.create_chatbot_prompt(
+            "Start Generate Response",
+            ai_model,
+            system_message,
+            message,
+            model,
+            max_tokens,
+            temperature,
+            top_p,
+            frequency_penalty,
+            presence_penalty,
+            keep_history,
+            response_format,
+            cache_mode,
+            stream,
+            stop_pattern
+        )
+        return self.start_in_background("Start Generate Response", self.generate_response_message_async(prompt, keep_history))
+
+    @keyword
+    def generate_responses(
+            self,
+            messages:list,
+            ai_model:str=None,
+            system_message:str=None,
+            model:str=None,
+            max_tokens:int=None,
+            temperature:float=None,
+            top_p:float=None,
+            frequency_penalty:float=None,
+            presence_penalty:float=None,
+            response_format:dict = None,
+            cache_mode:str = None,
+            stream:bool = None,
+            stop_pattern:str = None,
+            max_concurrency:int = None,
+            return_errors:bool = False
+        ):
+        """
+        Generates a response for each message at the same time and returns the responses in the same order as the messages
+
+        Instead of looping over Generate Response, which waits for each response before sending the next message, this keyword
+        sends up to max_concurrency messages at the same time.
+
+        The following arguments can be used (arguments with a * are required):
+        - *messages: list: The messages to generate a response for. Each message is either a string or a dictionary with arguments of
+            Generate Response except keep_history, e.g. {"message": "What is 1 + 1?", "temperature": 0}. Arguments in a dictionary
+            take priority over the arguments of this keyword.
+        - max_concurrency: int: The max amount of messages sent at the same time. Default = 5
+        - return_errors: bool: When False, an error listing every message that failed is raised after all messages are done.
+            When True, the error of a failed message is returned in its place instead. Default = False
+        - All other arguments are the same as for Generate Response, see its documentation. They apply to every message.
+
+        The history is not used or kept, every message is sent on its own.
+        """
+        max_concurrency, = self.get_default_values_for_arguments(max_concurrency=max_concurrency)
+        # Log the arguments
+        args = locals()
+        args.pop("self")
+        logger.debug(f"Calling keyword `Generate Responses` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        self.validate_input_arguments(items=messages, max_concurrency=max_concurrency)
+        arguments = {
+            "ai_model": ai_model,
+            "system_message": system_message,
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "frequency_penalty": frequency_penalty,
+            "presence_penalty": presence_penalty,
+            "response_format": response_format,
+            "cache_mode": cache_mode,
+            "stream": stream,
+            "stop_pattern": stop_pattern
+        }
+        # Check the arguments of every message up front, so a typo fails the keyword instead of only its message
+        valid_arguments = ["message", *arguments]
+        for message in messages:
+            if not isinstance(message, dict):
+                continue
+            error_message = None
+            if "keep_history" in message:
+                error_message = f"Invalid argument `keep_history` in message `{message}`. Generate Responses doesn't use or keep the history."
+            elif not set(message) <= set(valid_arguments):
+                invalid_arguments = [key for key in message if key not in valid_arguments]
+                error_message = f"Invalid arguments `{'`, `'.join(map(str, invalid_arguments))}` in message `{message}`. Valid arguments are: `{'`, `'.join(valid_arguments)}`."
+            if error_message is not None:
+                logger.error(error_message)
+                raise ValueError(error_message)
+
+        async def generate_response(message):
+            message_arguments = {**arguments, **message} if isinstance(message, dict) else {**arguments, "message": message}
+            prompt, _ = self.create_chatbot_prompt("Generate Responses", keep_history=False, **message_arguments)
+            prompt.config.kwargs["priority"] = self.priority or "bulk"
+            response = await self.get_response_async(prompt, prompt.config.kwargs["cache_mode"])
+            return response.message
+
+        return self.run_batch("Generate Responses", messages, generate_response, max_concurrency, return_errors)
+
+    def create_chatbot_prompt(
+            self,
+            keyword_name:str,
+            ai_model:str,
+            system_message:str,
+            message:str,
+            model:str,
+            max_tokens:int,
+            temperature:float,
+            top_p:float,
+            frequency_penalty:float,
+            presence_penalty:float,
+            keep_history:bool,
+            response_format:dict,
+            cache_mode:str,
+            stream:bool = None,
+            stop_pattern:str = None
+        ):
+        """
+        Creates the Prompt for the Generate Response keywords
+
+        Arguments that are not given get their default value. All arguments get validated.
+        Returns the Prompt and whether the history should be kept.
+        """
         # Set defaut values for arguments
         # If arguments are not given directly, get its default value. This is the value of the class attribute with the same name
-        ai_model, system_message, message, model, max_tokens, temperature, top_p, frequency_penalty, presence_penalty, keep_history, response_format = self.get_default_values_for_arguments(
+        ai_model, system_message, message, model, max_tokens, temperature, top_p, frequency_penalty, presence_penalty, keep_history, response_format, cache_mode, stream, stop_pattern = self.get_default_values_for_arguments(
             ai_model = ai_model,
             system_message = system_message,
             message = message,
@@ -125,22 +355,30 @@ class Chatbot(Module):
             frequency_penalty = frequency_penalty,
             presence_penalty = presence_penalty,
             keep_history = keep_history,
-            response_format = response_format
+            response_format = response_format,
+            cache_mode = cache_mode,
+            stream = stream,
+            stop_pattern = stop_pattern
         )
         # Log the arguments
         args = locals()
         args.pop("self")
-        logger.debug(f"Calling keyword `Generate Response` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        args.pop("keyword_name")
+        logger.debug(f"Calling keyword `{keyword_name}` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
         # Validate arguments
+        self.is_valid_max_tokens(max_tokens, model or self.ai_interface.get_default_model(ai_model, self.ai_tool))
         self.validate_input_arguments(
             message = message,
-            max_tokens = max_tokens,
             temperature = temperature,
             top_p = top_p,
             frequency_penalty = frequency_penalty,
-            presence_penalty = presence_penalty
+            presence_penalty = presence_penalty,
+            cache_mode = cache_mode,
+            stop_pattern = stop_pattern
         )
         history = self.history if keep_history else None
+        # Matching the pattern requires the text received so far, so it implies streaming
+        stop_predicate = re.compile(stop_pattern).search if stop_pattern is not None else None
         prompt = self.create_prompt(
             self.ai_tool,
             ai_model,
@@ -153,18 +391,93 @@ class Chatbot(Module):
             top_p,
             frequency_penalty,
             presence_penalty,
-            response_format           
+            response_format,
+            cache_mode = cache_mode,
+            stream = stream,
+            stop_predicate = stop_predicate
         )
-        response = self.ai_interface.call_ai_tool(prompt)
+        return prompt, keep_history
+
+    async def generate_response_message_async(self, prompt:object, keep_history:bool):
+        """
+        Gets the Response to the Prompt, updates the history and returns the message of the Response
+        """
+        response = await self.get_response_async(prompt, prompt.config.kwargs["cache_mode"])
         self.set_history(prompt, response, keep_history)
         return response.message
 
+    async def get_response_async(self, prompt:object, cache_mode:str):
+        """
+        Sends the Prompt to the AI_Interface and returns the Response
+
+        When the semantic cache is enabled, the Response to a similar enough previous Prompt is returned instead.
+        The cache_mode applies to the semantic cache the same way as to the response cache. Like with the response cache,
+        Prompts that can't be cached, e.g. with a stop predicate, skip the semantic cache.
+        """
+        if self.semantic_cache is None or not ResponseCache.is_cacheable(prompt) or cache_mode == "bypass":
+            return await self.ai_interface.call_ai_tool_async(prompt)
+        if cache_mode == "use":
+            response = self.semantic_cache.get(prompt)
+            if response is not None:
+                return self.semantic_cache.annotate(response, "semantic_hit")
+        response = await self.ai_interface.call_ai_tool_async(prompt)
+        self.semantic_cache.set(prompt, response)
+        return response
+
     def set_history(self, prompt:object, response:object, keep_history:bool):
         if not keep_history:
             self.history = []
         self.history.append({"user": prompt.message.user})
         self.history.append({"assistant": response.message})
 
+    # Semantic cache
+    @keyword
+    def enable_semantic_cache(self, threshold: float = .95, max_entries: int = 100000, dimensions: int = 256):
+        """
+        Enables the semantic cache for the Generate Response keyword.
+
+        When enabled, a message that is almost the same as a message sent before gets the response to that previous message.
+        Messages are compared after turning them into vectors locally, no AI model is used for this. Messages only differing in
+        whitespace, casing or punctuation are always the same, messages differing in a few words are similar.
+        Everything other than the message, like the system message, history, model and parameters, has to be exactly the same.
+
+        The following arguments can be used:
+        - threshold: float: The minimal cosine similarity between 2 messages to be considered the same. Can be anything from 0-1.
+            Be careful with lowering it, "What is 1 + 1?" and "What is 1 + 2?" are very similar but shouldn't get the same response. Default = .95
+        - max_entries: int: The amount of responses kept. When full, the oldest responses are replaced. Each lookup reads a
+            signature of every response, with 100000 responses this takes about 0.4 ms with numpy 2 and 1 ms with older numpy. Default = 100000
+        - dimensions: int: The size of the vectors messages are turned into. Default = 256
+
+        *NOTE:* This requires numpy to be installed.
+        """
+        logger.debug(f"Calling keyword: Enable Semantic Cache with arguments: (threshold: {threshold}), (max_entries: {max_entries}), (dimensions: {dimensions})")
+        try:
+            from RobotFrameworkAI.ai_interface.cache.SemanticCache import SemanticCache
+        except ImportError as e:
+            error_message = f"The semantic cache requires numpy, install it with: pip install numpy. Error: {e}"
+            logger.error(error_message)
+            raise ImportError(error_message)
+        self.semantic_cache = SemanticCache(threshold, max_entries, dimensions)
+
+    @keyword
+    def disable_semantic_cache(self):
+        """
+        Disables the semantic cache and removes all its responses.
+        """
+        logger.debug("Calling keyword: Disable Semantic Cache")
+        self.semantic_cache = None
+
+    # Validation methods
+    def is_valid_stop_pattern(self, stop_pattern: str):
+        if stop_pattern is None:
+            return
+        try:
+            re.compile(stop_pattern)
+        except re.error as e:
+            error_message = f"Invalid value `{stop_pattern}` for `stop_pattern`. Value must be a valid regular expression: {e}"
+            logger.error(error_message)
+            raise ValueError(error_message)
+
     # Setters
     @keyword
     def set_system_message(self, system_message: str = None):
@@ -190,4 +503,26 @@ class Chatbot(Module):
         See the RobotFrameworkAI docs for more information about setters.
         """
         logger.debug(f"Calling keyword: Set Keep History. Changing Keep History from `{self.keep_history}` to `{keep_history}`")
-        self.keep_history = keep_history
\ No newline at end of file
+        self.keep_history = keep_history
+
+    @keyword
+    def set_stream(self, stream: bool = None):
+        """
+        Setter for the Stream argument.
+        stream: bool: Receive the response in parts as it is generated, recording the time to first token and the tokens per second.
+        Default = False.
+        See the RobotFrameworkAI docs for more information about setters.
+        """
+        logger.debug(f"Calling keyword: Set Stream. Changing Stream from `{self.stream}` to `{stream}`")
+        self.stream = stream
+
+    @keyword
+    def set_stop_pattern(self, stop_pattern: str = None):
+        """
+        Setter for the Stop Pattern argument.
+        stop_pattern: str: A regular expression, the generation stops as soon as the response received so far matches it.
+        Default = None.
+        See the RobotFrameworkAI docs for more information about setters.
+        """
+        logger.debug(f"Calling keyword: Set Stop Pattern. Changing Stop Pattern from `{self.stop_pattern}` to `{stop_pattern}`")
+        self.stop_pattern = stop_pattern
@@ -1,13 +1,23 @@
+import asyncio
 import importlib
 import inspect
 import os
 import pkgutil
+import time
 from robot.api.deco import keyword, library
+from robot.utils import timestr_to_secs
 
-from RobotFrameworkAI.modules.Module import Module
+from RobotFrameworkAI.ai_interface.ai_model_tools.BatchTool import BatchTool
+from RobotFrameworkAI.manifest.LazyRegistry import LazyRegistry
+from RobotFrameworkAI.manifest.manifest import TEST_DATA_GENERATORS
+from RobotFrameworkAI.modules.Module import BatchError, Module
 import logging
 
+from RobotFrameworkAI.modules.real_test_data_generator.TestDataJob import TestDataJob
 from RobotFrameworkAI.modules.real_test_data_generator.test_data_generators.TestDataGenerator import TestDataGenerator
+from RobotFrameworkAI.objects.prompt.ai_tool_data.BatchData import BatchData
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
 
 
 logger = logging.getLogger(__name__)
@@ -29,7 +39,8 @@ class RealTestDataGenerator(Module):
     def __init__(self) -> None:
         super().__init__()
         self.module_name = "real_test_data_generator"
-        self.generators = self._discover_test_data_generators()
+        # Test data generators are listed in the manifest and only get imported when first used
+        self.generators = LazyRegistry(TEST_DATA_GENERATORS)
         self.ai_tool = "text_generator"
         # Set arguments
         self.type = None
@@ -43,6 +54,7 @@ class RealTestDataGenerator(Module):
 
         A dictionary will be created with the type of each TestDataGenerator as the key and an instance as value.
         The type comes from the type attribute in the implementation of the TestDataGenerator.
+        This imports every TestDataGenerator, it's used to generate the manifest.
         """
         test_data_generators = {}
         package = 'RobotFrameworkAI.modules.real_test_data_generator.test_data_generators'
@@ -88,6 +100,7 @@ class RealTestDataGenerator(Module):
             frequency_penalty:float=None,
             presence_penalty:float=None,
             response_format:dict=None,
+            cache_mode:str=None,
             **kwargs
         ):
         """
@@ -117,6 +130,9 @@ class RealTestDataGenerator(Module):
             Negative values encourage it to reuse tokens. Can be anything from -2 to 2. Default = 0
         - presence_penalty:float: Exact same as frequency_penalty except its scope is reduced to the immediate context.
             Can be anything from -2 to 2. Default = 0
+        - cache_mode:str: How the response cache is used, only has effect when the response cache is enabled with Enable Response Cache.
+            "use" returns a cached response if there is one, "refresh" always calls the AI model and replaces the cached response
+            and "bypass" doesn't use the cache. Default = "use"
         - kwargs:dict: Additional arguments can be supplied for specific types of test data. These will be explained in per type below
 
         Required arguments can also be set using setters.
@@ -153,8 +169,423 @@ class RealTestDataGenerator(Module):
 
         Each argument has its own setter, the name of the keyword is 'set' plus the name of the argument e.g. Set AI Model for AI Model.
         """     
+        prompt, generator = self.create_test_data_prompt(
+            "Generate Test Data",
+            ai_model,
+            type,
+            model,
+            amount,
+            format,
+            max_tokens,
+            temperature,
+            top_p,
+            frequency_penalty,
+            presence_penalty,
+            response_format,
+            cache_mode,
+            **kwargs
+        )
+        return self.ai_interface.run(self.get_test_data_async(prompt, generator))
+
+    @keyword
+    async def generate_test_data_async(
+            self,
+            ai_model:str=None,
+            type:str=None,
+            model:str=None,
+            amount:int=None,
+            format:str=None,
+            max_tokens:int=None,
+            temperature:float=None,
+            top_p:float=None,
+            frequency_penalty:float=None,
+            presence_penalty:float=None,
+            response_format:dict=None,
+            cache_mode:str=None,
+            **kwargs
+        ):
+        """
+        Generates test data the same way as Generate Test Data, but asynchronously
+
+        Accepts the same arguments as Generate Test Data, see its documentation.
+
+        Robot Framework runs this keyword on its own event loop, while the request is handled on the event loop of the
+        AI_Interface. When used from Python code, test data of many types can be generated at the same time by gathering them.
+        """
+        prompt, generator = self.create_test_data_prompt(
+            "Generate Test Data Async",
+            ai_model,
+            type,
+            model,
+            amount,
+            format,
+            max_tokens,
+            temperature,
+            top_p,
+            frequency_penalty,
+            presence_penalty,
+            response_format,
+            cache_mode,
+            **kwargs
+        )
+        return await self.get_test_data_async(prompt, generator)
+
+    @keyword
+    def start_generate_test_data(
+            self,
+            ai_model:str=None,
+            type:str=None,
+            model:str=None,
+            amount:int=None,
+            format:str=None,
+            max_tokens:int=None,
+            temperature:float=None,
+            top_p:float=None,
+            frequency_penalty:float=None,
+            presence_penalty:float=None,
+            response_format:dict=None,
+            cache_mode:str=None,
+            **kwargs
+        ):
+        """
+        Starts generating test data the same way as Generate Test Data, but returns a handle instead of waiting for the test data
+
+        Accepts the same arguments as Generate Test Data, see its documentation. The arguments are validated immediately.
+        The test continues while the test data is generated, use Wait For Response with the handle to get the test data.
+        """
+        prompt, generator = self.create_test_data_prompt(
+            "Start Generate Test Data",
+            ai_model,
+            type,
+            model,
+            amount,
+            format,
+            max_tokens,
+            temperature,
+            top_p,
+            frequency_penalty,
+            presence_penalty,
+            response_format,
+            cache_mode,
+            **kwargs
+        )
+        return self.start_in_background("Start Generate Test Data", self.get_test_data_async(prompt, generator))
+
+    @keyword
+    def generate_test_data_batch(
+            self,
+            parameter_sets:list,
+            ai_model:str=None,
+            type:str=None,
+            model:str=None,
+            amount:int=None,
+            format:str=None,
+            max_tokens:int=None,
+            temperature:float=None,
+            top_p:float=None,
+            frequency_penalty:float=None,
+            presence_penalty:float=None,
+            response_format:dict=None,
+            cache_mode:str=None,
+            max_concurrency:int=None,
+            return_errors:bool=False,
+            **kwargs
+        ):
+        """
+        Generates test data for each parameter set at the same time and returns the test data in the same order as the parameter sets
+
+        Instead of looping over Generate Test Data, which waits for the test data before generating the next, this keyword
+        generates up to max_concurrency sets of test data at the same time.
+
+        The following arguments can be used (arguments with a * are required):
+        - *parameter_sets: list: The parameter sets to generate test data for. Each parameter set is either a string, which is used as
+            the type, or a dictionary with arguments of Generate Test Data, e.g. {"type": "address", "amount": 10, "country": "Netherlands"}.
+            Arguments in a dictionary take priority over the arguments of this keyword.
+        - max_concurrency: int: The max amount of test data generated at the same time. Default = 5
+        - return_errors: bool: When False, an error listing every parameter set that failed is raised after all parameter sets are done.
+            When True, the error of a failed parameter set is returned in its place instead. Default = False
+        - All other arguments are the same as for Generate Test Data, see its documentation. They apply to every parameter set.
+        """
+        max_concurrency, = self.get_default_values_for_arguments(max_concurrency=max_concurrency)
+        # Log the arguments
+        args = locals()
+        args.pop("self")
+        logger.debug(f"Calling keyword `Generate Test Data Batch` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        self.validate_input_arguments(items=parameter_sets, max_concurrency=max_concurrency)
+        arguments = {
+            "ai_model": ai_model,
+            "type": type,
+            "model": model,
+            "amount": amount,
+            "format": format,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "frequency_penalty": frequency_penalty,
+            "presence_penalty": presence_penalty,
+            "response_format": response_format,
+            "cache_mode": cache_mode,
+            **kwargs
+        }
+
+        async def generate_test_data(parameter_set):
+            parameter_set_arguments = {**arguments, **parameter_set} if isinstance(parameter_set, dict) else {**arguments, "type": parameter_set}
+            prompt, generator = self.create_test_data_prompt("Generate Test Data Batch", **parameter_set_arguments)
+            prompt.config.kwargs["priority"] = self.priority or "bulk"
+            return await self.get_test_data_async(prompt, generator)
+
+        return self.run_batch("Generate Test Data Batch", parameter_sets, generate_test_data, max_concurrency, return_errors)
+
+    # Test data jobs
+    @keyword
+    def submit_test_data_job(
+            self,
+            job_directory:str,
+            parameter_sets:list,
+            ai_model:str=None,
+            type:str=None,
+            model:str=None,
+            amount:int=None,
+            format:str=None,
+            max_tokens:int=None,
+            temperature:float=None,
+            top_p:float=None,
+            frequency_penalty:float=None,
+            presence_penalty:float=None,
+            **kwargs
+        ):
+        """
+        Submits a job that generates test data for each parameter set offline, in a single batch, and returns the id of the batch
+
+        Where Generate Test Data Batch sends a request per parameter set and waits for all of them, a test data job uploads all
+        requests at once as a batch. The AI model handles the batch on its own time, usually within minutes but at most within
+        24 hours, for half the price. This is meant for generating large datasets, e.g. in a nightly run that prepares the
+        test data for the next day. Use Wait For Test Data Job to get the test data.
+
+        Everything about the job is kept in the job directory, so it survives the end of the test run. When the job directory
+        already has a job, that job is picked up again instead of submitting a new one. This way a run that was stopped
+        can simply be started again. Delete the job directory to start over.
+
+        The following arguments can be used (arguments with a * are required):
+        - *job_directory: str: The directory to keep the job in. It is created when it doesn't exist.
+        - *parameter_sets: list: The parameter sets to generate test data for, the same as for Generate Test Data Batch.
+            All parameter sets have to use the same AI model.
+        - All other arguments are the same as for Generate Test Data, see its documentation. They apply to every parameter set.
+            The response cache isn't used for test data jobs.
+
+        Currently supporting the AI models: "openai" and "mock".
+        """
+        logger.debug(f"Calling keyword: Submit Test Data Job with arguments: (job_directory: {job_directory}), (parameter_sets: {parameter_sets}), (ai_model: {ai_model}), (type: {type}), (model: {model}), (amount: {amount}), (format: {format}), (max_tokens: {max_tokens}), (temperature: {temperature}), (top_p: {top_p}), (frequency_penalty: {frequency_penalty}), (presence_penalty: {presence_penalty}), (kwargs: {kwargs})")
+        job = TestDataJob(job_directory)
+        if job.exists() and job.load().status != "created":
+            logger.info(f"Picking up {job} instead of submitting a new one")
+            return job.state["batch_id"]
+
+        self.validate_input_arguments(items=parameter_sets)
+        arguments = {
+            "ai_model": ai_model,
+            "type": type,
+            "model": model,
+            "amount": amount,
+            "format": format,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "frequency_penalty": frequency_penalty,
+            "presence_penalty": presence_penalty,
+            "response_format": None,
+            "cache_mode": None,
+            **kwargs
+        }
+        prompts = {}
+        requests = []
+        for index, parameter_set in enumerate(parameter_sets):
+            parameter_set_arguments = {**arguments, **parameter_set} if isinstance(parameter_set, dict) else {**arguments, "type": parameter_set}
+            prompt, generator = self.create_test_data_prompt("Submit Test Data Job", **parameter_set_arguments)
+            custom_id = f"request-{index}"
+            prompts[custom_id] = prompt
+            requests.append({"custom_id": custom_id, "type": generator.type, "parameter_set": parameter_set})
+        ai_models = {prompt.config.ai_model for prompt in prompts.values()}
+        models = {prompt.config.model for prompt in prompts.values()}
+        if len(ai_models) != 1 or len(models) != 1:
+            error_message = f"All parameter sets of a test data job have to use the same AI model and model, got the AI models `{'`, `'.join(map(str, ai_models))}` and the models `{'`, `'.join(map(str, models))}`."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        ai_model, model = ai_models.pop(), models.pop()
+
+        # The job is saved before it is submitted, so the parameter sets are known even when submitting fails
+        job.create(ai_model, model, requests)
+        prompt = self.create_batch_prompt(job, "submit_batch", job.requests_path, prompts)
+        response = self.ai_interface.run(self.ai_interface.call_ai_tool_async(prompt))
+        job.update(status="submitted", batch_id=response.message, batch_status=response.metadata.kwargs.get("status"))
+        logger.debug(f"Submitted {job}")
+        return job.state["batch_id"]
+
+    @keyword
+    def wait_for_test_data_job(self, job_directory:str, timeout:str=None, poll_interval:str="10s", return_errors:bool=False):
+        """
+        Waits for the test data job to finish and returns the test data of each parameter set, in the same order as the parameter sets
+
+        The results of the batch are downloaded to the job directory and turned into test data, which is kept in the
+        dataset.jsonl file of the job directory. Once a job is done, this keyword returns the test data from that file
+        without calling the AI model again.
+
+        The following arguments can be used (arguments with a * are required):
+        - *job_directory: str: The directory of the job, as given to Submit Test Data Job.
+        - timeout: str: The max time to wait, e.g. "30s" or "1 hour". When the job isn't finished in time an error is raised,
+            but the job keeps running so it can be waited for again, even by a later run. None means wait as long as it takes. Default = None
+        - poll_interval: str: How long to wait between checking whether the batch is finished, e.g. "10s" or "1 minute". Default = "10s"
+        - return_errors: bool: When False, an error listing every parameter set that failed is raised. When True, the error
+            of a failed parameter set is returned in its place instead. Default = False
+        """
+        logger.debug(f"Calling keyword: Wait For Test Data Job with arguments: (job_directory: {job_directory}), (timeout: {timeout}), (poll_interval: {poll_interval}), (return_errors: {return_errors})")
+        job = self.get_test_data_job(job_directory)
+        timeout = timestr_to_secs(timeout) if timeout is not None else None
+        poll_interval = timestr_to_secs(poll_interval)
+
+        if job.status == "submitted":
+            self.ai_interface.run(self.wait_for_batch_async(job, timeout, poll_interval))
+            prompt = self.create_batch_prompt(job, "download_batch_results", job.results_path)
+            response = self.ai_interface.run(self.ai_interface.call_ai_tool_async(prompt))
+            job.update(status="downloaded", results=response.metadata.kwargs.get("results"), errors=response.metadata.kwargs.get("errors"))
+        if job.status == "downloaded":
+            self.create_dataset(job)
+            job.update(status="done")
+
+        results = [
+            line["test_data"] if line["error"] is None else ValueError(line["error"])
+            for line in job.read_jsonl(job.dataset_path)
+        ]
+        errors = [(index, result) for index, result in enumerate(results) if isinstance(result, Exception)]
+        logger.debug(f"Finished {job}: {len(results) - len(errors)} of {len(results)} parameter sets succeeded")
+        if errors and not return_errors:
+            error_message = f"{len(errors)} of {len(results)} parameter sets of the test data job failed: " + "; ".join(f"item {index}: {error}" for index, error in errors)
+            logger.error(error_message)
+            raise BatchError(error_message, results)
+        return results
+
+    @keyword
+    def get_test_data_job_status(self, job_directory:str):
+        """
+        Returns the status of the test data job as a dictionary
+
+        The dictionary contains:
+        - status: The status of the job: "created", "submitted", "downloaded" or "done".
+        - batch_id: The id of the batch.
+        - batch_status: The status of the batch at the AI model, e.g. "in_progress" or "completed".
+        - request_counts: The total, completed and failed amount of requests of the batch.
+
+        The following arguments can be used (arguments with a * are required):
+        - *job_directory: str: The directory of the job, as given to Submit Test Data Job.
+        """
+        logger.debug(f"Calling keyword: Get Test Data Job Status with arguments: (job_directory: {job_directory})")
+        job = self.get_test_data_job(job_directory)
+        if job.status == "submitted":
+            response = self.ai_interface.run(self.ai_interface.call_ai_tool_async(self.create_batch_prompt(job, "get_batch")))
+            job.update(batch_status=response.message, request_counts=response.metadata.kwargs.get("request_counts"))
+        return {key: job.state.get(key) for key in ("status", "batch_id", "batch_status", "request_counts")}
+
+    @keyword
+    def cancel_test_data_job(self, job_directory:str):
+        """
+        Cancels the batch of the test data job
+
+        Requests that were already handled are kept, Wait For Test Data Job returns their test data and an error for the others.
+
+        The following arguments can be used (arguments with a * are required):
+        - *job_directory: str: The directory of the job, as given to Submit Test Data Job.
+        """
+        logger.debug(f"Calling keyword: Cancel Test Data Job with arguments: (job_directory: {job_directory})")
+        job = self.get_test_data_job(job_directory)
+        if job.status != "submitted":
+            logger.warning(f"{job} can't be cancelled as its batch is already finished")
+            return
+        response = self.ai_interface.run(self.ai_interface.call_ai_tool_async(self.create_batch_prompt(job, "cancel_batch")))
+        job.update(batch_status=response.message)
+
+    def get_test_data_job(self, job_directory:str) -> TestDataJob:
+        """
+        Loads the test data job, raises an error when it hasn't been submitted
+        """
+        job = TestDataJob(job_directory).load()
+        if job.status == "created":
+            error_message = f"{job} hasn't been submitted. Submit it again with Submit Test Data Job."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        return job
+
+    def create_batch_prompt(self, job:TestDataJob, action:str, file_path:str=None, prompts:dict=None):
+        """
+        Creates the Prompt for an action on the batch of the test data job
+        """
+        ai_tool_data = BatchData(action, job.state["batch_id"], file_path, prompts or {})
+        return self.create_prompt("batch", job.state["ai_model"], None, None, None, job.state["model"], None, None, None, None, None, None, ai_tool_data)
+
+    async def wait_for_batch_async(self, job:TestDataJob, timeout:float, poll_interval:float):
+        """
+        Checks the status of the batch of the job every poll_interval seconds until it is finished
+        """
+        start = time.monotonic()
+        while True:
+            response = await self.ai_interface.call_ai_tool_async(self.create_batch_prompt(job, "get_batch"))
+            job.update(batch_status=response.message, request_counts=response.metadata.kwargs.get("request_counts"))
+            if response.message in BatchTool.FINISHED_STATUSES:
+                return
+            if timeout is not None and time.monotonic() - start + poll_interval > timeout:
+                error_message = f"{job} didn't finish within {timeout} seconds, its batch is {response.message}"
+                logger.error(error_message)
+                raise TimeoutError(error_message)
+            await asyncio.sleep(poll_interval)
+
+    def create_dataset(self, job:TestDataJob):
+        """
+        Turns the results of the batch into test data with the TestDataGenerator of each request and writes them to the dataset
+
+        Requests without a result, e.g. because the batch was cancelled, get an error.
+        """
+        results = {result["custom_id"]: result for result in job.read_jsonl(job.results_path)}
+        dataset = []
+        for request in job.state["requests"]:
+            result = results.get(request["custom_id"])
+            test_data, error = None, None
+            if result is None:
+                error = f"The batch has no result for this parameter set, the batch is {job.state.get('batch_status')}"
+            elif result["error"] is not None:
+                error = result["error"]
+            else:
+                metadata = ResponseMetadata("batch", job.state["ai_model"], result["model"], result["finish_reason"], result["prompt_tokens"], result["completion_tokens"])
+                try:
+                    test_data = self.generators[request["type"]].format_response(Response(result["message"], metadata))
+                except Exception as e:
+                    error = f"Failed to generate test data: {e}"
+            dataset.append({"custom_id": request["custom_id"], "test_data": test_data, "error": error})
+        BatchTool.write_jsonl(job.dataset_path, dataset)
+
+    def create_test_data_prompt(
+            self,
+            keyword_name:str,
+            ai_model:str,
+            type:str,
+            model:str,
+            amount:int,
+            format:str,
+            max_tokens:int,
+            temperature:float,
+            top_p:float,
+            frequency_penalty:float,
+            presence_penalty:float,
+            response_format:dict,
+            cache_mode:str,
+            **kwargs
+        ):
+        """
+        Creates the Prompt for the Generate Test Data keywords
+
+        Arguments that are not given get their default value. All arguments get validated.
+        Returns the Prompt and the TestDataGenerator of the type of test data.
+        """
         # If arguments are not given directly, get its default value. This is the value of the class attribute with the same name
-        ai_model, model, max_tokens, temperature, top_p, frequency_penalty, presence_penalty, type, amount, format, kwargs = self.get_default_values_for_arguments(
+        ai_model, model, max_tokens, temperature, top_p, frequency_penalty, presence_penalty, type, amount, format, cache_mode, kwargs = self.get_default_values_for_arguments(
             ai_model=ai_model,
             model=model,
             max_tokens=max_tokens,
@@ -165,6 +596,7 @@ class RealTestDataGenerator(Module):
             type=type,
             amount=amount,
             format=format,
+            cache_mode=cache_mode,
             kwargs=kwargs
         )
         # Response format should always be a json object
@@ -172,15 +604,17 @@ class RealTestDataGenerator(Module):
         # Log the arguments
         args = locals()
         args.pop("self")
-        logger.debug(f"Calling keyword `Generate Test Data` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
+        args.pop("keyword_name")
+        logger.debug(f"Calling keyword `{keyword_name}` with arguments: {', '.join(f'({k}: {v})' for k, v in args.items())}")
         # Validate arguments
+        self.is_valid_max_tokens(max_tokens, model or self.ai_interface.get_default_model(ai_model, self.ai_tool))
         self.validate_input_arguments(
             type=type,
-            max_tokens=max_tokens,
             temperature=temperature,
             top_p=top_p,
             frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty
+            presence_penalty=presence_penalty,
+            cache_mode=cache_mode
         )
         generator = self.generators[type]
         system_message, user_message = generator.create_prompt_messages(amount, format, kwargs)
@@ -196,18 +630,26 @@ class RealTestDataGenerator(Module):
             top_p,
             frequency_penalty,
             presence_penalty,
-            response_format
+            response_format,
+            cache_mode=cache_mode
         )
         logger.debug(f"Prompt: {prompt}")
+        return prompt, generator
+
+    async def get_test_data_async(self, prompt, generator):
+        """
+        Sends the Prompt to the AI_Interface and returns the Response formatted by the TestDataGenerator
+        """
+        # Errors of the AI model are raised as is, so they can be told apart from a response that isn't valid test data
+        response = await self.ai_interface.call_ai_tool_async(prompt)
+        logger.debug(f"Response from AI tool: {response}")
         try:
-            response = self.ai_interface.call_ai_tool(prompt)
-            logger.debug(f"Response from AI tool: {response}")
             response = generator.format_response(response)
             logger.debug(f"Formatted response: {response}")
         except Exception as e:
             error_message = f"Failed to generate test data: {e}"
             logger.error(error_message)
-            raise ValueError(error_message)
+            raise ValueError(error_message) from e
 
         logger.debug(f"Generated test data: {response}")
         return response
@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class TestDataJob:
+    """
+    The state of a test data job, kept on disk so the job can be picked up again by a later run
+
+    A test data job generates the test data of many parameter sets with a single batch. Batches can take up to a day,
+    so everything needed to continue the job is kept in its directory:
+    - job.json: The state of the job, see below.
+    - requests.jsonl: The requests of the batch, as uploaded to the AI model.
+    - results.jsonl: The results of the batch, as downloaded from the AI model.
+    - dataset.jsonl: The test data of each parameter set, one line per parameter set in the same order.
+
+    The status of a job goes from created, when the requests are known but the batch isn't submitted yet, to submitted,
+    downloaded and finally done. Each step only happens once, a job that is picked up again continues where it was left.
+    The state is written to a temporary file first, so a run that stops halfway never leaves a broken job behind.
+    """
+    STATUSES = ("created", "submitted", "downloaded", "done")
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.job_path = os.path.join(directory, "job.json")
+        self.requests_path = os.path.join(directory, "requests.jsonl")
+        self.results_path = os.path.join(directory, "results.jsonl")
+        self.dataset_path = os.path.join(directory, "dataset.jsonl")
+        self.state: dict = {}
+
+    def exists(self) -> bool:
+        return os.path.exists(self.job_path)
+
+    def load(self) -> "TestDataJob":
+        if not self.exists():
+            error_message = f"No test data job found in `{self.directory}`. Submit one first with Submit Test Data Job."
+            logger.error(error_message)
+            raise ValueError(error_message)
+        with open(self.job_path, encoding="utf-8") as file:
+            self.state = json.load(file)
+        return self
+
+    def save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.state["updated"] = int(time.time())
+        temporary_path = f"{self.job_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file, indent=4, default=str)
+        os.replace(temporary_path, self.job_path)
+
+    def create(self, ai_model: str, model: str, requests: list) -> None:
+        """
+        Creates the state of a new job, requests is a list of dictionaries with the custom_id, type and parameter set of each request
+        """
+        now = int(time.time())
+        self.state = {
+            "status": "created",
+            "ai_model": ai_model,
+            "model": model,
+            "batch_id": None,
+            "batch_status": None,
+            "requests": requests,
+            "created": now,
+            "updated": now
+        }
+        self.save()
+
+    def update(self, **state) -> None:
+        self.state.update(state)
+        self.save()
+
+    @property
+    def status(self) -> str:
+        return self.state.get("status")
+
+    def read_jsonl(self, file_path: str) -> list:
+        with open(file_path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    def __str__(self) -> str:
+        return f"TestDataJob({self.directory}, status: {self.status}, batch: {self.state.get('batch_id')})"
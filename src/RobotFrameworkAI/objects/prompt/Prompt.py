@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+import hashlib
+import json
 from typing import List, Dict
 from RobotFrameworkAI.objects.prompt.PromptConfig import PromptConfig
 from RobotFrameworkAI.objects.prompt.PromptMessage import PromptMessage
@@ -26,3 +28,47 @@ class Prompt:
     parameters: Dict
     metadata: PromptMetadata
     ai_tool_data: AIToolData
+
+    def fingerprint(self) -> str:
+        """
+        Returns a hash of everything in the Prompt that influences the response of the AI model
+
+        Two Prompts with the same config, messages, parameters, response_format and AI tool data have the same fingerprint.
+        The metadata and the config kwargs are left out, as they don't change what gets sent to the AI model.
+        """
+        content = {
+            "ai_tool": self.config.ai_tool,
+            "ai_model": self.config.ai_model,
+            "model": self.config.model,
+            "response_format": self.config.response_format,
+            "system": self.message.system,
+            "user": self.message.user,
+            "history": self.message.history,
+            "parameters": self.parameters,
+            "ai_tool_data": asdict(self.ai_tool_data) if self.ai_tool_data is not None else None
+        }
+        canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def to_dict(self) -> dict:
+        """
+        Returns the Prompt as a dictionary that can be turned into JSON, when its config kwargs can
+
+        The AI tool data is left out, only Prompts without it can be turned back into a Prompt.
+        """
+        data = asdict(self)
+        data.pop("ai_tool_data")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Prompt":
+        """
+        Creates a Prompt from a dictionary created by to_dict
+        """
+        return cls(
+            PromptConfig(**data["config"]),
+            PromptMessage(**data["message"]),
+            data["parameters"],
+            PromptMetadata(**data["metadata"]),
+            None
+        )
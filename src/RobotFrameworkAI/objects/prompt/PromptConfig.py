@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict
 
 @dataclass
@@ -7,9 +7,10 @@ class PromptConfig:
     This object contains the configuration data for the Prompt.
 
     It contains the information about what AI tool and model to use and how to format the response.
+    The kwargs contain settings for how the Prompt is handled, e.g. the cache_mode, they are not sent to the AI model.
     """
     ai_tool: str
     ai_model: str
     model: str
     response_format: Dict
-    kwargs: Dict = None
+    kwargs: Dict = field(default_factory=dict)
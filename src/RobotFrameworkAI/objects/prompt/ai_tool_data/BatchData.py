@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from RobotFrameworkAI.objects.prompt.ai_tool_data.AIToolData import AIToolData
+
+@dataclass
+class BatchData(AIToolData):
+    """
+    Additional data used when using an AI batch tool.
+
+    Attributes:
+        action (str): Determines what you want to do with the batch.
+        id (Optional[str]): Identifier of the batch.
+        file_path (Optional[str]): The file the requests of the batch are written to before they are uploaded,
+            or the file the results of the batch are written to when they are downloaded.
+        prompts (Dict[str, Prompt]): The Prompts of the batch by their custom id, when submitting it.
+    """
+    action: str
+    id: Optional[str] = None
+    file_path: Optional[str] = None
+    prompts: Dict[str, object] = field(default_factory=dict)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
 
 @dataclass
@@ -15,3 +15,16 @@ class Response:
     """
     message: str
     metadata: ResponseMetadata
+
+    def to_dict(self) -> dict:
+        """
+        Returns the Response as a dictionary that can be turned into JSON
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Response":
+        """
+        Creates a Response from a dictionary created by to_dict
+        """
+        return cls(data["message"], ResponseMetadata(**data["metadata"]))
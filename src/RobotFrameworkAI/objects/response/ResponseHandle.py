@@ -0,0 +1,61 @@
+import concurrent.futures
+import logging
+import time
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseHandle:
+    """
+    A handle to a response that is being generated in the background
+
+    Start keywords, like Start Generate Response, return a ResponseHandle instead of waiting for the response.
+    The request is handled on the event loop of the AI_Interface, so the test can continue in the meantime.
+    The result can be collected later using the Wait For Response or Wait For All Responses keywords.
+
+    The result is whatever the corresponding keyword without Start would have returned, e.g. the message of the
+    Response for Start Generate Response. If the request failed, getting the result raises its error.
+    """
+    def __init__(self, future: concurrent.futures.Future, keyword_name: str) -> None:
+        self.future = future
+        self.keyword_name = keyword_name
+        self.start_time = time.time()
+
+    def done(self) -> bool:
+        """
+        Returns whether the result is available
+        """
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None):
+        """
+        Waits for and returns the result
+
+        Raises a TimeoutError if the result isn't available within timeout seconds. The request keeps running in that case,
+        so the result can be waited for again.
+        """
+        try:
+            return self.future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            error_message = f"`{self.keyword_name}` did not finish within {timeout} seconds"
+            logger.error(error_message)
+            raise TimeoutError(error_message) from None
+
+    def cancel(self) -> bool:
+        """
+        Cancels the request if it hasn't finished yet, returns whether it was cancelled
+        """
+        return self.future.cancel()
+
+    def __repr__(self) -> str:
+        if not self.future.done():
+            state = "running"
+        elif self.future.cancelled():
+            state = "cancelled"
+        elif self.future.exception() is not None:
+            state = "failed"
+        else:
+            state = "done"
+        return f"<ResponseHandle `{self.keyword_name}` {state}>"
@@ -14,6 +14,13 @@ class ResponseMetadata:
     The amount of tokens used in the prompt.
     The amount of tokens used in the response.
     The time of completion. 
+    Whether the Response came from the response cache and the cache's hit and miss counters.
+    The amount of seconds the Prompt waited for the rate limit before it was sent.
+    The amount of seconds the Prompt waited for a slot of the scheduler before it was sent.
+    The amount of times the Prompt was retried and the state of the circuit breaker of the model afterwards.
+    Whether the Response is a copy of the Response to an identical Prompt that was in flight at the same time.
+    Whether the Response came from a hedge request, sent because the first request took long.
+    When streamed, the seconds until the first token came in and the tokens per second after that.
     """
     ai_tool: str
     ai_model: str
@@ -23,3 +30,14 @@ class ResponseMetadata:
     completion_tokens: int = 0
     time: int = field(default_factory=lambda: int(time.time()))
     kwargs: dict = field(default_factory=dict)
+    cache_status: Optional[str] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    queue_wait: float = 0
+    scheduler_wait: float = 0
+    retries: int = 0
+    circuit_state: Optional[str] = None
+    coalesced: bool = False
+    hedged: bool = False
+    time_to_first_token: Optional[float] = None
+    tokens_per_second: Optional[float] = None
@@ -0,0 +1,487 @@
+import email.parser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockBehaviour, MockClient
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockTool import MockTool
+
+
+logger = logging.getLogger(__name__)
+
+
+class StubServer:
+    """
+    An HTTP server that speaks the part of the OpenAI API used by this library
+
+    It handles chat completions (also streamed), models, assistants, threads, messages, runs, files, vector stores and batches.
+    Everything is kept in memory and the content of responses is made up like the mock AI model does, so responses are
+    deterministic and follow the response format. The latency and errors of requests are set with a MockBehaviour, failed
+    requests get a 429 or 500 response with an OpenAI error body. When streaming, each word takes token_latency seconds.
+
+    Batches of chat completions are handled in a thread. They stay in progress for batch_latency seconds, after which
+    every request of the batch is answered. Errors are injected per request, failed requests end up in the error file.
+
+    Point OpenAI at the server with Configure AI Transport    openai    base_url=${url}, or with the OPENAI_BASE_URL
+    environment variable. The OpenAI client still needs a key, but any key is accepted.
+
+        with StubServer(behaviour=MockBehaviour(latency=.2)) as server:
+            ...  # send requests to server.url
+
+    The server runs in a thread and handles each connection in its own thread. Connections are kept alive.
+    """
+    def __init__(
+            self,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            behaviour: MockBehaviour = None,
+            token_latency: float = 0,
+            batch_latency: float = 0
+        ) -> None:
+        behaviour = behaviour or MockBehaviour()
+        behaviour.validate()
+        self.mock_client = MockClient(behaviour)
+        self.mock_tool = MockTool()
+        self.token_latency = token_latency
+        self.batch_latency = batch_latency
+        self.http_server = ThreadingHTTPServer((host, port), StubRequestHandler)
+        self.http_server.daemon_threads = True
+        self.http_server.stub = self
+        self.thread: Optional[threading.Thread] = None
+        # Everything created through the API, by id
+        self.objects: dict = {}
+        # The content of uploaded and created files, by id
+        self.file_contents: dict = {}
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # The amount of requests and errors per route, e.g. "POST /chat/completions"
+        self.requests: dict = {}
+        self.errors: dict = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self.http_server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        """
+        Starts the server in a thread and returns its URL
+        """
+        self.thread = threading.Thread(target=self.http_server.serve_forever, args=(.05,), name="StubServer", daemon=True)
+        self.thread.start()
+        logger.info(f"Stub server listening on {self.url}")
+        return self.url
+
+    def stop(self):
+        self.http_server.shutdown()
+        self.http_server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def set_behaviour(self, behaviour: MockBehaviour):
+        self.mock_client.set_behaviour(behaviour)
+
+    def get_statistics(self) -> dict:
+        with self.lock:
+            return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+    def create_id(self, prefix: str) -> str:
+        return f"{prefix}_stub_{next(self._ids)}"
+
+    def add(self, object: dict) -> dict:
+        with self.lock:
+            self.objects[object["id"]] = object
+        return object
+
+    def get(self, id: str, object_type: str) -> dict:
+        with self.lock:
+            object = self.objects.get(id)
+        if object is None or object["object"] != object_type:
+            raise StubError(404, f"No {object_type} found with id '{id}'.", "invalid_request_error")
+        return object
+
+    def count(self, route: str, status: int):
+        with self.lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+            if status >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    # Chat completions
+    def create_completion(self, body: dict):
+        """
+        Returns the content of the completion with its finish reason and usage
+        """
+        messages = body.get("messages", [])
+        system = next((message["content"] for message in messages if message["role"] == "system"), None)
+        user = next((message["content"] for message in reversed(messages) if message["role"] == "user"), None)
+        model, response_format = body.get("model"), body.get("response_format")
+        seed = self.mock_tool.create_seed(model, messages, response_format)
+        content = self.mock_tool.create_content(system, user, response_format, seed)
+        content, completion_tokens, finish_reason = self.mock_tool.pad_content(
+            content, body.get("max_tokens") or body.get("max_completion_tokens"), self.mock_client.behaviour.completion_tokens
+        )
+        prompt_tokens = self.mock_tool.count_tokens(*(message.get("content") for message in messages if isinstance(message.get("content"), str)))
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+        return content, finish_reason, usage
+
+    def chat_completion(self, body: dict) -> dict:
+        content, finish_reason, usage = self.create_completion(body)
+        return {
+            "id": self.create_id("chatcmpl"), "object": "chat.completion", "created": int(time.time()), "model": body.get("model"),
+            "choices": [{"index": 0, "finish_reason": finish_reason, "logprobs": None, "message": {"role": "assistant", "content": content}}],
+            "usage": usage
+        }
+
+    def chat_completion_chunks(self, body: dict):
+        content, finish_reason, usage = self.create_completion(body)
+        id, created = self.create_id("chatcmpl"), int(time.time())
+        def chunk(choices, usage=None):
+            return {"id": id, "object": "chat.completion.chunk", "created": created, "model": body.get("model"), "choices": choices, "usage": usage}
+        for i, word in enumerate(content.split(" ")):
+            yield chunk([{"index": 0, "delta": {"role": "assistant", "content": word if i == 0 else f" {word}"}, "finish_reason": None}])
+        yield chunk([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield chunk([], usage)
+
+    # Assistants
+    def create_assistant(self, body: dict, id: str = None) -> dict:
+        assistant = {
+            "id": id or self.create_id("asst"), "object": "assistant", "created_at": int(time.time()), "description": None,
+            "name": body.get("name"), "model": body.get("model"), "instructions": body.get("instructions"),
+            "tools": body.get("tools", []), "tool_resources": body.get("tool_resources") or {}, "metadata": body.get("metadata") or {},
+            "temperature": body.get("temperature"), "top_p": body.get("top_p"), "response_format": body.get("response_format") or "auto"
+        }
+        return self.add(assistant)
+
+    def update_assistant(self, id: str, body: dict) -> dict:
+        assistant = self.get(id, "assistant")
+        with self.lock:
+            assistant.update({key: value for key, value in body.items() if key in assistant})
+        return assistant
+
+    def delete(self, id: str, object_type: str) -> dict:
+        self.get(id, object_type)
+        with self.lock:
+            del self.objects[id]
+        return {"id": id, "object": f"{object_type}.deleted", "deleted": True}
+
+    # Threads
+    def create_thread(self, body: dict) -> dict:
+        thread = self.add({
+            "id": self.create_id("thread"), "object": "thread", "created_at": int(time.time()), "metadata": body.get("metadata") or {},
+            "tool_resources": None, "messages": []
+        })
+        for message in body.get("messages", []):
+            self.create_message(thread["id"], message)
+        return thread
+
+    def create_message(self, thread_id: str, body: dict, assistant_id: str = None, run_id: str = None) -> dict:
+        thread = self.get(thread_id, "thread")
+        content = body.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if part.get("type") == "text")
+        message = self.add({
+            "id": self.create_id("msg"), "object": "thread.message", "created_at": int(time.time()), "thread_id": thread_id,
+            "role": body.get("role", "user"), "content": [{"type": "text", "text": {"value": content, "annotations": []}}],
+            "assistant_id": assistant_id, "run_id": run_id, "attachments": body.get("attachments") or [], "metadata": {},
+            "status": "completed"
+        })
+        with self.lock:
+            thread["messages"].append(message)
+        return message
+
+    def list_messages(self, thread_id: str, query: dict) -> dict:
+        thread = self.get(thread_id, "thread")
+        with self.lock:
+            messages = list(thread["messages"])
+        run_id = query.get("run_id", [None])[0]
+        if run_id is not None:
+            messages = [message for message in messages if message["run_id"] == run_id]
+        if query.get("order", ["desc"])[0] == "desc":
+            messages.reverse()
+        limit = int(query.get("limit", [20])[0])
+        messages = messages[:limit]
+        return {
+            "object": "list", "data": messages, "has_more": False,
+            "first_id": messages[0]["id"] if messages else None, "last_id": messages[-1]["id"] if messages else None
+        }
+
+    def create_run(self, thread_id: str, body: dict) -> dict:
+        """
+        Runs finish straight away, the reply of the assistant is added to the thread
+        """
+        thread = self.get(thread_id, "thread")
+        assistant = self.get(body.get("assistant_id"), "assistant")
+        run_id = self.create_id("run")
+        with self.lock:
+            history = [message["content"][0]["text"]["value"] for message in thread["messages"]]
+        user = history[-1] if history else None
+        response_format = assistant["response_format"] if isinstance(assistant["response_format"], dict) else None
+        seed = self.mock_tool.create_seed(assistant["model"], assistant["instructions"], history)
+        content = self.mock_tool.create_content(assistant["instructions"], user, response_format, seed)
+        content, completion_tokens, _ = self.mock_tool.pad_content(content, None, self.mock_client.behaviour.completion_tokens)
+        prompt_tokens = self.mock_tool.count_tokens(assistant["instructions"], *history)
+        self.create_message(thread_id, {"role": "assistant", "content": content}, assistant["id"], run_id)
+        return self.add({
+            "id": run_id, "object": "thread.run", "created_at": int(time.time()), "thread_id": thread_id,
+            "assistant_id": assistant["id"], "status": "completed", "model": assistant["model"],
+            "instructions": assistant["instructions"], "tools": assistant["tools"], "parallel_tool_calls": True,
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+        })
+
+    # Files and vector stores
+    def create_file(self, body: bytes, content_type: str) -> dict:
+        message = email.parser.BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body)
+        filename, content, purpose = None, b"", None
+        for part in message.get_payload() if message.is_multipart() else []:
+            name = part.get_param("name", header="content-disposition")
+            if name == "file":
+                filename, content = part.get_filename(), part.get_payload(decode=True) or b""
+            elif name == "purpose":
+                purpose = part.get_payload()
+        return self.add_file(filename, content, purpose)
+
+    def add_file(self, filename: str, content: bytes, purpose: str) -> dict:
+        file = self.add({
+            "id": self.create_id("file"), "object": "file", "bytes": len(content), "created_at": int(time.time()),
+            "filename": filename, "purpose": purpose, "status": "processed"
+        })
+        with self.lock:
+            self.file_contents[file["id"]] = content
+        return file
+
+    def get_file_content(self, id: str) -> bytes:
+        self.get(id, "file")
+        with self.lock:
+            return self.file_contents.get(id, b"")
+
+    def create_vector_store(self, body: dict) -> dict:
+        return self.add({
+            "id": self.create_id("vs"), "object": "vector_store", "created_at": int(time.time()), "name": body.get("name"),
+            "usage_bytes": 0, "file_counts": self.file_counts(len(body.get("file_ids", []))), "status": "completed",
+            "metadata": body.get("metadata") or {}, "last_active_at": int(time.time())
+        })
+
+    def create_file_batch(self, vector_store_id: str, body: dict) -> dict:
+        vector_store = self.get(vector_store_id, "vector_store")
+        file_ids = body.get("file_ids", [])
+        with self.lock:
+            vector_store["file_counts"] = self.file_counts(vector_store["file_counts"]["total"] + len(file_ids))
+        return self.add({
+            "id": self.create_id("vsfb"), "object": "vector_store.files_batch", "created_at": int(time.time()),
+            "vector_store_id": vector_store_id, "status": "completed", "file_counts": self.file_counts(len(file_ids))
+        })
+
+    @staticmethod
+    def file_counts(total: int) -> dict:
+        return {"in_progress": 0, "completed": total, "failed": 0, "cancelled": 0, "total": total}
+
+    # Batches
+    def create_batch(self, body: dict) -> dict:
+        self.get(body["input_file_id"], "file")
+        if body.get("endpoint") != "/v1/chat/completions":
+            raise StubError(400, f"Unsupported endpoint '{body.get('endpoint')}', only /v1/chat/completions is supported.", "invalid_request_error")
+        now = int(time.time())
+        batch = self.add({
+            "id": self.create_id("batch"), "object": "batch", "endpoint": body["endpoint"], "errors": None,
+            "input_file_id": body["input_file_id"], "completion_window": body.get("completion_window", "24h"),
+            "status": "in_progress", "output_file_id": None, "error_file_id": None, "created_at": now, "in_progress_at": now,
+            "expires_at": now + 24 * 60 * 60, "finalizing_at": None, "completed_at": None, "failed_at": None, "expired_at": None,
+            "cancelling_at": None, "cancelled_at": None, "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            "metadata": body.get("metadata")
+        })
+        threading.Thread(target=self.run_batch, args=(batch,), name=f"StubServer {batch['id']}", daemon=True).start()
+        return batch
+
+    def run_batch(self, batch: dict):
+        """
+        Answers every request of the batch after the batch_latency and writes the output and error files
+        """
+        time.sleep(self.batch_latency)
+        lines = [json.loads(line) for line in self.get_file_content(batch["input_file_id"]).splitlines() if line.strip()]
+        outputs, errors = [], []
+        for line in lines:
+            _, error = self.mock_client.sample()
+            result = {"id": self.create_id("batch_req"), "custom_id": line["custom_id"], "response": None, "error": None}
+            if error is not None:
+                result["response"] = {"status_code": error.status_code, "request_id": result["id"], "body": {
+                    "error": {"message": error.message, "type": "server_error", "param": None, "code": None}
+                }}
+                errors.append(result)
+            else:
+                result["response"] = {"status_code": 200, "request_id": result["id"], "body": self.chat_completion(line["body"])}
+                outputs.append(result)
+        with self.lock:
+            if batch["status"] != "in_progress":
+                return
+        output_file = self.add_file("batch_output.jsonl", self.to_jsonl(outputs), "batch_output") if outputs else None
+        error_file = self.add_file("batch_errors.jsonl", self.to_jsonl(errors), "batch_output") if errors else None
+        with self.lock:
+            if batch["status"] != "in_progress":
+                return
+            now = int(time.time())
+            batch.update({
+                "status": "completed", "finalizing_at": now, "completed_at": now,
+                "output_file_id": output_file["id"] if output_file else None, "error_file_id": error_file["id"] if error_file else None,
+                "request_counts": {"total": len(lines), "completed": len(outputs), "failed": len(errors)}
+            })
+
+    def cancel_batch(self, id: str) -> dict:
+        batch = self.get(id, "batch")
+        with self.lock:
+            if batch["status"] == "in_progress":
+                now = int(time.time())
+                batch.update({"status": "cancelled", "cancelling_at": now, "cancelled_at": now})
+        return batch
+
+    @staticmethod
+    def to_jsonl(objects: list) -> bytes:
+        return "".join(json.dumps(object) + "\n" for object in objects).encode("utf-8")
+
+    def list_models(self) -> dict:
+        models = sorted(set(self.mock_tool.models) | {"gpt-3.5-turbo", "gpt-4o", "gpt-4o-mini"})
+        return {"object": "list", "data": [{"id": model, "object": "model", "created": 0, "owned_by": "stub"} for model in models]}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests to the StubServer, each route calls a method of the StubServer
+    """
+    protocol_version = "HTTP/1.1"
+    ID = r"([\w-]+)"
+    ROUTES = [
+        ("GET", r"/models", lambda stub, body, query: stub.list_models()),
+        ("POST", r"/chat/completions", None),
+        ("POST", r"/assistants", lambda stub, body, query: stub.create_assistant(body)),
+        ("GET", rf"/assistants/{ID}", lambda stub, body, query, id: stub.get(id, "assistant")),
+        ("POST", rf"/assistants/{ID}", lambda stub, body, query, id: stub.update_assistant(id, body)),
+        ("DELETE", rf"/assistants/{ID}", lambda stub, body, query, id: stub.delete(id, "assistant")),
+        ("POST", r"/threads", lambda stub, body, query: stub.create_thread(body)),
+        ("GET", rf"/threads/{ID}", lambda stub, body, query, id: stub.get(id, "thread")),
+        ("DELETE", rf"/threads/{ID}", lambda stub, body, query, id: stub.delete(id, "thread")),
+        ("POST", rf"/threads/{ID}/messages", lambda stub, body, query, id: stub.create_message(id, body)),
+        ("GET", rf"/threads/{ID}/messages", lambda stub, body, query, id: stub.list_messages(id, query)),
+        ("POST", rf"/threads/{ID}/runs", lambda stub, body, query, id: stub.create_run(id, body)),
+        ("GET", rf"/threads/{ID}/runs/{ID}", lambda stub, body, query, thread_id, id: stub.get(id, "thread.run")),
+        ("POST", r"/files", None),
+        ("GET", rf"/files/{ID}", lambda stub, body, query, id: stub.get(id, "file")),
+        ("DELETE", rf"/files/{ID}", lambda stub, body, query, id: stub.delete(id, "file")),
+        ("POST", r"/vector_stores", lambda stub, body, query: stub.create_vector_store(body)),
+        ("GET", rf"/vector_stores/{ID}", lambda stub, body, query, id: stub.get(id, "vector_store")),
+        ("POST", rf"/vector_stores/{ID}/file_batches", lambda stub, body, query, id: stub.create_file_batch(id, body)),
+        ("GET", rf"/vector_stores/{ID}/file_batches/{ID}", lambda stub, body, query, store_id, id: stub.get(id, "vector_store.files_batch")),
+        ("GET", rf"/files/{ID}/content", None),
+        ("POST", r"/batches", lambda stub, body, query: stub.create_batch(body)),
+        ("GET", rf"/batches/{ID}", lambda stub, body, query, id: stub.get(id, "batch")),
+        ("POST", rf"/batches/{ID}/cancel", lambda stub, body, query, id: stub.cancel_batch(id)),
+    ]
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    def handle_request(self, method: str):
+        stub = self.server.stub
+        url = urlparse(self.path)
+        path = re.sub(r"^/v1", "", url.path).rstrip("/")
+        raw_body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        route, handler, arguments = f"{method} {path}", None, ()
+        for route_method, pattern, route_handler in self.ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                route, handler, arguments = f"{method} {pattern.replace(self.ID, '{id}')}", route_handler, match.groups()
+                break
+        latency, error = stub.mock_client.sample()
+        if latency:
+            time.sleep(latency)
+        try:
+            if error is not None:
+                error_type = "rate_limit_exceeded" if error.status_code == 429 else "server_error"
+                raise StubError(error.status_code, str(error), error_type)
+            if route == "POST /files":
+                result = stub.create_file(raw_body, self.headers.get("Content-Type", ""))
+            elif route == "GET /files/{id}/content":
+                content = stub.get_file_content(*arguments)
+                stub.count(route, 200)
+                return self.send_bytes(200, content, "application/octet-stream")
+            else:
+                body = json.loads(raw_body) if raw_body and "json" in self.headers.get("Content-Type", "json") else {}
+                if route == "POST /chat/completions":
+                    if body.get("stream"):
+                        stub.count(route, 200)
+                        return self.send_stream(stub.chat_completion_chunks(body), stub.token_latency)
+                    result = stub.chat_completion(body)
+                elif handler is not None:
+                    result = handler(stub, body, parse_qs(url.query), *arguments)
+                else:
+                    raise StubError(404, f"Unknown route: {method} {url.path}", "invalid_request_error")
+        except StubError as e:
+            stub.count(route, e.status_code)
+            return self.send_json(e.status_code, {"error": {"message": e.message, "type": e.error_type, "param": None, "code": None}})
+        except (ValueError, KeyError, TypeError) as e:
+            stub.count(route, 400)
+            return self.send_json(400, {"error": {"message": f"Invalid request: {e}", "type": "invalid_request_error", "param": None, "code": None}})
+        stub.count(route, 200)
+        # Threads keep their messages for listing them, they are not part of the thread object of the API
+        self.send_json(200, {key: value for key, value in result.items() if key != "messages"})
+
+    def send_json(self, status: int, content: dict):
+        self.send_bytes(status, json.dumps(content).encode("utf-8"), "application/json")
+
+    def send_bytes(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, chunks, token_latency: float):
+        """
+        Sends the chunks as server-sent events, the way the OpenAI API streams completions
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = itertools.chain((f"data: {json.dumps(chunk)}\n\n" for chunk in chunks), ["data: [DONE]\n\n"])
+        try:
+            for event in events:
+                data = event.encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+                if token_latency:
+                    time.sleep(token_latency)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early, like with a stop_predicate
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        logger.debug(f"Stub server: {format % args}")
+
+
+class StubError(Exception):
+    """Exception raised by the StubServer to send an error response like the OpenAI API does."""
+    def __init__(self, status_code: int, message: str, error_type: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.error_type = error_type
@@ -0,0 +1,44 @@
+"""
+Runs the stub server of the OpenAI API until it is stopped with Ctrl+C
+
+    python -m RobotFrameworkAI.stub_server --port 8000 --latency 0.5 --latency-distribution lognormal --latency-stddev 0.3 --error-rate 0.01
+
+Then point OpenAI at it, e.g. with the environment variables OPENAI_BASE_URL=http://127.0.0.1:8000/v1 and OPENAI_KEY=stub.
+"""
+import argparse
+import time
+
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockBehaviour
+from RobotFrameworkAI.stub_server.StubServer import StubServer
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m RobotFrameworkAI.stub_server", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0, help="The average amount of seconds a request takes")
+    parser.add_argument("--latency-distribution", default="fixed", choices=MockBehaviour.LATENCY_DISTRIBUTIONS)
+    parser.add_argument("--latency-stddev", type=float, default=0, help="The spread of the latency in seconds")
+    parser.add_argument("--token-latency", type=float, default=0, help="The amount of seconds each word of a streamed response takes")
+    parser.add_argument("--batch-latency", type=float, default=0, help="The amount of seconds a batch stays in progress")
+    parser.add_argument("--error-rate", type=float, default=0, help="The fraction of requests that get a 500 response")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="The fraction of requests that get a 429 response")
+    parser.add_argument("--completion-tokens", type=int, default=None, help="The amount of tokens of each completion")
+    parser.add_argument("--seed", type=int, default=None)
+    arguments = parser.parse_args()
+
+    behaviour = MockBehaviour(
+        arguments.latency, arguments.latency_distribution, arguments.latency_stddev, arguments.error_rate,
+        arguments.rate_limit_rate, arguments.completion_tokens, arguments.seed
+    )
+    server = StubServer(arguments.host, arguments.port, behaviour, arguments.token_latency, arguments.batch_latency)
+    print(f"Stub server listening on {server.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print(server.get_statistics())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import json
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.budget.Budget import BudgetExceededError
+from RobotFrameworkAI.ai_interface.budget.BudgetManager import BudgetManager
+from RobotFrameworkAI.ai_interface.budget.PriceTable import PriceTable
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+
+@pytest.fixture
+def budget_manager(monkeypatch):
+    budget_manager = BudgetManager()
+    monkeypatch.setattr(AI_Interface(), "budget", budget_manager)
+    return budget_manager
+
+def generate(message, **kwargs):
+    return Chatbot().generate_response(ai_model="mock", message=message, cache_mode="bypass", **kwargs)
+
+def test_prices():
+    price_table = PriceTable()
+    assert price_table.get_cost("gpt-4o", 1_000_000, 0) == 2.5
+    assert price_table.get_price("gpt-4o-2024-08-06") == price_table.get_price("gpt-4o")
+    assert price_table.get_price("gpt-4o-mini-2024-07-18") == price_table.get_price("gpt-4o-mini")
+    assert price_table.get_cost("unknown", 1000, 1000) == 0
+    price_table.set_price("unknown", 1, 2)
+    assert price_table.get_cost("unknown", 1_000_000, 1_000_000) == 3
+
+def test_fail_policy_blocks_requests_before_they_are_sent(budget_manager):
+    chatbot = Chatbot()
+    chatbot.set_ai_budget(max_tokens=50)
+    generate("Hello", max_tokens=20)
+    with pytest.raises(BudgetExceededError):
+        generate("Hello again", max_tokens=50)
+    budget, = chatbot.get_ai_budget_report()
+    assert (budget["requests"], budget["blocked"], budget["exceeded"]) == (1, 1, False)
+    # The reservation is replaced by the actual usage
+    assert 0 < budget["tokens"] <= 20 + len("Hello") // 4 + 1
+    assert budget_manager.global_budget.reserved_tokens == 0
+
+def test_warn_policy_sends_requests(budget_manager):
+    chatbot = Chatbot()
+    chatbot.set_ai_model_price("mock-small", 1000, 1000)
+    chatbot.set_ai_budget(max_cost=.001, policy="warn")
+    generate("Hello", max_tokens=20)
+    generate("Hello again", max_tokens=20)
+    budget, = chatbot.get_ai_budget_report()
+    assert budget["requests"] == 2
+    assert budget["exceeded"]
+    assert budget["cost"] > .001
+
+def test_suite_and_test_budgets(budget_manager):
+    budget_manager.start_suite("Suite")
+    budget_manager.set_budget("test", max_tokens=1000)
+    budget_manager.set_budget("suite", max_tokens=2000)
+    for test in ("Suite.A", "Suite.B"):
+        budget_manager.start_test(test)
+        generate("Hello", max_tokens=20)
+        budget_manager.end_test()
+    budget_manager.end_suite()
+    assert [(budget["scope"], budget["name"], budget["requests"]) for budget in budget_manager.get_report()] == [
+        ("test", "Suite.A", 1), ("test", "Suite.B", 1), ("suite", "Suite", 2)
+    ]
+    assert budget_manager.get_budgets() == []
+
+def test_suite_budget_needs_a_suite(budget_manager):
+    with pytest.raises(ValueError):
+        Chatbot().set_ai_budget(max_tokens=100, scope="suite")
+    with pytest.raises(ValueError):
+        Chatbot().set_ai_budget(max_tokens=100, policy="ignore")
+
+def test_write_report(budget_manager, tmp_path):
+    Chatbot().set_ai_budget(max_tokens=100)
+    generate("Hello", max_tokens=20)
+    path = budget_manager.write(str(tmp_path))
+    assert json.load(open(path))[0]["requests"] == 1
@@ -0,0 +1,145 @@
+import gzip
+import json
+from types import SimpleNamespace
+import pytest
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.cassette.Cassette import CassetteMissError
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+
+def create_completion(content):
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 1700000000, "model": "gpt-3.5-turbo",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    })
+
+def create_chunk(content=None, finish_reason=None, usage=None):
+    choices = [] if usage else [{"index": 0, "delta": {"content": content}, "finish_reason": finish_reason}]
+    return ChatCompletionChunk.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 1700000000, "model": "gpt-3.5-turbo",
+        "choices": choices, "usage": usage
+    })
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        pass
+
+class FakeClient:
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = f"Answer {len(self.requests)}"
+        if kwargs.get("stream"):
+            usage = {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12}
+            return FakeStream([create_chunk(content), create_chunk(finish_reason="stop"), create_chunk(usage=usage)])
+        return create_completion(content)
+
+    async def close(self):
+        pass
+
+@pytest.fixture
+def openai_service(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    openai_service = AI_Interface().ai_models["openai"]
+    fake_client = FakeClient()
+    monkeypatch.setattr(openai_service, "_create_client", lambda: fake_client)
+    openai_service.fake_client = fake_client
+    yield openai_service
+    Chatbot().eject_ai_cassette("openai")
+    monkeypatch.undo()
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    openai_service.reset_client()
+
+def generate(message, temperature=1, **kwargs):
+    return Chatbot().generate_response(ai_model="openai", message=message, temperature=temperature, cache_mode="bypass", **kwargs)
+
+def test_recorded_responses_are_replayed_without_the_api(openai_service, tmp_path):
+    path = str(tmp_path / "cassette.json.gz")
+    chatbot = Chatbot()
+    chatbot.use_ai_cassette(path, mode="record", ai_model="openai")
+    assert generate("Hello") == "Answer 1"
+    assert generate("Hello") == "Answer 2"
+    assert generate("Bye") == "Answer 3"
+    chatbot.eject_ai_cassette("openai")
+    with gzip.open(path, "rt") as file:
+        assert len(json.load(file)["interactions"]) == 3
+
+    chatbot.use_ai_cassette(path, ai_model="openai")
+    assert generate("Bye") == "Answer 3"
+    assert generate("Hello") == "Answer 1"
+    assert generate("Hello") == "Answer 2"
+    assert len(openai_service.fake_client.requests) == 3
+
+def test_strict_policy_fails_requests_that_were_not_recorded(openai_service, tmp_path):
+    path = str(tmp_path / "cassette.json.gz")
+    chatbot = Chatbot()
+    chatbot.use_ai_cassette(path, mode="record", ai_model="openai")
+    generate("Hello")
+    chatbot.use_ai_cassette(path, ai_model="openai")
+    with pytest.raises(CassetteMissError):
+        generate("Hello", temperature=.5)
+    generate("Hello")
+    with pytest.raises(CassetteMissError):
+        generate("Hello")
+
+def test_lenient_policy_ignores_sampling_parameters_and_repeats_responses(openai_service, tmp_path):
+    path = str(tmp_path / "cassette.json.gz")
+    chatbot = Chatbot()
+    chatbot.use_ai_cassette(path, mode="record", ai_model="openai")
+    generate("Hello")
+    chatbot.use_ai_cassette(path, policy="lenient", ai_model="openai")
+    assert generate("Hello", temperature=.5) == "Answer 1"
+    assert generate("Hello") == "Answer 1"
+    with pytest.raises(CassetteMissError):
+        generate("Bye")
+
+def test_new_episodes_policy_records_requests_that_were_not_recorded(openai_service, tmp_path):
+    path = str(tmp_path / "cassette.json.gz")
+    chatbot = Chatbot()
+    chatbot.use_ai_cassette(path, policy="new_episodes", ai_model="openai")
+    assert generate("Hello") == "Answer 1"
+    chatbot.use_ai_cassette(path, ai_model="openai")
+    assert generate("Hello") == "Answer 1"
+    assert len(openai_service.fake_client.requests) == 1
+
+def test_streamed_responses_are_recorded_and_replayed(openai_service, tmp_path):
+    path = str(tmp_path / "cassette.json.gz")
+    chatbot = Chatbot()
+    chatbot.use_ai_cassette(path, mode="record", ai_model="openai")
+    assert generate("Hello", stream=True) == "Answer 1"
+    chatbot.use_ai_cassette(path, ai_model="openai")
+    response = AI_Interface().call_ai_tool(
+        chatbot.create_chatbot_prompt("Generate Response", "openai", None, "Hello", None, None, 1, None, None, None, False, None, "bypass", stream=True)[0]
+    )
+    assert response.message == "Answer 1"
+    assert response.metadata.completion_tokens == 2
+    assert len(openai_service.fake_client.requests) == 1
+
+def test_invalid_cassette_arguments(openai_service, tmp_path):
+    with pytest.raises(ValueError):
+        Chatbot().use_ai_cassette(str(tmp_path / "cassette.json.gz"), mode="rewind", ai_model="openai")
+    with pytest.raises(ValueError):
+        Chatbot().use_ai_cassette(str(tmp_path / "cassette.json.gz"), policy="loose", ai_model="openai")
+    with pytest.raises(FileNotFoundError):
+        Chatbot().use_ai_cassette(str(tmp_path / "missing.json.gz"), ai_model="openai")
+    with pytest.raises(TypeError):
+        Chatbot().use_ai_cassette(str(tmp_path / "cassette.json.gz"), mode="record")
+    with pytest.raises(TypeError):
+        Chatbot().eject_ai_cassette()
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.hedging.Hedger import Hedger
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+async def respond_after(delay, result, cancelled=None):
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        if cancelled is not None:
+            cancelled.append(result)
+        raise
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def test_fast_requests_are_not_hedged():
+    hedger = Hedger(delay=.1)
+    assert run(hedger.run(lambda: respond_after(0, "primary"), lambda: respond_after(0, "hedge"))) == ("primary", False)
+    assert hedger.get_statistics()["hedges"] == 0
+
+def test_hedge_wins_and_slow_request_is_cancelled():
+    hedger = Hedger(delay=.01)
+    cancelled = []
+    result = run(hedger.run(lambda: respond_after(1, "primary", cancelled), lambda: respond_after(0, "hedge")))
+    assert result == ("hedge", True)
+    assert cancelled == ["primary"]
+    assert hedger.get_statistics()["hedge_win_rate"] == 1
+
+def test_failed_request_waits_for_the_other():
+    hedger = Hedger(delay=.01)
+    assert run(hedger.run(lambda: respond_after(.02, ConnectionError()), lambda: respond_after(.05, "hedge"))) == ("hedge", True)
+    with pytest.raises(ConnectionError):
+        run(hedger.run(lambda: respond_after(.02, ConnectionError()), lambda: respond_after(0, TimeoutError())))
+
+def test_adaptive_delay_is_a_percentile_of_recent_latencies():
+    hedger = Hedger(percentile=90, min_samples=10)
+    hedger.latencies.extend(range(1, 10))
+    assert hedger.get_delay() is None
+    hedger.latencies.append(10)
+    assert hedger.get_delay() == 9
+
+@pytest.fixture
+def slow_openai(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    openai_service = AI_Interface().ai_models["openai"]
+    tool = openai_service.ai_tools["text_generator"]
+    async def call_ai_tool_async(prompt):
+        model = prompt.config.model or tool.default_model
+        await asyncio.sleep(1 if model == "gpt-4o-mini" else 0)
+        return Response(model, ResponseMetadata("text_generator", "openai", model, "stop", 10, 5))
+    monkeypatch.setattr(tool, "call_ai_tool_async", call_ai_tool_async)
+    yield openai_service
+    openai_service.disable_hedging()
+    openai_service.rate_limiters.clear()
+    openai_service.set_circuit_breaker()
+
+def test_hedge_to_fallback_model(slow_openai):
+    chatbot = Chatbot()
+    chatbot.enable_hedging("openai", delay=.01, fallback_model="gpt-3.5-turbo")
+    assert chatbot.generate_response("openai", message="hi", cache_mode="bypass") == "gpt-3.5-turbo"
+    assert chatbot.get_hedging_statistics("openai")["hedge_wins"] == 1
+    with pytest.raises(ValueError):
+        chatbot.get_hedging_statistics("gemini")
+
+def test_only_the_tokens_of_the_winning_request_are_rate_limited(slow_openai):
+    chatbot = Chatbot()
+    chatbot.enable_hedging("openai", delay=.01, fallback_model="gpt-3.5-turbo")
+    chatbot.set_rate_limit("openai", tokens_per_minute=6000)
+    assert chatbot.generate_response("openai", message="hi", cache_mode="bypass") == "gpt-3.5-turbo"
+    assert slow_openai.rate_limiters[None].tokens.tokens == pytest.approx(6000 - 15, abs=5)
+
+def test_hedges_go_through_the_circuit_breaker_of_their_model(slow_openai, monkeypatch):
+    chatbot = Chatbot()
+    chatbot.enable_hedging("openai", delay=.01, fallback_model="gpt-3.5-turbo")
+    circuit_breaker = slow_openai.get_circuit_breaker("gpt-3.5-turbo")
+    for _ in range(circuit_breaker.failure_threshold):
+        circuit_breaker.record_failure()
+    # The open circuit breaker stops the hedge, so the slow request answers
+    assert chatbot.generate_response("openai", message="hi", cache_mode="bypass") == "gpt-4o-mini"
+    assert chatbot.get_hedging_statistics("openai")["hedge_wins"] == 0
+
+    circuit_breaker.record_success()
+    tool = slow_openai.ai_tools["text_generator"]
+    call_ai_tool_async = tool.call_ai_tool_async
+    async def failing_fallback(prompt):
+        if prompt.config.model == "gpt-3.5-turbo":
+            raise ConnectionError("Fallback unavailable")
+        return await call_ai_tool_async(prompt)
+    monkeypatch.setattr(tool, "call_ai_tool_async", failing_fallback)
+    monkeypatch.setattr(tool, "is_retryable_error", lambda error: isinstance(error, ConnectionError))
+    assert chatbot.generate_response("openai", message="hi", cache_mode="bypass") == "gpt-4o-mini"
+    assert circuit_breaker.failures == 1
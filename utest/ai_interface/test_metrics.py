@@ -0,0 +1,84 @@
+import json
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.metrics.LatencyHistogram import LatencyHistogram
+from RobotFrameworkAI.ai_interface.metrics.MetricsRegistry import MetricsRegistry
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+
+
+@pytest.fixture
+def chatbot():
+    chatbot = Chatbot()
+    chatbot.reset_ai_usage_statistics()
+    yield chatbot
+    chatbot.set_mock_behaviour()
+    AI_Interface().ai_models["mock"].set_retry_policy()
+    chatbot.reset_ai_usage_statistics()
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+    for latency in range(1, 101):
+        histogram.observe(latency / 100)
+    assert histogram.count == 100
+    assert histogram.percentile(50) == pytest.approx(.5, abs=.05)
+    assert histogram.percentile(95) == pytest.approx(.95, abs=.1)
+    assert histogram.percentile(100) == 1
+    assert histogram.cumulative_counts()[-1] == (float("inf"), 100)
+    histogram.observe(1000)
+    assert histogram.percentile(100) == 1000
+
+def test_calls_are_counted_per_series(chatbot):
+    chatbot.generate_response(ai_model="mock", message="Hello", cache_mode="bypass")
+    chatbot.generate_response(ai_model="mock", message="Hello", model="mock-large", cache_mode="bypass")
+    RealTestDataGenerator().generate_test_data(ai_model="mock", type="address", amount=2, cache_mode="bypass")
+    statistics = chatbot.get_ai_usage_statistics()
+    assert statistics["totals"]["calls"] == 3
+    assert statistics["totals"]["total_tokens"] > 0
+    assert {(series["module"], series["model"]) for series in statistics["series"]} == {
+        ("chatbot", "mock-small"), ("chatbot", "mock-large"), ("real_test_data_generator", "mock-small")
+    }
+    statistics = chatbot.get_ai_usage_statistics(module="chatbot", model="mock-large")
+    assert statistics["totals"]["calls"] == 1
+    assert statistics["series"][0]["latency_p50"] is not None
+    chatbot.reset_ai_usage_statistics()
+    assert chatbot.get_ai_usage_statistics()["totals"]["calls"] == 0
+
+def test_errors_and_retries_are_counted(chatbot):
+    chatbot.set_retry_policy("mock", max_retries=2, base_delay=0)
+    chatbot.set_mock_behaviour(error_rate=1)
+    with pytest.raises(Exception):
+        chatbot.generate_response(ai_model="mock", message="Hello", cache_mode="bypass")
+    totals = chatbot.get_ai_usage_statistics()["totals"]
+    assert (totals["calls"], totals["errors"], totals["error_rate"]) == (1, 1, 1)
+
+def test_cache_hits_do_not_count_tokens():
+    registry = MetricsRegistry()
+    registry.record("chatbot", "openai", None, "text_generator", .5, 10, 20)
+    registry.record("chatbot", "openai", None, "text_generator", .001, 10, 20, cache_hit=True)
+    series, = registry.get_statistics()["series"]
+    assert series["model"] == "default"
+    assert (series["calls"], series["cache_hits"], series["total_tokens"]) == (2, 1, 30)
+
+def test_coalesced_responses_do_not_count_tokens(chatbot):
+    chatbot.set_mock_behaviour(latency=.1)
+    responses = chatbot.generate_responses(["Hello"] * 5, ai_model="mock")
+    assert len(set(responses)) == 1
+    totals = chatbot.get_ai_usage_statistics()["totals"]
+    assert totals["calls"] == 5
+    response = chatbot.generate_response(ai_model="mock", message="Hello", cache_mode="bypass")
+    assert response == responses[0]
+    assert chatbot.get_ai_usage_statistics()["totals"]["total_tokens"] == 2 * totals["total_tokens"]
+
+def test_write_metrics(tmp_path):
+    registry = MetricsRegistry()
+    registry.record("chatbot", "openai", "gpt-4o", "text_generator", .3, 10, 20, retries=1)
+    json_path, prometheus_path = registry.write(str(tmp_path))
+    assert json.load(open(json_path))["totals"]["retries"] == 1
+    prometheus = open(prometheus_path).read()
+    labels = 'module="chatbot",ai_model="openai",model="gpt-4o",ai_tool="text_generator"'
+    assert f"robotframework_ai_prompt_tokens_total{{{labels}}} 10" in prometheus
+    assert f'robotframework_ai_latency_seconds_bucket{{{labels},le="0.25"}} 0' in prometheus
+    assert f'robotframework_ai_latency_seconds_bucket{{{labels},le="0.5"}} 1' in prometheus
+    assert f"robotframework_ai_latency_seconds_count{{{labels}}} 1" in prometheus
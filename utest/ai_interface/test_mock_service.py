@@ -0,0 +1,82 @@
+import json
+import time
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockAPIError
+from RobotFrameworkAI.modules.assistant.Assistant import Assistant
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+
+
+@pytest.fixture
+def mock_service():
+    mock_service = AI_Interface().ai_models["mock"]
+    yield mock_service
+    Chatbot().set_mock_behaviour()
+    mock_service.set_retry_policy()
+
+def generate(message, **kwargs):
+    return Chatbot().generate_response(ai_model="mock", message=message, cache_mode="bypass", **kwargs)
+
+def test_mock_responses_are_deterministic(mock_service):
+    assert generate("Hello") == generate("Hello")
+    assert generate("Hello") != generate("Bye")
+    assert generate("Hello", model="mock-large") != generate("Hello")
+
+def test_mock_responses_follow_the_response_format(mock_service):
+    response = generate("Hello", response_format={"type": "json_object"})
+    assert isinstance(json.loads(response), dict)
+    schema = {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "age": {"type": "integer", "minimum": 18, "maximum": 99},
+            "tags": {"type": "array", "items": {"type": "string"}, "minItems": 2},
+            "role": {"enum": ["admin", "user"]}
+        }
+    }
+    response = json.loads(generate("Hello", response_format={"type": "json_schema", "json_schema": {"name": "user", "schema": schema}}))
+    assert set(response) == {"name", "age", "tags", "role"}
+    assert 18 <= response["age"] <= 99
+    assert len(response["tags"]) == 2
+    assert response["role"] == "admin"
+
+def test_mock_generates_test_data(mock_service):
+    addresses = RealTestDataGenerator().generate_test_data(ai_model="mock", type="address", amount=4)
+    assert len(addresses) == 4
+
+def test_mock_completion_tokens_are_capped_by_max_tokens(mock_service):
+    Chatbot().set_mock_behaviour(completion_tokens=50)
+    assert len(generate("Hello", max_tokens=100).split(" ")) == 50
+    assert len(generate("Hello", max_tokens=10).split(" ")) == 10
+
+def test_mock_latency_and_errors(mock_service):
+    Chatbot().set_mock_behaviour(latency=.05)
+    start = time.perf_counter()
+    generate("Hello")
+    assert time.perf_counter() - start >= .05
+
+    mock_service.set_retry_policy(max_retries=0)
+    Chatbot().set_mock_behaviour(error_rate=1)
+    with pytest.raises(MockAPIError) as error:
+        generate("Hello")
+    assert error.value.status_code == 500
+    Chatbot().set_mock_behaviour(rate_limit_rate=.5, seed=1)
+    mock_service.set_retry_policy(max_retries=10, base_delay=0)
+    generate("Hello")
+    with pytest.raises(ValueError):
+        Chatbot().set_mock_behaviour(error_rate=2)
+    with pytest.raises(ValueError):
+        Chatbot().set_mock_behaviour(latency_distribution="pareto")
+
+def test_mock_assistant(mock_service):
+    assistant = Assistant()
+    id = assistant.create_assistant(ai_model="mock", name="Bob", instructions="Be nice")
+    assert assistant.get_active_assistant_id(ai_model="mock") == id
+    first = assistant.send_message(ai_model="mock", message="Hello")
+    second = assistant.send_message(ai_model="mock", message="Hello")
+    # The thread grows, so the same message gets a different response
+    assert first != second
+    assistant.create_new_thread(ai_model="mock")
+    assert assistant.send_message(ai_model="mock", message="Hello") == first
+    assistant.delete_assistant(ai_model="mock")
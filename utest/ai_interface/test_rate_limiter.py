@@ -0,0 +1,103 @@
+import asyncio
+import time
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.rate_limiting.RateLimiter import RateLimiter, estimate_tokens
+from RobotFrameworkAI.ai_interface.rate_limiting.TokenBucket import TokenBucket
+from RobotFrameworkAI.ai_interface.resilience.RetryPolicy import RetryPolicy
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+def create_prompt(message="1 + 1 equals?", max_tokens=256):
+    return Chatbot().create_prompt("text_generator", "openai", None, message, None, None, max_tokens, 1, .5, 0, 0, None)
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(6000)
+    bucket.take(6000)
+    assert 0.9 < bucket.time_until_available(100) <= 1
+    bucket.take(-6000)
+    assert bucket.time_until_available(100) == 0
+
+def test_token_bucket_waits_until_full_for_more_than_its_capacity():
+    bucket = TokenBucket(60)
+    assert bucket.time_until_available(1000) == 0
+
+def test_estimate_tokens_includes_max_tokens_and_messages():
+    prompt = create_prompt("a" * 400, max_tokens=100)
+    assert estimate_tokens(prompt) == 100 + prompt.config.kwargs["prompt_tokens"]
+    # Prompts that weren't counted when they were created are estimated from their characters
+    del prompt.config.kwargs["prompt_tokens"]
+    assert estimate_tokens(prompt) == 201
+
+def test_requests_wait_in_order():
+    rate_limiter = RateLimiter(requests_per_minute=600)
+    rate_limiter.requests.tokens = 0
+    order = []
+    async def request(index):
+        waited = await rate_limiter.acquire(1)
+        order.append(index)
+        return waited
+    async def run_requests():
+        return await asyncio.gather(*(request(index) for index in range(3)))
+    waits = asyncio.run(run_requests())
+    assert order == [0, 1, 2]
+    assert 0.25 < max(waits) < 0.5
+
+def test_reconcile_corrects_the_estimate():
+    rate_limiter = RateLimiter(tokens_per_minute=1000)
+    asyncio.run(rate_limiter.acquire(500))
+    rate_limiter.reconcile(500, 100)
+    assert rate_limiter.tokens.tokens == pytest.approx(900, abs=1)
+
+@pytest.fixture
+def openai_tool(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    openai_service = AI_Interface().ai_models["openai"]
+    tool = openai_service.ai_tools["text_generator"]
+    async def call_ai_tool_async(prompt):
+        return Response("2", ResponseMetadata("text_generator", "openai", "gpt-4o-mini", "stop", 10, 5))
+    monkeypatch.setattr(tool, "call_ai_tool_async", call_ai_tool_async)
+    yield openai_service
+    openai_service.rate_limiters.clear()
+
+def test_rate_limit_is_applied_per_model_and_reported(openai_tool):
+    chatbot = Chatbot()
+    chatbot.set_rate_limit("openai", "gpt-4o-mini", requests_per_minute=600)
+    openai_tool.rate_limiters["gpt-4o-mini"].requests.tokens = 0
+    start = time.perf_counter()
+    response = AI_Interface().call_ai_tool(create_prompt())
+    assert time.perf_counter() - start >= .09
+    assert response.metadata.queue_wait >= .09
+    # Other models aren't limited
+    prompt = create_prompt()
+    prompt.config.model = "gpt-4o"
+    assert AI_Interface().call_ai_tool(prompt).metadata.queue_wait == 0
+
+def test_set_rate_limit_validates_arguments(openai_tool):
+    with pytest.raises(ValueError):
+        Chatbot().set_rate_limit("unknown", requests_per_minute=10)
+    with pytest.raises(ValueError):
+        Chatbot().set_rate_limit("openai", tokens_per_minute=0)
+    Chatbot().set_rate_limit("openai", requests_per_minute=10)
+    assert None in openai_tool.rate_limiters
+    Chatbot().set_rate_limit("openai")
+    assert openai_tool.rate_limiters == {}
+
+def test_failed_attempts_give_their_tokens_back(openai_tool, monkeypatch):
+    tool = openai_tool.ai_tools["text_generator"]
+    attempts = []
+    async def call_ai_tool_async(prompt):
+        attempts.append(prompt)
+        if len(attempts) < 3:
+            raise ConnectionError("Timed out")
+        return Response("2", ResponseMetadata("text_generator", "openai", "gpt-4o-mini", "stop", 10, 5))
+    monkeypatch.setattr(tool, "call_ai_tool_async", call_ai_tool_async)
+    monkeypatch.setattr(tool, "is_retryable_error", lambda error: isinstance(error, ConnectionError))
+    monkeypatch.setattr(openai_tool, "retry_policy", RetryPolicy(max_retries=2, base_delay=0))
+    Chatbot().set_rate_limit("openai", tokens_per_minute=6000)
+    response = AI_Interface().call_ai_tool(create_prompt())
+    assert response.metadata.retries == 2
+    # Only the tokens of the attempt that succeeded are taken
+    assert openai_tool.rate_limiters[None].tokens.tokens == pytest.approx(6000 - 15, abs=5)
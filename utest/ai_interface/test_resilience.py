@@ -0,0 +1,103 @@
+import time
+from types import SimpleNamespace
+import openai
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.resilience.CircuitBreaker import CircuitBreaker, CircuitOpenError
+from RobotFrameworkAI.ai_interface.resilience.RetryPolicy import RetryPolicy
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+def create_status_error(status_code, headers=None):
+    response = SimpleNamespace(request=None, status_code=status_code, headers=headers or {})
+    return openai.APIStatusError("error", response=response, body=None)
+
+def test_retry_delay_grows_exponentially_up_to_max_delay():
+    retry_policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+    assert [retry_policy.get_delay(retry) for retry in range(4)] == [1, 2, 4, 5]
+    assert 0 <= RetryPolicy(base_delay=1).get_delay(1) <= 2
+
+def test_retry_after_is_honored_up_to_max_delay():
+    retry_policy = RetryPolicy(max_delay=5)
+    assert retry_policy.get_delay(0, 3) == 3
+    assert retry_policy.get_delay(0, 60) == 5
+
+def test_circuit_breaker_opens_and_recovers():
+    circuit_breaker = CircuitBreaker("openai gpt-4o-mini", failure_threshold=2, cooldown=.05)
+    circuit_breaker.record_failure()
+    circuit_breaker.before_call()
+    circuit_breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_call()
+    time.sleep(.06)
+    circuit_breaker.before_call()
+    assert circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    # Only a single trial call is let through
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_call()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
+
+def test_openai_transient_errors(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    openai_tool = AI_Interface().ai_models["openai"].ai_tools["text_generator"]
+    assert openai_tool.is_retryable_error(create_status_error(429))
+    assert openai_tool.is_retryable_error(create_status_error(503))
+    assert not openai_tool.is_retryable_error(create_status_error(400))
+    assert not openai_tool.is_retryable_error(ValueError())
+    assert openai_tool.get_retry_after(create_status_error(429, {"retry-after": "2"})) == 2
+    assert openai_tool.get_retry_after(create_status_error(429, {"retry-after-ms": "250"})) == .25
+    assert openai_tool.get_retry_after(create_status_error(429)) is None
+
+@pytest.fixture
+def flaky_openai(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    openai_service = AI_Interface().ai_models["openai"]
+    tool = openai_service.ai_tools["text_generator"]
+    errors = []
+    calls = []
+    async def call_ai_tool_async(prompt):
+        calls.append(prompt)
+        if errors:
+            raise errors.pop(0)
+        return Response('{"addresses": [{"address": "Dam 1"}]}', ResponseMetadata("text_generator", "openai", "gpt-4o-mini"))
+    monkeypatch.setattr(tool, "call_ai_tool_async", call_ai_tool_async)
+    openai_service.set_retry_policy(2, .001, .01)
+    openai_service.set_circuit_breaker(3, 30)
+    yield SimpleNamespace(errors=errors, calls=calls)
+    openai_service.set_retry_policy()
+    openai_service.set_circuit_breaker()
+
+def create_prompt():
+    return Chatbot().create_prompt("text_generator", "openai", None, "1 + 1 equals?", None, None, 256, 1, .5, 0, 0, None)
+
+def test_transient_errors_are_retried(flaky_openai):
+    flaky_openai.errors.extend([create_status_error(500), create_status_error(429, {"retry-after-ms": "1"})])
+    response = AI_Interface().call_ai_tool(create_prompt())
+    assert len(flaky_openai.calls) == 3
+    assert response.metadata.retries == 2
+    assert response.metadata.circuit_state == "closed"
+
+def test_other_errors_are_not_retried(flaky_openai):
+    flaky_openai.errors.append(create_status_error(400))
+    with pytest.raises(openai.APIStatusError):
+        AI_Interface().call_ai_tool(create_prompt())
+    assert len(flaky_openai.calls) == 1
+
+def test_circuit_breaker_fails_fast(flaky_openai):
+    flaky_openai.errors.extend([create_status_error(500)] * 3)
+    with pytest.raises(openai.APIStatusError):
+        AI_Interface().call_ai_tool(create_prompt())
+    with pytest.raises(CircuitOpenError):
+        AI_Interface().call_ai_tool(create_prompt())
+    assert len(flaky_openai.calls) == 3
+
+def test_test_data_generator_raises_errors_of_the_ai_model_as_is(flaky_openai):
+    Chatbot().set_retry_policy("openai", max_retries=0)
+    flaky_openai.errors.append(create_status_error(500))
+    with pytest.raises(openai.APIStatusError):
+        RealTestDataGenerator().generate_test_data("openai", "address")
+    assert RealTestDataGenerator().generate_test_data("openai", "address") == ["Dam 1"]
@@ -0,0 +1,85 @@
+import time
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.cache.DiskCacheBackend import DiskCacheBackend
+from RobotFrameworkAI.ai_interface.cache.ResponseCache import ResponseCache
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+def create_prompt(message="1 + 1 equals?", temperature=1):
+    return Chatbot().create_prompt("text_generator", "openai", None, message, None, None, 256, temperature, .5, 0, 0, None)
+
+def create_response(message="2"):
+    return Response(message, ResponseMetadata("text_generator", "openai", "gpt-4o-mini"))
+
+@pytest.fixture
+def ai_interface(monkeypatch, tmp_path):
+    ai_interface = AI_Interface()
+    sent_prompts = []
+    async def send_prompt(prompt):
+        sent_prompts.append(prompt)
+        return create_response(f"response {len(sent_prompts)}")
+    monkeypatch.setattr(ai_interface, "_send_prompt", send_prompt)
+    ai_interface.enable_response_cache(directory=str(tmp_path))
+    ai_interface.sent_prompts = sent_prompts
+    yield ai_interface
+    ai_interface.disable_response_cache()
+
+def test_fingerprint_only_depends_on_what_is_sent_to_the_ai_model():
+    prompt = create_prompt()
+    other_prompt = create_prompt()
+    other_prompt.metadata.time += 10
+    other_prompt.config.kwargs["cache_mode"] = "refresh"
+    assert prompt.fingerprint() == other_prompt.fingerprint()
+    assert prompt.fingerprint() != create_prompt(temperature=0).fingerprint()
+    assert prompt.fingerprint() != create_prompt("2 + 2 equals?").fingerprint()
+
+def test_same_prompt_is_only_sent_once(ai_interface):
+    first = ai_interface.call_ai_tool(create_prompt())
+    second = ai_interface.call_ai_tool(create_prompt())
+    assert len(ai_interface.sent_prompts) == 1
+    assert second.message == first.message
+    assert (first.metadata.cache_status, second.metadata.cache_status) == ("miss", "hit")
+    assert (second.metadata.cache_hits, second.metadata.cache_misses) == (1, 1)
+
+def test_cache_modes(ai_interface):
+    prompt = create_prompt()
+    ai_interface.call_ai_tool(prompt)
+    prompt.config.kwargs["cache_mode"] = "refresh"
+    assert ai_interface.call_ai_tool(prompt).message == "response 2"
+    prompt.config.kwargs["cache_mode"] = "bypass"
+    assert ai_interface.call_ai_tool(prompt).message == "response 3"
+    prompt.config.kwargs["cache_mode"] = "use"
+    assert ai_interface.call_ai_tool(prompt).message == "response 2"
+
+def test_responses_are_stored_on_disk(tmp_path):
+    prompt = create_prompt()
+    ResponseCache(backend=DiskCacheBackend(str(tmp_path))).set(prompt, create_response())
+    response = ResponseCache(backend=DiskCacheBackend(str(tmp_path))).get(prompt)
+    assert response == create_response()
+
+def test_expired_responses_are_not_returned(tmp_path, monkeypatch):
+    cache = ResponseCache(ttl=60, backend=DiskCacheBackend(str(tmp_path)))
+    prompt = create_prompt()
+    cache.set(prompt, create_response())
+    now = time.time()
+    monkeypatch.setattr("time.time", lambda: now + 61)
+    assert cache.get(prompt) is None
+
+def test_least_recently_used_responses_are_evicted():
+    cache = ResponseCache(max_entries=2)
+    prompts = [create_prompt(str(i)) for i in range(3)]
+    for prompt in prompts:
+        cache.set(prompt, create_response())
+    assert cache.get(prompts[0]) is None
+    assert cache.get(prompts[2]) is not None
+
+def test_disk_is_kept_below_max_size(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path), max_size=2000)
+    cache = ResponseCache(backend=backend)
+    for i in range(50):
+        cache.set(create_prompt(str(i)), create_response())
+    assert backend.size <= 2000
+    assert sum(file.stat().st_size for file in tmp_path.iterdir()) == backend.size
@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.routing.ProviderHealth import ProviderHealth
+from RobotFrameworkAI.ai_interface.routing.Router import ModelGroupError
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+@pytest.fixture
+def members(monkeypatch):
+    """
+    Makes up the latency and errors of each member, by model
+    """
+    members = {"mock-large": {"latency": .05, "error": None}, "mock-small": {"latency": .01, "error": None}, "calls": []}
+    async def send_prompt(prompt):
+        member = members[prompt.config.model]
+        members["calls"].append(prompt.config.model)
+        await asyncio.sleep(member["latency"])
+        if member["error"] is not None:
+            raise member["error"]
+        return Response(prompt.config.model, ResponseMetadata("text_generator", prompt.config.ai_model, prompt.config.model))
+    monkeypatch.setattr(AI_Interface(), "_send_prompt", send_prompt)
+    yield members
+    AI_Interface().router.groups.clear()
+
+def generate(**kwargs):
+    return Chatbot().generate_response(ai_model="group", message="Hello", cache_mode="bypass", **kwargs)
+
+def test_health_uses_a_sliding_window():
+    health = ProviderHealth("mock", window=4, max_age=.2, min_samples=2)
+    for latency in (.1, .2, .3):
+        health.record(latency)
+    assert not health.is_degraded()
+    for _ in range(3):
+        health.record(None, error=True)
+    # Only the last 4 requests count
+    assert health.get_error_rate() == .75 and health.is_degraded()
+    assert health.get_latency() == .3
+    health.outcomes = type(health.outcomes)([(time - 1, latency, error) for time, latency, error in health.outcomes], maxlen=4)
+    assert health.get_error_rate() == 0 and not health.is_degraded()
+    assert health.get_statistics()["requests"] == 6
+
+def test_latency_policy_prefers_the_fastest_member(members):
+    Chatbot().create_model_group("group", "mock:mock-large", "mock:mock-small")
+    # Members without recent requests are tried first, so both get measured
+    assert [generate() for _ in range(4)] == ["mock-large", "mock-small", "mock-small", "mock-small"]
+    statistics = Chatbot().get_model_group_statistics("group")
+    assert [member["requests"] for member in statistics["members"]] == [1, 3]
+    assert statistics["members"][1]["latency_p50"] < statistics["members"][0]["latency_p50"]
+
+def test_failing_members_are_failed_over_and_degraded(members):
+    Chatbot().create_model_group("group", "mock:mock-small", "mock:mock-large", policy="priority", min_samples=2)
+    members["mock-small"]["error"] = ConnectionError("Connection reset")
+    assert [generate() for _ in range(3)] == ["mock-large"] * 3
+    # After 2 failures the fast member is degraded and not tried first anymore
+    assert members["calls"] == ["mock-small", "mock-large", "mock-small", "mock-large", "mock-large"]
+    statistics = Chatbot().get_model_group_statistics("group")
+    assert statistics["failovers"] == 2
+    assert statistics["members"][0]["degraded"]
+
+def test_errors_of_every_member(members):
+    Chatbot().create_model_group("group", "mock:mock-small", "mock:mock-large", policy="round_robin")
+    assert [generate() for _ in range(3)] == ["mock-small", "mock-large", "mock-small"]
+    members["mock-small"]["error"] = members["mock-large"]["error"] = ConnectionError("Connection reset")
+    with pytest.raises(ModelGroupError) as error:
+        generate()
+    assert len(error.value.errors) == 2
+    # Invalid arguments would fail with every member, so they aren't failed over
+    members["mock-small"]["error"] = ValueError("Invalid value for `temperature`")
+    members["calls"].clear()
+    with pytest.raises(ValueError):
+        Chatbot().generate_response(ai_model="group", message="Hello", cache_mode="bypass")
+    assert len(members["calls"]) == 1
+
+def test_create_model_group_validates_arguments():
+    chatbot = Chatbot()
+    with pytest.raises(ValueError):
+        chatbot.create_model_group("openai", "mock")
+    with pytest.raises(ValueError):
+        chatbot.create_model_group("group")
+    with pytest.raises(ValueError):
+        chatbot.create_model_group("group", "unknown:model")
+    with pytest.raises(ValueError) as context:
+        chatbot.create_model_group("group", "mock", "openai:gpt-4o-mnii")
+    assert "Invalid model `gpt-4o-mnii`" in str(context.value)
+    with pytest.raises(ValueError):
+        chatbot.create_model_group("group", "mock", policy="fastest")
+    assert AI_Interface().router.groups == {}
+
+def test_model_group_with_the_mock_ai_model():
+    chatbot = Chatbot()
+    chatbot.create_model_group("group", "mock:mock-small", "mock:mock-large")
+    try:
+        response = AI_Interface().call_ai_tool(chatbot.create_prompt("text_generator", "group", None, "Hello", None, None, 50, 1, .5, 0, 0, None))
+        assert (response.metadata.ai_model, response.metadata.model) == ("mock", "mock-small")
+    finally:
+        chatbot.remove_model_group("group")
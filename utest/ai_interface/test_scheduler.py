@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.scheduling.Scheduler import Scheduler
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+def run_requests(scheduler, requests, duration=.02):
+    """
+    Sends the requests, (name, priority, module) tuples, through the scheduler and returns the names in the order they started
+    """
+    order = []
+    async def request(name, priority, module):
+        async with scheduler.slot(priority, module):
+            order.append(name)
+            await asyncio.sleep(duration)
+    async def run_all():
+        await asyncio.gather(*(request(*request_arguments) for request_arguments in requests))
+    asyncio.run(run_all())
+    return order
+
+def test_higher_priorities_overtake_waiting_requests():
+    scheduler = Scheduler(max_concurrency=1)
+    requests = [("bulk 1", "bulk", "a"), ("bulk 2", "bulk", "a"), ("normal", "normal", "a"), ("critical", "critical", "a")]
+    assert run_requests(scheduler, requests) == ["bulk 1", "critical", "normal", "bulk 2"]
+    statistics = scheduler.get_statistics()
+    assert statistics["running"] == statistics["queued"] == 0
+    assert statistics["priorities"]["bulk"]["max_queued"] == 1
+    assert statistics["priorities"]["bulk"]["max_wait"] > statistics["priorities"]["critical"]["max_wait"] > 0
+
+def test_module_quota_does_not_hold_up_other_modules():
+    scheduler = Scheduler(max_concurrency=2)
+    scheduler.set_module_quota("assistant", 1)
+    requests = [("upload 1", "bulk", "assistant"), ("upload 2", "bulk", "assistant"), ("chat", "bulk", "chatbot")]
+    assert run_requests(scheduler, requests) == ["upload 1", "chat", "upload 2"]
+    assert scheduler.get_statistics()["priorities"]["bulk"]["waited"] == 1
+
+def test_cancelled_requests_leave_the_queue():
+    scheduler = Scheduler(max_concurrency=1)
+    async def run():
+        async with scheduler.slot("normal", "a"):
+            waiting = asyncio.ensure_future(scheduler.acquire("critical", "a"))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+        assert await scheduler.acquire("normal", "a") == 0
+    asyncio.run(run())
+    assert scheduler.running == 1 and scheduler.queue == []
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = Scheduler()
+    monkeypatch.setattr(AI_Interface(), "scheduler", scheduler)
+    prompts = []
+    async def call_ai_tool_async(prompt):
+        prompts.append(prompt)
+        await asyncio.sleep(.05)
+        return Response("Hi", ResponseMetadata("text_generator", "mock", "mock-small"))
+    monkeypatch.setattr(AI_Interface().ai_models["mock"], "call_ai_tool_async", call_ai_tool_async)
+    yield scheduler
+    Chatbot().set_priority()
+
+def test_keywords_send_their_priority(scheduler):
+    chatbot = Chatbot()
+    chatbot.configure_ai_scheduler(max_concurrency=1)
+    chatbot.generate_responses(["a", "b", "c"], "mock", cache_mode="bypass")
+    chatbot.set_priority("critical")
+    chatbot.generate_response(ai_model="mock", message="Hello", cache_mode="bypass")
+    statistics = chatbot.get_ai_scheduler_statistics(reset=True)
+    assert statistics["max_concurrency"] == 1
+    assert [statistics["priorities"][priority]["requests"] for priority in Scheduler.PRIORITIES] == [1, 0, 3]
+    assert statistics["priorities"]["bulk"]["waited"] == 2
+    assert chatbot.get_ai_scheduler_statistics()["priorities"]["bulk"]["requests"] == 0
+    with pytest.raises(ValueError):
+        chatbot.set_priority("urgent")
+    with pytest.raises(ValueError):
+        chatbot.configure_ai_scheduler(max_concurrency=0)
+
+def test_promoted_requests_move_up():
+    scheduler = Scheduler(max_concurrency=1)
+    order = []
+    async def request(name, priority, key=None):
+        async with scheduler.slot(priority, "a", key):
+            order.append(name)
+            await asyncio.sleep(.01)
+    async def run():
+        requests = [asyncio.ensure_future(request(name, "bulk", name)) for name in ("bulk 1", "bulk 2", "bulk 3")]
+        await asyncio.sleep(0)
+        assert scheduler.promote("bulk 3", "critical")
+        assert not scheduler.promote("bulk 3", "normal")
+        assert not scheduler.promote("bulk 1", "critical")
+        await asyncio.gather(*requests)
+    asyncio.run(run())
+    assert order == ["bulk 1", "bulk 3", "bulk 2"]
+    assert scheduler.waiting == {} and scheduler.queue == []
+
+def test_critical_prompt_joining_a_bulk_prompt_moves_it_up(scheduler, monkeypatch):
+    scheduler.configure(max_concurrency=1)
+    chatbot = Chatbot()
+    def create_prompt(message, priority):
+        return chatbot.create_prompt("text_generator", "mock", None, message, None, None, 256, 1, .5, 0, 0, None, cache_mode="use", priority=priority)
+    async def run():
+        ai_interface = AI_Interface()
+        requests = [asyncio.ensure_future(ai_interface.call_ai_tool_async(create_prompt(message, "bulk"))) for message in ("first", "second", "third")]
+        await asyncio.sleep(.01)
+        await ai_interface.call_ai_tool_async(create_prompt("third", "critical"))
+        await asyncio.gather(*requests)
+        return [prompt.message.user for prompt in sent_prompts]
+    sent_prompts = []
+    original = AI_Interface().ai_models["mock"].call_ai_tool_async
+    async def call_ai_tool_async(prompt):
+        sent_prompts.append(prompt)
+        return await original(prompt)
+    monkeypatch.setattr(AI_Interface().ai_models["mock"], "call_ai_tool_async", call_ai_tool_async)
+    assert AI_Interface().run(run()) == ["first", "third", "second"]
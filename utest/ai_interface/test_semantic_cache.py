@@ -0,0 +1,83 @@
+import pytest
+np = pytest.importorskip("numpy")
+from RobotFrameworkAI.ai_interface.cache.SemanticCache import HashingVectorizer, SemanticCache
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+def create_prompt(message, system_message=None):
+    return Chatbot().create_prompt("text_generator", "openai", system_message, message, None, None, 256, 1, .5, 0, 0, None)
+
+def create_response(message):
+    return Response(message, ResponseMetadata("text_generator", "openai", "gpt-4o-mini"))
+
+def test_vectorizer_ignores_whitespace_casing_and_punctuation():
+    first, second, third = HashingVectorizer().transform([
+        "What is the capital of France?", "what is  the capital of france", "Give me 3 addresses in Prague"
+    ])
+    assert first @ second == pytest.approx(1)
+    assert first @ third < .5
+
+def test_vectorizer_is_deterministic():
+    assert np.array_equal(HashingVectorizer().transform(["hello world"]), HashingVectorizer().transform(["hello world"]))
+
+def test_similar_prompt_gets_cached_response():
+    cache = SemanticCache()
+    cache.set(create_prompt("What is the capital of France?"), create_response("Paris"))
+    assert cache.get(create_prompt("what is the capital of  France")).message == "Paris"
+    assert cache.get(create_prompt("Give me 3 addresses in Prague")) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_prompts_with_different_context_are_not_compared():
+    cache = SemanticCache()
+    cache.set(create_prompt("What is the capital of France?"), create_response("Paris"))
+    assert cache.get(create_prompt("What is the capital of France?", "Answer in French")) is None
+
+def test_closest_prompt_is_found_among_many():
+    cache = SemanticCache()
+    for i in range(2000):
+        cache.set(create_prompt(f"Generate test case {i} for the login page"), create_response(str(i)))
+    responses = [cache.get(create_prompt("GENERATE test case 7 for the login page")), cache.get(create_prompt("Unrelated")),
+                 cache.get(create_prompt("generate test case 1999 for the login page"))]
+    assert [response.message if response else None for response in responses] == ["7", None, "1999"]
+    responses[0].metadata.kwargs["changed"] = True
+    assert cache.get(create_prompt("Generate test case 7 for the login page")).metadata.kwargs == {}
+
+def test_bits_are_counted_without_bitwise_count(monkeypatch):
+    values = np.random.default_rng(0).integers(0, 2 ** 63, 1000, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    expected = [bin(int(value)).count("1") for value in values]
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert SemanticCache._count_bits(values).tolist() == expected
+
+def test_oldest_entries_are_replaced_when_full():
+    cache = SemanticCache(max_entries=2)
+    for message in ("first message", "second message", "third message"):
+        cache.set(create_prompt(message), create_response(message))
+    assert cache.get(create_prompt("first message")) is None
+    assert cache.get(create_prompt("third message")).message == "third message"
+
+def test_chatbot_uses_semantic_cache(monkeypatch):
+    chatbot = Chatbot()
+    sent_prompts = []
+    async def call_ai_tool_async(prompt):
+        sent_prompts.append(prompt)
+        return create_response("Paris")
+    monkeypatch.setattr(chatbot.ai_interface, "call_ai_tool_async", call_ai_tool_async)
+    chatbot.enable_semantic_cache()
+    assert chatbot.generate_response("openai", message="What is the capital of France?") == "Paris"
+    assert chatbot.generate_response("openai", message="what is the capital of france") == "Paris"
+    chatbot.generate_response("openai", message="what is the capital of france", cache_mode="bypass")
+    assert len(sent_prompts) == 2
+
+def test_chatbot_doesnt_cache_stopped_responses(monkeypatch):
+    chatbot = Chatbot()
+    sent_prompts = []
+    async def call_ai_tool_async(prompt):
+        sent_prompts.append(prompt)
+        return create_response("Lorem ipsum" if prompt.config.kwargs["stop_predicate"] else "Lorem ipsum dolor sit amet")
+    monkeypatch.setattr(chatbot.ai_interface, "call_ai_tool_async", call_ai_tool_async)
+    chatbot.enable_semantic_cache()
+    assert chatbot.generate_response("openai", message="Write some lorem ipsum", stream=True, stop_pattern="ipsum") == "Lorem ipsum"
+    assert chatbot.generate_response("openai", message="Write some lorem ipsum") == "Lorem ipsum dolor sit amet"
+    assert len(sent_prompts) == 2
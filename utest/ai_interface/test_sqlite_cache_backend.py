@@ -0,0 +1,60 @@
+import multiprocessing
+import time
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.cache.SQLiteCacheBackend import SQLiteCacheBackend
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "responses.sqlite3")
+
+def write_entries(path, process):
+    backend = SQLiteCacheBackend(path, compaction_interval=None)
+    for i in range(50):
+        backend.set(f"{process}-{i}", {"message": f"{process}-{i}"}, time.time())
+        backend.set("shared", {"message": process}, time.time())
+
+def test_set_replaces_entry(path):
+    backend = SQLiteCacheBackend(path, compaction_interval=None)
+    backend.set("key", {"message": "first"}, 1)
+    backend.set("key", {"message": "second"}, 2)
+    assert backend.get("key") == (2, {"message": "second"})
+    assert backend.size()[1] == 1
+
+def test_database_uses_write_ahead_logging(path):
+    backend = SQLiteCacheBackend(path, compaction_interval=None)
+    assert backend._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_compact_evicts_least_recently_used_entries(path):
+    backend = SQLiteCacheBackend(path, max_entries=10, compaction_interval=None)
+    for i in range(20):
+        backend.set(str(i), {"message": i}, time.time())
+    backend.compact()
+    assert backend.size()[1] <= 9
+    assert backend.get("0") is None
+    assert backend.get("19") is not None
+
+def test_compact_removes_expired_entries(path):
+    backend = SQLiteCacheBackend(path, ttl=60, compaction_interval=None)
+    backend.set("old", {"message": "old"}, time.time() - 61)
+    backend.set("new", {"message": "new"}, time.time())
+    backend.compact()
+    assert backend.get("old") is None
+    assert backend.get("new") is not None
+
+def test_concurrent_writers_from_many_processes(path):
+    SQLiteCacheBackend(path, compaction_interval=None)
+    processes = [multiprocessing.Process(target=write_entries, args=(path, process)) for process in range(16)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+    assert SQLiteCacheBackend(path, compaction_interval=None).size()[1] == 16 * 50 + 1
+
+def test_ai_interface_can_use_sqlite_backend(tmp_path):
+    ai_interface = AI_Interface()
+    cache = ai_interface.enable_response_cache(directory=str(tmp_path), backend="sqlite")
+    assert isinstance(cache.backend, SQLiteCacheBackend)
+    ai_interface.disable_response_cache()
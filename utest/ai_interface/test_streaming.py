@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+
+def create_chunk(content=None, finish_reason=None, usage=None):
+    choices = [] if usage else [SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)]
+    return SimpleNamespace(created=1700000000, choices=choices, usage=usage)
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.received = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.received == len(self.chunks):
+            raise StopAsyncIteration
+        await asyncio.sleep(.001)
+        self.received += 1
+        return self.chunks[self.received - 1]
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def fake_stream(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    tool = AI_Interface().ai_models["openai"].ai_tools["text_generator"]
+    lines = [f"row {i}\n" for i in range(20)]
+    stream = FakeStream([create_chunk(line) for line in lines] + [create_chunk(finish_reason="stop"),
+                        create_chunk(usage=SimpleNamespace(prompt_tokens=12, completion_tokens=60))])
+    requests = []
+    async def create(**kwargs):
+        requests.append(kwargs)
+        return stream
+    monkeypatch.setattr(tool, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    stream.requests = requests
+    return stream
+
+def generate(**kwargs):
+    chatbot = Chatbot()
+    prompt, _ = chatbot.create_chatbot_prompt("Generate Response", "openai", None, "Give me rows", None, 256, 1, .5, 0, 0, False, None, "bypass", **kwargs)
+    return AI_Interface().call_ai_tool(prompt)
+
+def test_streamed_response_records_time_to_first_token(fake_stream):
+    response = generate(stream=True)
+    assert response.message == "".join(f"row {i}\n" for i in range(20))
+    assert fake_stream.requests[0]["stream"] is True
+    assert response.metadata.finish_reason == "stop"
+    assert (response.metadata.prompt_tokens, response.metadata.completion_tokens) == (12, 60)
+    assert 0 < response.metadata.time_to_first_token < 1
+    assert response.metadata.tokens_per_second > 0
+    assert fake_stream.closed
+
+def test_stream_stops_when_stop_pattern_matches(fake_stream):
+    response = generate(stop_pattern=r"(?:.*\n){5}")
+    assert response.message == "".join(f"row {i}\n" for i in range(5))
+    assert response.metadata.finish_reason == "stop_predicate"
+    assert response.metadata.completion_tokens == 5
+    assert fake_stream.received == 5
+    assert fake_stream.closed
+
+def test_invalid_stop_pattern():
+    with pytest.raises(ValueError):
+        Chatbot().generate_response("openai", message="hi", stop_pattern="(")
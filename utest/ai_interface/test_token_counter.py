@@ -0,0 +1,109 @@
+import subprocess
+import sys
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.tokens.TokenCounter import ContextWindowExceededError, TokenCounter
+from RobotFrameworkAI.ai_interface.tokens.TokenEstimator import HeuristicTokenEstimator, TokenEstimator
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+
+TEXT = "The quick brown fox jumps over the lazy dog, then it runs 12345 meters back home to sleep."
+
+
+class WordEstimator(TokenEstimator):
+    name = "words"
+
+    def count(self, text):
+        return len(text.split())
+
+
+@pytest.fixture
+def token_counter(monkeypatch):
+    token_counter = TokenCounter()
+    token_counter.set_model("tiny", 100, 30)
+    token_counter.set_estimator("tiny", WordEstimator())
+    monkeypatch.setattr(AI_Interface(), "token_counter", token_counter)
+    return token_counter
+
+def create_history(pairs):
+    history = []
+    for index in range(pairs):
+        history += [{"user": f"question {index} " * 5}, {"assistant": f"answer {index} " * 5}]
+    return history
+
+def test_heuristic_estimate():
+    estimator = HeuristicTokenEstimator()
+    assert estimator.count("") == 0
+    assert estimator.count("12345") == 2
+    assert estimator.count("internationalization") == 4
+    assert len(TEXT) / 6 < estimator.count(TEXT) < len(TEXT) / 3
+
+def test_tiktoken_counts_exactly():
+    pytest.importorskip("tiktoken")
+    token_counter = TokenCounter()
+    try:
+        assert token_counter.count("Hello world", "gpt-4o") == 2
+    except AssertionError:
+        # The encoding couldn't be downloaded, so the tokens were estimated
+        assert token_counter.get_estimator("gpt-4o") is token_counter.heuristic
+
+def test_models_match_on_prefix():
+    token_counter = TokenCounter()
+    assert token_counter.get_model("gpt-4o-2024-08-06") == TokenCounter.MODELS["gpt-4o"]
+    assert token_counter.get_model("gpt-4o-mini-2024-07-18") == TokenCounter.MODELS["gpt-4o-mini"]
+    assert token_counter.get_model("unknown") is None
+
+def test_history_is_trimmed_oldest_first(token_counter):
+    history = create_history(4)
+    # The message takes 3 + 4 + 1 tokens and every entry of the history 4 + 10 tokens
+    trimmed, max_tokens, prompt_tokens = token_counter.fit("tiny", None, "Hello", history, 30)
+    assert trimmed == history[4:]
+    assert (max_tokens, prompt_tokens) == (30, 8 + 4 * 14)
+    assert len(history) == 8
+
+def test_max_tokens_is_clamped(token_counter):
+    assert token_counter.fit("tiny", None, "Hello", None, 50)[1] == 30
+    assert token_counter.fit("tiny", None, "word " * 80, None, 30)[1] == 100 - 87
+    assert token_counter.fit("unknown", None, "Hello", create_history(100), 5000)[:2] == (create_history(100), 5000)
+
+def test_oversized_prompts_are_rejected(token_counter):
+    with pytest.raises(ContextWindowExceededError):
+        token_counter.fit("tiny", None, "word " * 100, None, 10)
+    token_counter.configure(overflow="fail")
+    with pytest.raises(ContextWindowExceededError):
+        token_counter.fit("tiny", None, "Hello", create_history(4), 30)
+    # Estimators set by hand are kept
+    assert isinstance(token_counter.get_estimator("tiny"), WordEstimator)
+
+def test_create_prompt_fits_the_prompt(token_counter):
+    chatbot = Chatbot()
+    prompt = chatbot.create_prompt("text_generator", "mock", None, "Hello", create_history(4), "tiny", 50, 1, .5, 0, 0, None)
+    assert prompt.message.history == create_history(4)[4:]
+    assert prompt.parameters["max_tokens"] == 30
+    assert prompt.config.kwargs["prompt_tokens"] == 64
+    assert chatbot.count_tokens("one two three", "tiny") == 3
+    with pytest.raises(ValueError):
+        chatbot.configure_token_counting(overflow="ignore")
+
+def test_first_prompt_is_fitted_to_the_default_model():
+    # In a new process, so the AI_Interface hasn't loaded the mock AI model yet
+    code = """
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+chatbot = Chatbot()
+chatbot.set_model_context_window("mock-small", 100, 30)
+history = [{"user": "question " * 20}, {"assistant": "answer " * 20}] * 3
+prompt = chatbot.create_prompt("text_generator", "mock", None, "Hello", history, None, 50, 1, .5, 0, 0, None)
+assert len(prompt.message.history) < len(history), prompt.message.history
+assert prompt.parameters["max_tokens"] == 30
+assert "mock" not in AI_Interface().ai_models.loaded()
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_max_tokens_is_validated_against_the_default_model(token_counter):
+    token_counter.set_model("mock-small", 8192, 6000)
+    chatbot = Chatbot()
+    prompt, _ = chatbot.create_chatbot_prompt("Generate Response", "mock", None, "Hello", None, 5000, 1, .5, 0, 0, False, None, "bypass")
+    assert prompt.parameters["max_tokens"] == 5000
+    with pytest.raises(ValueError):
+        chatbot.create_chatbot_prompt("Generate Response", "mock", None, "Hello", None, 7000, 1, .5, 0, 0, False, None, "bypass")
@@ -0,0 +1,40 @@
+import openai
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.transport.TransportConfig import TransportConfig
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+
+
+@pytest.fixture
+def openai_service(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+    openai_service = AI_Interface().ai_models["openai"]
+    yield openai_service
+    openai_service.configure_transport(TransportConfig())
+
+def test_transport_config_is_validated():
+    with pytest.raises(ValueError):
+        TransportConfig(max_connections=0).validate()
+    with pytest.raises(ValueError):
+        TransportConfig(read_timeout=-1).validate()
+
+def test_configure_ai_transport_replaces_the_client_of_the_tools(openai_service):
+    tool = openai_service.ai_tools["text_generator"]
+    Chatbot().configure_ai_transport("openai", max_connections=7, read_timeout=30)
+    assert tool.client is openai_service.client
+    assert isinstance(openai_service.client, openai.AsyncOpenAI)
+    assert openai_service.client.timeout.read == 30
+    assert openai_service.transport_config.max_connections == 7
+
+def test_warm_up_ai_connections_opens_connections_at_the_same_time(openai_service, monkeypatch):
+    requests = []
+    async def warm_up_request():
+        requests.append(openai_service.client)
+    monkeypatch.setattr(openai_service, "_warm_up_request", warm_up_request)
+    duration = Chatbot().warm_up_ai_connections("openai", connections=3)
+    assert len(requests) == 3
+    assert duration >= 0
+    with pytest.raises(ValueError):
+        Chatbot().warm_up_ai_connections("openai", connections=0)
+    with pytest.raises(TypeError):
+        Chatbot().warm_up_ai_connections(connections=1)
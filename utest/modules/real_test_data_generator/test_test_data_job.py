@@ -0,0 +1,59 @@
+import json
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.budget.Budget import BudgetExceededError
+from RobotFrameworkAI.ai_interface.budget.BudgetManager import BudgetManager
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+
+
+PARAMETER_SETS = ["address", {"type": "address", "amount": 2, "country": "Netherlands"}, {"type": "address", "amount": 5}]
+
+
+@pytest.fixture
+def mock_service():
+    mock_service = AI_Interface().ai_models["mock"]
+    yield mock_service
+    RealTestDataGenerator().set_mock_behaviour()
+    mock_service.set_retry_policy()
+
+def test_job_generates_test_data_in_order(mock_service, tmp_path, monkeypatch):
+    generator = RealTestDataGenerator()
+    batch_id = generator.submit_test_data_job(str(tmp_path), PARAMETER_SETS, ai_model="mock")
+    assert generator.get_test_data_job_status(str(tmp_path))["request_counts"] == {"total": 3, "completed": 3, "failed": 0}
+    test_data = generator.wait_for_test_data_job(str(tmp_path), poll_interval="0.01s")
+    assert [len(addresses) for addresses in test_data] == [3, 2, 5]
+    assert len((tmp_path / "requests.jsonl").read_text().splitlines()) == 3
+    # A job that is done is read from its directory, without calling the AI model
+    async def call_ai_tool_async(prompt):
+        raise AssertionError("The AI model shouldn't be called")
+    monkeypatch.setattr(generator.ai_interface, "call_ai_tool_async", call_ai_tool_async)
+    assert generator.wait_for_test_data_job(str(tmp_path)) == test_data
+    assert generator.submit_test_data_job(str(tmp_path), PARAMETER_SETS, ai_model="mock") == batch_id
+
+def test_job_that_failed_to_submit_is_submitted_again(mock_service, tmp_path):
+    generator = RealTestDataGenerator()
+    mock_service.set_retry_policy(max_retries=0)
+    generator.set_mock_behaviour(error_rate=1)
+    with pytest.raises(Exception):
+        generator.submit_test_data_job(str(tmp_path), PARAMETER_SETS, ai_model="mock")
+    assert json.loads((tmp_path / "job.json").read_text())["status"] == "created"
+    with pytest.raises(ValueError):
+        generator.wait_for_test_data_job(str(tmp_path))
+    generator.set_mock_behaviour()
+    generator.submit_test_data_job(str(tmp_path), PARAMETER_SETS, ai_model="mock")
+    assert len(generator.wait_for_test_data_job(str(tmp_path))) == 3
+
+def test_job_parameter_sets_share_an_ai_model(tmp_path):
+    with pytest.raises(ValueError):
+        RealTestDataGenerator().submit_test_data_job(str(tmp_path), ["address", {"type": "address", "ai_model": "openai"}], ai_model="mock")
+    with pytest.raises(ValueError):
+        RealTestDataGenerator().wait_for_test_data_job(str(tmp_path / "unknown"))
+
+def test_job_is_checked_against_the_budget_as_a_whole(mock_service, tmp_path, monkeypatch):
+    monkeypatch.setattr(AI_Interface(), "budget", BudgetManager())
+    generator = RealTestDataGenerator()
+    # Each of the 3 parameter sets can use up to max_tokens
+    generator.set_ai_budget(max_tokens=3 * 200)
+    with pytest.raises(BudgetExceededError):
+        generator.submit_test_data_job(str(tmp_path), PARAMETER_SETS, ai_model="mock", max_tokens=200)
+    assert generator.get_ai_budget_report()[0]["blocked"] == 1
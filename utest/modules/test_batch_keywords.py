@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.modules.Module import BatchError
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+@pytest.fixture
+def ai_model(monkeypatch):
+    ai_interface = AI_Interface()
+    state = {"running": 0, "max_running": 0, "prompts": []}
+    async def send_prompt(prompt):
+        state["prompts"].append(prompt)
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        # Later messages are answered sooner, so the order of the results can't come from the order they finished in
+        await asyncio.sleep(.2 / len(state["prompts"]))
+        state["running"] -= 1
+        if prompt.message.user == "fail":
+            raise ConnectionError("AI model unavailable")
+        if prompt.config.response_format:
+            message = json.dumps({"addresses": [{"address": prompt.message.user}]})
+        else:
+            message = prompt.message.user.upper()
+        return Response(message, ResponseMetadata("text_generator", "openai", "gpt-4o-mini"))
+    monkeypatch.setattr(ai_interface, "_send_prompt", send_prompt)
+    return state
+
+def test_generate_responses_returns_responses_in_order(ai_model):
+    messages = [f"message {i}" for i in range(20)]
+    start = time.perf_counter()
+    responses = Chatbot().generate_responses(messages, "openai", max_concurrency=10)
+    assert time.perf_counter() - start < 1
+    assert responses == [message.upper() for message in messages]
+    assert ai_model["max_running"] == 10
+
+def test_generate_responses_uses_the_same_defaults_and_validation(ai_model):
+    chatbot = Chatbot()
+    chatbot.set_temperature(0)
+    chatbot.generate_responses(["a", {"message": "b", "temperature": 2}], "openai")
+    assert [prompt.parameters["temperature"] for prompt in ai_model["prompts"]] == [0, 2]
+    chatbot.set_temperature(1)
+    with pytest.raises(BatchError) as context:
+        chatbot.generate_responses(["a", {"message": "b", "temperature": 3}], "openai")
+    assert "1 of 2 items" in str(context.value)
+    assert "item 1: Invalid value `3` for `temperature`" in str(context.value)
+    assert context.value.results[0] == "A"
+
+def test_generate_responses_returns_errors_per_message(ai_model):
+    responses = Chatbot().generate_responses(["a", "fail", "c"], "openai", return_errors=True)
+    assert responses[0] == "A" and responses[2] == "C"
+    assert isinstance(responses[1], ConnectionError)
+
+def test_generate_responses_rejects_invalid_message_arguments(ai_model):
+    with pytest.raises(ValueError) as context:
+        Chatbot().generate_responses(["a", {"message": "b", "keep_history": True}], "openai")
+    assert "Invalid argument `keep_history`" in str(context.value)
+    with pytest.raises(ValueError) as context:
+        Chatbot().generate_responses(["a", {"message": "b", "temprature": 0}], "openai")
+    assert "Invalid arguments `temprature`" in str(context.value)
+    assert ai_model["prompts"] == []
+
+def test_max_concurrency_must_be_positive(ai_model):
+    with pytest.raises(ValueError):
+        Chatbot().generate_responses(["a"], "openai", max_concurrency=0)
+
+def test_generate_test_data_batch(ai_model):
+    generator = RealTestDataGenerator()
+    test_data = generator.generate_test_data_batch(["address", {"type": "address", "country": "Netherlands"}], "openai")
+    assert len(test_data) == 2
+    assert "Netherlands" in test_data[1][0]
+    assert "Netherlands" not in test_data[0][0]
+
+def test_start_generate_response_returns_a_handle(ai_model):
+    chatbot = Chatbot()
+    start = time.perf_counter()
+    response_handle = chatbot.start_generate_response("openai", message="hello")
+    assert time.perf_counter() - start < .1
+    assert not response_handle.done()
+    assert chatbot.wait_for_response(response_handle) == "HELLO"
+    assert response_handle not in chatbot.ai_interface.response_handles
+
+def test_start_keywords_validate_arguments_immediately(ai_model):
+    with pytest.raises(ValueError):
+        Chatbot().start_generate_response("openai", message="hello", temperature=3)
+
+def test_wait_for_response_timeout(ai_model):
+    chatbot = Chatbot()
+    response_handle = chatbot.start_generate_response("openai", message="hello")
+    with pytest.raises(TimeoutError):
+        chatbot.wait_for_response(response_handle, timeout="10ms")
+    assert chatbot.wait_for_response(response_handle, timeout="1s") == "HELLO"
+
+def test_wait_for_all_responses_of_all_modules(ai_model):
+    chatbot, generator = Chatbot(), RealTestDataGenerator()
+    chatbot.start_generate_response("openai", message="a")
+    generator.start_generate_test_data("openai", "address", country="Netherlands")
+    chatbot.start_generate_response("openai", message="fail")
+    results = chatbot.wait_for_all_responses(return_errors=True)
+    assert results[0] == "A"
+    assert "Netherlands" in results[1][0]
+    assert isinstance(results[2], ConnectionError)
+    assert chatbot.wait_for_all_responses() == []
@@ -39,3 +39,11 @@ def test_validate_input_arguments_given_invalid_presence_penalty_raises_error(mo
     with pytest.raises(ValueError) as context:
         module.validate_input_arguments(max_tokens=100, temperature=1.0, top_p=0.5, frequency_penalty=-1.0, presence_penalty=3.0)
     assert "Invalid value `3.0` for `presence_penalty`" in str(context.value)
+
+def test_is_valid_max_tokens_uses_the_max_completion_tokens_of_the_model(module):
+    module.is_valid_max_tokens(8000, "gpt-4o-mini")
+    with pytest.raises(ValueError) as context:
+        module.is_valid_max_tokens(20000, "gpt-4o-mini")
+    assert "less than or equal to 16384" in str(context.value)
+    with pytest.raises(ValueError):
+        module.is_valid_max_tokens(8000, "unknown-model")
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.modules.assistant.Assistant import Assistant
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+from RobotFrameworkAI.objects.response.Response import Response
+from RobotFrameworkAI.objects.response.ResponseMetadata import ResponseMetadata
+
+
+@pytest.fixture(autouse=True)
+def openai_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "test-key")
+
+def test_ai_interface_is_shared_by_the_whole_process():
+    assert AI_Interface() is AI_Interface()
+
+def test_modules_share_the_same_ai_models():
+    chatbot, generator, assistant = Chatbot(), RealTestDataGenerator(), Assistant()
+    assert chatbot.ai_interface is generator.ai_interface is assistant.ai_interface
+    assert chatbot.ai_interface.ai_models["openai"] is assistant.ai_interface.ai_models["openai"]
+
+def test_ai_models_are_created_without_api_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_KEY")
+    openai_service = AI_Interface().ai_models["openai"]
+    assert openai_service.name == "openai"
+    assert "text_generator" in openai_service.ai_tools
+
+def test_missing_api_key_fails_on_first_use(monkeypatch):
+    monkeypatch.delenv("OPENAI_KEY")
+    openai_service = AI_Interface().ai_models["openai"]
+    openai_service._client = None
+    with pytest.raises(ValueError) as context:
+        openai_service.client
+    assert "OpenAI API key must be provided" in str(context.value)
+
+
+@pytest.fixture
+def slow_ai_model(monkeypatch):
+    ai_interface = AI_Interface()
+    threads = []
+    async def send_prompt(prompt):
+        threads.append(threading.current_thread())
+        await asyncio.sleep(.2)
+        return Response(prompt.message.user.upper(), ResponseMetadata("text_generator", "openai", "gpt-4o-mini"))
+    monkeypatch.setattr(ai_interface, "_send_prompt", send_prompt)
+    return threads
+
+def test_prompts_are_handled_on_the_event_loop_of_the_ai_interface(slow_ai_model):
+    assert Chatbot().generate_response("openai", message="hello") == "HELLO"
+    assert [thread.name for thread in slow_ai_model] == ["AI_Interface"]
+
+def test_async_keywords_run_concurrently(slow_ai_model):
+    chatbot = Chatbot()
+    async def generate_responses():
+        return await asyncio.gather(*(chatbot.generate_response_async("openai", message=f"message {i}") for i in range(10)))
+    start = time.perf_counter()
+    responses = asyncio.run(generate_responses())
+    assert time.perf_counter() - start < 1
+    assert responses == [f"MESSAGE {i}" for i in range(10)]
+
+def test_run_cannot_be_used_on_the_event_loop_of_the_ai_interface():
+    ai_interface = AI_Interface()
+    async def nested():
+        return ai_interface.run(asyncio.sleep(0))
+    with pytest.raises(RuntimeError):
+        ai_interface.run(nested())
+
+def test_identical_prompts_in_flight_are_sent_once(slow_ai_model):
+    chatbot = Chatbot()
+    responses = chatbot.generate_responses(["same"] * 5 + ["other"], "openai", max_concurrency=10)
+    assert responses == ["SAME"] * 5 + ["OTHER"]
+    assert len(slow_ai_model) == 2
+
+def test_each_caller_gets_its_own_copy_of_the_response(slow_ai_model):
+    ai_interface = AI_Interface()
+    prompt = Chatbot().create_prompt("text_generator", "openai", None, "same", None, None, 256, 1, .5, 0, 0, None)
+    async def send_prompts():
+        return await asyncio.gather(*(ai_interface.call_ai_tool_async(prompt) for _ in range(3)))
+    responses = asyncio.run(send_prompts())
+    assert len(slow_ai_model) == 1
+    assert responses[0] is not responses[1] and responses[1].metadata is not responses[2].metadata
+    assert [response.metadata.coalesced for response in responses] == [False, True, True]
+
+def test_prompts_bypassing_the_cache_are_not_coalesced(slow_ai_model):
+    Chatbot().generate_responses(["same"] * 3, "openai", cache_mode="bypass")
+    assert len(slow_ai_model) == 3
+
+def test_errors_are_raised_to_every_caller(monkeypatch):
+    ai_interface = AI_Interface()
+    calls = []
+    async def send_prompt(prompt):
+        calls.append(prompt)
+        await asyncio.sleep(.05)
+        raise ConnectionError("AI model unavailable")
+    monkeypatch.setattr(ai_interface, "_send_prompt", send_prompt)
+    responses = Chatbot().generate_responses(["same"] * 3, "openai", return_errors=True)
+    assert len(calls) == 1
+    assert all(isinstance(response, ConnectionError) for response in responses)
+    assert ai_interface.in_flight == {}
@@ -0,0 +1,72 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.gateway.GatewayClient import GatewayClient
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.objects.prompt.Prompt import Prompt
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="The AI gateway uses Unix sockets")
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    socket_path = str(tmp_path / "gateway.sock")
+    process = subprocess.Popen([sys.executable, "-m", "RobotFrameworkAI.gateway", "--socket", socket_path], stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while not os.path.exists(socket_path):
+        assert process.poll() is None and time.monotonic() < deadline, "The AI gateway didn't start"
+        time.sleep(.05)
+    assert os.stat(socket_path).st_mode & 0o777 == 0o600
+    Chatbot().configure_ai_gateway(socket_path)
+    yield process
+    process.kill()
+    process.wait()
+    Chatbot().configure_ai_gateway()
+
+def create_prompt(**kwargs):
+    return Chatbot().create_prompt("text_generator", "mock", "Be brief", "Hello", None, None, 256, 1, .5, 0, 0, None, **kwargs)
+
+def test_prompt_round_trip():
+    prompt = create_prompt(cache_mode="bypass")
+    assert Prompt.from_dict(prompt.to_dict()) == prompt
+
+def test_accepts(tmp_path, monkeypatch):
+    socket_path = tmp_path / "gateway.sock"
+    client = GatewayClient(str(socket_path))
+    assert not client.accepts(create_prompt())
+    socket_path.touch()
+    assert not client.accepts(create_prompt())
+    socket_path.unlink()
+    with socket.socket(socket.AF_UNIX) as server:
+        server.bind(str(socket_path))
+        assert client.accepts(create_prompt())
+        assert not client.accepts(create_prompt(stop_predicate=lambda text: True))
+        prompt = create_prompt()
+        prompt.config.ai_tool = "assistant"
+        assert not client.accepts(prompt)
+        uid = os.getuid()
+        monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+        assert not client.accepts(create_prompt())
+        monkeypatch.undo()
+        client.configure(str(socket_path), enabled=False)
+        assert not client.accepts(create_prompt())
+
+def test_prompts_are_sent_to_the_gateway(gateway):
+    chatbot = Chatbot()
+    response = chatbot.generate_response(ai_model="mock", message="Hello", cache_mode="bypass")
+    status = chatbot.get_ai_gateway_status()
+    assert status["connected"] and status["requests"] == 1
+    assert status["gateway"]["requests"] == 1
+    assert status["gateway"]["usage"]["totals"]["calls"] == 1
+
+    gateway.kill()
+    gateway.wait()
+    assert chatbot.generate_response(ai_model="mock", message="Hello", cache_mode="bypass") == response
+    status = chatbot.get_ai_gateway_status()
+    assert status["fallbacks"] >= 1 and status["gateway"] is None
+    assert not AI_Interface().gateway.accepts(create_prompt())
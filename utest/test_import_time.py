@@ -0,0 +1,24 @@
+import re
+import subprocess
+import sys
+
+# Budget in microseconds for importing RobotFrameworkAI itself, Robot Framework excluded
+IMPORT_TIME_BUDGET_US = 150_000
+
+
+def import_library():
+    # Robot Framework gets imported first so only the import time of the library itself is measured
+    code = "import robot.api.deco, robotlibcore; import RobotFrameworkAI, sys; print(sorted(sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+def test_import_does_not_import_ai_model_packages():
+    modules, _ = import_library()
+    assert "'openai'" not in modules
+    assert "OpenAIService" not in modules
+    assert "AddressGenerator" not in modules
+
+def test_import_time_is_within_budget():
+    _, importtime = import_library()
+    cumulative = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| RobotFrameworkAI$", importtime, re.MULTILINE)
+    assert int(cumulative.group(1)) < IMPORT_TIME_BUDGET_US
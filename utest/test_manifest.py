@@ -0,0 +1,19 @@
+from RobotFrameworkAI.manifest import manifest
+from RobotFrameworkAI.manifest.generate_manifest import build_manifest, render_manifest, MANIFEST_PATH
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+
+
+def test_manifest_is_up_to_date():
+    # If this fails, run: python -m RobotFrameworkAI.manifest.generate_manifest
+    with open(MANIFEST_PATH) as file:
+        assert file.read() == render_manifest(build_manifest())
+
+def test_manifest_lists_openai_tools():
+    assert set(manifest.AI_TOOLS["openai"]) == {"assistant", "batch", "text_generator"}
+
+def test_test_data_generators_are_loaded_on_first_use():
+    generators = RealTestDataGenerator().generators
+    assert "address" in generators
+    assert "address" not in generators.loaded()
+    assert generators["address"].type == "address"
+    assert "address" in generators.loaded()
@@ -0,0 +1,77 @@
+import json
+import openai
+import pytest
+import time
+from RobotFrameworkAI.ai_interface.AI_Interface import AI_Interface
+from RobotFrameworkAI.ai_interface.ai_model_services.mock_tools.MockClient import MockBehaviour
+from RobotFrameworkAI.ai_interface.transport.TransportConfig import TransportConfig
+from RobotFrameworkAI.modules.assistant.Assistant import Assistant
+from RobotFrameworkAI.modules.Module import BatchError
+from RobotFrameworkAI.modules.chatbot.Chatbot import Chatbot
+from RobotFrameworkAI.modules.real_test_data_generator.RealTestDataGenerator import RealTestDataGenerator
+from RobotFrameworkAI.stub_server.StubServer import StubServer
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    monkeypatch.setenv("OPENAI_KEY", "stub")
+    openai_service = AI_Interface().ai_models["openai"]
+    with StubServer() as stub_server:
+        Chatbot().configure_ai_transport("openai", base_url=stub_server.url)
+        yield stub_server
+    openai_service.configure_transport(TransportConfig())
+    openai_service.set_retry_policy()
+
+def test_chat_completions(stub_server):
+    chatbot = Chatbot()
+    response = chatbot.generate_response(ai_model="openai", message="Hello", cache_mode="bypass")
+    assert response == chatbot.generate_response(ai_model="openai", message="Hello", cache_mode="bypass")
+    assert chatbot.generate_response(ai_model="openai", message="Hello", stream=True, cache_mode="bypass") == response
+    addresses = RealTestDataGenerator().generate_test_data(ai_model="openai", type="address", amount=3, cache_mode="bypass")
+    assert len(addresses) == 3
+    assert stub_server.get_statistics()["requests"]["POST /chat/completions"] == 4
+
+def test_assistants(stub_server, tmp_path):
+    file_path = tmp_path / "notes.txt"
+    file_path.write_text("Some notes")
+    assistant = Assistant()
+    id = assistant.create_assistant(ai_model="openai", name="Bob", instructions="Be nice", response_format={"type": "json_object"})
+    assert isinstance(json.loads(assistant.send_message(ai_model="openai", message="Hello")), dict)
+    assistant.attach_files(ai_model="openai", file_paths=[str(file_path)])
+    assert assistant.get_active_assistant_id(ai_model="openai") == id
+    assistant.delete_assistant(ai_model="openai")
+    assert stub_server.get_statistics()["requests"]["DELETE /assistants/{id}"] == 1
+
+def test_injected_errors_are_retried(stub_server):
+    stub_server.set_behaviour(MockBehaviour(error_rate=1))
+    AI_Interface().ai_models["openai"].set_retry_policy(max_retries=2, base_delay=0)
+    with pytest.raises(openai.InternalServerError):
+        Chatbot().generate_response(ai_model="openai", message="Hello", cache_mode="bypass")
+    assert stub_server.get_statistics()["errors"]["POST /chat/completions"] == 3
+
+def test_test_data_jobs(stub_server, tmp_path):
+    stub_server.batch_latency = .3
+    generator = RealTestDataGenerator()
+    generator.submit_test_data_job(str(tmp_path), ["address", {"type": "address", "amount": 2}], ai_model="openai")
+    with pytest.raises(TimeoutError):
+        generator.wait_for_test_data_job(str(tmp_path), timeout="0.1s", poll_interval="0.05s")
+    assert generator.get_test_data_job_status(str(tmp_path))["batch_status"] == "in_progress"
+    test_data = generator.wait_for_test_data_job(str(tmp_path), poll_interval="0.05s")
+    assert [len(addresses) for addresses in test_data] == [3, 2]
+    assert generator.get_test_data_job_status(str(tmp_path))["request_counts"] == {"total": 2, "completed": 2, "failed": 0}
+
+def test_test_data_job_errors(stub_server, tmp_path):
+    stub_server.batch_latency = .2
+    generator = RealTestDataGenerator()
+    generator.submit_test_data_job(str(tmp_path), ["address"] * 6, ai_model="openai")
+    # Only the requests of the batch fail, not the calls that check on it
+    stub_server.set_behaviour(MockBehaviour(error_rate=.5, seed=3))
+    time.sleep(.4)
+    stub_server.set_behaviour(MockBehaviour())
+    with pytest.raises(BatchError) as error:
+        generator.wait_for_test_data_job(str(tmp_path), poll_interval="0.05s")
+    results = generator.wait_for_test_data_job(str(tmp_path), return_errors=True)
+    assert list(map(str, results)) == list(map(str, error.value.results))
+    failed = [result for result in results if isinstance(result, ValueError)]
+    assert 0 < len(failed) < 6
+    assert str(failed[0]) == "Error code: 500 - The mock AI model had an internal server error"